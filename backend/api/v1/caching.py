@@ -0,0 +1,61 @@
+"""
+Conditional GET support for read-heavy v1 endpoints.
+
+ETags and Last-Modified come from the per-table DataVersion counters
+(see movies.signals), so a matching If-None-Match / If-Modified-Since is
+answered with a 304 after a single primary-key lookup, before the view
+builds or evaluates any queryset.
+"""
+from functools import wraps
+from hashlib import sha256
+
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+from movies.models import DataVersion
+
+
+def conditional_get(*models, **cache_control):
+    """
+    Decorate a view so GET/HEAD responses carry a strong ETag and
+    Last-Modified derived from the given models' DataVersion rows.
+
+    Keyword arguments are passed to ``patch_cache_control``, e.g.
+    ``conditional_get(Genre, max_age=300, public=True)``.
+    """
+    labels = sorted(model._meta.label_lower for model in models)
+
+    def _versions(request):
+        state = getattr(request, '_data_versions', None)
+        if state is None:
+            rows = list(DataVersion.objects.filter(name__in=labels).values_list(
+                'name', 'version', 'updated_at'
+            ))
+            versions = {name: version for name, version, _ in rows}
+            last_modified = max((updated_at for _, _, updated_at in rows), default=None)
+            state = request._data_versions = (versions, last_modified)
+        return state
+
+    def etag(request, *args, **kwargs):
+        versions, _ = _versions(request)
+        parts = [request.get_full_path(), request.META.get('HTTP_ACCEPT', '')]
+        parts.extend(f'{label}:{versions.get(label, 0)}' for label in labels)
+        return sha256('|'.join(parts).encode()).hexdigest()[:32]
+
+    def last_modified(request, *args, **kwargs):
+        return _versions(request)[1]
+
+    def decorator(view):
+        conditional_view = condition(etag_func=etag, last_modified_func=last_modified)(view)
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+            response = conditional_view(request, *args, **kwargs)
+            if cache_control:
+                patch_cache_control(response, **cache_control)
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,5 @@
+from .search_filters import MovieSearchFilter
+
+__all__ = [
+    'MovieSearchFilter'
+]
@@ -0,0 +1,28 @@
+from rest_framework import filters
+from rest_framework.settings import api_settings
+from movies.search import search_movies
+
+
+class MovieSearchFilter(filters.SearchFilter):
+    """
+    Ranked full-text search backed by the database search index
+    (Postgres tsvector / SQLite FTS5). Falls back to DRF's icontains
+    search when the database has no index.
+
+    Place it after OrderingFilter so that, unless the client asked for an
+    explicit ``ordering``, results come back best match first.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search_terms = self.get_search_terms(request)
+        if not search_terms:
+            return queryset
+
+        results = search_movies(queryset, search_terms, using=queryset.db)
+        if results is None:
+            return super().filter_queryset(request, queryset, view)
+
+        if not request.query_params.get(api_settings.ORDERING_PARAM):
+            default_ordering = list(getattr(view, 'ordering', None) or [])
+            results = results.order_by('-search_rank', *default_ordering)
+        return results
@@ -0,0 +1,86 @@
+"""
+Fast JSON rendering for the v1 API.
+
+Opt in with API_FAST_JSON=True (see settings). Uses orjson when it is
+installed and falls back to DRF's stock renderer otherwise, so the
+dependency stays optional.
+"""
+from decimal import Decimal
+
+from django.conf import settings
+from rest_framework import renderers
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+DECIMAL_POLICIES = ('float', 'int', 'string')
+
+
+def decimal_encoder(policy):
+    """Return a callable turning a Decimal into its JSON value under ``policy``"""
+    if policy not in DECIMAL_POLICIES:
+        raise ValueError(f"Unknown decimal policy {policy!r}, expected one of {DECIMAL_POLICIES}")
+
+    if policy == 'string':
+        return str
+    if policy == 'int':
+        # Whole amounts (budgets, revenue) become ints, fractional ones (ROI) floats
+        return lambda value: int(value) if value == value.to_integral_value() else float(value)
+    return float
+
+
+def decimal_json_encoder(encode_decimal):
+    """DRF's JSONEncoder with Decimals encoded by ``encode_decimal``"""
+
+    class DecimalPolicyEncoder(encoders.JSONEncoder):
+        def default(self, obj):
+            if isinstance(obj, Decimal):
+                return encode_decimal(obj)
+            return super().default(obj)
+
+    return DecimalPolicyEncoder
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """
+    JSONRenderer backed by orjson with a configurable Decimal policy.
+
+    Pair it with ``COERCE_DECIMAL_TO_STRING = False`` so DecimalFields hand
+    Decimals to the renderer instead of pre-formatted strings. The stock
+    json paths (no orjson, indented output) apply the same policy.
+    """
+
+    def __init__(self, decimal_policy=None):
+        super().__init__()
+        self.encode_decimal = decimal_encoder(
+            decimal_policy or getattr(settings, 'API_JSON_DECIMAL_POLICY', 'float')
+        )
+        self.encoder_class = decimal_json_encoder(self.encode_decimal)
+        self.fallback_encoder = self.encoder_class()
+
+    def default(self, obj):
+        # Decimals per the policy; dates, lazy strings, querysets etc. keep
+        # DRF's formatting
+        return self.fallback_encoder.default(obj)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None:
+            # Pretty-printing is a browsable API / debugging path
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(
+            data,
+            default=self.default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+        )
+        # Keep output a strict JavaScript subset, as the stock renderer does
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
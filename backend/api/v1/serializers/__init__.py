@@ -4,8 +4,10 @@ from .movie_serializers import (
     MovieRatingSerializer,
     MovieListSerializer,
     MovieDetailSerializer,
-    MovieCreateUpdateSerializer
+    MovieCreateUpdateSerializer,
+    MovieReadModelSerializer
 )
+from .projections import MovieListProjection, movie_list_projection
 
 __all__ = [
     'StudioSerializer',
@@ -13,5 +15,8 @@ __all__ = [
     'MovieRatingSerializer', 
     'MovieListSerializer',
     'MovieDetailSerializer',
-    'MovieCreateUpdateSerializer'
+    'MovieCreateUpdateSerializer',
+    'MovieReadModelSerializer',
+    'MovieListProjection',
+    'movie_list_projection'
 ]
\ No newline at end of file
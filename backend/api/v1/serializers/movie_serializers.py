@@ -1,5 +1,6 @@
 from rest_framework import serializers
-from movies.models import Movie, Studio, Genre, MovieRating, Person
+from movies import tiers
+from movies.models import Movie, Studio, Genre, MovieRating, Person, MovieReadModel
 
 
 class StudioSerializer(serializers.ModelSerializer):
@@ -54,37 +55,11 @@ class MovieListSerializer(serializers.ModelSerializer):
     
     def get_budget_category(self, obj):
         """Categorize movie by budget size"""
-        if not obj.budget:
-            return "Unknown"
-        
-        budget = float(obj.budget)
-        if budget < 1_000_000:
-            return "Micro Budget"
-        elif budget < 15_000_000:
-            return "Low Budget"
-        elif budget < 50_000_000:
-            return "Medium Budget"
-        elif budget < 150_000_000:
-            return "High Budget"
-        else:
-            return "Blockbuster"
+        return tiers.budget_category(obj.budget)
     
     def get_performance_rating(self, obj):
         """Business performance assessment"""
-        if not obj.roi:
-            return "Unknown"
-        
-        roi = float(obj.roi)
-        if roi < -50:
-            return "Poor"
-        elif roi < 0:
-            return "Loss"
-        elif roi < 50:
-            return "Break Even"
-        elif roi < 200:
-            return "Good"
-        else:
-            return "Excellent"
+        return tiers.performance_rating(obj.roi)
 
 
 class MovieDetailSerializer(serializers.ModelSerializer):
@@ -111,44 +86,15 @@ class MovieDetailSerializer(serializers.ModelSerializer):
     
     def get_profit_margin(self, obj):
         """Calculate profit margin percentage"""
-        if obj.budget and obj.revenue and obj.budget > 0:
-            margin = ((obj.revenue - obj.budget) / obj.revenue) * 100
-            return round(margin, 2)
-        return None
+        return tiers.profit_margin(obj.budget, obj.revenue)
     
     def get_budget_category(self, obj):
         """Categorize movie by budget size"""
-        if not obj.budget:
-            return "Unknown"
-        
-        budget = float(obj.budget)
-        if budget < 1_000_000:
-            return "Micro Budget"
-        elif budget < 15_000_000:
-            return "Low Budget"
-        elif budget < 50_000_000:
-            return "Medium Budget"
-        elif budget < 150_000_000:
-            return "High Budget"
-        else:
-            return "Blockbuster"
+        return tiers.budget_category(obj.budget)
     
     def get_performance_rating(self, obj):
         """Business performance assessment"""
-        if not obj.roi:
-            return "Unknown"
-        
-        roi = float(obj.roi)
-        if roi < -50:
-            return "Poor"
-        elif roi < 0:
-            return "Loss"
-        elif roi < 50:
-            return "Break Even"
-        elif roi < 200:
-            return "Good"
-        else:
-            return "Excellent"
+        return tiers.performance_rating(obj.roi)
 
 
 class MovieCreateUpdateSerializer(serializers.ModelSerializer):
@@ -179,4 +125,35 @@ class MovieCreateUpdateSerializer(serializers.ModelSerializer):
             instance.calculate_roi()
         
         instance.save()
-        return instance
\ No newline at end of file
+        return instance
+
+
+class MovieReadModelSerializer(serializers.ModelSerializer):
+    """Catalogue rows from the synced read model"""
+    genres = serializers.SerializerMethodField()
+    is_profitable = serializers.SerializerMethodField()
+    budget_category = serializers.SerializerMethodField()
+    performance_rating = serializers.SerializerMethodField()
+
+    class Meta:
+        model = MovieReadModel
+        fields = [
+            'id', 'tmdb_id', 'imdb_id', 'title', 'original_title', 'release_date',
+            'release_year', 'runtime', 'budget', 'revenue', 'profit', 'roi',
+            'popularity', 'vote_average', 'vote_count', 'genres', 'primary_genre',
+            'imdb_rating', 'rotten_tomatoes', 'metacritic', 'domestic_gross',
+            'worldwide_gross', 'is_profitable', 'budget_category',
+            'performance_rating', 'synced_at'
+        ]
+
+    def get_genres(self, obj):
+        return obj.genre_names.split(', ') if obj.genre_names else []
+
+    def get_is_profitable(self, obj):
+        return tiers.is_profitable(obj.budget, obj.revenue)
+
+    def get_budget_category(self, obj):
+        return tiers.budget_category(obj.budget)
+
+    def get_performance_rating(self, obj):
+        return tiers.performance_rating(obj.roi)
@@ -0,0 +1,79 @@
+"""
+Read-only projections for hot list endpoints.
+
+A projection fetches plain ``values_list()`` tuples (with the studio and
+primary genre names joined in by the database) and maps each tuple to the
+same dict MovieListSerializer would produce, without building a serializer
+field tree per row.
+"""
+from django.db.models import OuterRef, Subquery
+from rest_framework.settings import api_settings
+from movies import tiers
+from movies.models import Genre
+
+
+def _decimal_formatter():
+    """Match DecimalField.to_representation for already-quantized DB values"""
+    if api_settings.COERCE_DECIMAL_TO_STRING:
+        return lambda value: None if value is None else '{:f}'.format(value)
+    return lambda value: value
+
+
+class MovieListProjection:
+    """Same output contract as MovieListSerializer, at a fraction of the cost"""
+
+    columns = (
+        'id', 'title', 'release_date', 'budget', 'revenue', 'roi',
+        'studio__name', 'primary_genre_name', 'tmdb_id',
+    )
+
+    def values(self, queryset):
+        """Turn a Movie queryset into a queryset of row tuples"""
+        # MovieListSerializer uses genres.first(), i.e. the lowest genre pk
+        primary_genre = Genre.objects.filter(movie=OuterRef('pk')).order_by('pk').values('name')[:1]
+        return (
+            queryset.prefetch_related(None)
+            .annotate(primary_genre_name=Subquery(primary_genre))
+            .values_list(*self.columns)
+        )
+
+    def compile(self):
+        """Build the row -> dict function once per response"""
+        decimal = _decimal_formatter()
+        budget_category = tiers.budget_category
+        performance_rating = tiers.performance_rating
+        is_profitable = tiers.is_profitable
+
+        def to_dict(row):
+            pk, title, release_date, budget, revenue, roi, studio_name, primary_genre, tmdb_id = row
+            item = {
+                'id': pk,
+                'title': title,
+                'release_date': release_date.isoformat() if release_date else None,
+                'budget': decimal(budget),
+                'revenue': decimal(revenue),
+                'roi': decimal(roi),
+                'studio_name': studio_name,
+                'primary_genre': primary_genre,
+                'is_profitable': is_profitable(budget, revenue),
+                'tmdb_id': tmdb_id,
+                'budget_category': budget_category(budget),
+                'performance_rating': performance_rating(roi),
+            }
+            if studio_name is None:
+                # The serializer skips studio_name when there is no studio
+                del item['studio_name']
+            return item
+
+        return to_dict
+
+    def to_dicts(self, rows):
+        to_dict = self.compile()
+        return [to_dict(row) for row in rows]
+
+    def data(self, queryset):
+        """Shortcut: evaluate ``queryset`` and return the serialized list"""
+        return self.to_dicts(self.values(queryset))
+
+
+movie_list_projection = MovieListProjection()
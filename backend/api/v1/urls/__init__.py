@@ -2,4 +2,5 @@ from django.urls import path, include
 
 urlpatterns = [
     path('', include('api.v1.urls.movie_urls')),
+    path('', include('api.v1.urls.report_urls')),
 ]
\ No newline at end of file
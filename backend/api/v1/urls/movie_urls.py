@@ -1,7 +1,8 @@
 from django.urls import path
 from api.v1.views.movie_views import (
     MovieListCreateView, MovieDetailView, StudioListView, GenreListView,
-    movie_analytics, profitable_movies, movies_by_budget_range, ml_training_data
+    CatalogueListView, CatalogueDetailView,
+    movie_autocomplete, movie_analytics, profitable_movies, movies_by_budget_range, ml_training_data
 )
 
 app_name = 'movies_api'
@@ -10,6 +11,11 @@ urlpatterns = [
     # 🎬 Core movie CRUD operations
     path('movies/', MovieListCreateView.as_view(), name='movie-list-create'),
     path('movies/<int:pk>/', MovieDetailView.as_view(), name='movie-detail'),
+    path('movies/autocomplete/', movie_autocomplete, name='movie-autocomplete'),
+
+    # 📚 Ingested catalogue (denormalised read model)
+    path('catalogue/', CatalogueListView.as_view(), name='catalogue-list'),
+    path('catalogue/<int:pk>/', CatalogueDetailView.as_view(), name='catalogue-detail'),
     
     # 🏢 Reference data
     path('studios/', StudioListView.as_view(), name='studio-list'),
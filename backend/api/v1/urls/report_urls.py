@@ -0,0 +1,11 @@
+from django.urls import path
+from api.v1.views.report_views import report_list, generate_report, report_file
+
+app_name = 'reports_api'
+
+urlpatterns = [
+    # 📑 Rendered reports, built once per data version
+    path('reports/', report_list, name='report-list'),
+    path('reports/<slug:name>/', generate_report, name='report-generate'),
+    path('reports/<slug:name>.<slug:file_format>', report_file, name='report-file'),
+]
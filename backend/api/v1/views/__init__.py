@@ -3,6 +3,9 @@ from .movie_views import (
     MovieDetailView,
     StudioListView,
     GenreListView,
+    CatalogueListView,
+    CatalogueDetailView,
+    movie_autocomplete,
     movie_analytics,
     profitable_movies,
     movies_by_budget_range,
@@ -14,6 +17,9 @@ __all__ = [
     'MovieDetailView', 
     'StudioListView',
     'GenreListView',
+    'CatalogueListView',
+    'CatalogueDetailView',
+    'movie_autocomplete',
     'movie_analytics',
     'profitable_movies',
     'movies_by_budget_range',
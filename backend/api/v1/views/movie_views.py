@@ -2,12 +2,20 @@ from rest_framework import generics, filters, status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from django.db import OperationalError, ProgrammingError, connections, router
 from django.db.models import Q, Avg, Sum, Count
-from movies.models import Movie, Studio, Genre
+from django.utils.decorators import method_decorator
+from movies.models import Movie, Studio, Genre, MovieRating, MovieReadModel
+from movies.autocomplete import title_autocomplete, TOP_K
+from api.v1.caching import conditional_get
+from api.v1.filters import MovieSearchFilter
 from api.v1.serializers.movie_serializers import (
     MovieListSerializer, MovieDetailSerializer, MovieCreateUpdateSerializer,
-    StudioSerializer, GenreSerializer
+    StudioSerializer, GenreSerializer, MovieReadModelSerializer
 )
+from api.v1.serializers.projections import movie_list_projection
+from movies import tiers
+from movies.financials import price_index
 
 
 class MovieListCreateView(generics.ListCreateAPIView):
@@ -16,7 +24,7 @@ class MovieListCreateView(generics.ListCreateAPIView):
     POST: Create new movie
     """
     queryset = Movie.objects.select_related('studio').prefetch_related('genres')
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, MovieSearchFilter]
     search_fields = ['title', 'overview', 'studio__name']
     filterset_fields = ['rating', 'studio', 'genres']
     ordering_fields = ['release_date', 'budget', 'revenue', 'roi']
@@ -27,7 +35,18 @@ class MovieListCreateView(generics.ListCreateAPIView):
             return MovieCreateUpdateSerializer
         return MovieListSerializer
 
+    def list(self, request, *args, **kwargs):
+        """Serve the list through the values() projection instead of the serializer"""
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = movie_list_projection.values(queryset)
 
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(movie_list_projection.to_dicts(page))
+        return Response(movie_list_projection.to_dicts(rows))
+
+
+@method_decorator(conditional_get(Movie, Studio, Genre, MovieRating, max_age=60), name='get')
 class MovieDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
     GET: Movie details with full information
@@ -42,32 +61,113 @@ class MovieDetailView(generics.RetrieveUpdateDestroyAPIView):
         return MovieDetailSerializer
 
 
+@method_decorator(conditional_get(Studio, Movie, max_age=300, public=True), name='get')
 class StudioListView(generics.ListAPIView):
     """List all studios with movie counts"""
     queryset = Studio.objects.annotate(movie_count=Count('movie')).order_by('name')
     serializer_class = StudioSerializer
 
 
+@method_decorator(conditional_get(Genre, max_age=300, public=True), name='get')
 class GenreListView(generics.ListAPIView):
     """List all genres"""
     queryset = Genre.objects.all().order_by('name')
     serializer_class = GenreSerializer
 
 
+def read_model_exists():
+    """Whether the sync job has created movie_read_model yet"""
+    connection = connections[router.db_for_read(MovieReadModel)]
+    with connection.cursor() as cursor:
+        tables = connection.introspection.table_names(cursor)
+    return MovieReadModel._meta.db_table in tables
+
+
+class ReadModelMixin:
+    """Answer 503 instead of 500 until the sync job has built the read model"""
+
+    def handle_exception(self, exc):
+        # Other database errors are real failures and stay 500s
+        if isinstance(exc, (ProgrammingError, OperationalError)) and not read_model_exists():
+            return Response(
+                {'detail': 'Catalogue read model is not available yet; run scripts/sync_read_model.py'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        return super().handle_exception(exc)
+
+
+class CatalogueListView(ReadModelMixin, generics.ListAPIView):
+    """
+    GET: Full ingested catalogue from the denormalised read model.
+    One indexed table, no joins; filter with ?genre=, ?release_year__gte= etc.
+    """
+    queryset = MovieReadModel.objects.all()
+    serializer_class = MovieReadModelSerializer
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, filters.SearchFilter]
+    filterset_fields = {
+        'release_year': ['exact', 'gte', 'lte'],
+        'primary_genre': ['exact'],
+        'vote_average': ['gte', 'lte'],
+        'roi': ['gte', 'lte'],
+        'budget': ['gte', 'lte'],
+    }
+    search_fields = ['title', 'original_title']
+    ordering_fields = ['release_date', 'budget', 'revenue', 'roi', 'vote_average', 'popularity']
+    ordering = ['-release_date']
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        genre = self.request.query_params.get('genre')
+        if genre:
+            queryset = queryset.filter(genre_names__icontains=genre)
+        return queryset
+
+
+class CatalogueDetailView(ReadModelMixin, generics.RetrieveAPIView):
+    """GET: One read-model row by ingestion movie id"""
+    queryset = MovieReadModel.objects.all()
+    serializer_class = MovieReadModelSerializer
+
+
+@api_view(['GET'])
+def movie_autocomplete(request):
+    """
+    Title suggestions for the search box.
+    Served from the in-process title index, no database work per keystroke.
+    """
+    query = request.query_params.get('q', '')
+    try:
+        limit = max(1, min(int(request.query_params.get('limit', TOP_K)), TOP_K))
+    except ValueError:
+        limit = TOP_K
+
+    return Response({
+        'query': query,
+        'results': title_autocomplete.complete(query, limit)
+    })
+
+
 @api_view(['GET'])
+@conditional_get(Movie, Studio, Genre, max_age=60, public=True)
 def movie_analytics(request):
     """
     🎯 BUSINESS INTELLIGENCE ENDPOINT
     This will power your React dashboard!
+    ?adjusted=true: budgets and revenues in price index base year dollars
     """
+    adjusted = request.query_params.get('adjusted', '').lower() in ('1', 'true', 'yes')
+    budget_field, revenue_field = (
+        ('adjusted_budget', 'adjusted_revenue') if adjusted else ('budget', 'revenue')
+    )
+
     # Basic statistics
     total_movies = Movie.objects.count()
     movies_with_budget = Movie.objects.exclude(budget__isnull=True).count()
     movies_with_revenue = Movie.objects.exclude(revenue__isnull=True).count()
     
     # Financial analytics
-    total_budget = Movie.objects.aggregate(Sum('budget'))['budget__sum'] or 0
-    total_revenue = Movie.objects.aggregate(Sum('revenue'))['revenue__sum'] or 0
+    total_budget = Movie.objects.aggregate(total=Sum(budget_field))['total'] or 0
+    total_revenue = Movie.objects.aggregate(total=Sum(revenue_field))['total'] or 0
     avg_roi = Movie.objects.exclude(roi__isnull=True).aggregate(Avg('roi'))['roi__avg']
     
     # Profitability analysis
@@ -75,20 +175,22 @@ def movie_analytics(request):
     loss_movies = Movie.objects.filter(roi__lt=0).count()
     
     # Top performers
-    top_revenue_movies = Movie.objects.exclude(revenue__isnull=True).order_by('-revenue')[:5]
+    top_revenue_movies = Movie.objects.exclude(
+        **{f'{revenue_field}__isnull': True}
+    ).order_by(f'-{revenue_field}')[:5]
     top_roi_movies = Movie.objects.exclude(roi__isnull=True).order_by('-roi')[:5]
     
     # Genre analysis
     genre_performance = Genre.objects.annotate(
         movie_count=Count('movie'),
-        avg_revenue=Avg('movie__revenue'),
+        avg_revenue=Avg(f'movie__{revenue_field}'),
         avg_roi=Avg('movie__roi')
     ).order_by('-avg_revenue')[:10]
     
     # Studio analysis
     studio_performance = Studio.objects.annotate(
         movie_count=Count('movie'),
-        total_revenue=Sum('movie__revenue'),
+        total_revenue=Sum(f'movie__{revenue_field}'),
         avg_roi=Avg('movie__roi')
     ).order_by('-total_revenue')[:10]
     
@@ -103,7 +205,9 @@ def movie_analytics(request):
             'total_budget': total_budget,
             'total_revenue': total_revenue,
             'overall_roi': round(((total_revenue - total_budget) / total_budget * 100), 2) if total_budget > 0 else 0,
-            'average_roi': round(avg_roi, 2) if avg_roi else 0
+            'average_roi': round(avg_roi, 2) if avg_roi else 0,
+            'adjusted': adjusted,
+            'price_base_year': price_index().base_year if adjusted else None
         },
         'profitability': {
             'profitable_movies': profitable_movies,
@@ -111,8 +215,8 @@ def movie_analytics(request):
             'success_rate': round((profitable_movies / (profitable_movies + loss_movies) * 100), 2) if (profitable_movies + loss_movies) > 0 else 0
         },
         'top_performers': {
-            'by_revenue': MovieListSerializer(top_revenue_movies, many=True).data,
-            'by_roi': MovieListSerializer(top_roi_movies, many=True).data
+            'by_revenue': movie_list_projection.data(top_revenue_movies),
+            'by_roi': movie_list_projection.data(top_roi_movies)
         },
         'genre_insights': [
             {
@@ -138,17 +242,19 @@ def movie_analytics(request):
 
 
 @api_view(['GET'])
+@conditional_get(Movie, Studio, Genre, max_age=60, public=True)
 def profitable_movies(request):
     """Get all profitable movies (ROI > 0) - DASHBOARD FILTER"""
     movies = Movie.objects.filter(roi__gt=0).order_by('-roi')
-    serializer = MovieListSerializer(movies, many=True)
+    results = movie_list_projection.data(movies)
     return Response({
-        'count': len(serializer.data),
-        'results': serializer.data
+        'count': len(results),
+        'results': results
     })
 
 
 @api_view(['GET'])
+@conditional_get(Movie, Studio, Genre, max_age=60, public=True)
 def movies_by_budget_range(request):
     """Get movies filtered by budget range - BUSINESS FILTERING"""
     min_budget = request.query_params.get('min_budget', 0)
@@ -159,18 +265,19 @@ def movies_by_budget_range(request):
         budget__lte=max_budget
     ).exclude(budget__isnull=True).order_by('-budget')
     
-    serializer = MovieListSerializer(movies, many=True)
+    results = movie_list_projection.data(movies)
     return Response({
         'filters': {
             'min_budget': min_budget,
             'max_budget': max_budget
         },
-        'count': len(serializer.data),
-        'results': serializer.data
+        'count': len(results),
+        'results': results
     })
 
 
 @api_view(['GET'])
+@conditional_get(Movie, Studio, Genre, max_age=60, public=True)
 def ml_training_data(request):
     """
     🤖 SPECIAL ENDPOINT FOR ML MODELS
@@ -199,8 +306,8 @@ def ml_training_data(request):
             'studio': movie.studio.name if movie.studio else 'Unknown',
             'genre_count': movie.genres.count(),
             'primary_genre': movie.genres.first().name if movie.genres.first() else 'Unknown',
-            'budget_category': MovieDetailSerializer().get_budget_category(movie),
-            'performance_rating': MovieDetailSerializer().get_performance_rating(movie),
+            'budget_category': tiers.budget_category(movie.budget),
+            'performance_rating': tiers.performance_rating(movie.roi),
             # Binary success indicator for classification
             'is_successful': movie.roi > 50,  # Define success as ROI > 50%
         })
@@ -0,0 +1,100 @@
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from django.conf import settings
+from django.http import FileResponse, Http404, JsonResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views.decorators.http import require_safe
+from rest_framework import status
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from reports import generation
+from reports.definitions import REPORTS, get_report
+from reports.models import ReportArtifact
+from reports.rendering import CONTENT_TYPES, available_formats
+
+
+@api_view(['GET'])
+def report_list(request):
+    """Reports, and which formats are already built for the current data"""
+    results = []
+    for name, definition in REPORTS.items():
+        version = generation.data_version(definition)
+        stored = generation.stored_artifacts(name, version)
+        results.append({
+            'name': name,
+            'title': definition.title,
+            'description': definition.description,
+            'data_version': version,
+            'formats': {
+                file_format: {
+                    'url': request.build_absolute_uri(
+                        reverse('reports_api:report-file', args=[name, file_format])
+                    ),
+                    'ready': file_format in stored,
+                    'content_hash': stored[file_format].content_hash if file_format in stored else None,
+                    'size': stored[file_format].size if file_format in stored else None,
+                }
+                for file_format in available_formats()
+            }
+        })
+    return Response({'count': len(results), 'results': results})
+
+
+@api_view(['POST'])
+def generate_report(request, name):
+    """Build a report for the current data in the background, unless already stored"""
+    definition = get_report(name)
+    if definition is None:
+        return Response({'error': f"Unknown report: {name}"}, status=status.HTTP_404_NOT_FOUND)
+
+    version = generation.data_version(definition)
+    if set(available_formats()) <= set(generation.stored_artifacts(name, version)):
+        return Response({'report': name, 'data_version': version, 'status': 'ready'})
+    generation.submit(name, version)
+    return Response(
+        {'report': name, 'data_version': version, 'status': 'pending'},
+        status=status.HTTP_202_ACCEPTED
+    )
+
+
+@require_safe
+def report_file(request, name, file_format):
+    """
+    Serve a stored report for the current data.
+    A report not built yet is built now; if that takes longer than
+    REPORTS_WAIT_SECONDS the response is 202 and the client retries.
+    """
+    definition = get_report(name)
+    if definition is None or file_format not in available_formats():
+        raise Http404(f"No {file_format} report called {name}")
+
+    version = generation.data_version(definition)
+    artifact = generation.stored_artifacts(name, version).get(file_format)
+    if artifact is None:
+        future = generation.submit(name, version)
+        try:
+            result = future.result(timeout=settings.REPORTS_WAIT_SECONDS)
+        except FutureTimeout:
+            response = JsonResponse(
+                {'report': name, 'data_version': version, 'status': 'pending'},
+                status=status.HTTP_202_ACCEPTED
+            )
+            response['Retry-After'] = '5'
+            return response
+        artifact = ReportArtifact.objects.get(
+            report=name, format=file_format, data_version=result['data_version']
+        )
+
+    # The content hash is a strong validator across data versions too
+    etag = f'"{artifact.content_hash}"'
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = FileResponse(
+            artifact.file.open('rb'),
+            content_type=CONTENT_TYPES[file_format],
+            filename=f'{name}-{artifact.data_version}.{file_format}'
+        )
+        response['ETag'] = etag
+    patch_cache_control(response, max_age=60, public=True)
+    return response
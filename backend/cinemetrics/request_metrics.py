@@ -0,0 +1,286 @@
+"""
+Per-request database and rendering cost.
+
+RequestMetricsMiddleware wraps every database connection for the duration
+of a request and records the query count, total SQL time and slowest
+statement, plus the time spent rendering (serialising) the response and
+its size. Totals are kept per view in an in-process registry and written
+one JSON line per request to the
+``cinemetrics.request_metrics`` logger (a rotating file when
+REQUEST_METRICS_LOG_FILE is set). Requests slower than
+REQUEST_METRICS_SLOW_MS log their query list, grouped so N+1 patterns
+stand out.
+
+Both are off by default because they expose internals:
+REQUEST_METRICS_SERVER_TIMING adds a Server-Timing header to responses
+for staff and INTERNAL_IPS, and REQUEST_METRICS_ENDPOINT serves the
+registry in Prometheus text format at /metrics, to the same clients.
+
+The registry is per process: scrape each worker, or aggregate the logs.
+"""
+import json
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.http import Http404, HttpResponse
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250, 1000)
+# Statements shown in a slow-request dump
+DUMP_STATEMENTS = 10
+SQL_PREVIEW_CHARS = 300
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 2)
+
+
+class RequestMetrics:
+    """What one request cost; filled in by the middleware and its hooks"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.view = None
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_sql = ''
+        self.statements = []
+        self.view_seconds = None
+        self.render_started = None
+        self.render_seconds = 0.0
+        self.total_seconds = 0.0
+        self.response_bytes = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        """connection.execute_wrapper hook: time every statement"""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.queries += 1
+            self.sql_seconds += elapsed
+            self.statements.append((sql, elapsed))
+            if elapsed > self.slowest_seconds:
+                self.slowest_seconds, self.slowest_sql = elapsed, sql
+
+    def start_render(self, response):
+        # TemplateResponses (DRF's Response included) render after the view returns
+        self.view_seconds = time.perf_counter() - self.started
+        self.render_started = time.perf_counter()
+        response.add_post_render_callback(self.finish_render)
+        return response
+
+    def finish_render(self, response):
+        self.render_seconds = time.perf_counter() - self.render_started
+
+    def server_timing(self):
+        app_seconds = max(0.0, (self.view_seconds or self.total_seconds) - self.sql_seconds)
+        return ', '.join([
+            f'db;dur={_ms(self.sql_seconds)};desc="{self.queries} queries"',
+            f'app;dur={_ms(app_seconds)}',
+            f'render;dur={_ms(self.render_seconds)}',
+            f'total;dur={_ms(self.total_seconds)}',
+        ])
+
+    def as_dict(self, request, response):
+        return {
+            'method': request.method,
+            'path': request.path,
+            'view': self.view,
+            'status': response.status_code,
+            'queries': self.queries,
+            'sql_ms': _ms(self.sql_seconds),
+            'slowest_sql_ms': _ms(self.slowest_seconds),
+            'slowest_sql': self.slowest_sql[:SQL_PREVIEW_CHARS],
+            'render_ms': _ms(self.render_seconds),
+            'total_ms': _ms(self.total_seconds),
+            'bytes': self.response_bytes,
+        }
+
+    def query_report(self):
+        """Slowest statements and the most repeated ones (N+1 suspects)"""
+        lines = ['Slowest statements:']
+        for sql, elapsed in sorted(self.statements, key=lambda item: -item[1])[:DUMP_STATEMENTS]:
+            lines.append(f'  {_ms(elapsed):>9} ms  {sql[:SQL_PREVIEW_CHARS]}')
+        repeated = Counter(sql for sql, _ in self.statements).most_common(DUMP_STATEMENTS)
+        repeated = [(sql, count) for sql, count in repeated if count > 1]
+        if repeated:
+            lines.append('Repeated statements:')
+            lines.extend(f'  x{count:<7} {sql[:SQL_PREVIEW_CHARS]}' for sql, count in repeated)
+        return '\n'.join(lines)
+
+
+class _Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+        self.total += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Per-view request totals, rendered in the Prometheus text format"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = Counter()
+            self.slow_requests = Counter()
+            self.sql_seconds = Counter()
+            self.render_seconds = Counter()
+            self.response_bytes = Counter()
+            self.durations = defaultdict(lambda: _Histogram(DURATION_BUCKETS))
+            self.query_counts = defaultdict(lambda: _Histogram(QUERY_BUCKETS))
+
+    def record(self, metrics, method, status, slow):
+        view = metrics.view or 'unresolved'
+        with self._lock:
+            self.requests[(view, method, str(status))] += 1
+            if slow:
+                self.slow_requests[view] += 1
+            self.sql_seconds[view] += metrics.sql_seconds
+            self.render_seconds[view] += metrics.render_seconds
+            self.response_bytes[view] += metrics.response_bytes
+            self.durations[view].observe(metrics.total_seconds)
+            self.query_counts[view].observe(metrics.queries)
+
+    @staticmethod
+    def _labels(**labels):
+        def escape(value):
+            return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+        return '{' + ','.join(f'{name}="{escape(value)}"' for name, value in labels.items()) + '}'
+
+    def _histogram(self, lines, name, help_text, histograms):
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+        for view, histogram in sorted(histograms.items()):
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                lines.append(f'{name}_bucket{self._labels(view=view, le=bound)} {count}')
+            lines.append(f'{name}_bucket{self._labels(view=view, le="+Inf")} {histogram.count}')
+            lines.append(f'{name}_sum{self._labels(view=view)} {histogram.total}')
+            lines.append(f'{name}_count{self._labels(view=view)} {histogram.count}')
+
+    def _counter(self, lines, name, help_text, values, label_names=('view',)):
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+        for key, value in sorted(values.items()):
+            key = key if isinstance(key, tuple) else (key,)
+            lines.append(f'{name}{self._labels(**dict(zip(label_names, key)))} {value}')
+
+    def render(self):
+        lines = []
+        with self._lock:
+            self._counter(
+                lines, 'cinemetrics_http_requests_total', 'Requests handled.',
+                self.requests, label_names=('view', 'method', 'status'),
+            )
+            self._counter(
+                lines, 'cinemetrics_http_slow_requests_total',
+                'Requests slower than REQUEST_METRICS_SLOW_MS.', self.slow_requests,
+            )
+            self._histogram(
+                lines, 'cinemetrics_http_request_duration_seconds',
+                'Request duration.', self.durations,
+            )
+            self._histogram(
+                lines, 'cinemetrics_db_queries_per_request',
+                'SQL statements per request.', self.query_counts,
+            )
+            self._counter(
+                lines, 'cinemetrics_db_seconds_total', 'Time spent in SQL.', self.sql_seconds,
+            )
+            self._counter(
+                lines, 'cinemetrics_render_seconds_total',
+                'Time spent rendering responses.', self.render_seconds,
+            )
+            self._counter(
+                lines, 'cinemetrics_response_bytes_total', 'Response body bytes.',
+                self.response_bytes,
+            )
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+def is_internal(request):
+    """Staff users and clients in INTERNAL_IPS"""
+    user = getattr(request, 'user', None)
+    return (
+        request.META.get('REMOTE_ADDR') in settings.INTERNAL_IPS
+        or bool(user and user.is_authenticated and user.is_staff)
+    )
+
+
+class RequestMetricsMiddleware:
+    """Measure each request's database and rendering cost (see module docstring)"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'REQUEST_METRICS_ENABLED', True)
+        self.slow_seconds = getattr(settings, 'REQUEST_METRICS_SLOW_MS', 500) / 1000
+        self.server_timing = getattr(settings, 'REQUEST_METRICS_SERVER_TIMING', False)
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        metrics = request._request_metrics = RequestMetrics()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(metrics))
+            response = self.get_response(request)
+
+        metrics.total_seconds = time.perf_counter() - metrics.started
+        if not response.streaming:
+            metrics.response_bytes = len(response.content)
+        if self.server_timing and is_internal(request):
+            response['Server-Timing'] = metrics.server_timing()
+
+        slow = metrics.total_seconds >= self.slow_seconds
+        registry.record(metrics, request.method, response.status_code, slow)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info('%s', json.dumps(metrics.as_dict(request, response)))
+        if slow:
+            logger.warning(
+                "Slow request %s %s (%s ms, %s queries, %s ms SQL)\n%s",
+                request.method, request.get_full_path(), _ms(metrics.total_seconds),
+                metrics.queries, _ms(metrics.sql_seconds), metrics.query_report(),
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        metrics = getattr(request, '_request_metrics', None)
+        if metrics is not None and request.resolver_match:
+            metrics.view = request.resolver_match.view_name
+
+    def process_template_response(self, request, response):
+        metrics = getattr(request, '_request_metrics', None)
+        if metrics is not None:
+            metrics.start_render(response)
+        return response
+
+
+def metrics_view(request):
+    """Prometheus scrape endpoint for this process's registry"""
+    if not is_internal(request):
+        raise Http404
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -1,6 +1,7 @@
 import os
 from pathlib import Path
-from decouple import config
+from decouple import Csv, config
+from .db_routers import database_from_url, replica_databases
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -32,8 +33,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'cinemetrics.request_metrics.RequestMetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'cinemetrics.db_routers.ReplicaPinningMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -68,6 +71,19 @@ DATABASES = {
     }
 }
 
+# Read replicas: comma-separated postgresql:// URLs. Reads are spread across
+# them; a client that wrote is pinned to the primary for REPLICA_PIN_SECONDS.
+DATABASES.update(replica_databases(config('DATABASE_REPLICAS', default='', cast=Csv())))
+DATABASE_ROUTERS = ['cinemetrics.db_routers.ReplicaRouter']
+
+# Denormalised read model maintained by scripts/sync_read_model.py. Point
+# READ_MODEL_DATABASE_URL at the same database the sync job writes to.
+READ_MODEL_DATABASE_URL = config('READ_MODEL_DATABASE_URL', default='')
+READ_MODEL_DATABASE = 'read_model' if READ_MODEL_DATABASE_URL else 'default'
+if READ_MODEL_DATABASE_URL:
+    DATABASES['read_model'] = database_from_url(READ_MODEL_DATABASE_URL)
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=5, cast=int)
+
 # REST Framework configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
@@ -86,6 +102,54 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Opt-in orjson renderer for the API; decimals are emitted as numbers
+# according to API_JSON_DECIMAL_POLICY ('float', 'int' or 'string')
+API_FAST_JSON = config('API_FAST_JSON', default=False, cast=bool)
+API_JSON_DECIMAL_POLICY = config('API_JSON_DECIMAL_POLICY', default='float')
+
+if API_FAST_JSON:
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = [
+        'api.v1.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ]
+    REST_FRAMEWORK['COERCE_DECIMAL_TO_STRING'] = False
+
+# Per-request DB/render metrics (see cinemetrics/request_metrics.py): one
+# JSON line per request to REQUEST_METRICS_LOG_FILE (rotated) and a query
+# dump for requests slower than REQUEST_METRICS_SLOW_MS. The Server-Timing
+# header and Prometheus text at /metrics are opt-in, and only ever shown to
+# staff and INTERNAL_IPS (e.g. the Prometheus scraper).
+REQUEST_METRICS_ENABLED = config('REQUEST_METRICS_ENABLED', default=True, cast=bool)
+REQUEST_METRICS_SLOW_MS = config('REQUEST_METRICS_SLOW_MS', default=500, cast=int)
+REQUEST_METRICS_SERVER_TIMING = config('REQUEST_METRICS_SERVER_TIMING', default=False, cast=bool)
+REQUEST_METRICS_ENDPOINT = config('REQUEST_METRICS_ENDPOINT', default=False, cast=bool)
+INTERNAL_IPS = config('INTERNAL_IPS', default='127.0.0.1', cast=Csv())
+REQUEST_METRICS_LOG_FILE = config('REQUEST_METRICS_LOG_FILE', default='')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'request_metrics': {
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': REQUEST_METRICS_LOG_FILE,
+            'maxBytes': 10 * 1024 * 1024,
+            'backupCount': 5,
+        } if REQUEST_METRICS_LOG_FILE else {
+            # No file: only slow-request dumps, on the console
+            'class': 'logging.StreamHandler',
+            'level': 'WARNING',
+        },
+    },
+    'loggers': {
+        'cinemetrics.request_metrics': {
+            'handlers': ['request_metrics'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
 # CORS settings (for React frontend)
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
@@ -103,5 +167,25 @@ STATIC_URL = 'static/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Title autocomplete index (see movies/autocomplete.py)
+TITLE_INDEX_SNAPSHOT = config('TITLE_INDEX_SNAPSHOT', default=str(BASE_DIR / 'title_index.snapshot'))
+TITLE_INDEX_REFRESH_SECONDS = config('TITLE_INDEX_REFRESH_SECONDS', default=30, cast=int)
+# Load the snapshot when Django starts rather than on the first lookup
+TITLE_INDEX_PRELOAD = config('TITLE_INDEX_PRELOAD', default=True, cast=bool)
+
+# Price index behind the inflation-adjusted figures (see movies/financials.py),
+# shared with the ingestion pipeline
+PRICE_INDEX = config(
+    'PRICE_INDEX', default=str(BASE_DIR.parent / 'src' / 'data' / 'processors' / 'price_index.csv')
+)
+PRICE_INDEX_BASE_YEAR = config('PRICE_INDEX_BASE_YEAR', default=None)
+
+# Rendered reports (see reports/generation.py): built by REPORTS_WORKERS
+# processes, stored under REPORTS_ROOT; a viewer asking for a report not yet
+# built for the current data waits up to REPORTS_WAIT_SECONDS for it
+REPORTS_ROOT = config('REPORTS_ROOT', default=str(BASE_DIR / 'report_artifacts'))
+REPORTS_WORKERS = config('REPORTS_WORKERS', default=2, cast=int)
+REPORTS_WAIT_SECONDS = config('REPORTS_WAIT_SECONDS', default=10, cast=float)
+
 # TMDB API Configuration
 TMDB_API_KEY = config('TMDB_API_KEY', default='')
\ No newline at end of file
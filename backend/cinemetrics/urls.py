@@ -1,7 +1,13 @@
+from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path
 
+from .request_metrics import metrics_view
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/v1/', include('api.v1.urls')),
 ]
+
+if settings.REQUEST_METRICS_ENDPOINT:
+    urlpatterns.append(path('metrics', metrics_view, name='metrics'))
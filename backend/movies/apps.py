@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class MoviesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'movies'
+
+    def ready(self):
+        from .signals import connect_signals
+        connect_signals()
+
+        from django.conf import settings
+        if settings.TITLE_INDEX_PRELOAD:
+            # Snapshot only: nothing here may touch the database
+            from .autocomplete import title_autocomplete
+            title_autocomplete.load_snapshot()
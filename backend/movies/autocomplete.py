@@ -0,0 +1,351 @@
+"""
+In-process title autocomplete.
+
+Titles and original titles are normalised and kept in one sorted list with
+a parallel array of movie ids, so a prefix lookup is a pair of bisects.
+Prefixes that cover many keys get their top-k precomputed, which keeps
+every lookup bounded no matter how short the prefix is.
+
+The index is loaded from a JSON snapshot when the app starts, without
+touching the database (``manage.py build_title_index`` writes one). A
+background thread, started by the first lookup, keeps it in step with
+the ``movies.movie`` DataVersion counter: rows changed since the last
+refresh are merged in, anything larger or involving deletes triggers a
+full rebuild. Without a snapshot the thread builds the index and lookups
+return nothing until it is ready.
+
+The counter is bumped by model signals, which ``QuerySet.update()``,
+``bulk_create()`` and ``bulk_update()`` skip: code writing titles that
+way must call ``movies.signals.bump_version`` itself (as
+adjust_financials does) or the index stays stale until the next write.
+"""
+import heapq
+import json
+import logging
+import os
+import threading
+import time
+import unicodedata
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Max
+
+from .models import Movie
+from .signals import get_versions
+
+logger = logging.getLogger(__name__)
+
+TOP_K = 10
+# Prefix ranges larger than this get a precomputed top-k instead of a scan
+SCAN_LIMIT = 256
+# Deltas larger than this are cheaper to apply as a full rebuild
+MAX_INCREMENTAL_ROWS = 1000
+SNAPSHOT_FORMAT = 2
+MOVIE_LABEL = Movie._meta.label_lower
+
+_LEADING_ARTICLES = ('the ', 'a ', 'an ')
+_END = chr(0x10FFFF)
+
+
+def normalise_title(value):
+    """Lowercase, strip accents and collapse punctuation to single spaces"""
+    value = unicodedata.normalize('NFKD', value or '')
+    chars = []
+    for char in value:
+        if unicodedata.combining(char):
+            continue
+        chars.append(char.lower() if char.isalnum() else ' ')
+    return ' '.join(''.join(chars).split())
+
+
+def title_keys(title, original_title=''):
+    """All normalised keys a movie is reachable under"""
+    keys = set()
+    for value in (title, original_title):
+        key = normalise_title(value)
+        if not key:
+            continue
+        keys.add(key)
+        for article in _LEADING_ARTICLES:
+            if key.startswith(article) and len(key) > len(article):
+                keys.add(key[len(article):])
+    return keys
+
+
+class TitleIndex:
+    """Immutable sorted-prefix index; refreshes return a new instance"""
+
+    def __init__(self, entries, version=0, watermark=None, row_count=0):
+        # entries: {movie_id: (title, original_title, popularity)}
+        self.entries = entries
+        self.version = version
+        self.watermark = watermark
+        self.row_count = row_count
+
+        pairs = sorted(
+            (key, movie_id)
+            for movie_id, (title, original_title, _) in entries.items()
+            for key in title_keys(title, original_title)
+        )
+        self.keys = [key for key, _ in pairs]
+        self.ids = array('q', (movie_id for _, movie_id in pairs))
+        self.hot = {}
+        self._build_hot()
+
+    # Lookups
+
+    def _range(self, prefix, lo=0, hi=None):
+        hi = len(self.keys) if hi is None else hi
+        start = bisect_left(self.keys, prefix, lo, hi)
+        end = bisect_left(self.keys, prefix + _END, start, hi)
+        return start, end
+
+    def _rank(self, start, end, limit):
+        entries = self.entries
+        ids = set(self.ids[start:end])
+        return heapq.nlargest(limit, ids, key=lambda movie_id: (entries[movie_id][2], -movie_id))
+
+    def _build_hot(self, prefixes=None):
+        """Precompute top-k for every prefix whose range exceeds SCAN_LIMIT"""
+        if prefixes is None:
+            stack = [('', 0, len(self.keys))]
+            while stack:
+                prefix, start, end = stack.pop()
+                if end - start <= SCAN_LIMIT:
+                    continue
+                if prefix:
+                    self.hot[prefix] = self._rank(start, end, TOP_K)
+                depth = len(prefix)
+                i = start
+                while i < end:
+                    if len(self.keys[i]) <= depth:
+                        i += 1
+                        continue
+                    child = self.keys[i][:depth + 1]
+                    j = bisect_left(self.keys, child + _END, i, end)
+                    stack.append((child, i, j))
+                    i = j
+            return
+
+        for prefix in prefixes:
+            start, end = self._range(prefix)
+            if end - start > SCAN_LIMIT:
+                self.hot[prefix] = self._rank(start, end, TOP_K)
+            else:
+                self.hot.pop(prefix, None)
+
+    def complete(self, prefix, limit=TOP_K):
+        """Return up to ``limit`` {id, title} dicts, most popular first"""
+        prefix = normalise_title(prefix)
+        if not prefix:
+            return []
+        limit = min(limit, TOP_K)
+
+        movie_ids = self.hot.get(prefix)
+        if movie_ids is None:
+            start, end = self._range(prefix)
+            movie_ids = self._rank(start, end, limit)
+        return [
+            {'id': movie_id, 'title': self.entries[movie_id][0]}
+            for movie_id in movie_ids[:limit]
+        ]
+
+    # Updates
+
+    def apply(self, changed, version, watermark, row_count):
+        """Return a new index with ``changed`` ({id: entry}) merged in"""
+        clone = TitleIndex.__new__(TitleIndex)
+        clone.entries = dict(self.entries)
+        clone.version = version
+        clone.watermark = watermark
+        clone.row_count = row_count
+        clone.keys = list(self.keys)
+        clone.ids = array('q', self.ids)
+        clone.hot = dict(self.hot)
+
+        touched = set()
+        for movie_id, entry in changed.items():
+            old = clone.entries.get(movie_id)
+            if old is not None:
+                for key in title_keys(old[0], old[1]):
+                    i = bisect_left(clone.keys, key)
+                    end = bisect_right(clone.keys, key, i)
+                    while i < end and clone.ids[i] != movie_id:
+                        i += 1
+                    if i < end:
+                        del clone.keys[i]
+                        del clone.ids[i]
+                    touched.add(key)
+            clone.entries[movie_id] = entry
+            for key in title_keys(entry[0], entry[1]):
+                i = bisect_left(clone.keys, key)
+                while i < len(clone.keys) and clone.keys[i] == key and clone.ids[i] < movie_id:
+                    i += 1
+                clone.keys.insert(i, key)
+                clone.ids.insert(i, movie_id)
+                touched.add(key)
+
+        prefixes = {key[:n] for key in touched for n in range(1, len(key) + 1)}
+        clone._build_hot(prefixes)
+        return clone
+
+    # Snapshots
+
+    def save(self, path):
+        """Write a JSON snapshot atomically"""
+        movie_ids = list(self.entries)
+        payload = {
+            'format': SNAPSHOT_FORMAT,
+            'version': self.version,
+            'watermark': self.watermark.isoformat() if self.watermark else None,
+            'row_count': self.row_count,
+            'ids': movie_ids,
+            'titles': [self.entries[movie_id][0] for movie_id in movie_ids],
+            'original_titles': [self.entries[movie_id][1] for movie_id in movie_ids],
+            'popularity': [self.entries[movie_id][2] for movie_id in movie_ids],
+        }
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as fh:
+            json.dump(payload, fh, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Read a snapshot written by save(); ValueError if it is not one"""
+        with open(path, encoding='utf-8') as fh:
+            payload = json.load(fh)
+        if not isinstance(payload, dict) or payload.get('format') != SNAPSHOT_FORMAT:
+            raise ValueError("Unsupported title index snapshot format")
+        try:
+            columns = [payload[name] for name in ('ids', 'titles', 'original_titles', 'popularity')]
+            if len({len(column) for column in columns}) != 1:
+                raise ValueError("Title index snapshot columns differ in length")
+            entries = {
+                int(movie_id): (str(title), str(original_title), float(score))
+                for movie_id, title, original_title, score in zip(*columns)
+            }
+            watermark = payload['watermark']
+            return cls(
+                entries,
+                int(payload['version']),
+                datetime.fromisoformat(watermark) if watermark else None,
+                int(payload['row_count']),
+            )
+        except (KeyError, TypeError) as exc:
+            raise ValueError(f"Malformed title index snapshot: {exc!r}") from exc
+
+
+def _popularity(revenue):
+    # The Django catalogue has no popularity column; box office is the proxy
+    return float(revenue) if revenue else 0.0
+
+
+def _fetch_entries(queryset):
+    return {
+        movie_id: (title, original_title or '', _popularity(revenue))
+        for movie_id, title, original_title, revenue in queryset.values_list(
+            'id', 'title', 'original_title', 'revenue'
+        ).iterator(chunk_size=5000)
+    }
+
+
+class TitleAutocomplete:
+    """Process-wide holder that keeps a TitleIndex fresh off the request path"""
+
+    def __init__(self, snapshot_path=None, refresh_seconds=30):
+        self.snapshot_path = snapshot_path
+        self.refresh_seconds = refresh_seconds
+        self._index = None
+        self._lock = threading.Lock()
+        self._refresher = None
+
+    def build(self):
+        """Rebuild from the database, write a fresh snapshot and serve it"""
+        version = get_versions(MOVIE_LABEL)[MOVIE_LABEL]
+        queryset = Movie.objects.order_by()
+        entries = _fetch_entries(queryset)
+        watermark = queryset.aggregate(latest=Max('updated_at'))['latest']
+        index = TitleIndex(entries, version, watermark, len(entries))
+        if self.snapshot_path:
+            try:
+                index.save(self.snapshot_path)
+            except OSError as exc:
+                logger.warning("Could not write title index snapshot: %s", exc)
+        self._index = index
+        return index
+
+    def load_snapshot(self):
+        """Serve the snapshot if there is a readable one; no database access"""
+        if self.snapshot_path and os.path.exists(self.snapshot_path):
+            try:
+                self._index = TitleIndex.load(self.snapshot_path)
+            except (OSError, ValueError) as exc:
+                logger.warning("Ignoring unreadable title index snapshot: %s", exc)
+        return self._index
+
+    def _refresh(self, index):
+        version = get_versions(MOVIE_LABEL)[MOVIE_LABEL]
+        if version == index.version:
+            return index
+
+        changed_qs = Movie.objects.order_by()
+        if index.watermark is not None:
+            changed_qs = changed_qs.filter(updated_at__gte=index.watermark)
+        row_count = Movie.objects.count()
+        if index.watermark is None or changed_qs.count() > MAX_INCREMENTAL_ROWS:
+            return self.build()
+
+        changed = _fetch_entries(changed_qs)
+        new_rows = sum(1 for movie_id in changed if movie_id not in index.entries)
+        if index.row_count + new_rows != row_count:
+            # Rows were deleted; the delta cannot tell us which ones
+            return self.build()
+
+        watermark = changed_qs.aggregate(latest=Max('updated_at'))['latest'] or index.watermark
+        return index.apply(changed, version, watermark, row_count)
+
+    def refresh(self):
+        """Bring the index up to date, building it if there is none yet"""
+        index = self._index
+        self._index = self.build() if index is None else self._refresh(index)
+        return self._index
+
+    def _run(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Title index refresh failed")
+            finally:
+                # This thread's connection would otherwise stay open for good
+                connections.close_all()
+            time.sleep(self.refresh_seconds)
+
+    def start(self):
+        """Start the background refresher (once per process)"""
+        with self._lock:
+            if self._refresher is None:
+                self._refresher = threading.Thread(
+                    target=self._run, name='title-index-refresh', daemon=True
+                )
+                self._refresher.start()
+
+    def get_index(self):
+        """The current index, or None until the first build finishes"""
+        if self._refresher is None:
+            self.start()
+        return self._index
+
+    def complete(self, prefix, limit=TOP_K):
+        index = self.get_index()
+        return index.complete(prefix, limit) if index is not None else []
+
+
+title_autocomplete = TitleAutocomplete(
+    snapshot_path=getattr(settings, 'TITLE_INDEX_SNAPSHOT', None),
+    refresh_seconds=getattr(settings, 'TITLE_INDEX_REFRESH_SECONDS', 30),
+)
@@ -0,0 +1,83 @@
+"""
+Inflation-adjusted budgets, revenues and profits.
+
+The price index table (settings.PRICE_INDEX, shared with the ingestion
+pipeline's data/processors/financials.py) turns a release year's dollars
+into dollars of settings.PRICE_INDEX_BASE_YEAR, the table's last year by
+default; years outside the table use its first or last row. Movie.save()
+stores the adjusted figures, and the adjust_financials command refreshes
+movies adjusted against another version of the table.
+"""
+import csv
+import hashlib
+from decimal import Decimal
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+
+ADJUSTED_FIELDS = ['adjusted_budget', 'adjusted_revenue', 'adjusted_profit', 'price_index_version']
+
+
+class PriceIndex:
+    """Consumer price index by year"""
+
+    def __init__(self, path, base_year=None):
+        raw = Path(path).read_bytes()
+        rows = list(csv.DictReader(
+            line for line in raw.decode('utf-8').splitlines()
+            if line.strip() and not line.startswith('#')
+        ))
+        if not rows or not {'year', 'cpi'} <= set(rows[0]):
+            raise ValueError(f'{path} needs year and cpi columns')
+        rows.sort(key=lambda row: int(row['year']))
+        self.years = np.array([int(row['year']) for row in rows])
+        # Empty cells are unknown
+        self.cpi = np.array([float(row['cpi']) if row['cpi'] else np.nan for row in rows])
+        self.base_year = int(base_year) if base_year else int(self.years[-1])
+        # Changes with the table or the base year
+        self.version = hashlib.sha256(raw + f'|{base_year}'.encode()).hexdigest()[:16]
+
+    def _cpi(self, years):
+        return self.cpi[np.minimum(np.searchsorted(self.years, years), len(self.years) - 1)]
+
+    def factors(self, years):
+        """Multiplier from each year's dollars to base-year dollars, NaN where the index is unknown"""
+        return self._cpi(self.base_year) / self._cpi(np.asarray(years, dtype=np.int64))
+
+    def adjust(self, years, budgets, revenues):
+        """(budgets, revenues, profits) arrays in base-year dollars, NaN where unknown"""
+        factors = self.factors(years)
+
+        def dollars(values):
+            values = np.array([float(value) if value else np.nan for value in values])
+            # Rounded to cents so profits match the stored figures
+            return np.round(values * factors, 2)
+
+        budgets, revenues = dollars(budgets), dollars(revenues)
+        return budgets, revenues, revenues - budgets
+
+
+def cents(value):
+    """A Decimal amount for a DecimalField, None for NaN"""
+    return None if np.isnan(value) else Decimal(f'{value:.2f}')
+
+
+@lru_cache(maxsize=1)
+def price_index():
+    return PriceIndex(settings.PRICE_INDEX, settings.PRICE_INDEX_BASE_YEAR)
+
+
+def adjust_movie(movie):
+    """Fill in ``movie``'s adjusted figures (without saving)"""
+    index = price_index()
+    # Dates may still be strings before the first save
+    release_date = movie._meta.get_field('release_date').to_python(movie.release_date)
+    [budget], [revenue], [profit] = index.adjust(
+        [release_date.year], [movie.budget], [movie.revenue]
+    )
+    movie.adjusted_budget = cents(budget)
+    movie.adjusted_revenue = cents(revenue)
+    movie.adjusted_profit = cents(profit)
+    movie.price_index_version = index.version
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from movies import financials
+from movies.models import Movie
+from movies.signals import bump_version
+
+
+class Command(BaseCommand):
+    help = 'Refresh inflation-adjusted budgets and revenues after a price index change'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Recompute every movie, not only those adjusted against another index'
+        )
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        index = financials.price_index()
+        movies = Movie.objects.all()
+        if not options['full']:
+            movies = movies.exclude(price_index_version=index.version)
+        rows = list(movies.values_list('id', 'release_date', 'budget', 'revenue'))
+
+        budgets, revenues, profits = index.adjust(
+            [release_date.year for _, release_date, _, _ in rows],
+            [budget for _, _, budget, _ in rows],
+            [revenue for _, _, _, revenue in rows],
+        )
+        updates = [
+            Movie(
+                id=movie_id,
+                adjusted_budget=financials.cents(budget),
+                adjusted_revenue=financials.cents(revenue),
+                adjusted_profit=financials.cents(profit),
+                price_index_version=index.version,
+            )
+            for (movie_id, _, _, _), budget, revenue, profit in zip(rows, budgets, revenues, profits)
+        ]
+        Movie.objects.bulk_update(updates, financials.ADJUSTED_FIELDS, batch_size=options['batch_size'])
+        if updates:
+            # bulk_update skips the signals that invalidate cached responses
+            bump_version(Movie._meta.label_lower)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Adjusted {len(updates)} movies to {index.base_year} dollars (index {index.version})"
+            )
+        )
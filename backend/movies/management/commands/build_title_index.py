@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from movies.autocomplete import title_autocomplete
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the title autocomplete snapshot from the database'
+
+    def handle(self, *args, **options):
+        index = title_autocomplete.build()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Indexed {index.row_count} movies ({len(index.keys)} keys, "
+                f"{len(index.hot)} hot prefixes) -> {title_autocomplete.snapshot_path}"
+            )
+        )
@@ -0,0 +1,132 @@
+from django.db import migrations
+
+# Postgres: weighted tsvector column + GIN index, trigram index for title
+# autocomplete, kept in sync by triggers on movies_movie and movies_studio.
+POSTGRES_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "ALTER TABLE movies_movie ADD COLUMN search_vector tsvector",
+    """
+    CREATE OR REPLACE FUNCTION movies_movie_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(NEW.original_title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(
+                (SELECT name FROM movies_studio WHERE id = NEW.studio_id), '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(NEW.overview, '')), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER movies_movie_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, original_title, overview, studio_id
+    ON movies_movie
+    FOR EACH ROW EXECUTE FUNCTION movies_movie_search_vector_update()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION movies_studio_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        UPDATE movies_movie SET studio_id = studio_id WHERE studio_id = NEW.id;
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER movies_studio_search_vector_trigger
+    AFTER UPDATE OF name ON movies_studio
+    FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name)
+    EXECUTE FUNCTION movies_studio_search_vector_update()
+    """,
+    # Backfill existing rows through the trigger
+    "UPDATE movies_movie SET title = title",
+    "CREATE INDEX movies_movie_search_vector_gin ON movies_movie USING gin (search_vector)",
+    "CREATE INDEX movies_movie_title_trgm ON movies_movie USING gin (title gin_trgm_ops)",
+]
+
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS movies_movie_title_trgm",
+    "DROP INDEX IF EXISTS movies_movie_search_vector_gin",
+    "DROP TRIGGER IF EXISTS movies_studio_search_vector_trigger ON movies_studio",
+    "DROP FUNCTION IF EXISTS movies_studio_search_vector_update()",
+    "DROP TRIGGER IF EXISTS movies_movie_search_vector_trigger ON movies_movie",
+    "DROP FUNCTION IF EXISTS movies_movie_search_vector_update()",
+    "ALTER TABLE movies_movie DROP COLUMN IF EXISTS search_vector",
+]
+
+# SQLite: FTS5 mirror table keyed by rowid = movies_movie.id
+SQLITE_FTS_VALUES = """
+    (new.id, new.title, new.original_title,
+     coalesce((SELECT name FROM movies_studio WHERE id = new.studio_id), ''),
+     new.overview)
+"""
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE movies_movie_fts USING fts5(
+        title, original_title, studio_name, overview,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3 4'
+    )
+    """,
+    f"""
+    CREATE TRIGGER movies_movie_fts_insert AFTER INSERT ON movies_movie BEGIN
+        INSERT INTO movies_movie_fts(rowid, title, original_title, studio_name, overview)
+        VALUES {SQLITE_FTS_VALUES};
+    END
+    """,
+    f"""
+    CREATE TRIGGER movies_movie_fts_update
+    AFTER UPDATE OF title, original_title, overview, studio_id ON movies_movie BEGIN
+        DELETE FROM movies_movie_fts WHERE rowid = old.id;
+        INSERT INTO movies_movie_fts(rowid, title, original_title, studio_name, overview)
+        VALUES {SQLITE_FTS_VALUES};
+    END
+    """,
+    """
+    CREATE TRIGGER movies_movie_fts_delete AFTER DELETE ON movies_movie BEGIN
+        DELETE FROM movies_movie_fts WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER movies_studio_fts_update AFTER UPDATE OF name ON movies_studio BEGIN
+        UPDATE movies_movie_fts SET studio_name = new.name
+        WHERE rowid IN (SELECT id FROM movies_movie WHERE studio_id = new.id);
+    END
+    """,
+    """
+    INSERT INTO movies_movie_fts(rowid, title, original_title, studio_name, overview)
+    SELECT m.id, m.title, m.original_title, coalesce(s.name, ''), m.overview
+    FROM movies_movie m LEFT JOIN movies_studio s ON s.id = m.studio_id
+    """,
+]
+
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS movies_studio_fts_update",
+    "DROP TRIGGER IF EXISTS movies_movie_fts_delete",
+    "DROP TRIGGER IF EXISTS movies_movie_fts_update",
+    "DROP TRIGGER IF EXISTS movies_movie_fts_insert",
+    "DROP TABLE IF EXISTS movies_movie_fts",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        statements = statements_by_vendor.get(schema_editor.connection.vendor, [])
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({'postgresql': POSTGRES_FORWARD, 'sqlite': SQLITE_FORWARD}),
+            _run({'postgresql': POSTGRES_REVERSE, 'sqlite': SQLITE_REVERSE}),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-19 09:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0003_data_version'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(fields=['roi'], name='movies_movi_roi_44a90d_idx'),
+        ),
+    ]
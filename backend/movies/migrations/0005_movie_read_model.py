@@ -0,0 +1,46 @@
+# Generated by Django 5.2.7 on 2026-10-19 09:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0004_movie_roi_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MovieReadModel',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('tmdb_id', models.IntegerField(null=True, unique=True)),
+                ('imdb_id', models.CharField(max_length=20, null=True)),
+                ('title', models.CharField(max_length=255)),
+                ('original_title', models.CharField(max_length=255, null=True)),
+                ('release_date', models.DateTimeField(null=True)),
+                ('release_year', models.IntegerField(null=True)),
+                ('runtime', models.IntegerField(null=True)),
+                ('budget', models.BigIntegerField(null=True)),
+                ('revenue', models.BigIntegerField(null=True)),
+                ('profit', models.BigIntegerField(null=True)),
+                ('roi', models.FloatField(help_text='Return on Investment percentage', null=True)),
+                ('popularity', models.FloatField(null=True)),
+                ('vote_average', models.FloatField(null=True)),
+                ('vote_count', models.IntegerField(null=True)),
+                ('genre_names', models.CharField(help_text='Comma-separated', max_length=500, null=True)),
+                ('primary_genre', models.CharField(max_length=100, null=True)),
+                ('imdb_rating', models.CharField(max_length=50, null=True)),
+                ('rotten_tomatoes', models.CharField(max_length=50, null=True)),
+                ('metacritic', models.CharField(max_length=50, null=True)),
+                ('domestic_gross', models.BigIntegerField(null=True)),
+                ('worldwide_gross', models.BigIntegerField(null=True)),
+                ('source_updated_at', models.DateTimeField(null=True)),
+                ('synced_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'movie_read_model',
+                'managed': False,
+            },
+        ),
+    ]
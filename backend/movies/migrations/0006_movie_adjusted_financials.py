@@ -0,0 +1,37 @@
+# Generated by Django 5.2.7 on 2026-10-19 11:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0005_movie_read_model'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='movie',
+            name='adjusted_budget',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=15, null=True),
+        ),
+        migrations.AddField(
+            model_name='movie',
+            name='adjusted_profit',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=15, null=True),
+        ),
+        migrations.AddField(
+            model_name='movie',
+            name='adjusted_revenue',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=15, null=True),
+        ),
+        migrations.AddField(
+            model_name='movie',
+            name='price_index_version',
+            field=models.CharField(blank=True, max_length=16, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(fields=['adjusted_revenue'], name='movies_movi_adjuste_5a8809_idx'),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from decimal import Decimal
+from . import financials, tiers
 
 class Studio(models.Model):
     """Movie studios and production companies"""
@@ -83,6 +84,12 @@ class Movie(models.Model):
     # Calculated Business Fields
     roi = models.DecimalField(max_digits=8, decimal_places=2, null=True, blank=True, 
                              help_text="Return on Investment percentage")
+
+    # Inflation-adjusted to the price index base year (see movies.financials)
+    adjusted_budget = models.DecimalField(max_digits=15, decimal_places=2, null=True, blank=True)
+    adjusted_revenue = models.DecimalField(max_digits=15, decimal_places=2, null=True, blank=True)
+    adjusted_profit = models.DecimalField(max_digits=15, decimal_places=2, null=True, blank=True)
+    price_index_version = models.CharField(max_length=16, null=True, blank=True)
     
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
@@ -94,17 +101,24 @@ class Movie(models.Model):
             models.Index(fields=['release_date']),
             models.Index(fields=['revenue']),
             models.Index(fields=['budget']),
+            models.Index(fields=['roi']),
+            models.Index(fields=['updated_at']),
+            models.Index(fields=['adjusted_revenue']),
         ]
 
     def __str__(self):
         return f"{self.title} ({self.release_date.year})"
+
+    def save(self, *args, **kwargs):
+        financials.adjust_movie(self)
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], *financials.ADJUSTED_FIELDS}
+        super().save(*args, **kwargs)
     
     @property
     def is_profitable(self):
         """Check if movie was profitable"""
-        if self.budget and self.revenue:
-            return self.revenue > self.budget
-        return None
+        return tiers.is_profitable(self.budget, self.revenue)
     
     def calculate_roi(self):
         """Calculate and save ROI percentage"""
@@ -133,4 +147,53 @@ class MovieRating(models.Model):
         unique_together = ['movie', 'source']
 
     def __str__(self):
-        return f"{self.movie.title} - {self.get_source_display()}: {self.rating}"
\ No newline at end of file
+        return f"{self.movie.title} - {self.get_source_display()}: {self.rating}"
+
+class DataVersion(models.Model):
+    """Per-table change counter, bumped on every write (see movies.signals)"""
+    name = models.CharField(max_length=100, unique=True, help_text="Model label, e.g. movies.movie")
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
+
+class MovieReadModel(models.Model):
+    """
+    Denormalised, read-only movie row kept up to date from the ingestion
+    store by scripts/sync_read_model.py (see src/database/read_model.py)
+    """
+    id = models.IntegerField(primary_key=True)
+    tmdb_id = models.IntegerField(unique=True, null=True)
+    imdb_id = models.CharField(max_length=20, null=True)
+    title = models.CharField(max_length=255)
+    original_title = models.CharField(max_length=255, null=True)
+    release_date = models.DateTimeField(null=True)
+    release_year = models.IntegerField(null=True)
+    runtime = models.IntegerField(null=True)
+    budget = models.BigIntegerField(null=True)
+    revenue = models.BigIntegerField(null=True)
+    profit = models.BigIntegerField(null=True)
+    roi = models.FloatField(null=True, help_text="Return on Investment percentage")
+    adjusted_budget = models.BigIntegerField(null=True)
+    adjusted_revenue = models.BigIntegerField(null=True)
+    adjusted_profit = models.BigIntegerField(null=True)
+    popularity = models.FloatField(null=True)
+    vote_average = models.FloatField(null=True)
+    vote_count = models.IntegerField(null=True)
+    genre_names = models.CharField(max_length=500, null=True, help_text="Comma-separated")
+    primary_genre = models.CharField(max_length=100, null=True)
+    imdb_rating = models.CharField(max_length=50, null=True)
+    rotten_tomatoes = models.CharField(max_length=50, null=True)
+    metacritic = models.CharField(max_length=50, null=True)
+    domestic_gross = models.BigIntegerField(null=True)
+    worldwide_gross = models.BigIntegerField(null=True)
+    source_updated_at = models.DateTimeField(null=True)
+    synced_at = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = 'movie_read_model'
+
+    def __str__(self):
+        return f"{self.title} ({self.release_year or 'n/a'})"
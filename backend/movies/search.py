@@ -0,0 +1,80 @@
+"""
+Full-text search over movies.
+
+Postgres keeps a weighted ``tsvector`` column (title, studio, overview) on
+``movies_movie`` behind a GIN index, plus a trigram index on ``title``.
+SQLite (local dev) mirrors the same columns into an FTS5 table. Both are
+maintained by database triggers (see migration 0002), so bulk writes
+that bypass the ORM stay in sync too.
+"""
+import re
+
+from django.db import connections
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'movies_movie_fts'
+SEARCH_CONFIG = 'english'
+
+_TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def search_vendor(using='default'):
+    """Return 'postgresql', 'sqlite' or None when no index backend exists"""
+    vendor = connections[using].vendor
+    return vendor if vendor in ('postgresql', 'sqlite') else None
+
+
+def normalise_terms(terms):
+    """Split raw search terms into plain word tokens"""
+    tokens = []
+    for term in terms:
+        tokens.extend(_TERM_RE.findall(term.lower()))
+    return tokens
+
+
+def _tsquery(tokens):
+    # Every token is prefix-matched so partially typed words still hit
+    return ' & '.join(f'{token}:*' for token in tokens)
+
+
+def _fts5_query(tokens):
+    return ' AND '.join('"{}"*'.format(token.replace('"', '""')) for token in tokens)
+
+
+def search_movies(queryset, terms, using='default'):
+    """
+    Restrict ``queryset`` to movies matching every term and annotate each
+    row with ``search_rank`` (higher is better).
+
+    Returns None when the database has no search index, so callers can fall
+    back to plain ``icontains`` filtering.
+    """
+    tokens = normalise_terms(terms)
+    vendor = search_vendor(using)
+    if not tokens or vendor is None:
+        return None
+
+    if vendor == 'postgresql':
+        query = _tsquery(tokens)
+        return queryset.annotate(
+            search_rank=RawSQL(
+                "ts_rank_cd(movies_movie.search_vector, to_tsquery(%s, %s))",
+                (SEARCH_CONFIG, query),
+            )
+        ).filter(
+            pk__in=RawSQL(
+                "SELECT id FROM movies_movie "
+                "WHERE search_vector @@ to_tsquery(%s, %s)",
+                (SEARCH_CONFIG, query),
+            )
+        )
+
+    query = _fts5_query(tokens)
+    # Join the FTS table once; bm25() is lower-is-better, so negate it to
+    # keep one sort direction
+    return queryset.extra(
+        select={'search_rank': f"-bm25({FTS_TABLE}, 10.0, 10.0, 5.0, 1.0)"},
+        tables=[FTS_TABLE],
+        where=[f"{FTS_TABLE}.rowid = movies_movie.id", f"{FTS_TABLE} MATCH %s"],
+        params=[query],
+    )
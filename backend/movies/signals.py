@@ -0,0 +1,49 @@
+"""
+Keep DataVersion counters in step with catalogue writes.
+
+Caches that sit in front of the catalogue (title autocomplete, HTTP
+ETags) compare these counters instead of re-reading the tables.
+"""
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.utils import timezone
+
+from .models import DataVersion, Genre, Movie, MovieRating, Person, Studio
+
+TRACKED_MODELS = [Studio, Genre, Person, Movie, MovieRating]
+
+
+def bump_version(label):
+    """Increment the counter for ``label``, creating it on first write"""
+    updated = DataVersion.objects.filter(name=label).update(
+        version=F('version') + 1, updated_at=timezone.now()
+    )
+    if not updated:
+        DataVersion.objects.get_or_create(name=label, defaults={'version': 1})
+
+
+def get_versions(*labels):
+    """Return {label: version} for the given model labels (0 if never written)"""
+    versions = dict(
+        DataVersion.objects.filter(name__in=labels).values_list('name', 'version')
+    )
+    return {label: versions.get(label, 0) for label in labels}
+
+
+def _on_write(sender, **kwargs):
+    bump_version(sender._meta.label_lower)
+
+
+def _on_genres_changed(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_version(Movie._meta.label_lower)
+
+
+def connect_signals():
+    for model in TRACKED_MODELS:
+        uid = f'data_version_{model._meta.label_lower}'
+        post_save.connect(_on_write, sender=model, dispatch_uid=f'{uid}_save')
+        post_delete.connect(_on_write, sender=model, dispatch_uid=f'{uid}_delete')
+    m2m_changed.connect(
+        _on_genres_changed, sender=Movie.genres.through, dispatch_uid='data_version_movie_genres'
+    )
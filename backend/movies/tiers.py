@@ -0,0 +1,56 @@
+"""
+Business tier rules shared by serializers, projections and ML exports.
+"""
+
+BUDGET_TIERS = [
+    (1_000_000, "Micro Budget"),
+    (15_000_000, "Low Budget"),
+    (50_000_000, "Medium Budget"),
+    (150_000_000, "High Budget"),
+]
+
+PERFORMANCE_TIERS = [
+    (-50, "Poor"),
+    (0, "Loss"),
+    (50, "Break Even"),
+    (200, "Good"),
+]
+
+
+def budget_category(budget):
+    """Categorize movie by budget size"""
+    if not budget:
+        return "Unknown"
+
+    budget = float(budget)
+    for upper_bound, label in BUDGET_TIERS:
+        if budget < upper_bound:
+            return label
+    return "Blockbuster"
+
+
+def performance_rating(roi):
+    """Business performance assessment"""
+    if not roi:
+        return "Unknown"
+
+    roi = float(roi)
+    for upper_bound, label in PERFORMANCE_TIERS:
+        if roi < upper_bound:
+            return label
+    return "Excellent"
+
+
+def is_profitable(budget, revenue):
+    """Check if movie was profitable"""
+    if budget and revenue:
+        return revenue > budget
+    return None
+
+
+def profit_margin(budget, revenue):
+    """Calculate profit margin percentage"""
+    if budget and revenue and budget > 0:
+        margin = ((revenue - budget) / revenue) * 100
+        return round(margin, 2)
+    return None
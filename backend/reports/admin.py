@@ -1,3 +1,11 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import ReportArtifact
+
+
+@admin.register(ReportArtifact)
+class ReportArtifactAdmin(admin.ModelAdmin):
+    list_display = ['report', 'format', 'data_version', 'size', 'build_seconds', 'created_at']
+    list_filter = ['report', 'format']
+    readonly_fields = ['report', 'format', 'data_version', 'content_hash', 'file', 'size',
+                       'build_seconds', 'created_at']
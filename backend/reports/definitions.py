@@ -0,0 +1,319 @@
+"""
+Report definitions.
+
+Each report names the models it reads (its data version is derived from
+their DataVersion counters, see reports.generation) and builds a
+ReportData of titled tables and charts, which reports.rendering turns
+into HTML, CSV, PNG and PDF. Bump ``version`` when a report's content or
+layout changes so stored artifacts are rebuilt.
+"""
+from collections import namedtuple
+
+from django.db.models import Avg, Case, Count, F, FloatField, Q, Sum, Value, When
+from django.db.models.functions import ExtractYear
+from movies import tiers
+from movies.financials import price_index
+from movies.models import Genre, Movie, MovieRating, Studio
+
+# kind: 'text', 'int', 'money', 'float' or 'percent' (formatting only)
+Column = namedtuple('Column', 'label kind')
+Table = namedtuple('Table', 'title columns rows')
+# kind: 'bar', 'barh' or 'line'
+Chart = namedtuple('Chart', 'title labels values ylabel kind')
+ReportData = namedtuple('ReportData', 'tables charts')
+
+# MovieRating on a 0-10 scale, whatever the source's maximum
+RATING_SCORE = F('rating') * 10 / F('max_rating')
+TOP_N = 10
+TOP_STUDIOS = 20
+
+REPORTS = {}
+
+
+def register(cls):
+    REPORTS[cls.name] = cls()
+    return cls
+
+
+def get_report(name):
+    """The registered report called ``name``, or None"""
+    return REPORTS.get(name)
+
+
+def _percent(part, whole):
+    return round(part / whole * 100, 2) if whole else None
+
+
+class ReportDefinition:
+    """A report built from the catalogue"""
+    name = ''
+    title = ''
+    description = ''
+    models = (Movie, Genre, Studio, MovieRating)
+    version = 1
+
+    @property
+    def labels(self):
+        return sorted(model._meta.label_lower for model in self.models)
+
+    def build(self):
+        """Query the catalogue and return a ReportData"""
+        raise NotImplementedError
+
+
+@register
+class GenreReport(ReportDefinition):
+    name = 'genre'
+    title = 'Genre Performance'
+    description = 'Ratings, revenue and ROI by genre'
+
+    def build(self):
+        genres = Genre.objects.annotate(
+            movie_count=Count('movie'),
+            with_roi=Count('movie', filter=Q(movie__roi__isnull=False)),
+            profitable=Count('movie', filter=Q(movie__roi__gt=0)),
+            avg_budget=Avg('movie__budget'),
+            avg_revenue=Avg('movie__revenue'),
+            avg_roi=Avg('movie__roi'),
+        ).filter(movie_count__gt=0).order_by('name')
+        # Separate query: joining ratings would repeat each movie per source
+        ratings = dict(
+            MovieRating.objects.values('movie__genres').annotate(
+                avg=Avg(RATING_SCORE, output_field=FloatField())
+            ).values_list('movie__genres', 'avg')
+        )
+
+        rows = [
+            [
+                genre.name,
+                genre.movie_count,
+                ratings.get(genre.id),
+                genre.avg_budget,
+                genre.avg_revenue,
+                genre.avg_roi,
+                _percent(genre.profitable, genre.with_roi),
+            ]
+            for genre in genres
+        ]
+        rows.sort(key=lambda row: (row[2] is None, -(row[2] or 0)))
+        rated = [row for row in rows if row[2] is not None]
+        with_roi = sorted((row for row in rows if row[5] is not None), key=lambda row: -row[5])
+
+        return ReportData(
+            tables=[Table('Genres by average rating', [
+                Column('Genre', 'text'),
+                Column('Movies', 'int'),
+                Column('Avg Rating', 'float'),
+                Column('Avg Budget', 'money'),
+                Column('Avg Revenue', 'money'),
+                Column('Avg ROI (%)', 'float'),
+                Column('Profitable (%)', 'percent'),
+            ], rows)],
+            charts=[
+                Chart('Average rating by genre', [row[0] for row in rated],
+                      [row[2] for row in rated], 'Rating (out of 10)', 'bar'),
+                Chart('Average ROI by genre', [row[0] for row in with_roi],
+                      [float(row[5]) for row in with_roi], 'ROI (%)', 'bar'),
+            ],
+        )
+
+
+@register
+class FinancialReport(ReportDefinition):
+    name = 'financial'
+    title = 'Financial Performance'
+    description = 'Budgets, revenues and ROI overall, by release year and by budget tier'
+    models = (Movie,)
+
+    def build(self):
+        base_year = price_index().base_year
+        movies = Movie.objects.filter(budget__gt=0, revenue__gt=0)
+        totals = movies.aggregate(
+            count=Count('id'),
+            budget=Sum('budget'),
+            revenue=Sum('revenue'),
+            adjusted_budget=Sum('adjusted_budget'),
+            adjusted_revenue=Sum('adjusted_revenue'),
+            avg_roi=Avg('roi'),
+            profitable=Count('id', filter=Q(roi__gt=0)),
+        )
+        budget, revenue = totals['budget'] or 0, totals['revenue'] or 0
+        overview = [
+            ['Movies with budget and revenue', totals['count']],
+            ['Total budget', budget],
+            ['Total revenue', revenue],
+            ['Total profit', revenue - budget],
+            [f'Total budget ({base_year} dollars)', totals['adjusted_budget']],
+            [f'Total revenue ({base_year} dollars)', totals['adjusted_revenue']],
+            ['Overall ROI (%)', _percent(revenue - budget, budget)],
+            ['Average ROI (%)', totals['avg_roi']],
+            ['Profitable (%)', _percent(totals['profitable'], totals['count'])],
+        ]
+
+        years = list(
+            movies.annotate(year=ExtractYear('release_date')).values('year').annotate(
+                count=Count('id'),
+                budget=Sum('budget'),
+                revenue=Sum('revenue'),
+                adjusted_revenue=Sum('adjusted_revenue'),
+                avg_roi=Avg('roi'),
+            ).order_by('year')
+        )
+        by_year = [
+            [row['year'], row['count'], row['budget'], row['revenue'],
+             row['revenue'] - row['budget'], row['adjusted_revenue'], row['avg_roi']]
+            for row in years
+        ]
+
+        # Same boundaries as tiers.budget_category, grouped in the database
+        tier = Case(
+            *[When(budget__lt=upper_bound, then=Value(label))
+              for upper_bound, label in tiers.BUDGET_TIERS],
+            default=Value('Blockbuster'),
+        )
+        order = [label for _, label in tiers.BUDGET_TIERS] + ['Blockbuster']
+        by_tier = {
+            row['tier']: row for row in movies.annotate(tier=tier).values('tier').annotate(
+                count=Count('id'),
+                avg_budget=Avg('budget'),
+                avg_revenue=Avg('revenue'),
+                avg_roi=Avg('roi'),
+                profitable=Count('id', filter=Q(roi__gt=0)),
+            )
+        }
+        tier_rows = [
+            [label, row['count'], row['avg_budget'], row['avg_revenue'], row['avg_roi'],
+             _percent(row['profitable'], row['count'])]
+            for label in order if (row := by_tier.get(label))
+        ]
+
+        return ReportData(
+            tables=[
+                Table('Overview', [Column('Metric', 'text'), Column('Value', 'float')], overview),
+                Table('By release year', [
+                    Column('Year', 'text'),
+                    Column('Movies', 'int'),
+                    Column('Budget', 'money'),
+                    Column('Revenue', 'money'),
+                    Column('Profit', 'money'),
+                    Column(f'Revenue ({base_year} dollars)', 'money'),
+                    Column('Avg ROI (%)', 'float'),
+                ], by_year),
+                Table('By budget tier', [
+                    Column('Tier', 'text'),
+                    Column('Movies', 'int'),
+                    Column('Avg Budget', 'money'),
+                    Column('Avg Revenue', 'money'),
+                    Column('Avg ROI (%)', 'float'),
+                    Column('Profitable (%)', 'percent'),
+                ], tier_rows),
+            ],
+            charts=[
+                Chart(f'Revenue by release year ({base_year} dollars)',
+                      [str(row[0]) for row in by_year],
+                      [float(row[5] or 0) for row in by_year], 'Revenue', 'line'),
+                Chart('Average ROI by budget tier', [row[0] for row in tier_rows],
+                      [float(row[4] or 0) for row in tier_rows], 'ROI (%)', 'bar'),
+            ],
+        )
+
+
+@register
+class RankingsReport(ReportDefinition):
+    name = 'rankings'
+    title = 'Movie Rankings'
+    description = 'Highest and lowest rated movies, top grossers and best returns'
+
+    columns = [
+        Column('Rank', 'int'),
+        Column('Title', 'text'),
+        Column('Year', 'text'),
+        Column('Studio', 'text'),
+        Column('Genres', 'text'),
+        Column('Rating', 'float'),
+        Column('Revenue', 'money'),
+        Column('ROI (%)', 'float'),
+    ]
+
+    def build(self):
+        movies = Movie.objects.select_related('studio').prefetch_related('genres').annotate(
+            avg_rating=Avg(F('ratings__rating') * 10 / F('ratings__max_rating'),
+                           output_field=FloatField())
+        )
+        rated = movies.filter(avg_rating__isnull=False)
+        rankings = [
+            ('Top rated', rated.order_by('-avg_rating', 'title')),
+            ('Lowest rated', rated.order_by('avg_rating', 'title')),
+            ('Highest revenue', movies.filter(revenue__isnull=False).order_by('-revenue', 'title')),
+            ('Best ROI', movies.filter(roi__isnull=False).order_by('-roi', 'title')),
+        ]
+        tables = [
+            Table(title, self.columns, [self._row(rank, movie) for rank, movie in
+                                        enumerate(queryset[:TOP_N], start=1)])
+            for title, queryset in rankings
+        ]
+        top_revenue = tables[2].rows
+        return ReportData(
+            tables=tables,
+            charts=[Chart('Highest revenue', [row[1] for row in top_revenue],
+                          [float(row[6]) for row in top_revenue], 'Revenue', 'barh')],
+        )
+
+    @staticmethod
+    def _row(rank, movie):
+        return [
+            rank,
+            movie.title,
+            movie.release_date.year,
+            movie.studio.name if movie.studio else '',
+            ', '.join(sorted(genre.name for genre in movie.genres.all())),
+            movie.avg_rating,
+            movie.revenue,
+            movie.roi,
+        ]
+
+
+@register
+class StudioReport(ReportDefinition):
+    name = 'studio'
+    title = 'Studio Performance'
+    description = f'The {TOP_STUDIOS} studios with the highest total revenue'
+    models = (Movie, Studio)
+
+    def build(self):
+        studios = Studio.objects.annotate(
+            movie_count=Count('movie'),
+            total_budget=Sum('movie__budget'),
+            total_revenue=Sum('movie__revenue'),
+            avg_roi=Avg('movie__roi'),
+            with_roi=Count('movie', filter=Q(movie__roi__isnull=False)),
+            profitable=Count('movie', filter=Q(movie__roi__gt=0)),
+        ).filter(total_revenue__isnull=False).order_by('-total_revenue', 'name')[:TOP_STUDIOS]
+
+        rows = [
+            [
+                studio.name,
+                studio.country,
+                studio.movie_count,
+                studio.total_budget,
+                studio.total_revenue,
+                studio.total_revenue - studio.total_budget if studio.total_budget else None,
+                studio.avg_roi,
+                _percent(studio.profitable, studio.with_roi),
+            ]
+            for studio in studios
+        ]
+        return ReportData(
+            tables=[Table('Studios by total revenue', [
+                Column('Studio', 'text'),
+                Column('Country', 'text'),
+                Column('Movies', 'int'),
+                Column('Total Budget', 'money'),
+                Column('Total Revenue', 'money'),
+                Column('Profit', 'money'),
+                Column('Avg ROI (%)', 'float'),
+                Column('Profitable (%)', 'percent'),
+            ], rows)],
+            charts=[Chart('Total revenue by studio', [row[0] for row in rows],
+                          [float(row[4]) for row in rows], 'Revenue', 'barh')],
+        )
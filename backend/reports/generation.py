@@ -0,0 +1,198 @@
+"""
+Report generation and storage.
+
+A report's data version hashes the DataVersion counters of the tables it
+reads (see movies.signals), and an artifact is stored once per report,
+format and data version, so an expensive report is built once per change
+to its data however many people view it. Files are named by their
+SHA-256 in settings.REPORTS_ROOT; a rebuild that renders the same bytes
+shares the existing file.
+
+Reports are built in a pool of spawned processes: by the generate_reports
+command (on demand, or on a schedule with --every or cron), and by the
+API when a viewer asks for a report not yet built for the current data.
+Concurrent requests for the same build in one server process share it.
+"""
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from hashlib import sha256
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db.models import Q
+from movies.signals import get_versions
+
+from . import rendering, workers
+from .definitions import REPORTS, get_report
+from .models import ReportArtifact
+
+logger = logging.getLogger(__name__)
+
+_pool = None
+_pending = {}
+_lock = threading.Lock()
+
+
+def data_version(definition):
+    """Changes whenever a table the report reads is written, or the report itself changes"""
+    versions = get_versions(*definition.labels)
+    parts = [f'{definition.name}:{definition.version}']
+    parts.extend(f'{label}:{versions[label]}' for label in definition.labels)
+    return sha256('|'.join(parts).encode()).hexdigest()[:16]
+
+
+def stored_artifacts(name, version):
+    """{format: ReportArtifact} already built for ``version``"""
+    return {
+        artifact.format: artifact
+        for artifact in ReportArtifact.objects.filter(report=name, data_version=version)
+    }
+
+
+def _store(name, version, file_format, content, build_seconds):
+    digest = sha256(content).hexdigest()
+    storage = ReportArtifact._meta.get_field('file').storage
+    path = f'{digest[:2]}/{digest}.{file_format}'
+    if not storage.exists(path):
+        path = storage.save(path, ContentFile(content))
+    # Another worker may have stored this version meanwhile
+    artifact, _ = ReportArtifact.objects.get_or_create(
+        report=name, format=file_format, data_version=version,
+        defaults={
+            'content_hash': digest,
+            'file': path,
+            'size': len(content),
+            'build_seconds': round(build_seconds, 3),
+        },
+    )
+    return artifact
+
+
+def generate(name, formats=None):
+    """
+    Build report ``name`` in ``formats`` (every available one by default)
+    for the current data, skipping formats already stored. Returns
+    {'report', 'data_version', 'built': [formats], 'seconds'}
+    """
+    definition = get_report(name)
+    if definition is None:
+        raise ValueError(f"Unknown report: {name}")
+    available = rendering.available_formats()
+    formats = formats or available
+    unsupported = set(formats) - set(available)
+    if unsupported:
+        raise ValueError(f"Cannot render {', '.join(sorted(unsupported))} (needs matplotlib)")
+
+    # Read before building: data written meanwhile gets a build of its own
+    version = data_version(definition)
+    stored = stored_artifacts(name, version)
+    missing = [file_format for file_format in formats if file_format not in stored]
+    started = time.perf_counter()
+    if missing:
+        data = definition.build()
+        query_seconds = time.perf_counter() - started
+        for file_format in missing:
+            rendering_started = time.perf_counter()
+            content = rendering.render(definition, data, file_format)
+            _store(name, version, file_format, content,
+                   query_seconds + time.perf_counter() - rendering_started)
+        logger.info(f"Built {name} report {version} ({', '.join(missing)}) "
+                    f"in {time.perf_counter() - started:.2f}s")
+    return {
+        'report': name,
+        'data_version': version,
+        'built': missing,
+        'seconds': round(time.perf_counter() - started, 3),
+    }
+
+
+def _executor(max_workers):
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=workers.setup,
+    )
+
+
+def generate_all(names=None, formats=None, max_workers=None):
+    """
+    Build each of ``names`` (every report by default) in a process pool.
+    Yields (name, result, error) as builds finish; one worker builds inline.
+    """
+    formats = formats or rendering.available_formats()
+    names = list(names or REPORTS)
+    # Only spawn workers for reports with something to build
+    stale = []
+    for name in names:
+        version = data_version(get_report(name))
+        if set(formats) <= set(stored_artifacts(name, version)):
+            yield name, {'report': name, 'data_version': version, 'built': [], 'seconds': 0}, None
+        else:
+            stale.append(name)
+
+    max_workers = min(max_workers or settings.REPORTS_WORKERS, len(stale))
+    if max_workers <= 1:
+        for name in stale:
+            try:
+                yield name, generate(name, formats), None
+            except Exception as error:
+                yield name, None, error
+        return
+
+    with _executor(max_workers) as pool:
+        futures = {pool.submit(workers.generate, name, formats): name for name in stale}
+        for future in as_completed(futures):
+            error = future.exception()
+            yield futures[future], None if error else future.result(), error
+
+
+def submit(name, version):
+    """
+    Build every format of ``name`` for data ``version`` in the server's
+    process pool; callers asking for a build already under way share its
+    future.
+    """
+    global _pool
+    key = (name, version)
+    with _lock:
+        future = _pending.get(key)
+        if future is not None:
+            return future
+        for attempt in range(2):
+            if _pool is None:
+                _pool = _executor(settings.REPORTS_WORKERS)
+            try:
+                future = _pool.submit(workers.generate, name)
+                break
+            except BrokenProcessPool:
+                # A worker died; start a fresh pool once
+                _pool = None
+                if attempt:
+                    raise
+        _pending[key] = future
+    future.add_done_callback(lambda done: _pending.pop(key, None))
+    return future
+
+
+def prune():
+    """
+    Delete artifacts of superseded data versions (and of reports no longer
+    defined), and the files no remaining artifact refers to. Returns the
+    number of artifacts deleted.
+    """
+    current = Q(pk__in=[])
+    for name, definition in REPORTS.items():
+        current |= Q(report=name, data_version=data_version(definition))
+    stale = ReportArtifact.objects.exclude(current)
+    paths = set(stale.values_list('file', flat=True))
+    deleted, _ = stale.delete()
+
+    storage = ReportArtifact._meta.get_field('file').storage
+    referenced = set(ReportArtifact.objects.filter(file__in=paths).values_list('file', flat=True))
+    for path in paths - referenced:
+        storage.delete(path)
+    return deleted
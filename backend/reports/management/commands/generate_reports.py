@@ -0,0 +1,57 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from reports import generation
+from reports.definitions import REPORTS
+from reports.rendering import available_formats
+
+
+class Command(BaseCommand):
+    help = 'Build reports not yet stored for the current data, in a process pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument('reports', nargs='*',
+                            help=f"Reports to build: {', '.join(REPORTS)} (default: all)")
+        parser.add_argument('--format', action='append', dest='formats',
+                            choices=['html', 'csv', 'png', 'pdf'],
+                            help='Format to build, repeatable (default: every available one)')
+        parser.add_argument('--workers', type=int, help='Worker processes (default: REPORTS_WORKERS)')
+        parser.add_argument('--every', type=int, metavar='SECONDS',
+                            help='Keep running, checking for changed data every SECONDS')
+        parser.add_argument('--prune', action='store_true',
+                            help='Delete artifacts of superseded data versions afterwards')
+
+    def handle(self, *args, **options):
+        unknown = set(options['reports']) - set(REPORTS)
+        if unknown:
+            raise CommandError(f"Unknown reports: {', '.join(sorted(unknown))}")
+        unsupported = set(options['formats'] or []) - set(available_formats())
+        if unsupported:
+            raise CommandError(f"Cannot render {', '.join(sorted(unsupported))}: install matplotlib")
+
+        while True:
+            self.run(options)
+            if not options['every']:
+                break
+            time.sleep(options['every'])
+
+    def run(self, options):
+        failed = 0
+        for name, result, error in generation.generate_all(
+            options['reports'], options['formats'], options['workers']
+        ):
+            if error:
+                failed += 1
+                self.stderr.write(self.style.ERROR(f"{name}: {error!r}"))
+            elif result['built']:
+                self.stdout.write(self.style.SUCCESS(
+                    f"{name}: built {', '.join(result['built'])} for data version "
+                    f"{result['data_version']} in {result['seconds']:.2f}s"
+                ))
+            else:
+                self.stdout.write(f"{name}: up to date ({result['data_version']})")
+
+        if options['prune']:
+            self.stdout.write(f"Pruned {generation.prune()} superseded artifacts")
+        if failed and not options['every']:
+            raise CommandError(f"{failed} reports failed")
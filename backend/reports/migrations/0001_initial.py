@@ -0,0 +1,72 @@
+# Generated by Django 5.2.7 on 2026-10-19 11:06
+
+import reports.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="ReportArtifact",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("report", models.CharField(max_length=50)),
+                (
+                    "format",
+                    models.CharField(
+                        choices=[
+                            ("html", "HTML"),
+                            ("csv", "CSV"),
+                            ("png", "PNG"),
+                            ("pdf", "PDF"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "data_version",
+                    models.CharField(
+                        help_text="Hash of the DataVersion counters the report reads",
+                        max_length=16,
+                    ),
+                ),
+                (
+                    "content_hash",
+                    models.CharField(
+                        help_text="SHA-256 of the file, also its name in storage",
+                        max_length=64,
+                    ),
+                ),
+                (
+                    "file",
+                    models.FileField(
+                        max_length=255,
+                        storage=reports.models.report_storage,
+                        upload_to="",
+                    ),
+                ),
+                ("size", models.PositiveIntegerField()),
+                (
+                    "build_seconds",
+                    models.FloatField(help_text="Time spent querying and rendering"),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "ordering": ["-created_at"],
+                "unique_together": {("report", "format", "data_version")},
+            },
+        ),
+    ]
@@ -1,3 +1,34 @@
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
 from django.db import models
 
-# Create your models here.
+
+def report_storage():
+    """Where rendered reports are kept (settings.REPORTS_ROOT)"""
+    return FileSystemStorage(location=settings.REPORTS_ROOT)
+
+
+class ReportArtifact(models.Model):
+    """A rendered report, built once per data version (see reports.generation)"""
+    FORMAT_CHOICES = [
+        ('html', 'HTML'),
+        ('csv', 'CSV'),
+        ('png', 'PNG'),
+        ('pdf', 'PDF'),
+    ]
+
+    report = models.CharField(max_length=50)
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES)
+    data_version = models.CharField(max_length=16, help_text="Hash of the DataVersion counters the report reads")
+    content_hash = models.CharField(max_length=64, help_text="SHA-256 of the file, also its name in storage")
+    file = models.FileField(storage=report_storage, max_length=255)
+    size = models.PositiveIntegerField()
+    build_seconds = models.FloatField(help_text="Time spent querying and rendering")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        unique_together = ['report', 'format', 'data_version']
+
+    def __str__(self):
+        return f"{self.report}.{self.format} ({self.data_version})"
@@ -0,0 +1,172 @@
+"""
+Render a ReportData to HTML, CSV, PNG or PDF bytes.
+
+Output depends only on the report and its data (no timestamps), so an
+unchanged report renders to the same bytes and the same content hash.
+PNG and PDF need matplotlib; without it only HTML and CSV are offered.
+"""
+import base64
+import csv
+import io
+
+from django.template.loader import render_to_string
+
+try:
+    from matplotlib.backends.backend_pdf import PdfPages
+    from matplotlib.figure import Figure
+    from matplotlib.ticker import MaxNLocator
+except ImportError:  # optional: charts are skipped
+    Figure = None
+
+CONTENT_TYPES = {
+    'html': 'text/html; charset=utf-8',
+    'csv': 'text/csv; charset=utf-8',
+    'png': 'image/png',
+    'pdf': 'application/pdf',
+}
+PDF_ROWS_PER_PAGE = 30
+
+
+def available_formats():
+    """Formats this installation can render"""
+    return ['html', 'csv', 'png', 'pdf'] if Figure else ['html', 'csv']
+
+
+def format_value(value, kind):
+    """A table cell as shown in HTML and PDF"""
+    if value is None:
+        return ''
+    if kind == 'int':
+        return f'{int(value):,}'
+    if kind == 'money':
+        return f'${float(value):,.0f}'
+    if kind == 'float':
+        return f'{float(value):,.2f}'
+    if kind == 'percent':
+        return f'{float(value):.1f}%'
+    return str(value)
+
+
+def _formatted_rows(table):
+    return [
+        [format_value(value, column.kind) for value, column in zip(row, table.columns)]
+        for row in table.rows
+    ]
+
+
+def _draw_chart(ax, chart):
+    ax.set_title(chart.title, fontweight='bold')
+    if not chart.values:
+        ax.text(0.5, 0.5, 'No data', ha='center', va='center', transform=ax.transAxes)
+        return
+    if chart.kind == 'barh':
+        # Largest at the top
+        ax.barh(chart.labels[::-1], chart.values[::-1], color='#3b75af')
+        ax.set_xlabel(chart.ylabel)
+        return
+    if chart.kind == 'line':
+        ax.plot(chart.labels, chart.values, marker='o', color='#3b75af')
+        ax.xaxis.set_major_locator(MaxNLocator(12))
+    else:
+        ax.bar(chart.labels, chart.values, color='#3b75af')
+        for label in ax.get_xticklabels():
+            label.set_rotation(45)
+            label.set_horizontalalignment('right')
+    ax.set_ylabel(chart.ylabel)
+    ax.grid(axis='y', alpha=0.3)
+
+
+def _chart_figure(chart):
+    figure = Figure(figsize=(11, 6), layout='constrained')
+    _draw_chart(figure.add_subplot(), chart)
+    return figure
+
+
+def _png(figure):
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format='png', dpi=100, metadata={'Software': None})
+    return buffer.getvalue()
+
+
+def render_csv(definition, data):
+    """Every table, each under its title row and separated by a blank line"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for number, table in enumerate(data.tables):
+        if number:
+            writer.writerow([])
+        writer.writerow([table.title])
+        writer.writerow([column.label for column in table.columns])
+        writer.writerows(['' if value is None else value for value in row] for row in table.rows)
+    return buffer.getvalue().encode('utf-8')
+
+
+def render_html(definition, data):
+    """A standalone page; charts are embedded as PNG when matplotlib is available"""
+    charts = []
+    if Figure:
+        charts = [
+            (chart.title, base64.b64encode(_png(_chart_figure(chart))).decode('ascii'))
+            for chart in data.charts
+        ]
+    return render_to_string('reports/report.html', {
+        'report': definition,
+        'tables': [
+            (table.title, [column.label for column in table.columns], _formatted_rows(table))
+            for table in data.tables
+        ],
+        'charts': charts,
+    }).encode('utf-8')
+
+
+def render_png(definition, data):
+    """All charts stacked in one image"""
+    figure = Figure(figsize=(11, 6 * max(len(data.charts), 1)), layout='constrained')
+    figure.suptitle(definition.title, fontsize=16, fontweight='bold')
+    for number, chart in enumerate(data.charts, start=1):
+        _draw_chart(figure.add_subplot(len(data.charts), 1, number), chart)
+    return _png(figure)
+
+
+def render_pdf(definition, data):
+    """A page per chart, then the tables, PDF_ROWS_PER_PAGE rows a page"""
+    buffer = io.BytesIO()
+    with PdfPages(buffer, metadata={'Title': definition.title, 'CreationDate': None}) as pdf:
+        for chart in data.charts:
+            figure = _chart_figure(chart)
+            figure.suptitle(definition.title, fontsize=14)
+            pdf.savefig(figure)
+        for table in data.tables:
+            rows = _formatted_rows(table)
+            for start in range(0, max(len(rows), 1), PDF_ROWS_PER_PAGE):
+                figure = Figure(figsize=(11.69, 8.27))
+                ax = figure.add_subplot()
+                ax.axis('off')
+                ax.set_title(table.title, fontweight='bold', loc='left')
+                page = rows[start:start + PDF_ROWS_PER_PAGE]
+                if page:
+                    cells = ax.table(
+                        cellText=page,
+                        colLabels=[column.label for column in table.columns],
+                        loc='upper center',
+                    )
+                    cells.auto_set_font_size(False)
+                    cells.set_fontsize(8)
+                    cells.auto_set_column_width(list(range(len(table.columns))))
+                else:
+                    ax.text(0.5, 0.5, 'No data', ha='center', va='center')
+                pdf.savefig(figure)
+    return buffer.getvalue()
+
+
+RENDERERS = {
+    'html': render_html,
+    'csv': render_csv,
+    'png': render_png,
+    'pdf': render_pdf,
+}
+
+
+def render(definition, data, file_format):
+    """Bytes of ``data`` rendered as ``file_format``"""
+    return RENDERERS[file_format](definition, data)
@@ -0,0 +1,28 @@
+"""
+Entry points for report worker processes.
+
+Workers are spawned, not forked, so they never share the parent's
+database connections; they import this module before Django is set up,
+so it must not import models at module level.
+"""
+
+
+def setup():
+    import os
+
+    import django
+
+    # Workers never serve autocomplete
+    os.environ.setdefault('TITLE_INDEX_PRELOAD', 'False')
+    django.setup()
+
+
+def generate(name, formats=None):
+    from django.db import connections
+
+    from .generation import generate as generate_report
+
+    try:
+        return generate_report(name, formats)
+    finally:
+        connections.close_all()
@@ -0,0 +1,5 @@
+"""
+Benchmark suite: a deterministic synthetic catalogue at 10k/100k/1M movies
+and latency / query count / peak RSS measurements for the analytics,
+ingestion, API and serializer hot paths. Run with ``python -m benchmarks.run``.
+"""
@@ -0,0 +1,150 @@
+"""
+Benchmark cases for the ingestion side (src/), grouped by the first part
+of their name:
+
+- analytics: GenrePerformanceAnalyzer on the live schema and the read model
+- ingestion: bulk loader merge, the collection pipeline's per-movie writer,
+             incremental read model sync
+
+The Django cases live in benchmarks.django_cases.
+"""
+
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import select, update
+from sqlalchemy.engine import Engine
+
+from analytics.performance import GenrePerformanceAnalyzer
+from data.collectors.omdb_collector import OMDbCollector
+from data.collectors.tmdb_collector import TMDbCollector
+from data.processors.entity_resolution import OMDbResolver
+from data.profiling import PipelineProfiler
+from database.bulk_load import BulkLoader
+from database.connection import SessionLocal
+from database.models import Movie
+from database.read_model import ReadModelSync, get_read_model_engine
+from scripts.collect_data import DataCollectionPipeline
+
+from .harness import Case
+from .synthetic import SyntheticCatalogue
+
+# Rows per call for the write and serializer cases, independent of scale
+BULK_LOAD_MOVIES = 5_000
+PIPELINE_MOVIES = 200
+SYNC_MOVIES = 2_000
+
+
+def analytics_cases(catalogue: SyntheticCatalogue, engine: Engine) -> List[Case]:
+    cases = []
+    for prefix, use_read_model in (
+        ("analytics", False),
+        ("analytics.read_model", True),
+    ):
+        analyzer = GenrePerformanceAnalyzer(use_read_model=use_read_model)
+        cases += [
+            Case(f"{prefix}.genre_summary", analyzer.get_genre_ratings_summary),
+            Case(
+                f"{prefix}.top_by_genre",
+                lambda analyzer=analyzer: analyzer.get_top_movies_by_genre("Drama", 10),
+            ),
+            Case(f"{prefix}.top_movies", analyzer.get_top_movies),
+            Case(f"{prefix}.bottom_movies", analyzer.get_bottom_movies),
+            Case(f"{prefix}.financial_data", analyzer.get_financial_data),
+        ]
+    return cases
+
+
+# Ingestion
+
+
+class OfflineTMDbCollector(TMDbCollector):
+    """Serve movie details from the synthetic catalogue instead of the API."""
+
+    def __init__(self, catalogue: SyntheticCatalogue):
+        super().__init__(api_key="offline")
+        self.catalogue = catalogue
+
+    def get_movie_details(self, movie_id: int):
+        return self.catalogue.movie(movie_id - 1)
+
+
+class OfflineOMDbCollector(OMDbCollector):
+    def __init__(self, catalogue: SyntheticCatalogue):
+        super().__init__(api_key="offline")
+        self.catalogue = catalogue
+
+    def get_movie_by_imdb_id(self, imdb_id: str):
+        return self.catalogue.omdb(int(imdb_id[2:]) - 1)
+
+
+class OfflinePipeline(DataCollectionPipeline):
+    def __init__(self, catalogue: SyntheticCatalogue):
+        self.profiler = PipelineProfiler()
+        self.tmdb_collector = OfflineTMDbCollector(catalogue)
+        self.omdb_collector = OfflineOMDbCollector(catalogue)
+        self.resolver = OMDbResolver(self.omdb_collector, profiler=self.profiler)
+        self._genres = {}
+        self._companies = {}
+
+
+def ingestion_cases(catalogue: SyntheticCatalogue, engine: Engine) -> List[Case]:
+    # Re-merging existing records keeps the dataset unchanged between runs
+    records = list(catalogue.records(0, min(BULK_LOAD_MOVIES, catalogue.movies)))
+    loader = BulkLoader(engine)
+
+    # New movies past the end of the catalogue, rolled back after each run
+    pipeline = OfflinePipeline(catalogue)
+    new_movies = [
+        {"id": tmdb_id, "title": f"Movie {tmdb_id}"}
+        for tmdb_id in range(
+            catalogue.movies + 1, catalogue.movies + PIPELINE_MOVIES + 1
+        )
+    ]
+
+    def process_movies():
+        db = SessionLocal()
+        # Cached genres/companies belong to the previous (rolled back) session
+        pipeline._genres = {}
+        pipeline._companies = {}
+        try:
+            for movie_data in new_movies:
+                pipeline._process_movie(db, movie_data)
+            db.flush()
+        finally:
+            db.rollback()
+            db.close()
+
+    sync = ReadModelSync(engine, get_read_model_engine())
+    with engine.connect() as connection:
+        touched = list(
+            connection.execute(
+                select(Movie.id).order_by(Movie.id).limit(SYNC_MOVIES)
+            ).scalars()
+        )
+
+    def touch_movies():
+        with engine.begin() as connection:
+            connection.execute(
+                update(Movie)
+                .where(Movie.id.in_(touched))
+                .values(updated_at=datetime.utcnow())
+            )
+
+    return [
+        Case("ingestion.bulk_load_merge", lambda: loader.load(records)),
+        Case("ingestion.pipeline_process_movie", process_movies),
+        Case("ingestion.read_model_sync", sync.run, setup=touch_movies),
+    ]
+
+
+def build_cases(
+    groups: List[str], catalogue: SyntheticCatalogue, engine: Engine
+) -> List[Case]:
+    builders = {
+        "analytics": lambda: analytics_cases(catalogue, engine),
+        "ingestion": lambda: ingestion_cases(catalogue, engine),
+    }
+    return [
+        case for group, build in builders.items() if group in groups for case in build()
+    ]
@@ -0,0 +1,72 @@
+"""
+Load a SyntheticCatalogue into the ingestion store.
+
+A target that already holds the requested number of movies is reused, so
+each scale is generated once; pass ``rebuild`` to start over. The Django
+catalogue is built by benchmarks.django_cases.
+"""
+
+import logging
+import time
+from typing import List
+
+from sqlalchemy import func, inspect, select
+from sqlalchemy.engine import Engine
+
+from database.bulk_load import BulkLoader
+from database.models import Base, BoxOffice, Movie, Rating
+from database.partitioning import partition_tables
+from database.read_model import ReadModelSync, read_model_metadata
+
+from .synthetic import SyntheticCatalogue, check_existing, chunks
+
+logger = logging.getLogger(__name__)
+
+
+def ingestion_movie_count(engine: Engine) -> int:
+    if not inspect(engine).has_table(Movie.__tablename__):
+        return 0
+    with engine.connect() as connection:
+        return connection.execute(select(func.count(Movie.id))).scalar()
+
+
+def build_ingestion(
+    catalogue: SyntheticCatalogue,
+    engine: Engine,
+    batch_size: int = 50_000,
+    rebuild: bool = False,
+):
+    """Bulk load movies and credits, add OMDb ratings/box office, sync the read model."""
+    if rebuild:
+        read_model_metadata.drop_all(engine)
+        Base.metadata.drop_all(engine)
+    if check_existing(ingestion_movie_count(engine), catalogue, "ingestion store"):
+        return
+
+    started = time.perf_counter()
+    Base.metadata.create_all(engine)
+    partition_tables(engine)
+    BulkLoader(engine, batch_size=batch_size).load(catalogue.records())
+
+    with engine.begin() as connection:
+        movie_ids = dict(connection.execute(select(Movie.tmdb_id, Movie.id)).all())
+        for start, stop in chunks(catalogue.movies, batch_size):
+            ratings: List[dict] = []
+            box_office: List[dict] = []
+            for index in range(start, stop):
+                movie = catalogue.movie(index)
+                omdb = catalogue.omdb(index, movie)
+                movie_id = movie_ids[movie["id"]]
+                ratings.extend(catalogue.ingestion_ratings(omdb, movie_id))
+                gross = catalogue.ingestion_box_office(omdb, movie, movie_id)
+                if gross:
+                    box_office.append(gross)
+            connection.execute(Rating.__table__.insert(), ratings)
+            if box_office:
+                connection.execute(BoxOffice.__table__.insert(), box_office)
+
+    ReadModelSync(engine, engine).run(full=True)
+    logger.info(
+        f"Built ingestion store ({catalogue.movies:,} movies) "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
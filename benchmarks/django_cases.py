@@ -0,0 +1,183 @@
+"""
+Django side of the benchmark suite: builds the synthetic catalogue in the
+Django database and times every /api/v1/ endpoint (through the Django test
+client) and the v1 serializers.
+
+backend/ and src/ both have top-level ``analytics`` and ``api`` packages,
+so this module runs in its own process (see benchmarks.run) after
+django.setup(), with only backend/ on the path.
+"""
+
+import logging
+import time
+from typing import Callable, Dict, List
+
+from django.core.management import call_command
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.test import Client
+from movies.autocomplete import title_autocomplete
+from movies.models import Genre, Movie, MovieRating, MovieReadModel, Person, Studio
+
+from api.v1.serializers import (
+    MovieDetailSerializer,
+    MovieListSerializer,
+    MovieReadModelSerializer,
+)
+from api.v1.serializers.projections import movie_list_projection
+
+from .harness import Case
+from .synthetic import COUNTRIES, GENRES, SyntheticCatalogue, check_existing, chunks
+
+logger = logging.getLogger(__name__)
+
+PERSON_ROLES = ("actor", "actor", "director", "producer", "writer")
+SERIALIZED_ROWS = 1_000
+
+
+def build_django(
+    catalogue: SyntheticCatalogue, batch_size: int = 5_000, rebuild: bool = False
+):
+    """Migrate and fill the Django default database."""
+    call_command("migrate", verbosity=0, interactive=False)
+    if rebuild:
+        call_command("flush", verbosity=0, interactive=False)
+    if check_existing(Movie.objects.count(), catalogue, "Django database"):
+        return
+
+    started = time.perf_counter()
+    MovieGenre = Movie.genres.through
+    with transaction.atomic():
+        Genre.objects.bulk_create(
+            [Genre(id=genre_id, name=name) for genre_id, name in GENRES],
+            ignore_conflicts=True,
+        )
+        for start, stop in chunks(catalogue.studios, batch_size):
+            Studio.objects.bulk_create(
+                Studio(
+                    id=studio_id,
+                    name=catalogue.studio_name(studio_id),
+                    country=COUNTRIES[studio_id % len(COUNTRIES)],
+                    founded_year=1900 + studio_id % 120,
+                )
+                for studio_id in range(start + 1, stop + 1)
+            )
+        for start, stop in chunks(catalogue.people, batch_size):
+            Person.objects.bulk_create(
+                Person(
+                    id=person_id,
+                    name=catalogue.person_name(person_id),
+                    primary_role=PERSON_ROLES[person_id % len(PERSON_ROLES)],
+                    tmdb_id=person_id,
+                )
+                for person_id in range(start + 1, stop + 1)
+            )
+        for start, stop in chunks(catalogue.movies, batch_size):
+            movies, links, ratings = [], [], []
+            for index in range(start, stop):
+                fields = catalogue.django_movie(index)
+                genre_ids = fields.pop("genre_ids")
+                for source, value in fields.pop("ratings").items():
+                    ratings.append(
+                        MovieRating(movie_id=fields["id"], source=source, rating=value)
+                    )
+                links.extend(
+                    MovieGenre(movie_id=fields["id"], genre_id=genre_id)
+                    for genre_id in genre_ids
+                )
+                movies.append(Movie(**fields))
+            Movie.objects.bulk_create(movies)
+            MovieGenre.objects.bulk_create(links)
+            MovieRating.objects.bulk_create(ratings)
+
+        # Explicit primary keys leave PostgreSQL sequences behind
+        models = [Genre, Studio, Person, Movie, MovieRating]
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), models):
+                cursor.execute(sql)
+
+    logger.info(
+        f"Built Django database ({catalogue.movies:,} movies) "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+
+
+def api_cases(catalogue: SyntheticCatalogue) -> List[Case]:
+    title_autocomplete.build()
+    client = Client(SERVER_NAME="localhost")
+    middle = catalogue.movies // 2 + 1
+    middle_page = max(1, catalogue.movies // 20 // 2)
+
+    def get(path: str) -> Callable[[], None]:
+        def request():
+            response = client.get(path)
+            if response.status_code != 200:
+                raise AssertionError(f"GET {path} returned {response.status_code}")
+            response.content
+
+        return request
+
+    paths: Dict[str, str] = {
+        "movies_list": "/api/v1/movies/",
+        "movies_list_by_revenue": "/api/v1/movies/?ordering=-revenue",
+        "movies_list_genre_filter": "/api/v1/movies/?genres=18",
+        "movies_list_deep_page": f"/api/v1/movies/?page={middle_page}",
+        "movies_search": "/api/v1/movies/?search=Crimson",
+        "movie_detail": f"/api/v1/movies/{middle}/",
+        "movie_autocomplete": "/api/v1/movies/autocomplete/?q=the cri",
+        "catalogue_list": "/api/v1/catalogue/",
+        "catalogue_by_genre": "/api/v1/catalogue/?genre=Drama&ordering=-roi",
+        "catalogue_detail": f"/api/v1/catalogue/{middle}/",
+        "studios": "/api/v1/studios/",
+        "genres": "/api/v1/genres/",
+        "analytics": "/api/v1/analytics/",
+        "profitable_movies": "/api/v1/movies/profitable/",
+        "budget_range": "/api/v1/movies/budget-range/?min_budget=100000000",
+        "ml_training_data": "/api/v1/ml-training-data/",
+    }
+    return [Case(f"api.{name}", get(path)) for name, path in paths.items()]
+
+
+def serializer_cases(catalogue: SyntheticCatalogue) -> List[Case]:
+    # Rows are fetched once here so the cases time serialisation alone
+    # (plus any per-row queries the serializer itself triggers)
+    movies = list(
+        Movie.objects.select_related("studio")
+        .prefetch_related("genres")
+        .order_by("id")[:SERIALIZED_ROWS]
+    )
+    rows = list(
+        movie_list_projection.values(Movie.objects.order_by("id"))[:SERIALIZED_ROWS]
+    )
+    detail = (
+        Movie.objects.select_related("studio")
+        .prefetch_related("genres", "ratings")
+        .get(pk=catalogue.movies // 2 + 1)
+    )
+    read_rows = list(MovieReadModel.objects.order_by("id")[:SERIALIZED_ROWS])
+
+    return [
+        Case(
+            "serializers.movie_list",
+            lambda: MovieListSerializer(movies, many=True).data,
+        ),
+        Case(
+            "serializers.movie_list_projection",
+            lambda: movie_list_projection.to_dicts(rows),
+        ),
+        Case("serializers.movie_detail", lambda: MovieDetailSerializer(detail).data),
+        Case(
+            "serializers.movie_read_model",
+            lambda: MovieReadModelSerializer(read_rows, many=True).data,
+        ),
+    ]
+
+
+def build_cases(groups: List[str], catalogue: SyntheticCatalogue) -> List[Case]:
+    builders = {
+        "api": lambda: api_cases(catalogue),
+        "serializers": lambda: serializer_cases(catalogue),
+    }
+    return [
+        case for group, build in builders.items() if group in groups for case in build()
+    ]
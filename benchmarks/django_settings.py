@@ -0,0 +1,12 @@
+"""
+Django settings for benchmark runs: the project settings pointed at the
+benchmark database, with DEBUG off so query logging does not skew timings.
+"""
+
+import os
+
+from cinemetrics.settings import *  # noqa: F401,F403
+from cinemetrics.settings import DATABASES, database_from_url
+
+DEBUG = False
+DATABASES["default"] = database_from_url(os.environ["BENCHMARK_DJANGO_DATABASE_URL"])
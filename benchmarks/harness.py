@@ -0,0 +1,320 @@
+"""
+Measurement harness.
+
+Each case is timed over a few runs after a warm-up, with the number of
+SQL statements it sends (through any SQLAlchemy engine or Django
+connection) and the peak resident set size reached while it ran. Results
+are written as JSON and compared with earlier runs on the same scale
+and databases, so regressions in latency, query count or memory show up
+from one run to the next.
+"""
+
+import gc
+import json
+import logging
+import platform
+import re
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import ExitStack, contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+PROC_STATUS = Path("/proc/self/status")
+PROC_CLEAR_REFS = Path("/proc/self/clear_refs")
+
+
+@dataclass
+class Case:
+    """A named callable to time; ``setup`` runs untimed before every call."""
+
+    name: str
+    func: Callable[[], Any]
+    setup: Optional[Callable[[], Any]] = None
+
+    @property
+    def group(self) -> str:
+        return self.name.split(".", 1)[0]
+
+
+@dataclass
+class Result:
+    name: str
+    runs: int
+    median_ms: float
+    min_ms: float
+    max_ms: float
+    queries: int
+    peak_rss_mb: float
+    rss_growth_mb: float
+    error: Optional[str] = None
+
+
+# Query counting
+
+
+class QueryCount:
+    def __init__(self):
+        self.value = 0
+
+    def sqlalchemy(self, *args, **kwargs):
+        self.value += 1
+
+    def django(self, execute, sql, params, many, context):
+        self.value += 1
+        return execute(sql, params, many, context)
+
+
+def _django_connections() -> List[Any]:
+    if "django.db" not in sys.modules:
+        return []
+    from django.apps import apps
+
+    if not apps.ready:
+        return []
+    from django.db import connections
+
+    return connections.all()
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryCount]:
+    """Count statements executed by every engine and Django connection."""
+    counter = QueryCount()
+    event.listen(Engine, "before_cursor_execute", counter.sqlalchemy)
+    try:
+        with ExitStack() as stack:
+            for connection in _django_connections():
+                stack.enter_context(connection.execute_wrapper(counter.django))
+            yield counter
+    finally:
+        event.remove(Engine, "before_cursor_execute", counter.sqlalchemy)
+
+
+# Memory
+
+
+def _status_mb(field: str) -> Optional[float]:
+    try:
+        match = re.search(rf"^{field}:\s+(\d+) kB", PROC_STATUS.read_text(), re.M)
+    except OSError:
+        return None
+    return int(match.group(1)) / 1024 if match else None
+
+
+def _max_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def reset_peak_rss() -> bool:
+    """Reset the kernel's high-water mark (Linux); False when unsupported."""
+    try:
+        PROC_CLEAR_REFS.write_text("5")
+        return True
+    except OSError:
+        return False
+
+
+def current_rss_mb() -> float:
+    return _status_mb("VmRSS") or _max_rss_mb()
+
+
+def peak_rss_mb() -> float:
+    """Peak RSS since the last reset (since process start without one)."""
+    return _status_mb("VmHWM") or _max_rss_mb()
+
+
+# Running
+
+
+def run_case(case: Case, repeat: int = 5, warmup: int = 1) -> Result:
+    """Time ``case``; query count is taken from the first timed run."""
+    try:
+        for _ in range(warmup):
+            if case.setup:
+                case.setup()
+            case.func()
+
+        gc.collect()
+        start_rss = current_rss_mb()
+        reset_peak_rss()
+        timings, queries = [], None
+        for _ in range(repeat):
+            if case.setup:
+                case.setup()
+            with count_queries() as counter:
+                started = time.perf_counter()
+                case.func()
+                timings.append((time.perf_counter() - started) * 1000)
+            if queries is None:
+                queries = counter.value
+        peak = peak_rss_mb()
+    except Exception as e:
+        logger.exception(f"{case.name} failed")
+        return Result(case.name, 0, 0.0, 0.0, 0.0, 0, 0.0, 0.0, error=repr(e))
+
+    return Result(
+        name=case.name,
+        runs=repeat,
+        median_ms=round(statistics.median(timings), 3),
+        min_ms=round(min(timings), 3),
+        max_ms=round(max(timings), 3),
+        queries=queries,
+        peak_rss_mb=round(peak, 1),
+        rss_growth_mb=round(max(0.0, peak - start_rss), 1),
+    )
+
+
+def run_cases(cases: List[Case], repeat: int = 5, warmup: int = 1) -> List[Result]:
+    results = []
+    for case in cases:
+        result = run_case(case, repeat=repeat, warmup=warmup)
+        logger.info(
+            f"{case.name:<40} "
+            + (
+                f"ERROR {result.error}"
+                if result.error
+                else f"{result.median_ms:>10.2f} ms {result.queries:>6} queries"
+            )
+        )
+        results.append(result)
+    return results
+
+
+# Persistence and comparison
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_metadata(**fields) -> Dict[str, Any]:
+    """Describe the run; ``key`` identifies runs that can be compared."""
+    meta = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "machine": platform.node(),
+        **fields,
+    }
+    meta["key"] = "-".join(
+        str(fields[name]) for name in ("scale", "seed", "ingestion_db", "django_db")
+    )
+    return meta
+
+
+def save_results(directory: Path, meta: Dict, results: List[Result]) -> Path:
+    directory.mkdir(parents=True, exist_ok=True)
+    stamp = meta["timestamp"].replace(":", "").replace("-", "")
+    path = directory / f"{stamp}-{meta['key']}.json"
+    path.write_text(
+        json.dumps(
+            {"meta": meta, "results": [asdict(result) for result in results]},
+            indent=2,
+        )
+    )
+    return path
+
+
+def load_baseline(paths: List[Path]) -> Dict[str, Dict[str, Any]]:
+    """Case name -> latest successful result across ``paths`` (oldest first)."""
+    baseline = {}
+    for path in paths:
+        for row in json.loads(path.read_text())["results"]:
+            if not row["error"]:
+                baseline[row["name"]] = row
+    return baseline
+
+
+def previous_runs(directory: Path, key: str) -> List[Path]:
+    """Saved runs with the same key, oldest first."""
+    return sorted(directory.glob(f"*-{key}.json")) if directory.exists() else []
+
+
+def compare(
+    results: List[Result],
+    baseline: Dict[str, Dict[str, Any]],
+    tolerance: float = 0.2,
+    min_latency_ms: float = 1.0,
+    min_rss_mb: float = 5.0,
+) -> Dict[str, List[str]]:
+    """
+    Case name -> regressions against ``baseline``. Latency and memory get
+    ``tolerance`` slack plus an absolute floor to ride out noise; any extra
+    query is a regression.
+    """
+    regressions = {}
+    for result in results:
+        old = baseline.get(result.name)
+        if result.error or old is None:
+            continue
+        found = []
+        if (
+            result.median_ms > old["median_ms"] * (1 + tolerance)
+            and result.median_ms - old["median_ms"] > min_latency_ms
+        ):
+            found.append(f"latency {old['median_ms']:.2f} -> {result.median_ms:.2f} ms")
+        if result.queries > old["queries"]:
+            found.append(f"queries {old['queries']} -> {result.queries}")
+        if (
+            result.rss_growth_mb > old["rss_growth_mb"] * (1 + tolerance)
+            and result.rss_growth_mb - old["rss_growth_mb"] > min_rss_mb
+        ):
+            found.append(
+                f"memory +{old['rss_growth_mb']:.1f} -> +{result.rss_growth_mb:.1f} MB"
+            )
+        if found:
+            regressions[result.name] = found
+    return regressions
+
+
+def report(
+    results: List[Result],
+    baseline: Optional[Dict[str, Dict[str, Any]]] = None,
+    regressions: Optional[Dict[str, List[str]]] = None,
+):
+    """Log a results table with the change against ``baseline``."""
+    baseline = baseline or {}
+    regressions = regressions or {}
+    logger.info(
+        f"\n{'case':<40} {'median ms':>11} {'min ms':>10} {'queries':>8} "
+        f"{'peak MB':>8} {'grew MB':>8} {'vs prev':>8}"
+    )
+    for result in results:
+        if result.error:
+            logger.info(f"{result.name:<40} ERROR {result.error}")
+            continue
+        old = baseline.get(result.name)
+        change = (
+            f"{(result.median_ms / old['median_ms'] - 1) * 100:+.0f}%"
+            if old and old.get("median_ms")
+            else "new"
+        )
+        flag = "  REGRESSION" if result.name in regressions else ""
+        logger.info(
+            f"{result.name:<40} {result.median_ms:>11.2f} {result.min_ms:>10.2f} "
+            f"{result.queries:>8} {result.peak_rss_mb:>8.1f} "
+            f"{result.rss_growth_mb:>8.1f} {change:>8}{flag}"
+        )
+    for name, found in regressions.items():
+        logger.warning(f"Regression in {name}: {'; '.join(found)}")
@@ -0,0 +1,361 @@
+"""
+Deterministic synthetic catalogue.
+
+Every record is derived from (seed, index) alone, so the same scale and
+seed always produce byte-identical data regardless of how many records
+are generated or in what order. Movies come out in the shape returned by
+TMDbCollector.get_movie_details() with credits appended (the bulk loader's
+input format) and OMDbCollector.get_movie_by_imdb_id(), so the same data
+feeds the ingestion store and the Django catalogue.
+"""
+
+import logging
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+# TMDb movie genre ids
+GENRES = (
+    (28, "Action"),
+    (12, "Adventure"),
+    (16, "Animation"),
+    (35, "Comedy"),
+    (80, "Crime"),
+    (99, "Documentary"),
+    (18, "Drama"),
+    (10751, "Family"),
+    (14, "Fantasy"),
+    (36, "History"),
+    (27, "Horror"),
+    (10402, "Music"),
+    (9648, "Mystery"),
+    (10749, "Romance"),
+    (878, "Science Fiction"),
+    (10770, "TV Movie"),
+    (53, "Thriller"),
+    (10752, "War"),
+    (37, "Western"),
+)
+# Rough TMDb frequencies: drama and comedy dominate
+GENRE_WEIGHTS = (9, 5, 3, 12, 5, 3, 16, 4, 3, 2, 6, 2, 3, 6, 4, 1, 7, 1, 1)
+
+ADJECTIVES = tuple(
+    """
+    Silent Broken Golden Last Hidden Crimson Endless Midnight Lost
+    Savage Electric Frozen Wild Secret Burning Distant Iron Quiet Final
+    Dark
+    """.split()
+)
+NOUNS = tuple(
+    """
+    Horizon Empire River Garden Protocol Kingdom Signal Harbor Frontier
+    Witness Machine Summer Crown Storm Legacy Mirror Voyage Shadow
+    Station Promise
+    """.split()
+)
+FIRST_NAMES = tuple(
+    """
+    Ava Ben Chloe Daniel Elena Felix Grace Hugo Iris Jonah Kira Liam
+    Maya Noah Olive Paul Quinn Rosa Sam Tara Umar Vera Wes Yara Zane
+    """.split()
+)
+LAST_NAMES = tuple(
+    """
+    Adler Brooks Castillo Dawson Ellis Fischer Garcia Hale Ito Jensen
+    Khan Lopez Moreau Nakamura Okafor Park Quinn Rossi Silva Turner Ueda
+    Vance Walsh Xu Young Zimmer
+    """.split()
+)
+STUDIO_WORDS = tuple(
+    """
+    Pictures Studios Films Entertainment Productions Media
+    """.split()
+)
+COUNTRIES = ("US", "GB", "FR", "DE", "JP", "KR", "IN", "CA", "ES", "IT")
+LANGUAGES = ("en", "en", "en", "fr", "es", "ja", "ko", "de", "hi", "it")
+CREW_JOBS = (
+    ("Director", "Directing"),
+    ("Screenplay", "Writing"),
+    ("Producer", "Production"),
+    ("Original Music Composer", "Sound"),
+    ("Director of Photography", "Camera"),
+)
+
+FIRST_RELEASE = date(1970, 1, 1)
+RELEASE_SPAN_DAYS = (date(2024, 12, 31) - FIRST_RELEASE).days
+# ingestion movies.budget/revenue are 32-bit integers
+MAX_GROSS = 2_000_000_000
+
+
+class SyntheticCatalogue:
+    """
+    ``movies`` movies with tmdb ids 1..movies, drawing on a studio and
+    people pool sized from the movie count. Popular studios and people
+    recur (power-law picks), as they do in the real catalogue.
+    """
+
+    def __init__(
+        self, movies: int, seed: int = 0, cast_size: int = 8, crew_size: int = 3
+    ):
+        self.movies = movies
+        self.seed = seed
+        self.cast_size = cast_size
+        self.crew_size = min(crew_size, len(CREW_JOBS))
+        self.studios = max(20, movies // 100)
+        self.people = max(200, movies * 2)
+
+    @classmethod
+    def for_scale(cls, scale: str, **kwargs) -> "SyntheticCatalogue":
+        return cls(SCALES[scale], **kwargs)
+
+    def _rng(self, kind: str, index: int) -> random.Random:
+        return random.Random(f"{self.seed}:{kind}:{index}")
+
+    # Names (pure functions of the id, no RNG needed)
+
+    @staticmethod
+    def genre(genre_id: int) -> str:
+        return dict(GENRES)[genre_id]
+
+    @staticmethod
+    def person_name(person_id: int) -> str:
+        first = FIRST_NAMES[person_id % len(FIRST_NAMES)]
+        last = LAST_NAMES[(person_id // len(FIRST_NAMES)) % len(LAST_NAMES)]
+        generation = person_id // (len(FIRST_NAMES) * len(LAST_NAMES))
+        return f"{first} {last}" + (f" {generation + 1}" if generation else "")
+
+    @staticmethod
+    def studio_name(studio_id: int) -> str:
+        noun = NOUNS[studio_id % len(NOUNS)]
+        word = STUDIO_WORDS[(studio_id // len(NOUNS)) % len(STUDIO_WORDS)]
+        return f"{noun} {word} {studio_id}"
+
+    @staticmethod
+    def imdb_id(index: int) -> str:
+        return f"tt{index + 1:08d}"
+
+    def _pick(self, rng: random.Random, size: int, skew: float = 2.0) -> int:
+        """1-based id in [1, size], biased towards low (popular) ids."""
+        return int(size * rng.random() ** skew) + 1
+
+    # Records
+
+    def movie(self, index: int) -> Dict[str, Any]:
+        """TMDb movie details (with credits) for the movie at ``index``."""
+        rng = self._rng("movie", index)
+        tmdb_id = index + 1
+
+        title = f"The {rng.choice(ADJECTIVES)} {rng.choice(NOUNS)}"
+        if rng.random() < 0.15:
+            title += f" {rng.randint(2, 4)}"
+        released = FIRST_RELEASE + timedelta(days=rng.randrange(RELEASE_SPAN_DAYS))
+
+        budget = revenue = 0
+        if rng.random() < 0.6:
+            budget = min(MAX_GROSS, int(rng.lognormvariate(16.5, 1.1)) // 1000 * 1000)
+            if rng.random() < 0.75:
+                revenue = min(MAX_GROSS, int(budget * rng.lognormvariate(0.5, 0.9)))
+
+        genres = []
+        for genre_id, name in rng.choices(
+            GENRES, weights=GENRE_WEIGHTS, k=rng.randint(1, 3)
+        ):
+            if all(genre["id"] != genre_id for genre in genres):
+                genres.append({"id": genre_id, "name": name})
+
+        studio_id = self._pick(rng, self.studios)
+        cast = []
+        for order in range(self.cast_size):
+            person_id = self._pick(rng, self.people)
+            cast.append(
+                {
+                    "id": person_id,
+                    "name": self.person_name(person_id),
+                    "character": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                    "order": order,
+                    "gender": person_id % 3,
+                    "popularity": round(100 / (1 + person_id / 500), 3),
+                    "known_for_department": "Acting",
+                    "adult": False,
+                }
+            )
+        crew = []
+        for job, department in CREW_JOBS[: self.crew_size]:
+            person_id = self._pick(rng, self.people, skew=1.5)
+            crew.append(
+                {
+                    "id": person_id,
+                    "name": self.person_name(person_id),
+                    "job": job,
+                    "department": department,
+                    "gender": person_id % 3,
+                    "popularity": round(100 / (1 + person_id / 500), 3),
+                    "known_for_department": department,
+                    "adult": False,
+                }
+            )
+
+        return {
+            "id": tmdb_id,
+            "imdb_id": self.imdb_id(index),
+            "title": title,
+            "original_title": title,
+            "overview": f"{title} ({released.year}), synthetic movie {tmdb_id}.",
+            "release_date": released.isoformat(),
+            "runtime": rng.randint(75, 180),
+            "budget": budget,
+            "revenue": revenue,
+            "popularity": round(rng.expovariate(1 / 15), 3),
+            "vote_average": round(min(10.0, max(0.0, rng.gauss(6.3, 1.1))), 1),
+            "vote_count": int(rng.expovariate(1 / 800)),
+            "poster_path": f"/poster{tmdb_id}.jpg",
+            "backdrop_path": f"/backdrop{tmdb_id}.jpg",
+            "adult": False,
+            "video": False,
+            "status": "Released",
+            "tagline": None,
+            "homepage": None,
+            "original_language": rng.choice(LANGUAGES),
+            "genres": genres,
+            "production_companies": [
+                {
+                    "id": studio_id,
+                    "name": self.studio_name(studio_id),
+                    "origin_country": COUNTRIES[studio_id % len(COUNTRIES)],
+                }
+            ],
+            "credits": {"cast": cast, "crew": crew},
+        }
+
+    def omdb(self, index: int, movie: Optional[Dict] = None) -> Dict[str, Any]:
+        """OMDb response for the movie at ``index`` (pass ``movie`` if built)."""
+        rng = self._rng("omdb", index)
+        movie = movie or self.movie(index)
+        imdb_rating = round(
+            min(10.0, max(1.0, movie["vote_average"] + rng.gauss(0, 0.5))), 1
+        )
+        box_office = movie["revenue"] * rng.uniform(0.3, 0.6)
+        return {
+            "Title": movie["title"],
+            "imdbID": movie["imdb_id"],
+            "imdbRating": str(imdb_rating),
+            "imdbVotes": f"{movie['vote_count'] * 12:,}",
+            "Ratings": [
+                {"Source": "Internet Movie Database", "Value": f"{imdb_rating}/10"},
+                {
+                    "Source": "Rotten Tomatoes",
+                    "Value": f"{min(100, max(0, int(imdb_rating * 10 + rng.gauss(0, 12))))}%",
+                },
+                {
+                    "Source": "Metacritic",
+                    "Value": f"{min(100, max(0, int(imdb_rating * 10 + rng.gauss(-5, 10))))}/100",
+                },
+            ],
+            "BoxOffice": f"${int(box_office):,}" if box_office else "N/A",
+            "Response": "True",
+        }
+
+    def records(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Dict]:
+        """Movie records for indexes [start, stop)."""
+        for index in range(start, self.movies if stop is None else stop):
+            yield self.movie(index)
+
+    # Ingestion store rows derived from the OMDb responses
+
+    @staticmethod
+    def ingestion_ratings(omdb: Dict, movie_id: int) -> List[Dict[str, Any]]:
+        """Rows for the ratings table, as OMDbCollector.extract_ratings makes them."""
+        rows = [
+            {
+                "movie_id": movie_id,
+                "source": "imdb",
+                "value": omdb["imdbRating"],
+                "votes": int(omdb["imdbVotes"].replace(",", "")),
+            }
+        ]
+        sources = {"Rotten Tomatoes": "rotten_tomatoes", "Metacritic": "metacritic"}
+        rows.extend(
+            {
+                "movie_id": movie_id,
+                "source": sources[rating["Source"]],
+                "value": rating["Value"],
+                "votes": None,
+            }
+            for rating in omdb["Ratings"]
+            if rating["Source"] in sources
+        )
+        return rows
+
+    @staticmethod
+    def ingestion_box_office(
+        omdb: Dict, movie: Dict, movie_id: int
+    ) -> Optional[Dict[str, Any]]:
+        gross = omdb["BoxOffice"]
+        if gross == "N/A":
+            return None
+        domestic = int(gross.replace("$", "").replace(",", ""))
+        worldwide = movie["revenue"]
+        return {
+            "movie_id": movie_id,
+            "domestic_gross": domestic,
+            "international_gross": worldwide - domestic,
+            "worldwide_gross": worldwide,
+        }
+
+    # Django catalogue rows
+
+    def django_movie(self, index: int) -> Dict[str, Any]:
+        """Field values for movies.Movie (pk = tmdb id)."""
+        movie = self.movie(index)
+        budget = Decimal(movie["budget"]) if movie["budget"] else None
+        revenue = Decimal(movie["revenue"]) if movie["revenue"] else None
+        roi = None
+        if budget and revenue:
+            # DecimalField(max_digits=8): clamp absurd synthetic outliers
+            roi = min(Decimal("999999.99"), round((revenue - budget) / budget * 100, 2))
+        return {
+            "id": movie["id"],
+            "title": movie["title"],
+            "original_title": movie["original_title"],
+            "release_date": date.fromisoformat(movie["release_date"]),
+            "runtime": movie["runtime"],
+            "rating": ("G", "PG", "PG-13", "R")[index % 4],
+            "overview": movie["overview"],
+            "tmdb_id": movie["id"],
+            "imdb_id": movie["imdb_id"],
+            "budget": budget,
+            "revenue": revenue,
+            "roi": roi,
+            "studio_id": movie["production_companies"][0]["id"],
+            "genre_ids": [genre["id"] for genre in movie["genres"]],
+            "ratings": {
+                "tmdb": Decimal(str(movie["vote_average"])),
+                "imdb": Decimal(self.omdb(index, movie)["imdbRating"]),
+            },
+        }
+
+
+# Dataset building helpers
+
+
+def chunks(stop: int, size: int) -> Iterator[Tuple[int, int]]:
+    for start in range(0, stop, size):
+        yield start, min(start + size, stop)
+
+
+def check_existing(existing: int, catalogue: SyntheticCatalogue, where: str) -> bool:
+    """True when ``where`` already holds this catalogue."""
+    if existing == catalogue.movies:
+        logger.info(f"Reusing {where} ({existing:,} movies)")
+        return True
+    if existing:
+        raise RuntimeError(
+            f"{where} holds {existing:,} movies, expected {catalogue.movies:,}; "
+            "use an empty database or --rebuild"
+        )
+    return False
@@ -0,0 +1,39 @@
+"""
+Fill the inflation-adjusted budget, revenue and profit of movies.
+
+Only movies changed since they were adjusted are recomputed, unless the
+price index table (PRICE_INDEX) or PRICE_INDEX_BASE_YEAR changed, which
+refreshes every movie. Run it after every collection, before
+scripts/sync_read_model.py:
+
+    python scripts/adjust_financials.py [--full]
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from data.processors.financials import refresh_financials
+from database.migrations.adjusted_financials import upgrade
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Adjust stale movies' financials to the price index base year."""
+    parser = argparse.ArgumentParser(description="Adjust movie financials")
+    parser.add_argument("--full", action="store_true", help="recompute every movie")
+    args = parser.parse_args()
+
+    # Existing databases need the adjusted columns first
+    upgrade()
+    refresh_financials(full=args.full)
+
+
+if __name__ == "__main__":
+    main()
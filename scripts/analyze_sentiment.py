@@ -0,0 +1,45 @@
+"""
+Score reviews collected since the last run into sentiment_analysis.
+
+Only reviews that have not been analysed yet are scored, so running it
+after every collection keeps the per-movie sentiment current:
+
+    python scripts/analyze_sentiment.py [--workers 4] [--batch-size 500]
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from data.processors.sentiment import MOVIE_BATCH_SIZE, analyze_sentiment
+from database.partitioning import ensure_partitions
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Score new reviews and record per-movie sentiment."""
+    parser = argparse.ArgumentParser(description="Analyze review sentiment")
+    parser.add_argument(
+        "--workers", type=int, help="scoring processes (default: CPU count)"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=MOVIE_BATCH_SIZE,
+        help="movies whose reviews are scored and written together",
+    )
+    args = parser.parse_args()
+
+    # Sentiment rows must land in an existing monthly partition
+    ensure_partitions()
+    analyze_sentiment(workers=args.workers, batch_size=args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
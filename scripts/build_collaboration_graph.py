@@ -0,0 +1,71 @@
+"""
+Build the cast/crew collaboration graph behind /api/collaborations.
+
+Writes a new graph version under COLLABORATION_GRAPH_DIR and makes it
+current; running API workers pick it up within
+COLLABORATION_GRAPH_REFRESH_SECONDS:
+
+    python scripts/build_collaboration_graph.py [--check 100]
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from analytics.graph import PAIR_KINDS, CollaborationGraph, CollaborationGraphBuilder
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def check_graph(graph: CollaborationGraph, queries: int):
+    """Report latency of pair rankings and collaborator lookups."""
+    rng = np.random.default_rng(0)
+    people = graph["person_ids"]
+    checks = {
+        "top_pairs": lambda i: graph.top_pairs(
+            list(PAIR_KINDS)[i % len(PAIR_KINDS)], "median_roi"
+        ),
+        "collaborators": lambda i: graph.collaborators(int(rng.choice(people))),
+    }
+    for name, query in checks.items():
+        timings = []
+        for i in range(queries):
+            started = time.perf_counter()
+            query(i)
+            timings.append((time.perf_counter() - started) * 1000)
+        logger.info(
+            f"{name}: {queries} queries, p50 {np.percentile(timings, 50):.2f} ms, "
+            f"p99 {np.percentile(timings, 99):.2f} ms"
+        )
+
+
+def main():
+    """Build, publish and optionally time the collaboration graph."""
+    parser = argparse.ArgumentParser(description="Build the collaboration graph")
+    parser.add_argument(
+        "--graph-dir", type=Path, help="default: COLLABORATION_GRAPH_DIR"
+    )
+    parser.add_argument(
+        "--check",
+        type=int,
+        default=0,
+        metavar="QUERIES",
+        help="time this many queries of each kind against the new graph",
+    )
+    args = parser.parse_args()
+
+    path = CollaborationGraphBuilder(graph_dir=args.graph_dir).build()
+    if args.check:
+        check_graph(CollaborationGraph(path), args.check)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Refresh the ML feature store (see src/ml/features.py).
+
+Computes features for movies updated since the last refresh and
+publishes them as a new data version; --full recomputes every movie:
+
+    python scripts/build_features.py [--full] [--compact]
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from ml.features import FeatureStore
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Run one feature store refresh."""
+    parser = argparse.ArgumentParser(description="Refresh the ML feature store")
+    parser.add_argument("--full", action="store_true", help="recompute every movie")
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="merge appended segments into one afterwards",
+    )
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    store = FeatureStore(batch_size=args.batch_size)
+    store.refresh(full=args.full)
+    if args.compact:
+        store.compact()
+    manifest = store.manifest()
+    logger.info(
+        f"Feature set {manifest['feature_set']} data version "
+        f"{manifest['data_version']}: {len(manifest['segments'])} segment(s), "
+        f"{len(manifest['columns'])} columns"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Build the columnar market snapshot behind /api/market.
+
+Writes a new snapshot version under MARKET_SNAPSHOT_DIR and makes it
+current; running API workers pick it up within
+MARKET_SNAPSHOT_REFRESH_SECONDS:
+
+    python scripts/build_market_snapshot.py [--check 100]
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from analytics.market import MarketSnapshot, MarketSnapshotBuilder
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def check_snapshot(snapshot: MarketSnapshot, queries: int):
+    """Report uncached latency of each market query."""
+    rng = np.random.default_rng(0)
+    first, last = snapshot.meta["years"]
+    genres = snapshot.genre_names
+
+    def span():
+        start = int(rng.integers(first, last + 1))
+        return start, int(rng.integers(start, last + 1))
+
+    checks = {
+        "release_windows": lambda: snapshot._release_windows(
+            int(rng.integers(first, last + 1)), None
+        ),
+        "genre_share": lambda: snapshot._genre_share("revenue", *span()),
+        "roi_seasonality": lambda: snapshot._roi_seasonality(
+            *span(), int(rng.integers(len(genres))) if genres else None
+        ),
+        "studio_concentration": lambda: snapshot._studio_concentration(
+            "revenue", *span(), 10
+        ),
+    }
+    for name, query in checks.items():
+        timings = []
+        for _ in range(queries):
+            started = time.perf_counter()
+            query()
+            timings.append((time.perf_counter() - started) * 1000)
+        logger.info(
+            f"{name}: {queries} queries, p50 {np.percentile(timings, 50):.2f} ms, "
+            f"p99 {np.percentile(timings, 99):.2f} ms"
+        )
+
+
+def main():
+    """Build, publish and optionally time the market snapshot."""
+    parser = argparse.ArgumentParser(description="Build the market snapshot")
+    parser.add_argument(
+        "--snapshot-dir", type=Path, help="default: MARKET_SNAPSHOT_DIR"
+    )
+    parser.add_argument(
+        "--check",
+        type=int,
+        default=0,
+        metavar="QUERIES",
+        help="time this many uncached queries of each kind against the new snapshot",
+    )
+    args = parser.parse_args()
+
+    path = MarketSnapshotBuilder(snapshot_dir=args.snapshot_dir).build()
+    if args.check:
+        check_snapshot(MarketSnapshot(path), args.check)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Build the content-based similarity index behind /api/movies/{id}/similar.
+
+Writes a new index version under SIMILARITY_INDEX_DIR and makes it
+current; running API workers pick it up within SIMILARITY_REFRESH_SECONDS:
+
+    python scripts/build_similarity_index.py [--nlist N] [--check 100]
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from ml.similarity import SimilarityIndex, SimilarityIndexBuilder
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def check_index(index: SimilarityIndex, queries: int, limit: int = 10):
+    """Report query latency and IVF recall against exact search."""
+    rng = np.random.default_rng(0)
+    movie_ids = rng.choice(index.ids, min(queries, len(index)), replace=False)
+    timings, recall = [], []
+    for movie_id in movie_ids:
+        started = time.perf_counter()
+        found = index.similar(int(movie_id), limit)
+        timings.append((time.perf_counter() - started) * 1000)
+        exact = index.similar(int(movie_id), limit, exact=True)
+        if exact:
+            recall.append(
+                len({i for i, _ in found} & {i for i, _ in exact}) / len(exact)
+            )
+    logger.info(
+        f"{len(movie_ids)} queries: p50 {np.percentile(timings, 50):.2f} ms, "
+        f"p99 {np.percentile(timings, 99):.2f} ms, "
+        f"recall@{limit} vs exact {np.mean(recall) if recall else 1:.3f}"
+    )
+
+
+def main():
+    """Build and publish a similarity index."""
+    parser = argparse.ArgumentParser(description="Build the similarity index")
+    parser.add_argument(
+        "--nlist",
+        type=int,
+        help="IVF lists (default: sqrt(movies), 0 below 20k movies = exact only)",
+    )
+    parser.add_argument("--index-dir", type=Path)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--check",
+        type=int,
+        default=0,
+        metavar="QUERIES",
+        help="time this many random queries against the new index",
+    )
+    args = parser.parse_args()
+
+    path = SimilarityIndexBuilder(index_dir=args.index_dir).build(
+        nlist=args.nlist, seed=args.seed
+    )
+    if args.check:
+        check_index(SimilarityIndex(path), args.check)
+
+
+if __name__ == "__main__":
+    main()
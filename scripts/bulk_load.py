@@ -0,0 +1,43 @@
+"""
+Bulk-load TMDb movie records (JSON or JSON Lines) into the database.
+
+Each record is a get_movie_details() response with credits appended:
+
+    python scripts/bulk_load.py data/movies_*.jsonl --batch-size 50000
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from database.bulk_load import bulk_load_files
+from database.connection import create_tables
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Create missing tables, then stage and merge the given files."""
+    parser = argparse.ArgumentParser(description="Bulk-load movie JSON files")
+    parser.add_argument("paths", nargs="+", type=Path, help=".json or .jsonl files")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=50_000,
+        help="staging rows buffered per table before each COPY/executemany",
+    )
+    args = parser.parse_args()
+
+    create_tables()
+    stats = bulk_load_files(args.paths, batch_size=args.batch_size)
+    for name, count in stats.items():
+        logger.info(f"{name:<24} {count:>10,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Check that the analytics queries use indexes instead of full table scans.
+
+Runs EXPLAIN (PostgreSQL, with sequential scans disabled so any scan that
+remains has no index alternative) or EXPLAIN QUERY PLAN (SQLite) for each
+hot query and fails if a table that should be read through an index is
+scanned. Exit code 1 means at least one plan regressed.
+
+    python scripts/check_query_plans.py [--verbose]
+"""
+
+import argparse
+import logging
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+from sqlalchemy import select, text
+from sqlalchemy.engine import Connection
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from analytics.performance import (
+    financial_movies_query,
+    genre_ratings_summary_query,
+    ranked_movies_query,
+    top_movies_by_genre_query,
+)
+from database.connection import engine
+from database.models import BoxOffice, Rating
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+# query name -> (statement, tables that must not be fully scanned)
+CHECKS = {
+    # Aggregates every genre link, so scanning movies_genres is expected
+    "genre_ratings_summary": (genre_ratings_summary_query(), ("movies",)),
+    "top_movies_by_genre": (
+        top_movies_by_genre_query("Drama", 10),
+        ("movies", "movies_genres", "genres"),
+    ),
+    "top_rated": (ranked_movies_query(10, descending=True), ("movies",)),
+    "bottom_rated": (ranked_movies_query(10, descending=False), ("movies",)),
+    "financial": (financial_movies_query(), ("movies",)),
+    "ratings_for_movie": (
+        select(Rating).where(Rating.movie_id == 1),
+        ("ratings",),
+    ),
+    "box_office_for_movie": (
+        select(BoxOffice).where(BoxOffice.movie_id == 1),
+        ("box_office",),
+    ),
+}
+
+# SQLite: "SCAN movies" is a full scan, "SCAN movies USING INDEX ..." is not
+SQLITE_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)(?! USING)")
+POSTGRES_SCAN = re.compile(r"Seq Scan on (\w+)")
+# SQLite reports anonymous join aliases such as movies_genres_1
+ALIAS_SUFFIX = re.compile(r"_\d+$")
+
+
+def explain(connection: Connection, statement) -> List[str]:
+    """Return the plan lines for ``statement`` on the connected database."""
+    sql = str(
+        statement.compile(
+            dialect=connection.dialect, compile_kwargs={"literal_binds": True}
+        )
+    )
+    if connection.dialect.name == "postgresql":
+        rows = connection.execute(text(f"EXPLAIN {sql}"))
+        return [row[0] for row in rows]
+    rows = connection.execute(text(f"EXPLAIN QUERY PLAN {sql}"))
+    return [row[-1] for row in rows]
+
+
+def full_scans(dialect: str, plan: Sequence[str]) -> List[str]:
+    """Tables read by a full scan in ``plan``."""
+    pattern = POSTGRES_SCAN if dialect == "postgresql" else SQLITE_SCAN
+    scanned = []
+    for line in plan:
+        match = pattern.search(line.strip())
+        if match:
+            scanned.append(ALIAS_SUFFIX.sub("", match.group(1)))
+    return scanned
+
+
+def check_query_plans(verbose: bool = False) -> Dict[str, Tuple[bool, List[str]]]:
+    """Explain every query in CHECKS; return name -> (ok, offending tables)."""
+    results = {}
+    with engine.connect() as connection:
+        dialect = connection.dialect.name
+        if dialect == "postgresql":
+            connection.execute(text("SET enable_seqscan = off"))
+
+        for name, (statement, indexed_tables) in CHECKS.items():
+            plan = explain(connection, statement)
+            offending = [
+                table for table in full_scans(dialect, plan) if table in indexed_tables
+            ]
+            results[name] = (not offending, offending)
+
+            status = "ok" if not offending else f"FULL SCAN of {', '.join(offending)}"
+            logger.info(f"{name:<24} {status}")
+            if verbose or offending:
+                for line in plan:
+                    logger.info(f"    {line}")
+
+    return results
+
+
+def main():
+    """Check query plans and exit non-zero on any regression."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--verbose", action="store_true", help="print every plan")
+    args = parser.parse_args()
+
+    results = check_query_plans(verbose=args.verbose)
+    failed = [name for name, (ok, _) in results.items() if not ok]
+    if failed:
+        logger.error(
+            f"{len(failed)} quer{'y' if len(failed) == 1 else 'ies'} regressed"
+        )
+        sys.exit(1)
+    logger.info("All query plans use indexes")
+
+
+if __name__ == "__main__":
+    main()
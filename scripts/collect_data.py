@@ -1,14 +1,24 @@
 """
 Data collection script for movies and series
+
+Every stage (API requests, JSON parsing, rate-limit waits, database
+writes) is timed; a per-stage breakdown with throughput, cache hit rate
+and retries is logged at the end of the run:
+
+    python scripts/collect_data.py [--pages 3] [--timings-output timings.json]
+        [--profile cprofile|pyinstrument] [--profile-output collect.prof]
+        [--resolve-missing 100]
 """
 
+import argparse
 import logging
 import os
 import sys
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 
 # Add src to path
@@ -16,37 +26,53 @@ sys.path.append(str(Path(__file__).parent.parent / "src"))
 
 from data.collectors.omdb_collector import OMDbCollector
 from data.collectors.tmdb_collector import TMDbCollector
+from data.processors.entity_resolution import OMDbResolver
+from data.profiling import PROFILERS, PipelineProfiler, capture_profile, profiler
 from database.connection import get_database
-from database.models import BoxOffice, Genre, Movie, Person, Rating
+from database.models import BoxOffice, Company, Genre, Movie, Person, Rating, Review
+from database.partitioning import ensure_partitions
+from database.read_model import sync_read_model
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+RESOLVE_BATCH_SIZE = 500
+
 
 class DataCollectionPipeline:
     """Main data collection pipeline."""
 
-    def __init__(self):
-        self.tmdb_collector = TMDbCollector()
-        self.omdb_collector = OMDbCollector()
+    def __init__(self, profiler: PipelineProfiler = profiler):
+        self.profiler = profiler
+        self.tmdb_collector = TMDbCollector(profiler=profiler)
+        self.omdb_collector = OMDbCollector(profiler=profiler)
+        self.resolver = OMDbResolver(self.omdb_collector, profiler=profiler)
+        # Genres seen this run, by TMDb id; most movies share a handful
+        self._genres: Dict[int, Genre] = {}
+        self._companies: Dict[int, Company] = {}
 
     def collect_popular_movies(self, pages: int = 5):
         """Collect popular movies from TMDb."""
         logger.info(f"Starting collection of popular movies ({pages} pages)...")
 
         db = next(get_database())
+        self._genres = {}
+        self._companies = {}
 
         try:
             # Get popular movies
-            popular_movies = self.tmdb_collector.bulk_collect_popular_movies(pages)
+            with self.profiler.span("tmdb.popular", pages=pages):
+                popular_movies = self.tmdb_collector.bulk_collect_popular_movies(pages)
             logger.info(
                 f"Collected {len(popular_movies)} movies"
             )  # Fixed: Collectedd -> Collected
 
             for movie_data in popular_movies:
-                self._process_movie(db, movie_data)
+                with self.profiler.span("movie", tmdb_id=movie_data.get("id")):
+                    self._process_movie(db, movie_data)
 
-            db.commit()
+            with self.profiler.span("db.commit"):
+                db.commit()
             logger.info("Popular movies collection completed!")
 
         except Exception as e:
@@ -56,16 +82,66 @@ class DataCollectionPipeline:
         finally:
             db.close()
 
+    def resolve_missing_imdb_ids(self, max_searches: int = 0):
+        """
+        Match stored movies without an IMDb ID to OMDb records, most popular
+        first, and collect their OMDb data. At most ``max_searches`` OMDb
+        searches are spent on movies that don't match locally.
+        """
+        logger.info(f"Resolving movies without an IMDb ID ({max_searches} searches)...")
+
+        db = next(get_database())
+        self.resolver.search_budget = max_searches
+
+        try:
+            movie_ids = [
+                movie_id
+                for (movie_id,) in db.query(Movie.id)
+                .filter(Movie.imdb_id.is_(None))
+                .order_by(Movie.popularity.desc())
+            ]
+            resolved = 0
+            # Committed in batches, so searches already paid for are kept
+            for start in range(0, len(movie_ids), RESOLVE_BATCH_SIZE):
+                batch = movie_ids[start : start + RESOLVE_BATCH_SIZE]
+                for movie in db.query(Movie).filter(Movie.id.in_(batch)).all():
+                    with self.profiler.span("omdb.resolve"):
+                        imdb_id = self.resolver.resolve(db, movie)
+                    if imdb_id:
+                        resolved += 1
+                        self._process_omdb_data(db, movie)
+
+                with self.profiler.span("db.commit"):
+                    db.commit()
+                db.expunge_all()
+            logger.info(f"Resolved {resolved} of {len(movie_ids)} movies")
+
+        except Exception as e:
+            logger.error(f"Error resolving IMDb IDs: {e}")
+            db.rollback()
+            raise
+        finally:
+            self.resolver.search_budget = None
+            db.close()
+
     def _process_movie(self, db: Session, movie_data: dict):
         """Process and save a single movie."""
         try:
             # Check if movie already exists
-            existing_movie = (
-                db.query(Movie).filter(Movie.tmdb_id == movie_data["id"]).first()
-            )
+            with self.profiler.span("db.lookup"):
+                existing_movie = (
+                    db.query(Movie).filter(Movie.tmdb_id == movie_data["id"]).first()
+                )
 
             if existing_movie:
                 logger.info(f"Movie already exists: {movie_data.get('title')}")
+                self.profiler.count("movies.skipped")
+                # Reviews keep arriving after a movie is first collected
+                reviews = self.tmdb_collector.get_movie_reviews(existing_movie.tmdb_id)
+                with self.profiler.span("db.reviews"):
+                    self._process_movie_reviews(
+                        db, existing_movie, reviews.get("results", [])
+                    )
                 return
 
             # Get detailed movie information
@@ -98,38 +174,129 @@ class DataCollectionPipeline:
             )
 
             db.add(movie)
-            db.flush()  # Get the movie ID
+            with self.profiler.span("db.flush"):
+                db.flush()  # Get the movie ID
 
             # Process genres
-            self._process_movie_genres(db, movie, detailed_movie.get("genres", []))
-
-            # Collect OMDb data for additional ratings
+            with self.profiler.span("db.genres"):
+                self._process_movie_genres(db, movie, detailed_movie.get("genres", []))
+
+            with self.profiler.span("db.companies"):
+                self._process_movie_companies(
+                    db, movie, detailed_movie.get("production_companies", [])
+                )
+
+            # Store reviews for the sentiment pipeline
+            with self.profiler.span("db.reviews"):
+                self._process_movie_reviews(
+                    db, movie, (detailed_movie.get("reviews") or {}).get("results", [])
+                )
+
+            # Collect OMDb data for additional ratings, matching movies TMDb
+            # has no IMDb ID for to an OMDb record first
+            if not movie.imdb_id:
+                with self.profiler.span("omdb.resolve"):
+                    self.resolver.resolve(db, movie)
             if movie.imdb_id:
                 self._process_omdb_data(db, movie)
 
+            self.profiler.count("items")
             logger.info(f"Processed movie: {movie.title}")
 
         except Exception as e:
+            self.profiler.count("movies.failed")
             logger.error(f"Error processing movie {movie_data.get('title')}: {e}")
 
     def _process_movie_genres(self, db: Session, movie: Movie, genres_data: list):
         """Process and link movie genres."""
         for genre_data in genres_data:
-            genre = db.query(Genre).filter(Genre.tmdb_id == genre_data["id"]).first()
-            if not genre:
-                # Create genre if it doesn't exist
-                genre = Genre(tmdb_id=genre_data["id"], name=genre_data["name"])
-                db.add(genre)
-                db.flush()
+            genre = self._genres.get(genre_data["id"])
+            if genre is not None:
+                self.profiler.count("cache.hits")
+            else:
+                self.profiler.count("cache.misses")
+                genre = (
+                    db.query(Genre).filter(Genre.tmdb_id == genre_data["id"]).first()
+                )
+                if not genre:
+                    # Create genre if it doesn't exist
+                    genre = Genre(tmdb_id=genre_data["id"], name=genre_data["name"])
+                    db.add(genre)
+                    db.flush()
+                self._genres[genre_data["id"]] = genre
 
             movie.genres.append(genre)
 
+    def _process_movie_companies(self, db: Session, movie: Movie, companies_data: list):
+        """Process and link the movie's production companies."""
+        for company_data in companies_data:
+            company = self._companies.get(company_data["id"])
+            if company is None:
+                company = (
+                    db.query(Company)
+                    .filter(Company.tmdb_id == company_data["id"])
+                    .first()
+                )
+                if not company:
+                    company = Company(
+                        tmdb_id=company_data["id"],
+                        name=company_data["name"],
+                        origin_country=company_data.get("origin_country") or None,
+                    )
+                    db.add(company)
+                    db.flush()
+                self._companies[company_data["id"]] = company
+
+            if company not in movie.companies:
+                movie.companies.append(company)
+
+    def _process_movie_reviews(self, db: Session, movie: Movie, reviews_data: list):
+        """
+        Upsert the movie's TMDb reviews on (source, external_id). New ones
+        are left unscored; edits to known ones keep their analyzed_at, so
+        every review is counted once in sentiment_analysis.
+        """
+        rows = []
+        for review_data in reviews_data:
+            if not review_data.get("content"):
+                continue
+            author_details = review_data.get("author_details") or {}
+            rows.append(
+                {
+                    "movie_id": movie.id,
+                    "source": "tmdb",
+                    "external_id": review_data["id"],
+                    "author": review_data.get("author"),
+                    "author_rating": author_details.get("rating"),
+                    "content": review_data["content"],
+                    "published_at": self._parse_timestamp(
+                        review_data.get("created_at")
+                    ),
+                }
+            )
+        if not rows:
+            return
+
+        dialect = postgresql if db.connection().dialect.name == "postgresql" else sqlite
+        insert = dialect.insert(Review).values(rows)
+        db.execute(
+            insert.on_conflict_do_update(
+                index_elements=["source", "external_id"],
+                set_={
+                    name: insert.excluded[name]
+                    for name in ("author", "author_rating", "content", "published_at")
+                },
+            )
+        )
+        self.profiler.count("reviews", len(rows))
+
     def _process_omdb_data(self, db: Session, movie: Movie):
         """Process OMDb data for additional ratings and box office."""
         try:
             omdb_data = self.omdb_collector.get_movie_by_imdb_id(movie.imdb_id)
 
             if omdb_data:
+                self.profiler.count("omdb.matched")
                 # Process ratings
                 ratings = self.omdb_collector.extract_ratings(omdb_data)
                 for rating_data in ratings:
@@ -160,15 +327,71 @@ class DataCollectionPipeline:
         except ValueError:
             return None
 
+    def _parse_timestamp(self, timestamp: str) -> Optional[datetime]:
+        """Parse an ISO 8601 timestamp to a naive UTC datetime."""
+        if not timestamp:
+            return None
+
+        try:
+            parsed = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+        return parsed
+
 
 def main():
     """Main data collection function."""  # Fixed: collecton -> collection
+    parser = argparse.ArgumentParser(description="Collect popular movies")
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument(
+        "--timings-output",
+        type=Path,
+        help="write the per-stage breakdown and counters to this JSON file",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=PROFILERS,
+        help="run the collection under a profiler (pyinstrument must be installed)",
+    )
+    parser.add_argument(
+        "--profile-output",
+        type=Path,
+        help="cProfile .prof file or pyinstrument HTML report",
+    )
+    parser.add_argument(
+        "--resolve-missing",
+        type=int,
+        metavar="SEARCHES",
+        help=(
+            "then match stored movies without an IMDb ID to OMDb, spending at "
+            "most SEARCHES OMDb searches (0: local matches only)"
+        ),
+    )
+    args = parser.parse_args()
+
     pipeline = DataCollectionPipeline()
+    profiler.reset()
+
+    with capture_profile(args.profile, args.profile_output):
+        # Ratings/box office snapshots must land in an existing monthly partition
+        with profiler.span("db.partitions"):
+            ensure_partitions()
+
+        # Collect popular movies
+        pipeline.collect_popular_movies(pages=args.pages)
+        if args.resolve_missing is not None:
+            pipeline.resolve_missing_imdb_ids(args.resolve_missing)
 
-    # Collect popular movies
-    pipeline.collect_popular_movies(pages=3)
+        # Project the new rows into the read model served by the APIs
+        with profiler.span("read_model.sync"):
+            sync_read_model()
 
     logger.info("Data collection completed!")
+    profiler.report()
+    if args.timings_output:
+        profiler.export(args.timings_output)
 
 
 if __name__ == "__main__":
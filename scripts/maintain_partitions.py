@@ -0,0 +1,55 @@
+"""
+Scheduled maintenance for the time-series tables.
+
+Creates upcoming monthly partitions and compacts months older than the
+retention window into the *_monthly rollup tables. Safe to run repeatedly,
+e.g. daily from cron:
+
+    python scripts/maintain_partitions.py --months-ahead 3 --keep-months 12
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from database.partitioning import compact, ensure_partitions, partition_tables
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Partition, pre-create upcoming months and compact old ones."""
+    parser = argparse.ArgumentParser(description="Maintain time-series partitions")
+    parser.add_argument(
+        "--months-ahead",
+        type=int,
+        default=3,
+        help="create partitions this many months past the current one",
+    )
+    parser.add_argument(
+        "--keep-months",
+        type=int,
+        default=12,
+        help="keep raw rows for this many months; older ones are rolled up",
+    )
+    parser.add_argument(
+        "--no-compact", action="store_true", help="only create partitions"
+    )
+    args = parser.parse_args()
+
+    partition_tables(months_ahead=args.months_ahead)
+    ensure_partitions(months_ahead=args.months_ahead)
+
+    if not args.no_compact:
+        compacted = compact(keep_months=args.keep_months)
+        total = sum(len(months) for months in compacted.values())
+        logger.info(f"Compacted {total} table-months")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Score the whole catalogue with the current ROI model.
+
+Predictions are computed in one vectorised pass over the feature store
+(refreshed first unless --no-refresh) and upserted into movie_predictions:
+
+    python scripts/score_movies.py [--no-refresh]
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from database.connection import engine
+from database.models import MoviePrediction
+from ml.features import FeatureStore
+from ml.roi import roi_models, write_predictions
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Write a prediction for every movie in the feature store."""
+    parser = argparse.ArgumentParser(description="Bulk-score movies")
+    parser.add_argument(
+        "--no-refresh",
+        action="store_true",
+        help="score the feature store as it is",
+    )
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    model = roi_models.get()
+    if model is None:
+        sys.exit("No ROI model published; run scripts/train_roi_model.py first")
+
+    store = FeatureStore()
+    if not args.no_refresh:
+        store.refresh()
+    frame = store.read()
+    if frame is None:
+        sys.exit("The feature store is empty; run scripts/build_features.py")
+
+    started = time.perf_counter()
+    predictions = model.predict(frame)
+    scored = time.perf_counter() - started
+
+    MoviePrediction.__table__.create(engine, checkfirst=True)
+    started = time.perf_counter()
+    written = write_predictions(
+        frame.ids, predictions, model.version, batch_size=args.batch_size
+    )
+    logger.info(
+        f"Scored {len(frame):,} movies with model {model.version} in "
+        f"{scored:.2f}s; wrote {written:,} predictions in "
+        f"{time.perf_counter() - started:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Refresh the denormalised movie read model and talent rollups from the
+ingestion store.
+
+Run after each collection (or on a schedule); only movies whose rows changed
+since the previous run, and the people credited on them, are re-projected:
+
+    python scripts/sync_read_model.py [--full]
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from analytics.talent import refresh_talent_rollups
+from database.read_model import sync_read_model
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Run one read model refresh."""
+    parser = argparse.ArgumentParser(description="Sync the movie read model")
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="re-project every movie and person and drop rows for deleted ones",
+    )
+    parser.add_argument(
+        "--skip-people", action="store_true", help="leave the talent rollups alone"
+    )
+    parser.add_argument("--batch-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    stats = sync_read_model(full=args.full, batch_size=args.batch_size)
+    logger.info(f"Read model: {stats}")
+    if not args.skip_people:
+        stats = refresh_talent_rollups(full=args.full, batch_size=args.batch_size)
+        logger.info(f"Talent rollups: {stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Train the ROI / success model behind /api/predict.
+
+Refreshes the feature store (unless --no-refresh), picks the
+regularisation by cross-validation in a process pool and publishes the
+model under ROI_MODEL_DIR:
+
+    python scripts/train_roi_model.py [--no-refresh] [--folds 5] [--workers 4]
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from ml.features import FeatureStore
+from ml.roi import ALPHAS, FOLDS, publish_model, train_roi_model
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Train, report cross-validation and publish an ROI model."""
+    parser = argparse.ArgumentParser(description="Train the ROI model")
+    parser.add_argument(
+        "--no-refresh",
+        action="store_true",
+        help="train on the feature store as it is",
+    )
+    parser.add_argument("--folds", type=int, default=FOLDS)
+    parser.add_argument(
+        "--alphas",
+        type=lambda value: [float(alpha) for alpha in value.split(",")],
+        default=list(ALPHAS),
+        help="comma-separated regularisation strengths to cross-validate",
+    )
+    parser.add_argument("--workers", type=int, help="processes (default: CPUs)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    store = FeatureStore()
+    if not args.no_refresh:
+        store.refresh()
+    frame = store.read()
+    if frame is None:
+        sys.exit("The feature store is empty; run scripts/build_features.py")
+    model = train_roi_model(
+        frame,
+        folds=args.folds,
+        alphas=args.alphas,
+        workers=args.workers,
+        seed=args.seed,
+    )
+    for alpha, metrics in model.meta["cross_validation"].items():
+        logger.info(f"alpha {alpha:>8}: {metrics}")
+    path = publish_model(model)
+    logger.info(f"Published ROI model {model.version} to {path}")
+
+
+if __name__ == "__main__":
+    main()
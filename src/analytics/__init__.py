@@ -2,7 +2,20 @@
 Analytics module for movie performance analysis and visualizations.
 """
 
-from .performance import GenrePerformanceAnalyzer
-from .visualizations import MovieDataVisualizer
+from .performance import AsyncGenrePerformanceAnalyzer, GenrePerformanceAnalyzer
 
-__all__ = ["GenrePerformanceAnalyzer", "MovieDataVisualizer"]
+
+def __getattr__(name):
+    # Imported lazily so the API service does not need matplotlib/seaborn
+    if name == "MovieDataVisualizer":
+        from .visualizations import MovieDataVisualizer
+
+        return MovieDataVisualizer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = [
+    "AsyncGenrePerformanceAnalyzer",
+    "GenrePerformanceAnalyzer",
+    "MovieDataVisualizer",
+]
@@ -0,0 +1,467 @@
+"""
+Collaboration graph over cast and crew.
+
+movie_cast and movie_crew make a bipartite movie-person graph. The
+builder reads both tables once into NumPy arrays and stores the graph in
+compressed sparse row (CSR) form, in both directions:
+
+- ``movie_indptr`` / ``movie_people``: the people on each movie
+- ``person_indptr`` / ``person_movies``: the movies of each person
+
+Sparse products over those arrays give, per person, the film count,
+co-appearances (weighted degree of the person-person graph B^T B) and a
+PageRank "star power" score. Pair tables (director-actor, actor-actor,
+director-writer) are aggregated the same way: every (pair, movie) is
+expanded from the CSR rows, keyed, and summed per pair, with the films,
+mean/median ROI, total revenue and average rating of the pair's movies.
+Only pairs with at least MIN_PAIR_FILMS films together are kept.
+
+Everything is saved as .npy files into a version directory under
+COLLABORATION_GRAPH_DIR and memory-mapped on load (see ml.artifacts), so
+queries are array scans instead of multi-join SQL.
+"""
+
+import json
+import logging
+import os
+import sys
+import time
+from array import array
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from database.connection import engine as default_engine
+from database.models import Movie, movie_cast_association, movie_crew_association
+from ml.artifacts import DATA_DIR, CurrentArtifact, new_version_dir, publish_version
+
+logger = logging.getLogger(__name__)
+
+COLLABORATION_GRAPH_DIR = Path(
+    os.getenv("COLLABORATION_GRAPH_DIR", str(DATA_DIR / "graph"))
+)
+COLLABORATION_GRAPH_REFRESH_SECONDS = int(
+    os.getenv("COLLABORATION_GRAPH_REFRESH_SECONDS", "30")
+)
+
+# Actors are the top-billed cast; crew roles by job title
+TOP_BILLED = 5
+CREW_ROLES = {
+    "Director": "director",
+    "Screenplay": "writer",
+    "Writer": "writer",
+    "Producer": "producer",
+}
+# Edge role codes are positions in ROLES
+ROLES = ("crew", "actor", "director", "writer", "producer")
+PAIR_KINDS = {
+    "director-actor": ("director", "actor"),
+    "actor-actor": ("actor", "actor"),
+    "director-writer": ("director", "writer"),
+}
+PAIR_COLUMNS = (
+    "films",
+    "roi_films",
+    "mean_roi",
+    "median_roi",
+    "total_revenue",
+    "avg_rating",
+)
+PAIR_SORTS = ("films", "mean_roi", "median_roi", "total_revenue", "avg_rating")
+MIN_PAIR_FILMS = 2
+DAMPING = 0.85
+PAGERANK_ITERATIONS = 100
+PAGERANK_TOLERANCE = 1e-10
+
+
+def csr_indptr(rows: np.ndarray, n_rows: int) -> np.ndarray:
+    """Row pointer for entries sorted by ``rows``."""
+    indptr = np.zeros(n_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n_rows), out=indptr[1:])
+    return indptr
+
+
+def expand_rows(indptr: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """Positions of every entry in the given CSR rows, row after row."""
+    starts, lengths = indptr[rows], indptr[rows + 1] - indptr[rows]
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return offsets + np.arange(lengths.sum())
+
+
+def pagerank(
+    movie_of: np.ndarray,
+    person_of: np.ndarray,
+    n_movies: int,
+    n_people: int,
+    damping: float = DAMPING,
+) -> np.ndarray:
+    """
+    PageRank of the person-person graph W = B^T B - diag(films), where B is
+    the 0/1 movie x person matrix given by one (movie, person) entry per
+    membership. W is never built: W y = B^T (B y) - films * y.
+    """
+    if not n_people:
+        return np.empty(0)
+    films = np.bincount(person_of, minlength=n_people).astype(np.float64)
+    size = np.bincount(movie_of, minlength=n_movies).astype(np.float64)
+    out_weight = np.bincount(person_of, weights=size[movie_of] - 1, minlength=n_people)
+    dangling = out_weight == 0
+    rank = np.full(n_people, 1 / n_people)
+    for iteration in range(PAGERANK_ITERATIONS):
+        y = np.divide(rank, out_weight, out=np.zeros(n_people), where=~dangling)
+        per_movie = np.bincount(movie_of, weights=y[person_of], minlength=n_movies)
+        spread = (
+            np.bincount(person_of, weights=per_movie[movie_of], minlength=n_people)
+            - films * y
+        )
+        updated = (
+            damping * spread + (damping * rank[dangling].sum() + 1 - damping) / n_people
+        )
+        delta = np.abs(updated - rank).sum()
+        rank = updated
+        if delta < PAGERANK_TOLERANCE:
+            break
+    logger.info(f"PageRank converged after {iteration + 1} iterations")
+    return rank
+
+
+def group_median(groups: np.ndarray, values: np.ndarray, n_groups: int) -> np.ndarray:
+    """Median of ``values`` per group id (NaN for empty groups)."""
+    median = np.full(n_groups, np.nan)
+    if not len(values):
+        return median
+    order = np.lexsort((values, groups))
+    groups, values = groups[order], values[order]
+    counts = np.bincount(groups, minlength=n_groups)
+    starts = np.cumsum(counts) - counts
+    present = counts > 0
+    low = starts[present] + (counts[present] - 1) // 2
+    high = starts[present] + counts[present] // 2
+    median[present] = (values[low] + values[high]) / 2
+    return median
+
+
+class CollaborationGraphBuilder:
+    """Build the collaboration graph from the ingestion store."""
+
+    def __init__(
+        self,
+        engine: Optional[Engine] = None,
+        graph_dir: Optional[Path] = None,
+        batch_size: int = 50_000,
+    ):
+        self.engine = engine or default_engine
+        self.graph_dir = Path(graph_dir or COLLABORATION_GRAPH_DIR)
+        self.batch_size = batch_size
+
+    # Loading
+
+    def _movies(self) -> Dict[str, np.ndarray]:
+        ids, budget, revenue, rating = array("q"), array("d"), array("d"), array("d")
+        query = select(
+            Movie.id, Movie.budget, Movie.revenue, Movie.vote_average
+        ).order_by(Movie.id)
+        with self.engine.connect() as connection:
+            result = connection.execution_options(yield_per=self.batch_size).execute(
+                query
+            )
+            for row in result:
+                ids.append(row.id)
+                budget.append(row.budget or 0)
+                revenue.append(row.revenue or 0)
+                rating.append(np.nan if row.vote_average is None else row.vote_average)
+        budget = np.frombuffer(budget)
+        revenue = np.frombuffer(revenue)
+        known = (budget > 0) & (revenue > 0)
+        roi = np.full(len(budget), np.nan)
+        roi[known] = (revenue[known] - budget[known]) / budget[known] * 100
+        return {
+            "ids": np.frombuffer(ids, dtype=np.int64),
+            "roi": roi,
+            "revenue": np.where(revenue > 0, revenue, np.nan),
+            "rating": np.frombuffer(rating),
+        }
+
+    def _edges(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(movie id, person id, role) for every credit."""
+        codes = {role: code for code, role in enumerate(ROLES)}
+        movie_ids, person_ids, role_codes = array("q"), array("q"), array("b")
+        queries = [
+            select(
+                movie_cast_association.c.movie_id,
+                movie_cast_association.c.person_id,
+                movie_cast_association.c.order,
+            ),
+            select(
+                movie_crew_association.c.movie_id,
+                movie_crew_association.c.person_id,
+                movie_crew_association.c.job,
+            ),
+        ]
+        with self.engine.connect() as connection:
+            for cast, query in zip((True, False), queries):
+                result = connection.execution_options(
+                    yield_per=self.batch_size
+                ).execute(query)
+                for movie_id, person_id, detail in result:
+                    movie_ids.append(movie_id)
+                    person_ids.append(person_id)
+                    if cast:
+                        billed = detail is not None and detail < TOP_BILLED
+                        role_codes.append(codes["actor"] if billed else codes["crew"])
+                    else:
+                        role_codes.append(codes[CREW_ROLES.get(detail, "crew")])
+        return (
+            np.frombuffer(movie_ids, dtype=np.int64),
+            np.frombuffer(person_ids, dtype=np.int64),
+            np.frombuffer(role_codes, dtype=np.int8),
+        )
+
+    # Building
+
+    def _pairs(
+        self,
+        movie_of: np.ndarray,
+        person_of: np.ndarray,
+        roles: np.ndarray,
+        kind: str,
+        movies: Dict[str, np.ndarray],
+        n_people: int,
+    ) -> Dict[str, np.ndarray]:
+        """Aggregate every (left, right) pair of ``kind`` over shared movies."""
+        n_movies = len(movies["ids"])
+        left_role, right_role = (ROLES.index(role) for role in PAIR_KINDS[kind])
+        sides = []
+        for role in (left_role, right_role):
+            mask = roles == role
+            # Edges are sorted by movie, so each side is CSR-ordered already
+            sides.append((csr_indptr(movie_of[mask], n_movies), person_of[mask]))
+        (left_ptr, left_people), (right_ptr, right_people) = sides
+
+        left_count = np.diff(left_ptr)
+        right_count = np.diff(right_ptr)
+        per_movie = left_count * right_count
+        movie = np.repeat(np.arange(n_movies), per_movie)
+        k = np.arange(per_movie.sum()) - np.repeat(
+            np.cumsum(per_movie) - per_movie, per_movie
+        )
+        left = left_people[left_ptr[movie] + k // right_count[movie]]
+        right = right_people[right_ptr[movie] + k % right_count[movie]]
+        # Same-role pairs are unordered: keep each once, and never self-pairs
+        keep = left < right if left_role == right_role else left != right
+        left, right, movie = left[keep], right[keep], movie[keep]
+
+        keys, pair, films = np.unique(
+            left * n_people + right, return_inverse=True, return_counts=True
+        )
+        n_pairs = len(keys)
+        roi = movies["roi"][movie]
+        has_roi = np.isfinite(roi)
+        roi_films = np.bincount(pair[has_roi], minlength=n_pairs)
+        roi_sum = np.bincount(pair[has_roi], weights=roi[has_roi], minlength=n_pairs)
+        revenue = np.nan_to_num(movies["revenue"][movie])
+        rating = movies["rating"][movie]
+        has_rating = np.isfinite(rating)
+        rated = np.bincount(pair[has_rating], minlength=n_pairs)
+        rating_sum = np.bincount(
+            pair[has_rating], weights=rating[has_rating], minlength=n_pairs
+        )
+        table = {
+            "left": keys // n_people,
+            "right": keys % n_people,
+            "films": films,
+            "roi_films": roi_films,
+            "mean_roi": np.divide(
+                roi_sum, roi_films, out=np.full(n_pairs, np.nan), where=roi_films > 0
+            ),
+            "median_roi": group_median(pair[has_roi], roi[has_roi], n_pairs),
+            "total_revenue": np.bincount(pair, weights=revenue, minlength=n_pairs),
+            "avg_rating": np.divide(
+                rating_sum, rated, out=np.full(n_pairs, np.nan), where=rated > 0
+            ),
+        }
+        kept = films >= MIN_PAIR_FILMS
+        logger.info(
+            f"{kind}: {len(left):,} credited pairs, {n_pairs:,} distinct, "
+            f"{int(kept.sum()):,} with {MIN_PAIR_FILMS}+ films"
+        )
+        return {name: values[kept] for name, values in table.items()}
+
+    def build(self) -> Path:
+        """Build a new graph version, make it current and return its path."""
+        started = time.perf_counter()
+        movies = self._movies()
+        movie_ids, person_ids, roles = self._edges()
+
+        if not len(movies["ids"]):
+            raise ValueError("No movies to build a graph from")
+        movie_of = np.minimum(
+            np.searchsorted(movies["ids"], movie_ids), len(movies["ids"]) - 1
+        )
+        # Drop credits for movies added since the movie list was read
+        known = movies["ids"][movie_of] == movie_ids
+        movie_of, person_ids, roles = movie_of[known], person_ids[known], roles[known]
+        people, person_of = np.unique(person_ids, return_inverse=True)
+        n_movies, n_people = len(movies["ids"]), len(people)
+
+        order = np.lexsort((roles, person_of, movie_of))
+        movie_of, person_of, roles = movie_of[order], person_of[order], roles[order]
+
+        # Membership (one entry per movie and person, whatever their roles)
+        member = np.ones(len(movie_of), dtype=bool)
+        member[1:] = (movie_of[1:] != movie_of[:-1]) | (person_of[1:] != person_of[:-1])
+        # One edge per movie, person and role: several jobs can share a role
+        # (Writer and Screenplay), and must not count the movie twice in a pair
+        credit = member.copy()
+        credit[1:] |= roles[1:] != roles[:-1]
+        credit_movie, credit_person, credit_role = (
+            movie_of[credit],
+            person_of[credit],
+            roles[credit],
+        )
+        member_movie, member_person = movie_of[member], person_of[member]
+        by_person = np.argsort(member_person, kind="stable")
+
+        size = np.bincount(member_movie, minlength=n_movies)
+        arrays = {
+            "movie_ids": movies["ids"],
+            "person_ids": people,
+            "movie_indptr": csr_indptr(member_movie, n_movies),
+            "movie_people": member_person.astype(np.int32),
+            "person_indptr": csr_indptr(member_person, n_people),
+            "person_movies": member_movie[by_person].astype(np.int32),
+            "films": np.bincount(member_person, minlength=n_people),
+            "co_appearances": np.bincount(
+                member_person, weights=size[member_movie] - 1, minlength=n_people
+            ).astype(np.int64),
+            "pagerank": pagerank(member_movie, member_person, n_movies, n_people),
+        }
+        arrays["pagerank_order"] = np.argsort(-arrays["pagerank"], kind="stable")
+        for kind in PAIR_KINDS:
+            table = self._pairs(
+                credit_movie, credit_person, credit_role, kind, movies, n_people
+            )
+            for name, values in table.items():
+                arrays[f"{kind}.{name}"] = values
+
+        version, path = new_version_dir(self.graph_dir)
+        for name, values in arrays.items():
+            np.save(path / f"{name}.npy", values)
+        meta = {
+            "version": version,
+            "built_at": datetime.now().isoformat(timespec="seconds"),
+            "movies": n_movies,
+            "people": n_people,
+            "memberships": len(member_movie),
+            "pair_kinds": list(PAIR_KINDS),
+            "min_pair_films": MIN_PAIR_FILMS,
+        }
+        (path / "meta.json").write_text(json.dumps(meta, indent=2))
+        publish_version(self.graph_dir, version)
+        logger.info(
+            f"Built collaboration graph {version} ({n_movies:,} movies, "
+            f"{n_people:,} people, {len(member_movie):,} credits) "
+            f"in {time.perf_counter() - started:.1f}s"
+        )
+        return path
+
+
+class CollaborationGraph:
+    """Read-only, memory-mapped collaboration graph."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.meta = json.loads((self.path / "meta.json").read_text())
+        self.version = self.meta["version"]
+        self.arrays = {
+            file.stem: np.load(file, mmap_mode="r") for file in self.path.glob("*.npy")
+        }
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.arrays[name]
+
+    def person_row(self, person_id: int) -> Optional[int]:
+        people = self["person_ids"]
+        row = int(np.searchsorted(people, person_id))
+        return row if row < len(people) and people[row] == person_id else None
+
+    def person(self, row: int) -> Dict:
+        return {
+            "person_id": int(self["person_ids"][row]),
+            "films": int(self["films"][row]),
+            "co_appearances": int(self["co_appearances"][row]),
+            # Scaled so the average person scores 1
+            "star_power": float(self["pagerank"][row] * len(self["pagerank"])),
+        }
+
+    def collaborators(self, person_id: int, limit: int = 20) -> Optional[List[Dict]]:
+        """People who share the most movies with ``person_id`` (None if unknown)."""
+        row = self.person_row(person_id)
+        if row is None:
+            return None
+        start, stop = self["person_indptr"][row], self["person_indptr"][row + 1]
+        movies = np.asarray(self["person_movies"][start:stop], dtype=np.int64)
+        people = self["movie_people"][expand_rows(self["movie_indptr"], movies)]
+        counts = np.bincount(people, minlength=len(self["person_ids"]))
+        counts[row] = 0
+        top = np.flatnonzero(counts)
+        top = top[np.lexsort((top, -counts[top]))][:limit]
+        return [
+            {**self.person(int(other)), "films_together": int(counts[other])}
+            for other in top
+        ]
+
+    def star_power(self, limit: int = 20, min_films: int = 1) -> List[Dict]:
+        """Highest-PageRank people with at least ``min_films`` films."""
+        order = self["pagerank_order"]
+        if min_films > 1:
+            order = order[self["films"][order] >= min_films]
+        return [self.person(int(row)) for row in order[:limit]]
+
+    def top_pairs(
+        self,
+        kind: str = "director-actor",
+        sort: str = "median_roi",
+        min_films: int = MIN_PAIR_FILMS,
+        limit: int = 20,
+    ) -> List[Dict]:
+        """The best pairs of ``kind`` by ``sort``, among pairs with enough films."""
+        if kind not in PAIR_KINDS:
+            raise ValueError(
+                f"Unknown pair kind {kind!r}, expected one of {list(PAIR_KINDS)}"
+            )
+        if sort not in PAIR_SORTS:
+            raise ValueError(f"Unknown sort {sort!r}, expected one of {PAIR_SORTS}")
+        metric = np.asarray(self[f"{kind}.{sort}"], dtype=np.float64)
+        films = self[f"{kind}.roi_films" if "roi" in sort else f"{kind}.films"]
+        candidates = np.flatnonzero((films >= min_films) & np.isfinite(metric))
+        if len(candidates) > limit:
+            candidates = candidates[
+                np.argpartition(-metric[candidates], limit - 1)[:limit]
+            ]
+        candidates = candidates[np.argsort(-metric[candidates], kind="stable")]
+
+        people = self["person_ids"]
+        pairs = []
+        for row in candidates:
+            pair = {
+                "left_id": int(people[self[f"{kind}.left"][row]]),
+                "right_id": int(people[self[f"{kind}.right"][row]]),
+            }
+            for name in PAIR_COLUMNS:
+                value = self[f"{kind}.{name}"][row].item()
+                pair[name] = None if value != value else value
+            pairs.append(pair)
+        return pairs
+
+
+collaboration_graphs = CurrentArtifact(
+    COLLABORATION_GRAPH_DIR, CollaborationGraph, COLLABORATION_GRAPH_REFRESH_SECONDS
+)
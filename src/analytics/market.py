@@ -0,0 +1,586 @@
+"""
+Market analysis over a columnar snapshot of the catalogue.
+
+MarketSnapshotBuilder reads every dated movie once, with its genres and
+production companies, and precomputes the tables each query needs:
+
+- release_windows(): films released per week of a year, by genre, from
+  per-movie release days and CSR genre memberships;
+- genre_share(): each genre's share of releases, revenue or budget per
+  year (multi-genre films split evenly across their genres), from a
+  years x genres table per metric;
+- roi_seasonality(): median, mean and pooled ROI and the share of
+  profitable films by release month, over films with budget and revenue.
+  Those films are stored sorted by (month, ROI), so any year range or
+  genre keeps each month's ROIs in order and medians need no sort;
+- studio_concentration(): Herfindahl-Hirschman index of production
+  companies' revenue or release shares per year (co-productions split
+  evenly), stored per year, with the leading studios over the period
+  summed from a (year, company) totals table.
+
+The tables are saved as .npy files into a version directory under
+MARKET_SNAPSHOT_DIR and published (see ml.artifacts); MarketSnapshot
+memory-maps them. Results are cached per snapshot, so repeated queries
+cost a dictionary lookup until a new snapshot is published.
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from array import array
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import Table, select
+from sqlalchemy.engine import Engine
+
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from analytics.graph import csr_indptr, expand_rows
+from database.connection import engine as default_engine
+from database.models import (
+    Company,
+    Genre,
+    Movie,
+    movie_company_association,
+    movie_genre_association,
+)
+from ml.artifacts import DATA_DIR, CurrentArtifact, new_version_dir, publish_version
+
+logger = logging.getLogger(__name__)
+
+MARKET_SNAPSHOT_DIR = Path(os.getenv("MARKET_SNAPSHOT_DIR", str(DATA_DIR / "market")))
+MARKET_SNAPSHOT_REFRESH_SECONDS = int(
+    os.getenv("MARKET_SNAPSHOT_REFRESH_SECONDS", "30")
+)
+# Cached query results per snapshot
+MARKET_CACHE_SIZE = 1024
+
+SHARE_METRICS = ("releases", "revenue", "budget")
+CONCENTRATION_METRICS = ("releases", "revenue")
+# Genres with a bit in the per-movie genre mask, enough for TMDb's 19
+GENRE_MASK_BITS = 64
+EPOCH = date(1970, 1, 1)
+
+
+def _day(value: date) -> int:
+    return (value - EPOCH).days
+
+
+def _week_start(days: np.ndarray) -> np.ndarray:
+    # 1970-01-01 was a Thursday; weeks start on Monday
+    return days - (days + 3) % 7
+
+
+def _value(value: float, digits: int = 2) -> Optional[float]:
+    return None if value != value else round(float(value), digits)
+
+
+class MarketSnapshotBuilder:
+    """Build the market snapshot from the ingestion store."""
+
+    def __init__(
+        self,
+        engine: Optional[Engine] = None,
+        snapshot_dir: Optional[Path] = None,
+        batch_size: int = 50_000,
+    ):
+        self.engine = engine or default_engine
+        self.snapshot_dir = Path(snapshot_dir or MARKET_SNAPSHOT_DIR)
+        self.batch_size = batch_size
+
+    def _movies(self) -> Dict[str, np.ndarray]:
+        ids, days, budget, revenue = array("q"), array("q"), array("d"), array("d")
+        query = (
+            select(Movie.id, Movie.release_date, Movie.budget, Movie.revenue)
+            .where(Movie.release_date.isnot(None))
+            .order_by(Movie.id)
+        )
+        with self.engine.connect() as connection:
+            result = connection.execution_options(yield_per=self.batch_size).execute(
+                query
+            )
+            for row in result:
+                ids.append(row.id)
+                days.append(_day(row.release_date.date()))
+                budget.append(row.budget if row.budget and row.budget > 0 else np.nan)
+                revenue.append(
+                    row.revenue if row.revenue and row.revenue > 0 else np.nan
+                )
+        days = np.frombuffer(days, dtype=np.int64)
+        calendar = days.astype("datetime64[D]")
+        return {
+            "movie_ids": np.frombuffer(ids, dtype=np.int64),
+            "day": days.astype(np.int32),
+            "year": calendar.astype("datetime64[Y]").astype(np.int32) + 1970,
+            "month": (
+                calendar.astype("datetime64[M]").astype(np.int32) % 12 + 1
+            ).astype(np.int8),
+            "budget": np.frombuffer(budget),
+            "revenue": np.frombuffer(revenue),
+        }
+
+    def _memberships(
+        self, association: Table, key: str, names: Table, movie_ids: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """CSR rows of ``association`` per movie, with the names they point to."""
+        movies, others = array("q"), array("q")
+        query = select(association.c.movie_id, association.c[key])
+        with self.engine.connect() as connection:
+            result = connection.execution_options(yield_per=self.batch_size).execute(
+                query
+            )
+            for movie_id, other_id in result:
+                movies.append(movie_id)
+                others.append(other_id)
+            labels = dict(connection.execute(select(names.c.id, names.c.name)).all())
+
+        movies = np.frombuffer(movies, dtype=np.int64)
+        others = np.frombuffer(others, dtype=np.int64)
+        row = np.minimum(np.searchsorted(movie_ids, movies), len(movie_ids) - 1)
+        # Undated movies, or movies added since the movie list was read
+        known = movie_ids[row] == movies
+        row, others = row[known], others[known]
+        ids, codes = np.unique(others, return_inverse=True)
+        order = np.lexsort((codes, row))
+        return {
+            "indptr": csr_indptr(row[order], len(movie_ids)),
+            "codes": codes[order].astype(np.int32),
+            "ids": ids,
+            "names": np.array([labels.get(int(other), "") for other in ids], dtype=str),
+        }
+
+    def build(self) -> Path:
+        """Build a new snapshot version, make it current and return its path."""
+        started = time.perf_counter()
+        movies = self._movies()
+        if not len(movies["movie_ids"]):
+            raise ValueError("No dated movies to build a market snapshot from")
+        for prefix, association, key, names in (
+            ("genre", movie_genre_association, "genre_id", Genre.__table__),
+            ("company", movie_company_association, "company_id", Company.__table__),
+        ):
+            memberships = self._memberships(
+                association, key, names, movies["movie_ids"]
+            )
+            for name, values in memberships.items():
+                movies[f"{prefix}_{name}"] = values
+        arrays = market_tables(movies)
+
+        version, path = new_version_dir(self.snapshot_dir)
+        for name, values in arrays.items():
+            np.save(path / f"{name}.npy", values)
+        meta = {
+            "version": version,
+            "built_at": datetime.now().isoformat(timespec="seconds"),
+            "movies": len(movies["movie_ids"]),
+            "genres": len(arrays["genre_ids"]),
+            "companies": len(arrays["company_ids"]),
+            "years": [int(arrays["years"][0]), int(arrays["years"][-1])],
+        }
+        (path / "meta.json").write_text(json.dumps(meta, indent=2))
+        publish_version(self.snapshot_dir, version)
+        logger.info(
+            f"Built market snapshot {version} ({meta['movies']:,} movies, "
+            f"{meta['companies']:,} companies) in {time.perf_counter() - started:.1f}s"
+        )
+        return path
+
+
+def _split(indptr: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Owning row and 1 / members of every CSR membership."""
+    lengths = np.diff(indptr)
+    owner = np.repeat(np.arange(len(lengths)), lengths)
+    return owner, 1.0 / lengths[owner]
+
+
+def _metric(movies: Dict[str, np.ndarray], metric: str) -> np.ndarray:
+    """Per-movie value of ``metric``, NaN where unknown."""
+    if metric == "releases":
+        return np.ones(len(movies["movie_ids"]))
+    return movies[metric]
+
+
+def market_tables(movies: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Snapshot tables from per-movie columns (``movie_ids``, ``day``,
+    ``year``, ``month``, ``budget``, ``revenue``, NaN where unknown) and
+    CSR ``genre_*`` / ``company_*`` memberships.
+    """
+    year, month = movies["year"], movies["month"]
+    years = np.arange(year.min(), year.max() + 1, dtype=np.int32)
+    year_index = (year - years[0]).astype(np.int64)
+    n_years = len(years)
+    genre_owner, genre_split = _split(movies["genre_indptr"])
+    genre_codes = movies["genre_codes"].astype(np.int64)
+    n_genres = len(movies["genre_ids"])
+    # One bit per genre: filters are a shift and a mask
+    masked = genre_codes < GENRE_MASK_BITS
+    genre_mask = np.zeros(len(year), dtype=np.uint64)
+    np.bitwise_or.at(
+        genre_mask,
+        genre_owner[masked],
+        np.left_shift(np.uint64(1), genre_codes[masked].astype(np.uint64)),
+    )
+    tables = {
+        "years": years,
+        "day": movies["day"],
+        "year": year,
+        "genre_indptr": movies["genre_indptr"],
+        "genre_codes": movies["genre_codes"],
+        "genre_mask": genre_mask,
+        "genre_ids": movies["genre_ids"],
+        "genre_names": movies["genre_names"],
+        "company_ids": movies["company_ids"],
+        "company_names": movies["company_names"],
+    }
+
+    for metric in SHARE_METRICS:
+        value = np.nan_to_num(_metric(movies, metric)[genre_owner])
+        tables[f"share_{metric}"] = np.bincount(
+            year_index[genre_owner] * n_genres + genre_codes,
+            weights=value * genre_split,
+            minlength=n_years * n_genres,
+        ).reshape(n_years, n_genres)
+
+    budget, revenue = movies["budget"], movies["revenue"]
+    financed = np.flatnonzero(np.isfinite(budget) & np.isfinite(revenue))
+    roi = (revenue[financed] - budget[financed]) / budget[financed] * 100
+    order = np.lexsort((roi, month[financed]))
+    financed = financed[order]
+    tables.update(
+        roi=roi[order],
+        roi_year=year[financed],
+        roi_month=month[financed],
+        roi_budget=budget[financed],
+        roi_revenue=revenue[financed],
+        roi_genre_mask=genre_mask[financed],
+    )
+
+    # (year, company) totals, sorted by year then company
+    company_owner, company_split = _split(movies["company_indptr"])
+    n_companies = len(movies["company_ids"])
+    keys, key_index = np.unique(
+        year_index[company_owner] * n_companies + movies["company_codes"],
+        return_inverse=True,
+    )
+    key_year = keys // n_companies
+    tables["studio_year"] = years[key_year]
+    tables["studio_code"] = (keys % n_companies).astype(np.int32)
+    for metric in CONCENTRATION_METRICS:
+        value = _metric(movies, metric)[company_owner]
+        known = np.isfinite(value)
+        total = np.bincount(
+            key_index[known],
+            weights=value[known] * company_split[known],
+            minlength=len(keys),
+        )
+        tables[f"studio_{metric}"] = total
+        tables[f"studio_{metric}_films"] = np.bincount(
+            key_index[known], minlength=len(keys)
+        ).astype(np.int32)
+
+        # Per-year HHI, studio count and top-four share
+        present = np.flatnonzero(total > 0)
+        owner = key_year[present]
+        year_total = np.bincount(owner, weights=total[present], minlength=n_years)
+        share = total[present] / year_total[owner]
+        studios = np.bincount(owner, minlength=n_years)
+        # Rank within each year, largest share first
+        ranked = np.lexsort((-share, owner))
+        rank = np.arange(len(ranked)) - (np.cumsum(studios) - studios)[owner[ranked]]
+        leaders = ranked[rank < 4]
+        tables[f"concentration_{metric}"] = np.column_stack(
+            [
+                np.bincount(owner, weights=share * share, minlength=n_years) * 10_000,
+                studios,
+                np.bincount(owner[leaders], weights=share[leaders], minlength=n_years),
+            ]
+        )
+    return tables
+
+
+class MarketSnapshot:
+    """Read-only, memory-mapped market snapshot with cached queries."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.meta = json.loads((self.path / "meta.json").read_text())
+        self.version = self.meta["version"]
+        self.arrays = {
+            file.stem: np.load(file, mmap_mode="r") for file in self.path.glob("*.npy")
+        }
+        self.genre_names = [str(name) for name in self["genre_names"]]
+        self._cache: Dict[Tuple, Dict] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.arrays[name]
+
+    def _cached(self, key: Tuple, compute: Callable[[], Dict]) -> Dict:
+        result = self._cache.get(key)
+        if result is None:
+            result = compute()
+            with self._lock:
+                if len(self._cache) >= MARKET_CACHE_SIZE:
+                    self._cache.clear()
+                self._cache[key] = result
+        return result
+
+    # Selection helpers
+
+    def _genre_code(self, genre: Optional[str]) -> Optional[int]:
+        if genre is None:
+            return None
+        lowered = [name.lower() for name in self.genre_names]
+        if genre.lower() not in lowered:
+            raise ValueError(
+                f"Unknown genre {genre!r}, expected one of {self.genre_names}"
+            )
+        code = lowered.index(genre.lower())
+        if code >= GENRE_MASK_BITS:
+            raise ValueError(f"Genre {genre!r} can't be used as a filter")
+        return code
+
+    @staticmethod
+    def _has_genre(mask: np.ndarray, genre: Optional[int]) -> np.ndarray:
+        if genre is None:
+            return np.ones(len(mask), dtype=bool)
+        return (mask & np.uint64(1 << genre)) != 0
+
+    def _year_slice(self, start_year: Optional[int], end_year: Optional[int]) -> slice:
+        """Rows of the per-year tables between the two years."""
+        years = self["years"]
+        return slice(
+            years.searchsorted(start_year) if start_year is not None else 0,
+            (
+                years.searchsorted(end_year, side="right")
+                if end_year is not None
+                else len(years)
+            ),
+        )
+
+    # Queries
+
+    def release_windows(self, year: int, genre: Optional[str] = None) -> Dict:
+        """Films released per Monday-starting week of ``year``, by genre."""
+        code = self._genre_code(genre)
+        return self._cached(
+            ("release_windows", year, code),
+            lambda: self._release_windows(year, code),
+        )
+
+    def _release_windows(self, year: int, genre: Optional[int]) -> Dict:
+        first = _week_start(np.int64(_day(date(year, 1, 1))))
+        last = _week_start(np.int64(_day(date(year, 12, 31))))
+        n_weeks = int((last - first) // 7 + 1)
+        rows = np.flatnonzero(self["year"] == year)
+        rows = rows[self._has_genre(self["genre_mask"][rows], genre)]
+        week = (_week_start(self["day"][rows].astype(np.int64)) - first) // 7
+
+        indptr = self["genre_indptr"]
+        owner = np.repeat(np.arange(len(rows)), indptr[rows + 1] - indptr[rows])
+        codes = self["genre_codes"][expand_rows(indptr, rows)]
+        n_genres = len(self.genre_names)
+        by_genre = np.bincount(
+            week[owner] * n_genres + codes, minlength=n_weeks * n_genres
+        ).reshape(n_weeks, n_genres)
+        releases = np.bincount(week, minlength=n_weeks)
+        start = EPOCH + timedelta(days=int(first))
+        return {
+            "year": year,
+            "genre": self.genre_names[genre] if genre is not None else None,
+            "snapshot_version": self.version,
+            "weeks": [
+                {
+                    "week_start": start + timedelta(weeks=index),
+                    "releases": int(releases[index]),
+                    "genres": {
+                        self.genre_names[code]: int(by_genre[index, code])
+                        for code in np.flatnonzero(by_genre[index])
+                    },
+                }
+                for index in range(n_weeks)
+            ],
+        }
+
+    def genre_share(
+        self,
+        metric: str = "releases",
+        start_year: Optional[int] = None,
+        end_year: Optional[int] = None,
+    ) -> Dict:
+        """Each genre's share of ``metric`` per release year."""
+        if metric not in SHARE_METRICS:
+            raise ValueError(
+                f"Unknown metric {metric!r}, expected one of {SHARE_METRICS}"
+            )
+        return self._cached(
+            ("genre_share", metric, start_year, end_year),
+            lambda: self._genre_share(metric, start_year, end_year),
+        )
+
+    def _genre_share(
+        self, metric: str, start_year: Optional[int], end_year: Optional[int]
+    ) -> Dict:
+        span = self._year_slice(start_year, end_year)
+        years = self["years"][span]
+        totals = np.asarray(self[f"share_{metric}"][span])
+        year_totals = totals.sum(axis=1)
+        return {
+            "metric": metric,
+            "snapshot_version": self.version,
+            "years": [
+                {
+                    "year": int(year),
+                    "total": round(float(year_totals[index]), 2),
+                    "shares": {
+                        self.genre_names[code]: round(
+                            float(totals[index, code] / year_totals[index]), 4
+                        )
+                        for code in np.flatnonzero(totals[index])
+                    },
+                }
+                for index, year in enumerate(years)
+                if year_totals[index] > 0
+            ],
+        }
+
+    def roi_seasonality(
+        self,
+        start_year: Optional[int] = None,
+        end_year: Optional[int] = None,
+        genre: Optional[str] = None,
+    ) -> Dict:
+        """ROI by release month over films with budget and revenue."""
+        code = self._genre_code(genre)
+        return self._cached(
+            ("roi_seasonality", start_year, end_year, code),
+            lambda: self._roi_seasonality(start_year, end_year, code),
+        )
+
+    def _roi_seasonality(
+        self, start_year: Optional[int], end_year: Optional[int], genre: Optional[int]
+    ) -> Dict:
+        year = self["roi_year"]
+        keep = self._has_genre(self["roi_genre_mask"], genre)
+        if start_year is not None:
+            keep &= year >= start_year
+        if end_year is not None:
+            keep &= year <= end_year
+        rows = np.flatnonzero(keep)
+        month = self["roi_month"][rows].astype(np.int64) - 1
+        roi = self["roi"][rows]
+        budget, revenue = self["roi_budget"][rows], self["roi_revenue"][rows]
+
+        films = np.bincount(month, minlength=12)
+        # Rows are sorted by (month, ROI): each month's median is its middle
+        starts = np.cumsum(films) - films
+        present = films > 0
+        median = np.full(12, np.nan)
+        median[present] = (
+            roi[starts[present] + (films[present] - 1) // 2]
+            + roi[starts[present] + films[present] // 2]
+        ) / 2
+        total_budget = np.bincount(month, weights=budget, minlength=12)
+        total_revenue = np.bincount(month, weights=revenue, minlength=12)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = np.bincount(month, weights=roi, minlength=12) / films
+            pooled = (total_revenue - total_budget) / total_budget * 100
+            profitable = np.bincount(month, weights=roi > 0, minlength=12) / films
+        return {
+            "genre": self.genre_names[genre] if genre is not None else None,
+            "start_year": start_year,
+            "end_year": end_year,
+            "snapshot_version": self.version,
+            "months": [
+                {
+                    "month": index + 1,
+                    "films": int(films[index]),
+                    "median_roi": _value(median[index]),
+                    "mean_roi": _value(mean[index]),
+                    "pooled_roi": _value(pooled[index]),
+                    "profitable_share": _value(profitable[index], 4),
+                }
+                for index in range(12)
+            ],
+        }
+
+    def studio_concentration(
+        self,
+        metric: str = "revenue",
+        start_year: Optional[int] = None,
+        end_year: Optional[int] = None,
+        top: int = 10,
+    ) -> Dict:
+        """Per-year HHI of studio shares of ``metric`` and the top studios."""
+        if metric not in CONCENTRATION_METRICS:
+            raise ValueError(
+                f"Unknown metric {metric!r}, expected one of {CONCENTRATION_METRICS}"
+            )
+        return self._cached(
+            ("studio_concentration", metric, start_year, end_year, top),
+            lambda: self._studio_concentration(metric, start_year, end_year, top),
+        )
+
+    def _studio_concentration(
+        self, metric: str, start_year: Optional[int], end_year: Optional[int], top: int
+    ) -> Dict:
+        span = self._year_slice(start_year, end_year)
+        years = self["years"][span]
+        per_year = self[f"concentration_{metric}"][span]
+
+        studio_year = self["studio_year"]
+        rows = slice(
+            studio_year.searchsorted(years[0]) if len(years) else 0,
+            studio_year.searchsorted(years[-1], side="right") if len(years) else 0,
+        )
+        codes = self["studio_code"][rows]
+        n_companies = len(self["company_ids"])
+        company_total = np.bincount(
+            codes, weights=self[f"studio_{metric}"][rows], minlength=n_companies
+        )
+        company_films = np.bincount(
+            codes, weights=self[f"studio_{metric}_films"][rows], minlength=n_companies
+        )
+        period_total = company_total.sum()
+        period_share = company_total / period_total if period_total else company_total
+        leading = np.flatnonzero(company_total > 0)
+        leading = leading[np.lexsort((leading, -company_total[leading]))][:top]
+        return {
+            "metric": metric,
+            "start_year": start_year,
+            "end_year": end_year,
+            "hhi": round(float((period_share * period_share).sum() * 10_000), 1),
+            "snapshot_version": self.version,
+            "years": [
+                {
+                    "year": int(year),
+                    "hhi": round(float(hhi), 1),
+                    "studios": int(studios),
+                    "top4_share": round(float(top4), 4),
+                }
+                for year, (hhi, studios, top4) in zip(years, per_year)
+                if studios
+            ],
+            "top_studios": [
+                {
+                    "company_id": int(self["company_ids"][code]),
+                    "name": str(self["company_names"][code]),
+                    "films": int(company_films[code]),
+                    "share": round(float(period_share[code]), 4),
+                }
+                for code in leading
+            ],
+        }
+
+
+market_snapshots = CurrentArtifact(
+    MARKET_SNAPSHOT_DIR, MarketSnapshot, MARKET_SNAPSHOT_REFRESH_SECONDS
+)
@@ -2,126 +2,335 @@
 Performance analytic for movies and genres
 """
 
+import os
 import sys
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
 import pandas as pd
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 
 # Add src to path for imports
 sys.path.append(str(Path(__file__).parent.parent))
 
-from database.connection import get_database
+from data.processors.financials import default_price_index
+from database.connection import read_session_scope
 from database.models import Genre, Movie, Rating
+from database.read_model import (
+    GENRE_SEPARATOR,
+    get_read_model_engine,
+    movie_genre_read_model,
+    movie_read_model,
+)
+
+# Serve the analyzer from the synced read model (database/read_model.py)
+# instead of joining the ingestion tables
+USE_READ_MODEL = os.getenv("ANALYTICS_USE_READ_MODEL", "").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+# Query builders and row formatters are shared by the sync and async analyzers
+# so both stacks run exactly the same SQL.
+
+
+def genre_ratings_summary_query() -> Select:
+    """Average/min/max rating and movie count per genre."""
+    return (
+        select(
+            Genre.name.label("genre"),
+            func.avg(Movie.vote_average).label("avg_rating"),
+            func.count(Movie.id).label("movie_count"),
+            func.min(Movie.vote_average).label("min_rating"),
+            func.max(Movie.vote_average).label("max_rating"),
+        )
+        .select_from(Movie)
+        .join(Movie.genres)
+        .group_by(Genre.name)
+        .order_by(func.avg(Movie.vote_average).desc())
+    )
+
+
+def top_movies_by_genre_query(genre_name: str, limit: int) -> Select:
+    """Highest-rated movies within one genre, with genres eagerly loaded."""
+    return (
+        select(Movie)
+        .options(selectinload(Movie.genres))
+        .join(Movie.genres)
+        .filter(Genre.name == genre_name)
+        .order_by(Movie.vote_average.desc())
+        .limit(limit)
+    )
+
+
+def ranked_movies_query(limit: int, descending: bool = True) -> Select:
+    """Movies ordered by rating, with genres eagerly loaded."""
+    order = Movie.vote_average.desc() if descending else Movie.vote_average.asc()
+    return (
+        select(Movie).options(selectinload(Movie.genres)).order_by(order).limit(limit)
+    )
+
+
+def financial_movies_query(adjusted: bool = False) -> Select:
+    """Movies that have both budget and revenue, nominal or inflation-adjusted."""
+    budget, revenue = (
+        (Movie.adjusted_budget, Movie.adjusted_revenue)
+        if adjusted
+        else (Movie.budget, Movie.revenue)
+    )
+    return select(
+        Movie.title,
+        budget.label("budget"),
+        revenue.label("revenue"),
+        Movie.vote_average,
+        Movie.release_date,
+    ).filter(budget > 0, revenue > 0)
+
+
+def financial_summary_queries(
+    financial_query: Select, limit: int
+) -> Tuple[Select, Select, Select]:
+    """
+    Totals, best and worst ROI performers over ``financial_query`` (either
+    financial query), aggregated, ordered and limited in the database.
+    """
+    movies = financial_query.subquery()
+    roi = (movies.c.revenue - movies.c.budget) * 100.0 / movies.c.budget
+    totals = select(
+        func.count().label("movie_count"),
+        func.coalesce(func.sum(movies.c.budget), 0).label("total_budget"),
+        func.coalesce(func.sum(movies.c.revenue), 0).label("total_revenue"),
+        func.coalesce(func.avg(roi), 0.0).label("average_roi"),
+    )
+    top = select(movies).order_by(roi.desc(), movies.c.title).limit(limit)
+    bottom = select(movies).order_by(roi.asc(), movies.c.title).limit(limit)
+    return totals, top, bottom
+
+
+# Read-model equivalents: same row shapes, no joins
+
+
+def read_model_genre_summary_query() -> Select:
+    genre = movie_genre_read_model.c
+    return (
+        select(
+            genre.genre_name.label("genre"),
+            func.avg(genre.vote_average).label("avg_rating"),
+            func.count(genre.movie_id).label("movie_count"),
+            func.min(genre.vote_average).label("min_rating"),
+            func.max(genre.vote_average).label("max_rating"),
+        )
+        .group_by(genre.genre_name)
+        .order_by(func.avg(genre.vote_average).desc())
+    )
+
+
+def read_model_top_by_genre_query(genre_name: str, limit: int) -> Select:
+    genre = movie_genre_read_model.c
+    movie = movie_read_model.c
+    return (
+        select(
+            genre.title,
+            genre.vote_average,
+            genre.release_date,
+            genre.budget,
+            genre.revenue,
+            movie.vote_count,
+            movie.genre_names,
+        )
+        .join(movie_read_model, movie.id == genre.movie_id)
+        .where(genre.genre_name == genre_name)
+        .order_by(genre.vote_average.desc())
+        .limit(limit)
+    )
+
+
+def read_model_ranked_query(limit: int, descending: bool = True) -> Select:
+    movie = movie_read_model.c
+    order = movie.vote_average.desc() if descending else movie.vote_average.asc()
+    return (
+        select(
+            movie.title,
+            movie.vote_average,
+            movie.release_date,
+            movie.vote_count,
+            movie.budget,
+            movie.revenue,
+            movie.genre_names,
+        )
+        .order_by(order)
+        .limit(limit)
+    )
+
+
+def read_model_financial_query(adjusted: bool = False) -> Select:
+    movie = movie_read_model.c
+    budget, revenue = (
+        (movie.adjusted_budget, movie.adjusted_revenue)
+        if adjusted
+        else (movie.budget, movie.revenue)
+    )
+    return select(
+        movie.title,
+        budget.label("budget"),
+        revenue.label("revenue"),
+        movie.vote_average,
+        movie.release_date,
+    ).where(budget > 0, revenue > 0)
+
+
+def genre_names(movie: Any) -> List[str]:
+    """Genre names of an ORM Movie or a read-model row."""
+    if hasattr(movie, "genre_names"):
+        return movie.genre_names.split(GENRE_SEPARATOR) if movie.genre_names else []
+    return [genre.name for genre in movie.genres]
+
+
+def format_genre_summary(rows: Sequence[Any]) -> List[Dict]:
+    return [
+        {
+            "Genre": row.genre,
+            "Avg Rating": round(row.avg_rating, 2),
+            "Movie Count": row.movie_count,
+            "Min Rating": round(row.min_rating, 2),
+            "Max Rating": round(row.max_rating, 2),
+            "Rating Range": round(row.max_rating - row.min_rating, 2),
+        }
+        for row in rows
+    ]
+
+
+def format_ranked_movie(movie: Movie, with_financials: bool = True) -> Dict:
+    data = {
+        "title": movie.title,
+        "rating": movie.vote_average,
+        "release_year": movie.release_date.year if movie.release_date else "Unknown",
+        "vote_count": movie.vote_count or 0,
+        "genres": genre_names(movie),
+    }
+    if with_financials:
+        data["budget"] = f"${movie.budget:,}" if movie.budget else "Unknown"
+        data["revenue"] = f"${movie.revenue:,}" if movie.revenue else "Unknown"
+    return data
+
+
+def format_financial_row(row: Any) -> Dict:
+    profit = row.revenue - row.budget
+    return {
+        "title": row.title,
+        "budget": row.budget,
+        "revenue": row.revenue,
+        "profit": profit,
+        "roi": (profit / row.budget) * 100 if row.budget > 0 else 0,
+        "rating": row.vote_average,
+        "release_year": row.release_date.year if row.release_date else "Unknown",
+    }
+
+
+def format_financial_rows(rows: Sequence[Any]) -> List[Dict]:
+    """Profit/ROI per movie, sorted by ROI (best first)."""
+    financial_data = [format_financial_row(row) for row in rows]
+    financial_data.sort(key=lambda x: x["roi"], reverse=True)
+    return financial_data
+
+
+def format_financial_summary(
+    totals: Any, top: Sequence[Any], bottom: Sequence[Any]
+) -> Dict:
+    return {
+        "movie_count": totals.movie_count,
+        "total_budget": int(totals.total_budget),
+        "total_revenue": int(totals.total_revenue),
+        "total_profit": int(totals.total_revenue) - int(totals.total_budget),
+        "average_roi": float(totals.average_roi),
+        "top_performers": [format_financial_row(row) for row in top],
+        "bottom_performers": [format_financial_row(row) for row in bottom],
+    }
 
 
 class GenrePerformanceAnalyzer:
     """Analyze genre performance metrics."""
 
-    def __init__(self):
-        self.db = next(get_database())
+    def __init__(
+        self, session: Optional[Session] = None, use_read_model: Optional[bool] = None
+    ):
+        # A caller-owned session is reused as-is; otherwise each query
+        # borrows a pooled connection only for as long as it runs.
+        self._session_override = session
+        self.use_read_model = (
+            USE_READ_MODEL if use_read_model is None else use_read_model
+        )
+
+    @contextmanager
+    def _session(self) -> Iterator[Session]:
+        if self._session_override is not None:
+            yield self._session_override
+        elif self.use_read_model:
+            with Session(get_read_model_engine()) as db:
+                yield db
+        else:
+            with read_session_scope() as db:
+                yield db
 
     def get_genre_ratings_summary(self) -> pd.DataFrame:
         """Get average ratings and movie counts by genre."""
-
-        # Query to get genre performance data
         query = (
-            self.db.query(
-                Genre.name.label("genre"),
-                func.avg(Movie.vote_average).label("avg_rating"),
-                func.count(Movie.id).label("movie_count"),
-                func.min(Movie.vote_average).label("min_rating"),
-                func.max(Movie.vote_average).label("max_rating"),
-            )
-            .join(Movie.genres)
-            .group_by(Genre.name)
-            .order_by(func.avg(Movie.vote_average).desc())
+            read_model_genre_summary_query()
+            if self.use_read_model
+            else genre_ratings_summary_query()
         )
-
-        results = query.all()
+        with self._session() as db:
+            results = db.execute(query).all()
 
         # Convert to DataFrame for easy analysis
-        data = []
-        for result in results:
-            data.append(
-                {
-                    "Genre": result.genre,
-                    "Avg Rating": round(result.avg_rating, 2),
-                    "Movie Count": result.movie_count,
-                    "Min Rating": round(result.min_rating, 2),
-                    "Max Rating": round(result.max_rating, 2),
-                    "Rating Range": round(result.max_rating - result.min_rating, 2),
-                }
-            )
-
-        return pd.DataFrame(data)
+        return pd.DataFrame(format_genre_summary(results))
 
     def get_top_movies_by_genre(self, genre_name: str, limit: int = 5) -> List[Dict]:
         """Get top-rated movies for a specific genre."""
-
-        movies = (
-            self.db.query(Movie)
-            .join(Movie.genres)
-            .filter(Genre.name == genre_name)
-            .order_by(Movie.vote_average.desc())
-            .limit(limit)
-            .all()
-        )
-
-        return [
-            {
-                "title": movie.title,
-                "rating": movie.vote_average,
-                "release_year": movie.release_date.year
-                if movie.release_date
-                else "Unknown",
-                "budget": f"${movie.budget:,}" if movie.budget else "Unknown",
-                "revenue": f"${movie.revenue:,}" if movie.revenue else "Unknown",
-            }
-            for movie in movies
-        ]
+        with self._session() as db:
+            if self.use_read_model:
+                query = read_model_top_by_genre_query(genre_name, limit)
+                movies = db.execute(query).all()
+            else:
+                movies = db.scalars(top_movies_by_genre_query(genre_name, limit)).all()
+            return [format_ranked_movie(movie) for movie in movies]
 
     def get_top_movies(self, limit: int = 10) -> List[Dict]:
         """Get highest-rated movies overall."""
-        movies = (
-            self.db.query(Movie).order_by(Movie.vote_average.desc()).limit(limit).all()
-        )
-
-        return [
-            {
-                "title": movie.title,
-                "rating": movie.vote_average,
-                "release_year": movie.release_date.year
-                if movie.release_date
-                else "Unknown",
-                "vote_count": movie.vote_count or 0,
-                "genres": [genre.name for genre in movie.genres],
-                "budget": f"${movie.budget:,}" if movie.budget else "Unknown",
-                "revenue": f"${movie.revenue:,}" if movie.revenue else "Unknown",
-            }
-            for movie in movies
-        ]
+        with self._session() as db:
+            movies = self._ranked(db, limit, descending=True)
+            return [format_ranked_movie(movie) for movie in movies]
 
     def get_bottom_movies(self, limit: int = 10) -> List[Dict]:
         """Get lowest-rated movies overall."""
-        movies = (
-            self.db.query(Movie).order_by(Movie.vote_average.asc()).limit(limit).all()
+        with self._session() as db:
+            movies = self._ranked(db, limit, descending=False)
+            return [
+                format_ranked_movie(movie, with_financials=False) for movie in movies
+            ]
+
+    def get_financial_data(self, adjusted: bool = False) -> List[Dict]:
+        """
+        Get profit and ROI for movies with budget and revenue, best ROI first.
+        ``adjusted``: in price-index base year dollars.
+        """
+        query = (
+            read_model_financial_query(adjusted)
+            if self.use_read_model
+            else financial_movies_query(adjusted)
         )
+        with self._session() as db:
+            rows = db.execute(query).all()
+        return format_financial_rows(rows)
 
-        return [
-            {
-                "title": movie.title,
-                "rating": movie.vote_average,
-                "release_year": movie.release_date.year
-                if movie.release_date
-                else "Unknown",
-                "vote_count": movie.vote_count or 0,
-                "genres": [genre.name for genre in movie.genres],
-            }
-            for movie in movies
-        ]
+    def _ranked(self, db: Session, limit: int, descending: bool) -> Sequence[Any]:
+        if self.use_read_model:
+            return db.execute(read_model_ranked_query(limit, descending)).all()
+        return db.scalars(ranked_movies_query(limit, descending)).all()
 
     def analyze_movie_rankings(self) -> None:
         """Print comprehensive movie ranking analysis."""
@@ -206,43 +415,19 @@ class GenrePerformanceAnalyzer:
                 f"   {i}. {movie['title']} ({movie['release_year']}) - {movie['rating']}/10"
             )
 
-    def analyze_financial_performance(self) -> None:
+    def analyze_financial_performance(self, adjusted: bool = False) -> None:
         """Analyze budget vs revenue and ROI for movies."""
         print("\nFINANCIAL PERFORMANCE ANALYSIS")
         print("=" * 50)
+        if adjusted:
+            print(f"(in {default_price_index().base_year} dollars)")
 
-        # Get movies with both budget and revenue data
-        movies_with_finance = (
-            self.db.query(Movie).filter(Movie.budget > 0, Movie.revenue > 0).all()
-        )
+        financial_data = self.get_financial_data(adjusted)
 
-        if not movies_with_finance:
+        if not financial_data:
             print("No financial data available (budget and revenue)")
             return
 
-        # Calculate financial metrics
-        financial_data = []
-        for movie in movies_with_finance:
-            profit = movie.revenue - movie.budget
-            roi = (profit / movie.budget) * 100 if movie.budget > 0 else 0
-
-            financial_data.append(
-                {
-                    "title": movie.title,
-                    "budget": movie.budget,
-                    "revenue": movie.revenue,
-                    "profit": profit,
-                    "roi": roi,
-                    "rating": movie.vote_average,
-                    "release_year": movie.release_date.year
-                    if movie.release_date
-                    else "Unknown",
-                }
-            )
-
-        # Sort by ROI
-        financial_data.sort(key=lambda x: x["roi"], reverse=True)
-
         print(
             f"\nFINANCIAL OVERVIEW ({len(financial_data)} movies with financial data):"
         )
@@ -309,8 +494,85 @@ class GenrePerformanceAnalyzer:
                 )
 
     def close(self):
-        """Close database connection."""
-        self.db.close()
+        """Close the caller-provided session, if any.
+
+        Sessions opened by the analyzer itself are returned to the pool after
+        each query, so there is nothing else to release.
+        """
+        if self._session_override is not None:
+            self._session_override.close()
+
+
+class AsyncGenrePerformanceAnalyzer:
+    """Async counterpart of GenrePerformanceAnalyzer for the FastAPI service."""
+
+    def __init__(self, session: AsyncSession, use_read_model: Optional[bool] = None):
+        # With the read model, ``session`` must be on the read model database
+        self.db = session
+        self.use_read_model = (
+            USE_READ_MODEL if use_read_model is None else use_read_model
+        )
+
+    async def get_genre_ratings_summary(self) -> List[Dict]:
+        """Get average ratings and movie counts by genre."""
+        query = (
+            read_model_genre_summary_query()
+            if self.use_read_model
+            else genre_ratings_summary_query()
+        )
+        results = (await self.db.execute(query)).all()
+        return format_genre_summary(results)
+
+    async def get_top_movies_by_genre(
+        self, genre_name: str, limit: int = 5
+    ) -> List[Dict]:
+        """Get top-rated movies for a specific genre."""
+        if self.use_read_model:
+            query = read_model_top_by_genre_query(genre_name, limit)
+            movies = (await self.db.execute(query)).all()
+        else:
+            query = top_movies_by_genre_query(genre_name, limit)
+            movies = (await self.db.scalars(query)).all()
+        return [format_ranked_movie(movie) for movie in movies]
+
+    async def get_top_movies(self, limit: int = 10) -> List[Dict]:
+        """Get highest-rated movies overall."""
+        movies = await self._ranked(limit, descending=True)
+        return [format_ranked_movie(movie) for movie in movies]
+
+    async def get_bottom_movies(self, limit: int = 10) -> List[Dict]:
+        """Get lowest-rated movies overall."""
+        movies = await self._ranked(limit, descending=False)
+        return [format_ranked_movie(movie, with_financials=False) for movie in movies]
+
+    async def get_financial_data(self, adjusted: bool = False) -> List[Dict]:
+        """Get profit and ROI for movies with budget and revenue, best ROI first."""
+        rows = (await self.db.execute(self._financial_query(adjusted))).all()
+        return format_financial_rows(rows)
+
+    async def get_financial_summary(
+        self, limit: int = 5, adjusted: bool = False
+    ) -> Dict:
+        """Totals and the ``limit`` best and worst ROI performers."""
+        totals, top, bottom = financial_summary_queries(
+            self._financial_query(adjusted), limit
+        )
+        return format_financial_summary(
+            (await self.db.execute(totals)).one(),
+            (await self.db.execute(top)).all(),
+            (await self.db.execute(bottom)).all(),
+        )
+
+    def _financial_query(self, adjusted: bool) -> Select:
+        if self.use_read_model:
+            return read_model_financial_query(adjusted)
+        return financial_movies_query(adjusted)
+
+    async def _ranked(self, limit: int, descending: bool) -> Sequence[Any]:
+        if self.use_read_model:
+            query = read_model_ranked_query(limit, descending)
+            return (await self.db.execute(query)).all()
+        return (await self.db.scalars(ranked_movies_query(limit, descending))).all()
 
 
 # Example usage
@@ -0,0 +1,289 @@
+"""
+Talent performance rollups.
+
+TalentRollupSync computes one person_rollup row per credited person
+(see database.read_model): film count, primary role, mean and median
+TMDb rating, total and average revenue, pooled ROI over films with both
+budget and revenue, career span, and rating trend (least-squares slope
+of rating against release year, in points per decade, from
+TREND_MIN_FILMS rated films).
+
+People are processed in batches: two queries fetch a batch's credits
+with their movies' figures, and every metric is a bincount over the
+(person, movie) memberships. Incremental runs only recompute people
+credited on movies updated since the last run, or whose own row
+changed, so the API's sorted, filtered listings stay index lookups on a
+small table.
+"""
+
+import logging
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import delete, func, select, union
+from sqlalchemy.engine import Connection
+
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from analytics.graph import CREW_ROLES, group_median
+from database.models import (
+    Movie,
+    Person,
+    movie_cast_association,
+    movie_crew_association,
+)
+from database.read_model import ReadModelSync, person_rollup, read_model_metadata
+
+logger = logging.getLogger(__name__)
+
+# Ties for the most frequent role go to the earlier one
+PRIMARY_ROLES = ("director", "actor", "writer", "producer", "crew")
+TREND_MIN_FILMS = 3
+# Release years are centred here before fitting the trend
+TREND_ORIGIN = 2000
+
+
+def _sums(groups: np.ndarray, values: np.ndarray, n_groups: int) -> np.ndarray:
+    return np.bincount(groups, weights=values, minlength=n_groups)
+
+
+def _mean(total: np.ndarray, count: np.ndarray) -> np.ndarray:
+    return np.divide(total, count, out=np.full(len(total), np.nan), where=count > 0)
+
+
+def _value(value: float, digits: Optional[int] = None):
+    if value != value:
+        return None
+    return round(float(value), digits) if digits is not None else int(value)
+
+
+class TalentRollupSync(ReadModelSync):
+    """Refresh person_rollup rows for people whose films changed."""
+
+    name = "people"
+
+    def run(self, full: bool = False) -> Dict[str, int]:
+        """
+        Recompute rollups for people credited on movies updated since the
+        last run (everyone when ``full``, which also drops rows for people
+        who no longer have credits).
+        """
+        started = time.perf_counter()
+        refreshed_at = datetime.utcnow()
+        read_model_metadata.create_all(self.target)
+
+        since = None if full else self._watermark()
+        with self.source.connect() as source:
+            until = self._high_watermark(source)
+            person_ids = self._changed_people(source, since)
+            stats = {"changed": len(person_ids), "upserted": 0, "deleted": 0}
+
+            for start in range(0, len(person_ids), self.batch_size):
+                chunk = person_ids[start : start + self.batch_size]
+                rows = self._rollups(source, chunk, refreshed_at)
+                with self.target.begin() as target:
+                    target.execute(
+                        delete(person_rollup).where(
+                            person_rollup.c.person_id.in_(chunk)
+                        )
+                    )
+                    if rows:
+                        target.execute(person_rollup.insert(), rows)
+                stats["upserted"] += len(rows)
+                stats["deleted"] += len(chunk) - len(rows)
+
+        with self.target.begin() as target:
+            if full:
+                stats["deleted"] += target.execute(
+                    delete(person_rollup).where(
+                        person_rollup.c.refreshed_at < refreshed_at
+                    )
+                ).rowcount
+            self._save_watermark(target, until)
+
+        logger.info(
+            f"Talent rollups ({'full' if full else 'incremental'}) "
+            f"finished in {time.perf_counter() - started:.1f}s: {stats}"
+        )
+        return stats
+
+    @staticmethod
+    def _high_watermark(source: Connection) -> Optional[datetime]:
+        stamps = [
+            source.execute(select(func.max(table.updated_at))).scalar()
+            for table in (Movie, Person)
+        ]
+        stamps = [stamp for stamp in stamps if stamp is not None]
+        return max(stamps) if stamps else None
+
+    @staticmethod
+    def _changed_people(source: Connection, since: Optional[datetime]) -> List[int]:
+        if since is None:
+            changed = union(
+                select(movie_cast_association.c.person_id),
+                select(movie_crew_association.c.person_id),
+            ).subquery()
+        else:
+            movies = select(Movie.id).where(Movie.updated_at >= since)
+            changed = union(
+                select(movie_cast_association.c.person_id).where(
+                    movie_cast_association.c.movie_id.in_(movies)
+                ),
+                select(movie_crew_association.c.person_id).where(
+                    movie_crew_association.c.movie_id.in_(movies)
+                ),
+                select(Person.id).where(Person.updated_at >= since),
+            ).subquery()
+        return list(
+            source.execute(select(changed.c[0]).order_by(changed.c[0])).scalars()
+        )
+
+    def _rollups(
+        self, source: Connection, person_ids: Sequence[int], refreshed_at: datetime
+    ) -> List[Dict]:
+        """person_rollup rows for the credited people among ``person_ids``."""
+        role_codes = {role: code for code, role in enumerate(PRIMARY_ROLES)}
+        credits = []
+        for table, detail in (
+            (movie_cast_association, None),
+            (movie_crew_association, movie_crew_association.c.job),
+        ):
+            query = (
+                select(
+                    table.c.person_id,
+                    Movie.id,
+                    Movie.budget,
+                    Movie.revenue,
+                    Movie.vote_average,
+                    Movie.release_date,
+                    *([detail] if detail is not None else []),
+                )
+                .join(Movie, Movie.id == table.c.movie_id)
+                .where(table.c.person_id.in_(person_ids))
+            )
+            for row in source.execute(query):
+                role = "actor" if detail is None else CREW_ROLES.get(row[6], "crew")
+                credits.append((*row[:6], role_codes[role]))
+        if not credits:
+            return []
+
+        people = np.array(sorted({credit[0] for credit in credits}), dtype=np.int64)
+        person = np.searchsorted(people, [credit[0] for credit in credits])
+        movie = np.array([credit[1] for credit in credits], dtype=np.int64)
+        role = np.array([credit[6] for credit in credits], dtype=np.int64)
+        n = len(people)
+        order = np.lexsort((role, movie, person))
+        person, movie, role = person[order], movie[order], role[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = (person[1:] != person[:-1]) | (movie[1:] != movie[:-1])
+
+        # Roles count films, not jobs: Writer and Screenplay on one film is one
+        credited = first.copy()
+        credited[1:] |= role[1:] != role[:-1]
+        role_counts = np.zeros((n, len(PRIMARY_ROLES)), dtype=np.int64)
+        np.add.at(role_counts, (person[credited], role[credited]), 1)
+
+        # One membership per (person, movie), whatever the jobs
+        rows = order[first]
+        person = person[first]
+
+        def column(index: int) -> np.ndarray:
+            return np.array(
+                [
+                    np.nan if credits[i][index] is None else credits[i][index]
+                    for i in rows
+                ],
+                dtype=np.float64,
+            )
+
+        budget, revenue, rating = column(2), column(3), column(4)
+        year = np.array(
+            [credits[i][5].year if credits[i][5] is not None else np.nan for i in rows],
+            dtype=np.float64,
+        )
+
+        films = np.bincount(person, minlength=n)
+        rated = np.isfinite(rating) & (rating > 0)
+        rated_films = np.bincount(person[rated], minlength=n)
+        earned = np.isfinite(revenue) & (revenue > 0)
+        revenue_films = np.bincount(person[earned], minlength=n)
+        total_revenue = _sums(person[earned], revenue[earned], n)
+        financed = earned & np.isfinite(budget) & (budget > 0)
+        roi_budget = _sums(person[financed], budget[financed], n)
+        roi_revenue = _sums(person[financed], revenue[financed], n)
+
+        dated = np.isfinite(year)
+        first_year = np.full(n, np.nan)
+        last_year = np.full(n, np.nan)
+        if dated.any():
+            first_year[:] = np.inf
+            last_year[:] = -np.inf
+            np.minimum.at(first_year, person[dated], year[dated])
+            np.maximum.at(last_year, person[dated], year[dated])
+            first_year[np.isinf(first_year)] = np.nan
+            last_year[np.isinf(last_year)] = np.nan
+
+        # Least-squares slope from per-person sums
+        fit = rated & dated
+        x = year[fit] - TREND_ORIGIN
+        y = rating[fit]
+        count = np.bincount(person[fit], minlength=n)
+        sx, sy = _sums(person[fit], x, n), _sums(person[fit], y, n)
+        sxx, sxy = _sums(person[fit], x * x, n), _sums(person[fit], x * y, n)
+        spread = count * sxx - sx * sx
+        trend = np.divide(
+            (count * sxy - sx * sy) * 10,
+            spread,
+            out=np.full(n, np.nan),
+            where=(count >= TREND_MIN_FILMS) & (spread > 0),
+        )
+
+        metrics = {
+            "avg_rating": _mean(_sums(person[rated], rating[rated], n), rated_films),
+            "median_rating": group_median(person[rated], rating[rated], n),
+            "avg_revenue": _mean(total_revenue, revenue_films),
+            "roi": np.divide(
+                (roi_revenue - roi_budget) * 100,
+                roi_budget,
+                out=np.full(n, np.nan),
+                where=roi_budget > 0,
+            ),
+            "rating_trend": trend,
+        }
+        names = dict(
+            source.execute(
+                select(Person.id, Person.name).where(Person.id.in_(people.tolist()))
+            ).all()
+        )
+        primary = role_counts.argmax(axis=1)
+        return [
+            {
+                "person_id": int(person_id),
+                "name": names.get(int(person_id)) or "",
+                "primary_role": PRIMARY_ROLES[primary[i]],
+                "film_count": int(films[i]),
+                "rated_films": int(rated_films[i]),
+                "avg_rating": _value(metrics["avg_rating"][i], 3),
+                "median_rating": _value(metrics["median_rating"][i], 3),
+                "revenue_films": int(revenue_films[i]),
+                "total_revenue": int(total_revenue[i]) if revenue_films[i] else None,
+                "avg_revenue": _value(metrics["avg_revenue"][i], 2),
+                "total_budget": int(roi_budget[i]) if roi_budget[i] else None,
+                "roi": _value(metrics["roi"][i], 2),
+                "first_year": _value(first_year[i]),
+                "last_year": _value(last_year[i]),
+                "rating_trend": _value(metrics["rating_trend"][i], 4),
+                "refreshed_at": refreshed_at,
+            }
+            for i, person_id in enumerate(people)
+        ]
+
+
+def refresh_talent_rollups(full: bool = False, **kwargs) -> Dict[str, int]:
+    """Run one incremental (or full) talent rollup refresh."""
+    return TalentRollupSync(**kwargs).run(full=full)
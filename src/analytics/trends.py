@@ -0,0 +1,90 @@
+"""
+Monthly sentiment trends over live rows and compacted rollups
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import Select, func, literal, select, union_all
+
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from database.models import SentimentAnalysis, SentimentMonthly
+from database.partitioning import add_months, month_start, month_trunc
+
+
+def sentiment_trend_query(movie_id: int, since: datetime) -> Select:
+    """
+    Per-month sentiment for one movie since ``since``.
+
+    Every sentiment_analysis row covers the reviews one pipeline run
+    scored, so a month's score is the review-weighted mean of its rows.
+
+    Recent months come from sentiment_analysis (filtered on the partition
+    key so PostgreSQL prunes to the matching partitions), older ones from
+    sentiment_monthly. Months present in both are merged.
+    """
+    month = month_trunc(SentimentAnalysis.analysis_date)
+    live = (
+        select(
+            month.label("month"),
+            func.count(SentimentAnalysis.id).label("sample_count"),
+            func.coalesce(
+                func.sum(
+                    SentimentAnalysis.sentiment_score * SentimentAnalysis.review_count
+                ),
+                0.0,
+            ).label("score_sum"),
+            func.coalesce(func.sum(SentimentAnalysis.review_count), 0).label(
+                "review_count"
+            ),
+        )
+        .where(
+            SentimentAnalysis.movie_id == movie_id,
+            SentimentAnalysis.analysis_date >= since,
+        )
+        .group_by(month)
+    )
+    compacted = (
+        select(
+            SentimentMonthly.month.label("month"),
+            SentimentMonthly.sample_count,
+            SentimentMonthly.sentiment_score_sum.label("score_sum"),
+            SentimentMonthly.review_count,
+        )
+        .where(SentimentMonthly.movie_id == movie_id)
+        .where(SentimentMonthly.month >= month_trunc(literal(since)))
+    )
+    months = union_all(live, compacted).subquery()
+    return (
+        select(
+            months.c.month,
+            func.sum(months.c.sample_count).label("sample_count"),
+            func.sum(months.c.score_sum).label("score_sum"),
+            func.sum(months.c.review_count).label("review_count"),
+        )
+        .group_by(months.c.month)
+        .order_by(months.c.month)
+    )
+
+
+def format_sentiment_trend(rows: Sequence[Any]) -> List[Dict]:
+    return [
+        {
+            "month": row.month.strftime("%Y-%m"),
+            "avg_sentiment": round(row.score_sum / row.review_count, 4)
+            if row.review_count
+            else None,
+            "samples": row.sample_count,
+            "reviews": row.review_count,
+        }
+        for row in rows
+    ]
+
+
+def trend_start(months: int, now: Optional[datetime] = None) -> datetime:
+    """First day of the month ``months`` months before ``now``."""
+    return add_months(month_start(now or datetime.utcnow()), -months)
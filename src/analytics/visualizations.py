@@ -15,7 +15,7 @@ import seaborn as sns
 sys.path.append(str(Path(__file__).parent.parent))
 
 from analytics.performance import GenrePerformanceAnalyzer
-from database.connection import get_database
+from database.connection import read_session_scope
 from database.models import Genre, Movie
 
 # Set style for better-looking plots
@@ -93,15 +93,18 @@ class MovieDataVisualizer:
 
     def create_rating_distribution(self, save_path: str = "rating_distribution.png"):
         """Create histogram showing distribution of movie ratings."""
-        db = next(get_database())
-
         # Get all movie ratings
-        movies = db.query(Movie).all()
-        ratings = [movie.vote_average for movie in movies if movie.vote_average]
+        with read_session_scope() as db:
+            ratings = [
+                rating
+                for (rating,) in db.query(Movie.vote_average).filter(
+                    Movie.vote_average.isnot(None)
+                )
+                if rating
+            ]
 
         if not ratings:
             print("No rating data available")
-            db.close()
             return
 
         plt.figure(figsize=(10, 6))
@@ -152,8 +155,6 @@ class MovieDataVisualizer:
         print(f"Rating distribution chart saved as: {save_path}")
         plt.show()
 
-        db.close()
-
     def create_top_movies_chart(
         self, limit: int = 10, save_path: str = "top_movies.png"
     ):
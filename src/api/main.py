@@ -1,7 +1,39 @@
+"""
+CineMetrics FastAPI service
+"""
+
+import sys
+from contextlib import asynccontextmanager
+from pathlib import Path
+
 from fastapi import FastAPI
 
-app = FastAPI()
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from database.connection import dispose_async_engine
+from database.read_model import dispose_async_read_model_engine
+
+from .routes import analytics, collaborations, market, movies, people, predict
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await dispose_async_engine()
+    await dispose_async_read_model_engine()
+
+
+app = FastAPI(title="CineMetrics API", lifespan=lifespan)
+
+app.include_router(movies.router, prefix="/api")
+app.include_router(analytics.router, prefix="/api")
+app.include_router(market.router, prefix="/api")
+app.include_router(predict.router, prefix="/api")
+app.include_router(collaborations.router, prefix="/api")
+app.include_router(people.router, prefix="/api")
+
 
 @app.get("/")
 def read_root():
-    return {"message": "Hello World"}
\ No newline at end of file
+    return {"message": "Hello World"}
@@ -0,0 +1,284 @@
+"""
+Pydantic response schemas for the CineMetrics API
+"""
+
+from datetime import date, datetime
+from typing import Dict, Generic, List, Optional, TypeVar, Union
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """Offset-paginated list response."""
+
+    total: int
+    limit: int
+    offset: int
+    results: List[T]
+
+
+class GenreSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+
+
+class MovieSummary(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    tmdb_id: Optional[int] = None
+    title: str
+    release_date: Optional[datetime] = None
+    vote_average: Optional[float] = None
+    vote_count: Optional[int] = None
+    popularity: Optional[float] = None
+    budget: Optional[int] = None
+    revenue: Optional[int] = None
+
+
+class MovieDetail(MovieSummary):
+    imdb_id: Optional[str] = None
+    original_title: Optional[str] = None
+    overview: Optional[str] = None
+    tagline: Optional[str] = None
+    runtime: Optional[int] = None
+    status: Optional[str] = None
+    original_language: Optional[str] = None
+    poster_path: Optional[str] = None
+    genres: List[GenreSchema] = []
+
+
+class SimilarMovie(MovieSummary):
+    score: float
+
+
+class SimilarMovies(BaseModel):
+    movie_id: int
+    index_version: str
+    exact: bool
+    results: List[SimilarMovie]
+
+
+class SentimentMonth(BaseModel):
+    month: str
+    avg_sentiment: Optional[float] = None
+    samples: int
+    reviews: int
+
+
+class SentimentTrend(BaseModel):
+    movie_id: int
+    since: date
+    months: List[SentimentMonth]
+
+
+class MovieFeatures(BaseModel):
+    """A movie that is not (yet) in the catalogue."""
+
+    budget: Optional[float] = Field(None, ge=0)
+    runtime: Optional[int] = Field(None, ge=0)
+    release_date: Optional[date] = None
+    genres: List[str] = []
+
+
+class PredictionRequest(BaseModel):
+    movie_ids: List[int] = Field([], max_length=1000)
+    movies: List[MovieFeatures] = Field([], max_length=1000)
+
+    @model_validator(mode="after")
+    def require_movies(self):
+        if not self.movie_ids and not self.movies:
+            raise ValueError("Provide movie_ids and/or movies")
+        return self
+
+
+class Prediction(BaseModel):
+    movie_id: Optional[int] = None
+    predicted_roi: float
+    success_probability: float
+    is_successful: bool
+
+
+class PredictionBatch(BaseModel):
+    model_version: str
+    predictions: List[Prediction]
+    missing: List[int] = []
+
+
+class GenreRatingSummary(BaseModel):
+    genre: str
+    avg_rating: float
+    movie_count: int
+    min_rating: float
+    max_rating: float
+    rating_range: float
+
+
+class RankedMovie(BaseModel):
+    title: str
+    rating: Optional[float] = None
+    release_year: Union[int, str]
+    vote_count: int = 0
+    genres: List[str] = []
+    budget: Optional[str] = None
+    revenue: Optional[str] = None
+
+
+class FinancialMovie(BaseModel):
+    title: str
+    budget: int
+    revenue: int
+    profit: int
+    roi: float
+    rating: Optional[float] = None
+    release_year: Union[int, str]
+
+
+class FinancialSummary(BaseModel):
+    movie_count: int
+    total_budget: int
+    total_revenue: int
+    total_profit: int
+    average_roi: float
+    top_performers: List[FinancialMovie]
+    bottom_performers: List[FinancialMovie]
+    # Budgets, revenues and profits in dollars of this year when adjusted
+    price_base_year: Optional[int] = None
+
+
+class YearlyMarket(BaseModel):
+    year: int
+    movie_count: int
+    total_budget: int
+    total_revenue: int
+    avg_rating: float
+
+
+class ReleaseWeek(BaseModel):
+    week_start: date
+    releases: int
+    genres: Dict[str, int]
+
+
+class ReleaseWindows(BaseModel):
+    year: int
+    genre: Optional[str] = None
+    snapshot_version: str
+    weeks: List[ReleaseWeek]
+
+
+class GenreShareYear(BaseModel):
+    year: int
+    total: float
+    shares: Dict[str, float]
+
+
+class GenreShare(BaseModel):
+    metric: str
+    snapshot_version: str
+    years: List[GenreShareYear]
+
+
+class RoiMonth(BaseModel):
+    month: int
+    films: int
+    median_roi: Optional[float] = None
+    mean_roi: Optional[float] = None
+    pooled_roi: Optional[float] = None
+    profitable_share: Optional[float] = None
+
+
+class RoiSeasonality(BaseModel):
+    genre: Optional[str] = None
+    start_year: Optional[int] = None
+    end_year: Optional[int] = None
+    snapshot_version: str
+    months: List[RoiMonth]
+
+
+class ConcentrationYear(BaseModel):
+    year: int
+    hhi: float
+    studios: int
+    top4_share: float
+
+
+class StudioShare(BaseModel):
+    company_id: int
+    name: str
+    films: int
+    share: float
+
+
+class StudioConcentration(BaseModel):
+    metric: str
+    start_year: Optional[int] = None
+    end_year: Optional[int] = None
+    hhi: float
+    snapshot_version: str
+    years: List[ConcentrationYear]
+    top_studios: List[StudioShare]
+
+
+class StarPower(BaseModel):
+    person_id: int
+    name: Optional[str] = None
+    films: int
+    co_appearances: int
+    star_power: float
+
+
+class Collaborator(StarPower):
+    films_together: int
+
+
+class Collaborators(BaseModel):
+    person: StarPower
+    graph_version: str
+    results: List[Collaborator]
+
+
+class CollaboratorPair(BaseModel):
+    left_id: int
+    left_name: Optional[str] = None
+    right_id: int
+    right_name: Optional[str] = None
+    films: int
+    roi_films: int
+    mean_roi: Optional[float] = None
+    median_roi: Optional[float] = None
+    total_revenue: float
+    avg_rating: Optional[float] = None
+
+
+class CollaboratorPairs(BaseModel):
+    kind: str
+    sort: str
+    graph_version: str
+    results: List[CollaboratorPair]
+
+
+class TalentRollup(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    person_id: int
+    name: str
+    primary_role: Optional[str] = None
+    film_count: int
+    rated_films: int
+    avg_rating: Optional[float] = None
+    median_rating: Optional[float] = None
+    revenue_films: int
+    total_revenue: Optional[int] = None
+    avg_revenue: Optional[float] = None
+    total_budget: Optional[int] = None
+    roi: Optional[float] = None
+    first_year: Optional[int] = None
+    last_year: Optional[int] = None
+    rating_trend: Optional[float] = Field(
+        None, description="rating change per decade of career"
+    )
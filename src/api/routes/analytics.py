@@ -0,0 +1,92 @@
+"""
+Analytics endpoints backed by AsyncGenrePerformanceAnalyzer
+"""
+
+from typing import List
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from analytics.performance import USE_READ_MODEL, AsyncGenrePerformanceAnalyzer
+from data.processors.financials import default_price_index
+from database.connection import get_async_read_database
+from database.read_model import get_async_read_model_database
+
+from ..models.schemas import FinancialSummary, GenreRatingSummary, RankedMovie
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+
+# ANALYTICS_USE_READ_MODEL switches the analyzer to the read model database
+get_analytics_database = (
+    get_async_read_model_database if USE_READ_MODEL else get_async_read_database
+)
+
+
+def get_analyzer(
+    db: AsyncSession = Depends(get_analytics_database),
+) -> AsyncGenrePerformanceAnalyzer:
+    return AsyncGenrePerformanceAnalyzer(db, use_read_model=USE_READ_MODEL)
+
+
+@router.get("/genres", response_model=List[GenreRatingSummary])
+async def genre_ratings(
+    analyzer: AsyncGenrePerformanceAnalyzer = Depends(get_analyzer),
+):
+    """Average rating and movie count per genre, best first."""
+    rows = await analyzer.get_genre_ratings_summary()
+    return [
+        GenreRatingSummary(
+            genre=row["Genre"],
+            avg_rating=row["Avg Rating"],
+            movie_count=row["Movie Count"],
+            min_rating=row["Min Rating"],
+            max_rating=row["Max Rating"],
+            rating_range=row["Rating Range"],
+        )
+        for row in rows
+    ]
+
+
+@router.get("/genres/{genre_name}/top", response_model=List[RankedMovie])
+async def top_movies_by_genre(
+    genre_name: str,
+    limit: int = Query(5, ge=1, le=50),
+    analyzer: AsyncGenrePerformanceAnalyzer = Depends(get_analyzer),
+):
+    """Highest-rated movies in a genre."""
+    return await analyzer.get_top_movies_by_genre(genre_name, limit)
+
+
+@router.get("/top-movies", response_model=List[RankedMovie])
+async def top_movies(
+    limit: int = Query(10, ge=1, le=100),
+    analyzer: AsyncGenrePerformanceAnalyzer = Depends(get_analyzer),
+):
+    """Highest-rated movies overall."""
+    return await analyzer.get_top_movies(limit)
+
+
+@router.get("/bottom-movies", response_model=List[RankedMovie])
+async def bottom_movies(
+    limit: int = Query(10, ge=1, le=100),
+    analyzer: AsyncGenrePerformanceAnalyzer = Depends(get_analyzer),
+):
+    """Lowest-rated movies overall."""
+    return await analyzer.get_bottom_movies(limit)
+
+
+@router.get("/financial", response_model=FinancialSummary)
+async def financial_summary(
+    limit: int = Query(5, ge=1, le=50),
+    adjusted: bool = Query(
+        False, description="Inflation-adjusted to the price index base year"
+    ),
+    analyzer: AsyncGenrePerformanceAnalyzer = Depends(get_analyzer),
+):
+    """Budget/revenue totals with best and worst ROI performers."""
+    summary = await analyzer.get_financial_summary(limit, adjusted)
+    return FinancialSummary(
+        **summary,
+        price_base_year=default_price_index().base_year if adjusted else None,
+    )
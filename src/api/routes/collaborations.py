@@ -0,0 +1,120 @@
+"""
+Collaboration graph endpoints backed by analytics.graph
+"""
+
+from typing import Dict, Iterable, List
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from analytics.graph import (
+    MIN_PAIR_FILMS,
+    PAIR_KINDS,
+    PAIR_SORTS,
+    CollaborationGraph,
+    collaboration_graphs,
+)
+from database.connection import get_async_read_database
+from database.models import Person
+
+from ..models.schemas import (
+    CollaboratorPair,
+    CollaboratorPairs,
+    Collaborators,
+    StarPower,
+)
+
+router = APIRouter(prefix="/collaborations", tags=["collaborations"])
+
+
+# Sync dependency: FastAPI runs it in a worker thread, so loading a new
+# version never blocks the event loop
+def get_graph() -> CollaborationGraph:
+    graph = collaboration_graphs.get()
+    if graph is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Collaboration graph not built; run "
+            "scripts/build_collaboration_graph.py",
+        )
+    return graph
+
+
+async def person_names(db: AsyncSession, person_ids: Iterable[int]) -> Dict[int, str]:
+    rows = await db.execute(
+        select(Person.id, Person.name).filter(Person.id.in_(set(person_ids)))
+    )
+    return dict(rows.all())
+
+
+@router.get("/pairs", response_model=CollaboratorPairs)
+async def top_pairs(
+    kind: str = Query("director-actor", enum=list(PAIR_KINDS)),
+    sort: str = Query("median_roi", enum=list(PAIR_SORTS)),
+    min_films: int = Query(
+        3, ge=MIN_PAIR_FILMS, description="films together (with ROI for ROI sorts)"
+    ),
+    limit: int = Query(20, ge=1, le=100),
+    graph: CollaborationGraph = Depends(get_graph),
+    db: AsyncSession = Depends(get_async_read_database),
+):
+    """Most bankable collaborator pairs, e.g. director-actor by median ROI."""
+    try:
+        pairs = graph.top_pairs(kind, sort, min_films, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    names = await person_names(
+        db, [pair[side] for pair in pairs for side in ("left_id", "right_id")]
+    )
+    return CollaboratorPairs(
+        kind=kind,
+        sort=sort,
+        graph_version=graph.version,
+        results=[
+            CollaboratorPair(
+                **pair,
+                left_name=names.get(pair["left_id"]),
+                right_name=names.get(pair["right_id"]),
+            )
+            for pair in pairs
+        ],
+    )
+
+
+@router.get("/star-power", response_model=List[StarPower])
+async def star_power(
+    min_films: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=100),
+    graph: CollaborationGraph = Depends(get_graph),
+    db: AsyncSession = Depends(get_async_read_database),
+):
+    """People with the highest PageRank in the collaboration graph."""
+    people = graph.star_power(limit, min_films)
+    names = await person_names(db, [person["person_id"] for person in people])
+    return [
+        StarPower(**person, name=names.get(person["person_id"])) for person in people
+    ]
+
+
+@router.get("/people/{person_id}", response_model=Collaborators)
+async def collaborators(
+    person_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    graph: CollaborationGraph = Depends(get_graph),
+    db: AsyncSession = Depends(get_async_read_database),
+):
+    """A person's most frequent collaborators."""
+    results = graph.collaborators(person_id, limit)
+    if results is None:
+        raise HTTPException(status_code=404, detail="Person not in the graph")
+    names = await person_names(
+        db, [person_id] + [other["person_id"] for other in results]
+    )
+    return Collaborators(
+        person=StarPower(
+            **graph.person(graph.person_row(person_id)), name=names.get(person_id)
+        ),
+        graph_version=graph.version,
+        results=[{**other, "name": names.get(other["person_id"])} for other in results],
+    )
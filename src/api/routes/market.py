@@ -0,0 +1,122 @@
+"""
+Market overview endpoints
+
+Everything but /yearly is served from the market snapshot
+(analytics.market), whose query results are cached per snapshot version.
+"""
+
+from typing import Callable, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import extract, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from analytics.market import (
+    CONCENTRATION_METRICS,
+    SHARE_METRICS,
+    MarketSnapshot,
+    market_snapshots,
+)
+from database.connection import get_async_read_database
+from database.models import Movie
+
+from ..models.schemas import (
+    GenreShare,
+    ReleaseWindows,
+    RoiSeasonality,
+    StudioConcentration,
+    YearlyMarket,
+)
+
+router = APIRouter(prefix="/market", tags=["market"])
+
+
+# Sync dependency: FastAPI runs it in a worker thread, so loading a new
+# version never blocks the event loop
+def get_snapshot() -> MarketSnapshot:
+    snapshot = market_snapshots.get()
+    if snapshot is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Market snapshot not built; run scripts/build_market_snapshot.py",
+        )
+    return snapshot
+
+
+def run_query(query: Callable[..., Dict], *args) -> Dict:
+    try:
+        return query(*args)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/yearly", response_model=List[YearlyMarket])
+async def yearly_market(db: AsyncSession = Depends(get_async_read_database)):
+    """Releases, spend, gross and average rating per release year."""
+    year = extract("year", Movie.release_date).label("year")
+    rows = await db.execute(
+        select(
+            year,
+            func.count(Movie.id),
+            func.coalesce(func.sum(Movie.budget), 0),
+            func.coalesce(func.sum(Movie.revenue), 0),
+            func.coalesce(func.avg(Movie.vote_average), 0.0),
+        )
+        .filter(Movie.release_date.isnot(None))
+        .group_by(year)
+        .order_by(year)
+    )
+    return [
+        YearlyMarket(
+            year=int(row[0]),
+            movie_count=row[1],
+            total_budget=row[2],
+            total_revenue=row[3],
+            avg_rating=round(row[4], 2),
+        )
+        for row in rows
+    ]
+
+
+@router.get("/release-windows", response_model=ReleaseWindows)
+async def release_windows(
+    year: int = Query(..., ge=1870, le=2100),
+    genre: Optional[str] = None,
+    snapshot: MarketSnapshot = Depends(get_snapshot),
+):
+    """Films released per week of ``year`` (weeks start on Monday), by genre."""
+    return run_query(snapshot.release_windows, year, genre)
+
+
+@router.get("/genre-share", response_model=GenreShare)
+async def genre_share(
+    metric: str = Query("releases", enum=list(SHARE_METRICS)),
+    start_year: Optional[int] = None,
+    end_year: Optional[int] = None,
+    snapshot: MarketSnapshot = Depends(get_snapshot),
+):
+    """Each genre's share of releases, revenue or budget per year."""
+    return run_query(snapshot.genre_share, metric, start_year, end_year)
+
+
+@router.get("/seasonality", response_model=RoiSeasonality)
+async def roi_seasonality(
+    start_year: Optional[int] = None,
+    end_year: Optional[int] = None,
+    genre: Optional[str] = None,
+    snapshot: MarketSnapshot = Depends(get_snapshot),
+):
+    """Median, mean and pooled ROI and share of profitable films by release month."""
+    return run_query(snapshot.roi_seasonality, start_year, end_year, genre)
+
+
+@router.get("/concentration", response_model=StudioConcentration)
+async def studio_concentration(
+    metric: str = Query("revenue", enum=list(CONCENTRATION_METRICS)),
+    start_year: Optional[int] = None,
+    end_year: Optional[int] = None,
+    top: int = Query(10, ge=1, le=100),
+    snapshot: MarketSnapshot = Depends(get_snapshot),
+):
+    """Studio concentration (HHI, 0-10,000) per year and the leading studios."""
+    return run_query(snapshot.studio_concentration, metric, start_year, end_year, top)
@@ -0,0 +1,188 @@
+"""
+Movie catalogue endpoints
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from starlette.concurrency import run_in_threadpool
+
+from analytics.performance import USE_READ_MODEL
+from analytics.trends import format_sentiment_trend, sentiment_trend_query, trend_start
+from database.connection import get_async_read_database
+from database.models import Genre, Movie
+from database.read_model import (
+    get_async_read_model_database,
+    movie_genre_read_model,
+    movie_read_model,
+)
+from ml.similarity import similar_movies
+
+from ..models.schemas import (
+    MovieDetail,
+    MovieSummary,
+    Page,
+    SentimentTrend,
+    SimilarMovie,
+    SimilarMovies,
+)
+
+router = APIRouter(prefix="/movies", tags=["movies"])
+
+ORDERING = {
+    "rating": Movie.vote_average.desc(),
+    "popularity": Movie.popularity.desc(),
+    "release_date": Movie.release_date.desc(),
+    "revenue": Movie.revenue.desc(),
+    "budget": Movie.budget.desc(),
+    "title": Movie.title.asc(),
+}
+
+READ_MODEL_ORDERING = {
+    "rating": movie_read_model.c.vote_average.desc(),
+    "popularity": movie_read_model.c.popularity.desc(),
+    "release_date": movie_read_model.c.release_date.desc(),
+    "revenue": movie_read_model.c.revenue.desc(),
+    "budget": movie_read_model.c.budget.desc(),
+    "title": movie_read_model.c.title.asc(),
+}
+
+# ANALYTICS_USE_READ_MODEL serves the list from movie_read_model, no joins
+get_list_database = (
+    get_async_read_model_database if USE_READ_MODEL else get_async_read_database
+)
+
+
+def title_pattern(search: str) -> str:
+    """ILIKE pattern matching ``search`` anywhere; % and _ are literal."""
+    escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def read_model_list_query(genre: Optional[str], search: Optional[str]) -> Select:
+    movie = movie_read_model.c
+    query = select(*[movie[name] for name in MovieSummary.model_fields])
+    if genre:
+        genre_rows = movie_genre_read_model.c
+        query = query.where(
+            movie.id.in_(
+                select(genre_rows.movie_id).where(genre_rows.genre_name == genre)
+            )
+        )
+    if search:
+        query = query.where(movie.title.ilike(title_pattern(search), escape="\\"))
+    return query
+
+
+@router.get("", response_model=Page[MovieSummary])
+async def list_movies(
+    genre: Optional[str] = None,
+    search: Optional[str] = Query(None, min_length=1),
+    ordering: str = Query("popularity", enum=list(ORDERING)),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_list_database),
+):
+    """List movies with optional genre filter and title search."""
+    if USE_READ_MODEL:
+        query = read_model_list_query(genre, search)
+        order, movie_id = READ_MODEL_ORDERING[ordering], movie_read_model.c.id
+    else:
+        query = select(Movie)
+        if genre:
+            query = query.join(Movie.genres).filter(Genre.name == genre)
+        if search:
+            query = query.filter(Movie.title.ilike(title_pattern(search), escape="\\"))
+        order, movie_id = ORDERING[ordering], Movie.id
+
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
+    page = query.order_by(order.nulls_last(), movie_id).limit(limit).offset(offset)
+    movies = (
+        (await db.execute(page)).all()
+        if USE_READ_MODEL
+        else (await db.scalars(page)).all()
+    )
+
+    return Page[MovieSummary](
+        total=total or 0,
+        limit=limit,
+        offset=offset,
+        results=[MovieSummary.model_validate(movie) for movie in movies],
+    )
+
+
+@router.get("/{movie_id}", response_model=MovieDetail)
+async def get_movie(movie_id: int, db: AsyncSession = Depends(get_async_read_database)):
+    """Movie details with genres."""
+    movie = await db.scalar(
+        select(Movie).options(selectinload(Movie.genres)).filter(Movie.id == movie_id)
+    )
+    if movie is None:
+        raise HTTPException(status_code=404, detail="Movie not found")
+    return MovieDetail.model_validate(movie)
+
+
+@router.get("/{movie_id}/sentiment", response_model=SentimentTrend)
+async def get_sentiment_trend(
+    movie_id: int,
+    months: int = Query(24, ge=1, le=240),
+    db: AsyncSession = Depends(get_async_read_database),
+):
+    """Monthly sentiment, from live rows and compacted rollups."""
+    if await db.scalar(select(Movie.id).filter(Movie.id == movie_id)) is None:
+        raise HTTPException(status_code=404, detail="Movie not found")
+    since = trend_start(months)
+    rows = (await db.execute(sentiment_trend_query(movie_id, since))).all()
+    return SentimentTrend(
+        movie_id=movie_id, since=since.date(), months=format_sentiment_trend(rows)
+    )
+
+
+@router.get("/{movie_id}/similar", response_model=SimilarMovies)
+async def get_similar_movies(
+    movie_id: int,
+    limit: int = Query(10, ge=1, le=50),
+    exact: bool = Query(False, description="scan every movie instead of the IVF lists"),
+    db: AsyncSession = Depends(get_async_read_database),
+):
+    """Movies with the most similar genres, overview and cast/crew."""
+    index = await similar_movies.aget()
+    if index is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Similarity index not built; run scripts/build_similarity_index.py",
+        )
+    if movie_id not in index:
+        if await db.scalar(select(Movie.id).filter(Movie.id == movie_id)) is None:
+            raise HTTPException(status_code=404, detail="Movie not found")
+        raise HTTPException(
+            status_code=404, detail="Movie not in the similarity index yet"
+        )
+
+    # An exact scan of a large catalogue takes long enough to block the loop
+    matches = (
+        await run_in_threadpool(index.similar, movie_id, limit, exact=True)
+        if exact
+        else index.similar(movie_id, limit)
+    )
+    scores = dict(matches)
+    movies = {
+        movie.id: movie
+        for movie in await db.scalars(select(Movie).filter(Movie.id.in_(scores)))
+    }
+    return SimilarMovies(
+        movie_id=movie_id,
+        index_version=index.version,
+        exact=exact,
+        results=[
+            SimilarMovie(
+                **MovieSummary.model_validate(movies[match_id]).model_dump(),
+                score=score,
+            )
+            for match_id, score in matches
+            if match_id in movies
+        ],
+    )
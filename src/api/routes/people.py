@@ -0,0 +1,91 @@
+"""
+Talent performance endpoints backed by the person_rollup read model
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from analytics.talent import PRIMARY_ROLES
+from database.read_model import get_async_read_model_database, person_rollup
+
+from ..models.schemas import Page, TalentRollup
+
+router = APIRouter(prefix="/people", tags=["people"])
+
+rollup = person_rollup.c
+ORDERING = {
+    "film_count": rollup.film_count.desc(),
+    "avg_rating": rollup.avg_rating.desc(),
+    "median_rating": rollup.median_rating.desc(),
+    "total_revenue": rollup.total_revenue.desc(),
+    "avg_revenue": rollup.avg_revenue.desc(),
+    "roi": rollup.roi.desc(),
+    "rating_trend": rollup.rating_trend.desc(),
+    "name": rollup.name.asc(),
+}
+
+# Once seen, the table is assumed to stay; sync jobs never drop it
+_rollup_built = False
+
+
+async def get_rollup_database(
+    db: AsyncSession = Depends(get_async_read_model_database),
+) -> AsyncSession:
+    """Read model session; 503 until the first sync has created person_rollup."""
+    global _rollup_built
+    if not _rollup_built:
+        _rollup_built = await db.run_sync(
+            lambda session: inspect(session.connection()).has_table(person_rollup.name)
+        )
+        if not _rollup_built:
+            raise HTTPException(
+                status_code=503,
+                detail="Talent rollup not built; run scripts/sync_read_model.py",
+            )
+    return db
+
+
+@router.get("", response_model=Page[TalentRollup])
+async def list_people(
+    role: Optional[str] = Query(None, enum=list(PRIMARY_ROLES)),
+    min_films: int = Query(1, ge=1),
+    ordering: str = Query("film_count", enum=list(ORDERING)),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_rollup_database),
+):
+    """Per-person career metrics, filtered by primary role and film count."""
+    if ordering not in ORDERING:
+        raise HTTPException(status_code=400, detail=f"Unknown ordering {ordering!r}")
+    query = select(person_rollup)
+    if role:
+        query = query.where(rollup.primary_role == role)
+    if min_films > 1:
+        query = query.where(rollup.film_count >= min_films)
+
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
+    rows = await db.execute(
+        query.order_by(ORDERING[ordering].nulls_last(), rollup.person_id)
+        .limit(limit)
+        .offset(offset)
+    )
+    return Page[TalentRollup](
+        total=total,
+        limit=limit,
+        offset=offset,
+        results=[TalentRollup.model_validate(row) for row in rows],
+    )
+
+
+@router.get("/{person_id}", response_model=TalentRollup)
+async def get_person(person_id: int, db: AsyncSession = Depends(get_rollup_database)):
+    """Career metrics for one person."""
+    row = (
+        await db.execute(select(person_rollup).where(rollup.person_id == person_id))
+    ).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Person not found")
+    return TalentRollup.model_validate(row)
@@ -0,0 +1,76 @@
+"""
+ROI prediction endpoints
+"""
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.connection import get_async_read_database
+from ml.features import compute_features, feature_frames, features_from_records
+from ml.roi import SUCCESS_ROI, roi_models
+
+from ..models.schemas import Prediction, PredictionBatch, PredictionRequest
+
+router = APIRouter(prefix="/predict", tags=["predictions"])
+
+
+@router.post("", response_model=PredictionBatch)
+async def predict(
+    request: PredictionRequest, db: AsyncSession = Depends(get_async_read_database)
+):
+    """Predicted ROI and success probability for stored or described movies."""
+    model = await roi_models.aget()
+    if model is None:
+        raise HTTPException(
+            status_code=503,
+            detail="No ROI model published; run scripts/train_roi_model.py",
+        )
+
+    genre_names = model.spec.genre_names
+    frames = []
+    if request.movie_ids:
+        # Stored movies come from the feature store; ones added since its
+        # last refresh are computed the same way on the fly
+        store = await feature_frames.aget()
+        missing = list(request.movie_ids)
+        if store is not None:
+            stored, missing = store.take(request.movie_ids)
+            frames.append((stored, stored.ids.tolist()))
+        if missing:
+            computed = await db.run_sync(
+                lambda session: compute_features(
+                    session.connection(), missing, genre_names
+                )
+            )
+            frames.append((computed, computed.ids.tolist()))
+    if request.movies:
+        described = features_from_records(
+            [movie.model_dump() for movie in request.movies], genre_names
+        )
+        frames.append((described, [None] * len(described)))
+
+    movie_ids, predicted_roi, probabilities = [], [], []
+    for frame, frame_ids in frames:
+        if not len(frame):
+            continue
+        predictions = model.predict(frame)
+        movie_ids.extend(frame_ids)
+        predicted_roi.extend(predictions["predicted_roi"].tolist())
+        probabilities.extend(predictions["success_probability"].tolist())
+
+    found = {movie_id for movie_id in movie_ids if movie_id is not None}
+    return PredictionBatch(
+        model_version=model.version,
+        predictions=[
+            Prediction(
+                movie_id=movie_id,
+                predicted_roi=round(roi, 2),
+                success_probability=round(probability, 4),
+                is_successful=roi > SUCCESS_ROI,
+            )
+            for movie_id, roi, probability in zip(
+                movie_ids, predicted_roi, probabilities
+            )
+        ],
+        missing=[movie_id for movie_id in request.movie_ids if movie_id not in found],
+    )
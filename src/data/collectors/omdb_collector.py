@@ -3,12 +3,18 @@ OMDb API data collector for ratings and box office data
 """
 import logging
 import os
-import time
+import sys
+from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 import requests
 from dotenv import load_dotenv
 
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from data.profiling import PipelineProfiler
+from data.profiling import profiler as default_profiler
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
@@ -17,10 +23,15 @@ logger = logging.getLogger(__name__)
 class OMDbCollector:
     """Collector for Open Movie Database (OMDb) API."""
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        profiler: Optional[PipelineProfiler] = None,
+    ):
         self.api_key = api_key or os.getenv("OMDB_API_KEY")
         self.base_url = "http://www.omdbapi.com/"
         self.session = requests.Session()
+        self.profiler = profiler or default_profiler
 
         if not self.api_key:
             raise ValueError("OMDb API key is required")
@@ -30,10 +41,14 @@ class OMDbCollector:
         params["apikey"] = self.api_key
 
         try:
-            response = self.session.get(self.base_url, params=params)
+            with self.profiler.span("omdb.request"):
+                response = self.session.get(self.base_url, params=params)
+            self.profiler.count("omdb.requests")
+            self.profiler.count("omdb.bytes", len(response.content))
             response.raise_for_status()
 
-            data = response.json()
+            with self.profiler.span("omdb.parse"):
+                data = response.json()
 
             # Check for API errors
             if data.get("Response") == "False":
@@ -60,9 +75,20 @@ class OMDbCollector:
             params["y"] = str(year)
         return self._make_request(params)
 
-    def search_movies(self, query: str, page: int = 1) -> Dict[str, Any]:
+    def search_movies(
+        self,
+        query: str,
+        page: int = 1,
+        year: Optional[int] = None,
+        type: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """Search for movies by title."""
-        return self._make_request({"s": query, "page": str(page)})
+        params = {"s": query, "page": str(page)}
+        if year:
+            params["y"] = str(year)
+        if type:
+            params["type"] = type
+        return self._make_request(params)
 
     def get_series_by_imdb_id(self, imdb_id: str) -> Dict[str, Any]:
         """Get TV series data by IMDb ID."""
@@ -81,7 +107,7 @@ class OMDbCollector:
                     results.append(movie_data)
 
                 # Rate limiting - OMDb allows 1000 requests per day
-                time.sleep(0.1)
+                self.profiler.sleep(0.1)
 
             except Exception as e:
                 logger.error(f"Error collecting data for IMDb ID {imdb_id}: {e}")
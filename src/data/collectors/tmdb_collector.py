@@ -4,13 +4,19 @@ TMDb API data collector for movies and TV series
 
 import logging
 import os
-import time
+import sys
 from datetime import datetime
+from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 import requests
 from dotenv import load_dotenv
 
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from data.profiling import PipelineProfiler
+from data.profiling import profiler as default_profiler
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
@@ -19,10 +25,15 @@ logger = logging.getLogger(__name__)
 class TMDbCollector:
     """Collector for The Movie Database (TMDb) API."""
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        profiler: Optional[PipelineProfiler] = None,
+    ):
         self.api_key = api_key or os.getenv("TMDB_API_KEY")
         self.base_url = "https://api.themoviedb.org/3"
         self.session = requests.Session()
+        self.profiler = profiler or default_profiler
 
         if not self.api_key:
             raise ValueError("TMDb API key is required")
@@ -38,17 +49,23 @@ class TMDbCollector:
         url = f"{self.base_url}/{endpoint}"
 
         try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
+            with self.profiler.span("tmdb.request", endpoint=endpoint):
+                response = self.session.get(url, params=params)
+            self.profiler.count("tmdb.requests")
+            self.profiler.count("tmdb.bytes", len(response.content))
 
-            # Handle rate limiting
+            # Handle rate limiting (before raise_for_status, which raises on 429)
             if response.status_code == 429:
                 retry_after = int(response.headers.get("Retry-After", 1))
                 logger.warning(f"Rate limited. Waiting {retry_after} seconds...")
-                time.sleep(retry_after)
+                self.profiler.count("retries")
+                self.profiler.sleep(retry_after)
                 return self._make_request(endpoint, params)
 
-            return response.json()
+            response.raise_for_status()
+
+            with self.profiler.span("tmdb.parse"):
+                return response.json()
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Error making request to {url}: {e}")
@@ -65,6 +82,10 @@ class TMDbCollector:
             {"append_to_response": "credits,reviews,keywords,videos"},
         )
 
+    def get_movie_reviews(self, movie_id: int, page: int = 1) -> Dict[str, Any]:
+        """Get a page of user reviews for a movie."""
+        return self._make_request(f"movie/{movie_id}/reviews", {"page": page})
+
     def get_movie_credits(self, movie_id: int) -> Dict[str, Any]:
         """Get cast and crew information for a movie."""
         return self._make_request(f"movie/{movie_id}/credits")
@@ -122,7 +143,7 @@ class TMDbCollector:
             all_movies.extend(response.get("results", []))
 
             # Rate limiting - TMDb allows 40 requests per 10 seconds
-            time.sleep(0.25)
+            self.profiler.sleep(0.25)
 
         return all_movies
 
@@ -137,7 +158,7 @@ class TMDbCollector:
                 detailed_movies.append(movie_details)
 
                 # Rate limiting
-                time.sleep(0.25)
+                self.profiler.sleep(0.25)
 
             except Exception as e:
                 logger.error(f"Error collecting details for movie {movie_id}: {e}")
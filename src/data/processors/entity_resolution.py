@@ -0,0 +1,327 @@
+"""
+Entity resolution between TMDb movies and OMDb records.
+
+TMDb movies without an IMDb ID can't be looked up in OMDb directly, and
+OMDbCollector.get_movie_by_title() is a blind guess that costs quota.
+OMDbResolver matches a movie's title and original title against
+omdb_titles, the OMDb search results seen so far:
+
+- blocking: candidates must share a character trigram of the normalised
+  title (lowercased, without accents, punctuation or a leading or
+  trailing article), found through an inverted trigram index, and be
+  released within YEAR_WINDOW years of the movie;
+- scoring: Dice similarity of the trigram sets, computed for every
+  candidate at once from the index postings, times YEAR_PENALTY when
+  the years differ. The best candidate is accepted from MATCH_THRESHOLD
+  when it beats the runner-up by AMBIGUITY_MARGIN.
+
+Matches are cached in omdb_matches and written to the movie's imdb_id,
+so each movie is resolved once. Only when nothing matches locally does
+the resolver spend OMDb quota, on a search with the release year and
+then one without; the results join omdb_titles for every later lookup.
+Movies whose searches found nothing are not searched again for
+SEARCH_RETRY_DAYS.
+"""
+
+import logging
+import re
+import sys
+import unicodedata
+from datetime import datetime, timedelta
+from itertools import chain
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from data.collectors.omdb_collector import OMDbCollector
+from data.profiling import PipelineProfiler
+from data.profiling import profiler as default_profiler
+from database.models import Movie, OMDbMatch, OMDbTitle
+
+logger = logging.getLogger(__name__)
+
+NGRAM = 3
+YEAR_WINDOW = 1
+YEAR_PENALTY = 0.95
+MATCH_THRESHOLD = 0.85
+AMBIGUITY_MARGIN = 0.05
+SEARCH_RETRY_DAYS = 30
+RECENT_TITLES = 2000
+
+LEADING_ARTICLE = re.compile(r"^(?:the|a|an) ")
+TRAILING_ARTICLE = re.compile(r", (?:the|a|an)$")
+YEAR = re.compile(r"\d{4}")
+
+
+def normalize_title(title: str) -> str:
+    """Lowercase ASCII words of ``title`` without a leading/trailing article."""
+    text = unicodedata.normalize("NFKD", title).encode("ascii", "ignore").decode()
+    text = TRAILING_ARTICLE.sub("", text.lower().strip()).replace("&", " and ")
+    text = " ".join(re.findall(r"[a-z0-9]+", text))
+    return LEADING_ARTICLE.sub("", text)
+
+
+def title_grams(title: str) -> Set[str]:
+    """Character trigrams of the normalised title, padded at word edges."""
+    padded = f" {normalize_title(title)} "
+    return {padded[i : i + NGRAM] for i in range(len(padded) - NGRAM + 1)}
+
+
+def parse_year(value: Optional[str]) -> Optional[int]:
+    """First year in an OMDb ``Year`` such as ``2008`` or ``2008–2013``."""
+    found = YEAR.match(value or "")
+    return int(found.group()) if found else None
+
+
+class TitleIndex:
+    """Inverted trigram index over titles, with their years."""
+
+    def __init__(
+        self,
+        keys: Sequence[str],
+        titles: Sequence[str],
+        years: Sequence[Optional[int]],
+    ):
+        self.keys = list(keys)
+        self.years = np.array(
+            [np.nan if year is None else year for year in years], dtype=np.float64
+        )
+        self.vocabulary: Dict[str, int] = {}
+        grams = [
+            [self.vocabulary.setdefault(gram, len(self.vocabulary)) for gram in found]
+            for found in map(title_grams, titles)
+        ]
+        self.sizes = np.array([len(found) for found in grams], dtype=np.int64)
+        flat = np.fromiter(chain.from_iterable(grams), dtype=np.int64)
+        rows = np.repeat(np.arange(len(self.keys)), self.sizes)
+        # CSR postings: the titles containing gram g are
+        # postings[indptr[g]:indptr[g + 1]]
+        self.postings = rows[np.argsort(flat, kind="stable")]
+        self.indptr = np.zeros(len(self.vocabulary) + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(flat, minlength=len(self.vocabulary)), out=self.indptr[1:]
+        )
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def score(
+        self, title: str, year: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows inside the blocking window for ``title`` and their scores."""
+        grams = title_grams(title)
+        found = [self.vocabulary[gram] for gram in grams if gram in self.vocabulary]
+        if not found:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        postings = np.concatenate(
+            [self.postings[self.indptr[gram] : self.indptr[gram + 1]] for gram in found]
+        )
+        rows, shared = np.unique(postings, return_counts=True)
+        scores = 2.0 * shared / (len(grams) + self.sizes[rows])
+        if year is not None:
+            gap = np.abs(self.years[rows] - year)
+            # Candidates without a year never pass (NaN comparisons are False)
+            block = gap <= YEAR_WINDOW
+            rows, scores = rows[block], scores[block] * np.where(
+                gap[block] > 0, YEAR_PENALTY, 1.0
+            )
+        return rows, scores
+
+
+def best_match(
+    indexes: Sequence[TitleIndex], titles: Sequence[str], year: Optional[int] = None
+) -> Optional[Tuple[str, float]]:
+    """Key and score of the accepted match for any of ``titles``."""
+    scored = [
+        (index, *index.score(title, year)) for index in indexes for title in titles
+    ]
+    scores = np.concatenate([found[2] for found in scored])
+    if not len(scores):
+        return None
+
+    rows = np.concatenate([found[1] for found in scored])
+    source = np.repeat(np.arange(len(scored)), [len(found[1]) for found in scored])
+    # Best and runner-up distinct keys; a key can score under several
+    # titles, or in both indexes after a re-fetch
+    ranked: List[Tuple[str, float]] = []
+    for i in np.argsort(-scores, kind="stable"):
+        key = scored[source[i]][0].keys[rows[i]]
+        if not ranked or key != ranked[0][0]:
+            ranked.append((key, float(scores[i])))
+            if len(ranked) == 2:
+                break
+    best = ranked[0][1]
+    runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+    if best < MATCH_THRESHOLD or best - runner_up < AMBIGUITY_MARGIN:
+        return None
+    return ranked[0]
+
+
+class OMDbResolver:
+    """Resolve TMDb movies without an IMDb ID to OMDb records."""
+
+    def __init__(
+        self,
+        omdb_collector: Optional[OMDbCollector] = None,
+        profiler: Optional[PipelineProfiler] = None,
+        search_budget: Optional[int] = None,
+    ):
+        self.omdb_collector = omdb_collector
+        self.profiler = profiler or default_profiler
+        # OMDb searches this resolver may still make; None: no limit
+        self.search_budget = search_budget
+        self._titles: Optional[Dict[str, Tuple[str, Optional[int]]]] = None
+        # Titles added since the main index was built get a small index of
+        # their own, folded in once there are RECENT_TITLES of them
+        self._index: Optional[TitleIndex] = None
+        self._recent: Dict[str, Tuple[str, Optional[int]]] = {}
+        self._recent_index: Optional[TitleIndex] = None
+
+    def resolve(self, db: Session, movie: Movie, search: bool = True) -> Optional[str]:
+        """
+        IMDb ID matching ``movie``, or None. Accepted matches are cached and
+        written to ``movie.imdb_id`` unless another movie already has it.
+        """
+        match = db.get(OMDbMatch, movie.id)
+        if match is not None and match.imdb_id:
+            self.profiler.count("omdb.match.cached")
+            return self._assign(db, movie, match.imdb_id)
+
+        year = movie.release_date.year if movie.release_date else None
+        titles = [
+            title
+            for title in dict.fromkeys((movie.title, movie.original_title))
+            if title
+        ]
+        found = best_match(self.indexes(db), titles, year)
+        method = "local"
+        if found is None and search and self._may_search(match):
+            for search_year in (year, None) if year else (None,):
+                if not self._search(db, movie.title, search_year):
+                    break
+                method = "search"
+                found = best_match(self.indexes(db), titles, year)
+                if found is not None:
+                    break
+
+        if found is None:
+            self.profiler.count("omdb.match.none")
+            if method == "search":
+                self._record(db, movie, None, None, method)
+            return None
+
+        imdb_id, score = found
+        self.profiler.count(f"omdb.match.{method}")
+        self._record(db, movie, imdb_id, score, method)
+        logger.info(f"Matched {movie.title} to OMDb {imdb_id} ({method}, {score:.2f})")
+        return self._assign(db, movie, imdb_id)
+
+    def indexes(self, db: Session) -> List[TitleIndex]:
+        """Trigram indexes over omdb_titles, including new search results."""
+        if self._titles is None:
+            self._titles = {
+                row.imdb_id: (row.title, row.year)
+                for row in db.execute(
+                    select(OMDbTitle.imdb_id, OMDbTitle.title, OMDbTitle.year)
+                )
+            }
+        if self._index is None or len(self._recent) >= RECENT_TITLES:
+            self._index = self._build(self._titles)
+            self._recent, self._recent_index = {}, None
+        if self._recent and self._recent_index is None:
+            self._recent_index = self._build(self._recent)
+        return [self._index] + ([self._recent_index] if self._recent else [])
+
+    @staticmethod
+    def _build(titles: Dict[str, Tuple[str, Optional[int]]]) -> TitleIndex:
+        keys = list(titles)
+        return TitleIndex(
+            keys, [titles[key][0] for key in keys], [titles[key][1] for key in keys]
+        )
+
+    def add_titles(self, db: Session, records: List[Dict]):
+        """Store OMDb search results (``imdbID``, ``Title``, ``Year``, ``Type``)."""
+        self.indexes(db)
+        fetched_at = datetime.utcnow()
+        records = {
+            record["imdbID"]: record
+            for record in records
+            if record.get("imdbID") and record.get("Title")
+        }
+        for imdb_id, record in records.items():
+            year = parse_year(record.get("Year"))
+            db.merge(
+                OMDbTitle(
+                    imdb_id=imdb_id,
+                    title=record["Title"],
+                    year=year,
+                    type=record.get("Type"),
+                    fetched_at=fetched_at,
+                )
+            )
+            self._titles[imdb_id] = self._recent[imdb_id] = (record["Title"], year)
+        # merge() only finds flushed rows; a later search may return these
+        db.flush()
+        self._recent_index = None
+
+    def _may_search(self, match: Optional[OMDbMatch]) -> bool:
+        if self.omdb_collector is None:
+            return False
+        if match is not None and match.matched_at > datetime.utcnow() - timedelta(
+            days=SEARCH_RETRY_DAYS
+        ):
+            self.profiler.count("omdb.match.recent_miss")
+            return False
+        return True
+
+    def _search(self, db: Session, title: str, year: Optional[int]) -> bool:
+        """Spend one OMDb search on ``title``; False when out of budget."""
+        if self.search_budget is not None:
+            if self.search_budget <= 0:
+                return False
+            self.search_budget -= 1
+        self.profiler.count("omdb.searches")
+        results = self.omdb_collector.search_movies(title, year=year, type="movie")
+        self.add_titles(db, results.get("Search", []))
+        return True
+
+    def _record(
+        self,
+        db: Session,
+        movie: Movie,
+        imdb_id: Optional[str],
+        score: Optional[float],
+        method: str,
+    ):
+        db.merge(
+            OMDbMatch(
+                movie_id=movie.id,
+                imdb_id=imdb_id,
+                score=round(score, 4) if score is not None else None,
+                method=method,
+                matched_at=datetime.utcnow(),
+            )
+        )
+        # Sessions don't autoflush; the next get() must find this row
+        db.flush()
+
+    def _assign(self, db: Session, movie: Movie, imdb_id: str) -> Optional[str]:
+        if movie.imdb_id == imdb_id:
+            return imdb_id
+        owner = db.execute(select(Movie.id).where(Movie.imdb_id == imdb_id)).scalar()
+        if owner is not None and owner != movie.id:
+            self.profiler.count("omdb.match.conflict")
+            logger.warning(
+                f"OMDb match {imdb_id} for {movie.title} already belongs to movie {owner}"
+            )
+            return None
+        movie.imdb_id = imdb_id
+        db.flush()
+        return imdb_id
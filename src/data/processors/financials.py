@@ -0,0 +1,260 @@
+"""
+Inflation-adjusted and currency-normalised movie financials.
+
+Budgets and revenues are stored in nominal money of their release year,
+so totals and rankings across decades mostly measure inflation.
+PriceIndex reads a local index table (price_index.csv, or PRICE_INDEX):
+a ``year,cpi`` row per year plus optional columns named by ISO currency
+code with the US dollars one unit of that currency bought that year.
+factors() turns release years, and currencies, into multipliers to US
+dollars of PRICE_INDEX_BASE_YEAR (the table's last year by default).
+Years outside the table use its first or last row.
+
+FinancialsRefresher stores adjusted_budget, adjusted_revenue and
+adjusted_profit on movies, computed for every stale movie in one
+vectorised pass, and records the index fingerprint in
+price_index_version. Movies are stale when they were adjusted against
+another index, or changed since they were adjusted, so editing the table
+refreshes every movie once and later runs cost a single scan. Refreshed
+movies get a new updated_at, which carries the figures into the read
+model. ROI is the same adjusted or not: budget and revenue share a
+release year.
+"""
+
+import csv
+import hashlib
+import logging
+import os
+import sys
+import time
+from array import array
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Sequence, Union
+
+import numpy as np
+from sqlalchemy import bindparam, func, or_, select, update
+from sqlalchemy.engine import Engine
+
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from database.connection import engine as default_engine
+from database.models import Movie
+
+logger = logging.getLogger(__name__)
+
+PRICE_INDEX_PATH = Path(
+    os.getenv("PRICE_INDEX", str(Path(__file__).with_name("price_index.csv")))
+)
+PRICE_INDEX_BASE_YEAR = os.getenv("PRICE_INDEX_BASE_YEAR")
+# Stored figures are in this currency unless told otherwise
+BASE_CURRENCY = "USD"
+
+
+class PriceIndex:
+    """Consumer price index and exchange rates to US dollars by year."""
+
+    def __init__(
+        self,
+        years: Sequence[int],
+        cpi: Sequence[float],
+        rates: Optional[Mapping[str, Sequence[float]]] = None,
+        base_year: Optional[int] = None,
+        version: str = "",
+    ):
+        order = np.argsort(years)
+        self.years = np.asarray(years, dtype=np.int64)[order]
+        self.cpi = np.asarray(cpi, dtype=np.float64)[order]
+        self.rates = {
+            code.upper(): np.asarray(values, dtype=np.float64)[order]
+            for code, values in (rates or {}).items()
+        }
+        self.base_year = int(self.years[-1] if base_year is None else base_year)
+        self.version = version
+
+    @classmethod
+    def load(
+        cls,
+        path: Union[str, Path] = PRICE_INDEX_PATH,
+        base_year: Optional[Union[int, str]] = PRICE_INDEX_BASE_YEAR,
+    ) -> "PriceIndex":
+        """Read the index table; ``#`` lines are comments, empty cells unknown."""
+        raw = Path(path).read_bytes()
+        rows = list(
+            csv.DictReader(
+                line
+                for line in raw.decode("utf-8").splitlines()
+                if line.strip() and not line.startswith("#")
+            )
+        )
+        if not rows or not {"year", "cpi"} <= set(rows[0]):
+            raise ValueError(f"{path} needs year and cpi columns")
+
+        def column(name: str) -> np.ndarray:
+            return np.array([float(row[name]) if row[name] else np.nan for row in rows])
+
+        # The fingerprint changes with the table or the base year
+        version = hashlib.sha256(raw + f"|{base_year}".encode()).hexdigest()[:16]
+        return cls(
+            column("year").astype(np.int64),
+            column("cpi"),
+            {name: column(name) for name in rows[0] if name not in ("year", "cpi")},
+            int(base_year) if base_year else None,
+            version,
+        )
+
+    def _at(self, values: np.ndarray, years: np.ndarray) -> np.ndarray:
+        index = np.minimum(np.searchsorted(self.years, years), len(self.years) - 1)
+        return values[index]
+
+    def factors(
+        self,
+        years: Sequence[float],
+        currencies: Optional[Sequence[str]] = None,
+    ) -> np.ndarray:
+        """
+        Multiplier from each year's money (US dollars unless ``currencies``
+        says otherwise) to base-year US dollars; NaN for a missing year or a
+        currency without a rate.
+        """
+        years = np.asarray(years, dtype=np.float64)
+        known = np.isfinite(years)
+        at = np.where(known, years, self.base_year).astype(np.int64)
+        factor = self._at(self.cpi, np.int64(self.base_year)) / self._at(self.cpi, at)
+        factor[~known] = np.nan
+        if currencies is None:
+            return factor
+
+        currencies = np.char.upper(np.asarray(currencies, dtype=str))
+        for code in np.unique(currencies):
+            if code == BASE_CURRENCY:
+                continue
+            rows = currencies == code
+            rate = self.rates.get(code)
+            factor[rows] = (
+                np.nan if rate is None else factor[rows] * self._at(rate, at[rows])
+            )
+        return factor
+
+
+def adjust(
+    index: PriceIndex,
+    years: Sequence[float],
+    budget: Sequence[float],
+    revenue: Sequence[float],
+    currencies: Optional[Sequence[str]] = None,
+) -> Dict[str, np.ndarray]:
+    """Adjusted budget, revenue and profit; NaN where a figure is unknown."""
+    factor = index.factors(years, currencies)
+    budget = np.asarray(budget, dtype=np.float64)
+    revenue = np.asarray(revenue, dtype=np.float64)
+    with np.errstate(invalid="ignore"):
+        budget = np.where(budget > 0, budget * factor, np.nan)
+        revenue = np.where(revenue > 0, revenue * factor, np.nan)
+    return {
+        "adjusted_budget": budget,
+        "adjusted_revenue": revenue,
+        "adjusted_profit": revenue - budget,
+    }
+
+
+@lru_cache(maxsize=1)
+def default_price_index() -> PriceIndex:
+    return PriceIndex.load()
+
+
+class FinancialsRefresher:
+    """Keep the adjusted financial columns of movies up to date."""
+
+    def __init__(
+        self,
+        engine: Optional[Engine] = None,
+        index: Optional[PriceIndex] = None,
+        batch_size: int = 10_000,
+    ):
+        self.engine = engine or default_engine
+        self.index = index or default_price_index()
+        self.batch_size = batch_size
+
+    def run(self, full: bool = False) -> Dict[str, int]:
+        """Adjust stale movies (every movie when ``full``)."""
+        started = time.perf_counter()
+        movies = Movie.__table__
+        query = select(
+            movies.c.id, movies.c.release_date, movies.c.budget, movies.c.revenue
+        ).order_by(movies.c.id)
+        if not full:
+            query = query.where(
+                or_(
+                    movies.c.price_index_version.is_(None),
+                    movies.c.price_index_version != self.index.version,
+                    movies.c.adjusted_at.is_(None),
+                    movies.c.updated_at > movies.c.adjusted_at,
+                )
+            )
+
+        ids, years, budget, revenue = array("q"), array("d"), array("d"), array("d")
+        with self.engine.connect() as connection:
+            for row in connection.execution_options(yield_per=self.batch_size).execute(
+                query
+            ):
+                ids.append(row.id)
+                years.append(row.release_date.year if row.release_date else np.nan)
+                budget.append(row.budget or np.nan)
+                revenue.append(row.revenue or np.nan)
+
+        adjusted = adjust(
+            self.index,
+            np.frombuffer(years),
+            np.frombuffer(budget),
+            np.frombuffer(revenue),
+        )
+        # Both stamps from the same clock, so the movie isn't stale again
+        statement = (
+            update(movies)
+            .where(movies.c.id == bindparam("movie_id"))
+            .values(
+                {name: bindparam(f"{name}_value") for name in adjusted}
+                | {
+                    "price_index_version": self.index.version,
+                    "adjusted_at": func.now(),
+                    "updated_at": func.now(),
+                }
+            )
+        )
+        for start in range(0, len(ids), self.batch_size):
+            stop = min(start + self.batch_size, len(ids))
+            rows = [
+                {"movie_id": ids[i]}
+                | {
+                    f"{name}_value": None
+                    if values[i] != values[i]
+                    else round(values[i])
+                    for name, values in adjusted.items()
+                }
+                for i in range(start, stop)
+            ]
+            with self.engine.begin() as connection:
+                connection.execute(statement, rows)
+
+        stats = {
+            "adjusted": len(ids),
+            "with_figures": int(
+                (
+                    np.isfinite(adjusted["adjusted_budget"])
+                    | np.isfinite(adjusted["adjusted_revenue"])
+                ).sum()
+            ),
+        }
+        logger.info(
+            f"Adjusted financials to {self.index.base_year} dollars "
+            f"(index {self.index.version}) in {time.perf_counter() - started:.1f}s: "
+            f"{stats}"
+        )
+        return stats
+
+
+def refresh_financials(full: bool = False, **kwargs) -> Dict[str, int]:
+    """Adjust movies changed since the last run, or all after an index change."""
+    return FinancialsRefresher(**kwargs).run(full=full)
@@ -0,0 +1,344 @@
+"""
+Review sentiment scoring.
+
+Scoring is lexicon-based, in the style of VADER, and runs on CPU only.
+Each lexicon word (sentiment_lexicon.txt, one ``word<TAB>weight`` line on
+a -4..4 scale; SENTIMENT_LEXICON points at another file in that format,
+such as VADER's own) contributes its weight, raised or lowered by an
+intensifier up to three words before it, flipped and damped by a
+negation in the same window, and halved before / increased by half after
+a "but". A review's total is normalised to a compound score in -1..1:
+above COMPOUND_THRESHOLD it counts as positive, below its negative as
+negative, otherwise neutral. Confidence grows with the number of lexicon
+words found.
+
+score_texts() scores a batch with array operations over all of its
+tokens at once. SentimentPipeline scores only reviews not analysed yet,
+a batch of movies at a time with chunks spread across a process pool,
+then inserts one sentiment_analysis row per movie and source (review,
+positive, negative and neutral counts, mean score and confidence) and
+marks those reviews analysed in the same transaction, so a run costs as
+much as the reviews added since the previous one.
+"""
+
+import logging
+import os
+import re
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from itertools import chain
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from sqlalchemy import bindparam, distinct, insert, select, update
+from sqlalchemy.engine import Engine
+
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from database.connection import engine as default_engine
+from database.models import Review, SentimentAnalysis
+
+logger = logging.getLogger(__name__)
+
+LEXICON_PATH = Path(
+    os.getenv(
+        "SENTIMENT_LEXICON", str(Path(__file__).with_name("sentiment_lexicon.txt"))
+    )
+)
+MOVIE_BATCH_SIZE = int(os.getenv("SENTIMENT_MOVIE_BATCH_SIZE", "500"))
+CHUNK_SIZE = 500
+
+TOKEN = re.compile(r"[a-z]+(?:'[a-z]+)?")
+NEGATIONS = frozenset(
+    {
+        "aint",
+        "cannot",
+        "neither",
+        "never",
+        "no",
+        "nobody",
+        "none",
+        "nor",
+        "not",
+        "nothing",
+        "nowhere",
+        "without",
+    }
+)
+# Added to (or, when negative, taken from) the magnitude of the next
+# sentiment words
+INTENSIFIERS = {
+    "absolutely": 0.293,
+    "completely": 0.293,
+    "deeply": 0.293,
+    "especially": 0.293,
+    "extremely": 0.293,
+    "highly": 0.293,
+    "hugely": 0.293,
+    "incredibly": 0.293,
+    "most": 0.293,
+    "really": 0.293,
+    "so": 0.293,
+    "thoroughly": 0.293,
+    "too": 0.293,
+    "totally": 0.293,
+    "truly": 0.293,
+    "utterly": 0.293,
+    "very": 0.293,
+    "barely": -0.293,
+    "hardly": -0.293,
+    "kinda": -0.293,
+    "marginally": -0.293,
+    "occasionally": -0.293,
+    "partly": -0.293,
+    "slightly": -0.293,
+    "somewhat": -0.293,
+}
+# Decay of a modifier's effect with its distance from the sentiment word
+WINDOW_DECAY = (1.0, 0.95, 0.9)
+NEGATION_SCALAR = -0.74
+BUT_BEFORE, BUT_AFTER = 0.5, 1.5
+NORMALIZATION_ALPHA = 15.0
+COMPOUND_THRESHOLD = 0.05
+# Lexicon words for a review's confidence to reach 1 - 1/e
+CONFIDENCE_HITS = 4.0
+# Reviews for a movie's confidence to reach half its reviews' mean
+CONFIDENCE_PRIOR = 2.0
+
+
+class Lexicon:
+    """Sorted vocabulary of sentiment words and modifiers."""
+
+    def __init__(self, weights: Dict[str, float]):
+        words = set(weights) | NEGATIONS | set(INTENSIFIERS) | {"but"}
+        self.words = np.array(sorted(words))
+        self.weight = np.array([weights.get(word, 0.0) for word in self.words])
+        self.boost = np.array([INTENSIFIERS.get(word, 0.0) for word in self.words])
+        self.negation = np.isin(self.words, list(NEGATIONS))
+        self.but = self.words == "but"
+        # Longer tokens can't match, so they are stored one character past
+        # the longest word instead of in full
+        self.width = max(map(len, words)) + 1
+
+    @classmethod
+    def load(cls, path: Union[str, Path] = LEXICON_PATH) -> "Lexicon":
+        """Read ``word<TAB>weight`` lines; extra columns are ignored."""
+        weights = {}
+        with open(path, encoding="utf-8") as lexicon_file:
+            for line in lexicon_file:
+                fields = line.rstrip("\n").split("\t")
+                if len(fields) < 2 or not TOKEN.fullmatch(fields[0]):
+                    continue
+                try:
+                    weights[fields[0]] = float(fields[1])
+                except ValueError:
+                    continue
+        return cls(weights)
+
+    def lookup(self, tokens: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """Weight, intensifier boost, negation and "but" flags per token."""
+        index = np.searchsorted(self.words, tokens)
+        index[index == len(self.words)] = 0
+        found = self.words[index] == tokens
+        negation = np.where(found, self.negation[index], False)
+        negation |= np.char.endswith(tokens, "n't")
+        return (
+            np.where(found, self.weight[index], 0.0),
+            np.where(found, self.boost[index], 0.0),
+            negation,
+            np.where(found, self.but[index], False),
+        )
+
+
+@lru_cache(maxsize=1)
+def default_lexicon() -> Lexicon:
+    return Lexicon.load()
+
+
+def _preceding(values: np.ndarray, position: np.ndarray, distance: int):
+    """``values`` of the token ``distance`` back in the same review."""
+    shifted = np.zeros_like(values)
+    shifted[distance:] = values[:-distance]
+    return np.where(position >= distance, shifted, 0)
+
+
+def score_texts(
+    texts: Sequence[str], lexicon: Optional[Lexicon] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Compound score (-1..1) and confidence (0..1) for each text."""
+    lexicon = lexicon or default_lexicon()
+    documents = [TOKEN.findall(text.lower().replace("’", "'")) for text in texts]
+    lengths = np.fromiter(map(len, documents), dtype=np.int64, count=len(documents))
+    n = len(documents)
+    if not lengths.sum():
+        return np.zeros(n), np.zeros(n)
+
+    tokens = np.array(list(chain.from_iterable(documents)), dtype=f"U{lexicon.width}")
+    review = np.repeat(np.arange(n), lengths)
+    starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    position = np.arange(len(tokens)) - starts
+    weight, boost, negation, but = lexicon.lookup(tokens)
+
+    valence = weight.copy()
+    negated = np.zeros(len(tokens), dtype=bool)
+    for distance, decay in enumerate(WINDOW_DECAY, start=1):
+        valence += np.sign(weight) * _preceding(boost, position, distance) * decay
+        negated |= _preceding(negation, position, distance).astype(bool)
+    valence[negated] *= NEGATION_SCALAR
+
+    # Weight clauses around the first "but" of each review
+    buts = np.cumsum(but)
+    seen_but = buts - np.concatenate(([0], buts))[starts] > 0
+    has_but = np.bincount(review, weights=but, minlength=n) > 0
+    valence *= np.where(seen_but, BUT_AFTER, np.where(has_but[review], BUT_BEFORE, 1.0))
+
+    total = np.bincount(review, weights=valence, minlength=n)
+    hits = np.bincount(review, weights=weight != 0, minlength=n)
+    compound = total / np.sqrt(total * total + NORMALIZATION_ALPHA)
+    return compound, 1.0 - np.exp(-hits / CONFIDENCE_HITS)
+
+
+def _score_chunk(texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    # Runs in pool workers, each loading the lexicon once
+    return score_texts(texts)
+
+
+def aggregate(
+    movie_ids: np.ndarray,
+    sources: np.ndarray,
+    compound: np.ndarray,
+    confidence: np.ndarray,
+    analysis_date: datetime,
+) -> List[Dict]:
+    """One sentiment_analysis row per (movie, source) of the scored reviews."""
+    keys, group = np.unique(
+        np.rec.fromarrays([movie_ids, sources]), return_inverse=True
+    )
+    n = len(keys)
+    count = np.bincount(group, minlength=n)
+    label = np.where(
+        compound > COMPOUND_THRESHOLD,
+        0,
+        np.where(compound < -COMPOUND_THRESHOLD, 1, 2),
+    )
+    labels = np.zeros((n, 3), dtype=np.int64)
+    np.add.at(labels, (group, label), 1)
+    score = np.bincount(group, weights=compound, minlength=n) / count
+    mean_confidence = np.bincount(group, weights=confidence, minlength=n) / count
+    group_confidence = mean_confidence * count / (count + CONFIDENCE_PRIOR)
+    return [
+        {
+            "movie_id": int(key[0]),
+            "source": str(key[1]),
+            "sentiment_score": round(float(score[i]), 4),
+            "confidence": round(float(group_confidence[i]), 4),
+            "review_count": int(count[i]),
+            "positive_mentions": int(labels[i, 0]),
+            "negative_mentions": int(labels[i, 1]),
+            "neutral_mentions": int(labels[i, 2]),
+            "analysis_date": analysis_date,
+        }
+        for i, key in enumerate(keys)
+    ]
+
+
+class SentimentPipeline:
+    """Score new reviews and record per-movie sentiment."""
+
+    def __init__(
+        self,
+        engine: Optional[Engine] = None,
+        workers: Optional[int] = None,
+        batch_size: int = MOVIE_BATCH_SIZE,
+        chunk_size: int = CHUNK_SIZE,
+    ):
+        self.engine = engine or default_engine
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
+
+    def run(self) -> Dict[str, int]:
+        """Score every review not analysed yet."""
+        started = time.perf_counter()
+        analysis_date = datetime.utcnow()
+        stats = {"movies": 0, "reviews": 0, "rows": 0}
+        with self.engine.connect() as connection:
+            movie_ids = list(
+                connection.execute(
+                    select(distinct(Review.movie_id))
+                    .where(Review.analyzed_at.is_(None))
+                    .order_by(Review.movie_id)
+                ).scalars()
+            )
+        if not movie_ids:
+            logger.info("No new reviews to score")
+            return stats
+
+        pool = ProcessPoolExecutor(self.workers) if self.workers > 1 else None
+        try:
+            for start in range(0, len(movie_ids), self.batch_size):
+                batch = movie_ids[start : start + self.batch_size]
+                reviews, rows = self._score_batch(pool, batch, analysis_date)
+                stats["movies"] += len(batch)
+                stats["reviews"] += reviews
+                stats["rows"] += rows
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        elapsed = time.perf_counter() - started
+        logger.info(
+            f"Sentiment scored {stats['reviews']} reviews "
+            f"({stats['reviews'] / max(elapsed, 1e-9):.0f}/s) in {elapsed:.1f}s: {stats}"
+        )
+        return stats
+
+    def _score_batch(
+        self, pool: Optional[Executor], movie_ids: List[int], analysis_date: datetime
+    ) -> Tuple[int, int]:
+        with self.engine.connect() as connection:
+            reviews = connection.execute(
+                select(Review.id, Review.movie_id, Review.source, Review.content)
+                .where(Review.movie_id.in_(movie_ids), Review.analyzed_at.is_(None))
+                .order_by(Review.id)
+            ).all()
+        if not reviews:
+            return 0, 0
+
+        texts = [review.content or "" for review in reviews]
+        chunks = [
+            texts[start : start + self.chunk_size]
+            for start in range(0, len(texts), self.chunk_size)
+        ]
+        scored = list(
+            pool.map(_score_chunk, chunks) if pool else map(_score_chunk, chunks)
+        )
+        compound = np.concatenate([chunk[0] for chunk in scored])
+        confidence = np.concatenate([chunk[1] for chunk in scored])
+
+        rows = aggregate(
+            np.array([review.movie_id for review in reviews], dtype=np.int64),
+            np.array([review.source or "" for review in reviews]),
+            compound,
+            confidence,
+            analysis_date,
+        )
+        with self.engine.begin() as connection:
+            connection.execute(insert(SentimentAnalysis.__table__), rows)
+            connection.execute(
+                update(Review.__table__)
+                .where(Review.__table__.c.id == bindparam("review_id"))
+                .values(analyzed_at=analysis_date),
+                [{"review_id": review.id} for review in reviews],
+            )
+        return len(reviews), len(rows)
+
+
+def analyze_sentiment(**kwargs) -> Dict[str, int]:
+    """Run one incremental sentiment pass."""
+    return SentimentPipeline(**kwargs).run()
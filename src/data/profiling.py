@@ -0,0 +1,224 @@
+"""
+Timing spans and throughput counters for the collection pipeline.
+
+Wrap a unit of work in ``profiler.span("tmdb.request")``. Spans nest, and
+every stage accumulates its call count and total/min/max time; each span
+is also logged at DEBUG as one JSON line with its parent stage and any
+attributes. Counters track items, bytes, cache hits and retries.
+``report()`` logs a per-stage breakdown and ``export()`` writes it as JSON.
+
+``capture_profile()`` optionally runs a block under cProfile or, when it
+is installed, pyinstrument.
+"""
+
+import cProfile
+import io
+import json
+import logging
+import math
+import pstats
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+try:
+    import pyinstrument
+except ImportError:  # pragma: no cover - optional dependency
+    pyinstrument = None
+
+logger = logging.getLogger(__name__)
+
+PROFILERS = ("cprofile", "pyinstrument")
+
+
+@dataclass
+class StageStats:
+    calls: int = 0
+    errors: int = 0
+    total: float = 0.0
+    min: float = math.inf
+    max: float = 0.0
+
+    def add(self, elapsed: float, failed: bool = False):
+        self.calls += 1
+        self.errors += failed
+        self.total += elapsed
+        self.min = min(self.min, elapsed)
+        self.max = max(self.max, elapsed)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_s": round(self.total, 4),
+            "mean_ms": round(self.total / self.calls * 1000, 3) if self.calls else 0,
+            "min_ms": round(self.min * 1000, 3) if self.calls else 0,
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class PipelineProfiler:
+    """Per-stage timings and run-level counters for one collection run."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, StageStats] = defaultdict(StageStats)
+        self.counters: Counter = Counter()
+        self._stack: List[str] = []
+
+    @contextmanager
+    def span(self, stage: str, **attributes) -> Iterator[None]:
+        """Time the enclosed block as ``stage``."""
+        parent = self._stack[-1] if self._stack else None
+        self._stack.append(stage)
+        started = time.perf_counter()
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            self._stack.pop()
+            self.stages[stage].add(elapsed, failed)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    json.dumps(
+                        {
+                            "span": stage,
+                            "parent": parent,
+                            "ms": round(elapsed * 1000, 3),
+                            "failed": failed,
+                            **attributes,
+                        },
+                        default=str,
+                    )
+                )
+
+    def count(self, name: str, value: int = 1):
+        self.counters[name] += value
+
+    def sleep(self, seconds: float, reason: str = "rate_limit"):
+        """time.sleep, recorded as a ``sleep.<reason>`` stage."""
+        with self.span(f"sleep.{reason}", seconds=seconds):
+            time.sleep(seconds)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def throughput(self) -> Dict[str, Any]:
+        elapsed = self.elapsed or 1e-9
+        hits, misses = self.counters["cache.hits"], self.counters["cache.misses"]
+        requests = sum(
+            value for name, value in self.counters.items() if name.endswith(".requests")
+        )
+        response_bytes = sum(
+            value for name, value in self.counters.items() if name.endswith(".bytes")
+        )
+        return {
+            "items": self.counters["items"],
+            "items_per_s": round(self.counters["items"] / elapsed, 3),
+            "requests": requests,
+            "requests_per_s": round(requests / elapsed, 3),
+            "bytes": response_bytes,
+            "bytes_per_s": round(response_bytes / elapsed, 1),
+            "cache_hit_rate": round(hits / (hits + misses), 4)
+            if hits + misses
+            else None,
+            "retries": self.counters["retries"],
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "elapsed_s": round(self.elapsed, 3),
+            "stages": {
+                name: stats.to_dict() for name, stats in sorted(self.stages.items())
+            },
+            "counters": dict(sorted(self.counters.items())),
+            "throughput": self.throughput(),
+        }
+
+    def report(self):
+        """Log the per-stage breakdown, slowest stages first."""
+        elapsed = self.elapsed
+        logger.info(
+            f"Collection run: {elapsed:.2f}s (stages nest, so shares overlap)\n"
+            f"{'stage':<24} {'calls':>7} {'total s':>9} {'share':>7} "
+            f"{'mean ms':>9} {'max ms':>9}"
+        )
+        for name, stats in sorted(self.stages.items(), key=lambda item: -item[1].total):
+            logger.info(
+                f"{name:<24} {stats.calls:>7} {stats.total:>9.3f} "
+                f"{stats.total / elapsed:>7.1%} "
+                f"{stats.total / stats.calls * 1000:>9.2f} {stats.max * 1000:>9.2f}"
+            )
+        throughput = self.throughput()
+        hit_rate = throughput["cache_hit_rate"]
+        logger.info(
+            f"{throughput['items']} items ({throughput['items_per_s']}/s), "
+            f"{throughput['requests']} requests, "
+            f"{throughput['bytes'] / 1024:.1f} KiB received, "
+            f"{throughput['retries']} retries, cache hit rate "
+            + (f"{hit_rate:.1%}" if hit_rate is not None else "n/a")
+        )
+
+    def export(self, path: Union[str, Path]):
+        Path(path).write_text(json.dumps(self.to_dict(), indent=2))
+        logger.info(f"Timings written to {path}")
+
+
+# Shared by the collectors and the pipeline unless one is passed in
+profiler = PipelineProfiler()
+
+
+@contextmanager
+def capture_profile(
+    kind: Optional[str], output: Optional[Union[str, Path]] = None
+) -> Iterator[None]:
+    """
+    Profile the enclosed block with ``kind`` ("cprofile" or "pyinstrument";
+    None does nothing). cProfile stats are dumped to ``output`` (a .prof
+    file for snakeviz/pstats), pyinstrument writes an HTML report there;
+    both log a text summary.
+    """
+    if kind is None:
+        yield
+        return
+    if kind not in PROFILERS:
+        raise ValueError(f"Unknown profiler {kind!r}, expected one of {PROFILERS}")
+
+    if kind == "pyinstrument":
+        if pyinstrument is None:
+            raise RuntimeError(
+                "pyinstrument is not installed (pip install pyinstrument)"
+            )
+        sampler = pyinstrument.Profiler()
+        sampler.start()
+        try:
+            yield
+        finally:
+            sampler.stop()
+            if output:
+                Path(output).write_text(sampler.output_html())
+            logger.info(sampler.output_text(unicode=True, color=False))
+        return
+
+    tracer = cProfile.Profile()
+    tracer.enable()
+    try:
+        yield
+    finally:
+        tracer.disable()
+        if output:
+            tracer.dump_stats(str(output))
+        summary = io.StringIO()
+        pstats.Stats(tracer, stream=summary).sort_stats("cumulative").print_stats(25)
+        logger.info(summary.getvalue())
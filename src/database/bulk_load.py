@@ -0,0 +1,533 @@
+"""
+Bulk loader for initial catalogue loads.
+
+TMDb movie records, as returned by get_movie_details() with credits appended,
+are flattened in a single streaming pass into staging tables. On PostgreSQL
+the staging rows are written with COPY ... FROM STDIN; other databases
+use executemany. Set-based INSERT ... SELECT statements then merge the
+staging tables into movies, people, genres, movies_genres, companies,
+movies_companies, movie_cast and movie_crew inside one transaction, so a
+failed load leaves nothing behind. A record's genres, companies and
+credits replace the movie's existing links, so links dropped upstream are
+removed.
+"""
+
+import io
+import json
+import logging
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    delete,
+    exists,
+    func,
+    select,
+    true,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection, Engine
+
+from .connection import engine as default_engine
+from .models import (
+    Company,
+    Genre,
+    Movie,
+    Person,
+    movie_cast_association,
+    movie_company_association,
+    movie_crew_association,
+    movie_genre_association,
+)
+
+logger = logging.getLogger(__name__)
+
+MOVIE_FIELDS = (
+    "tmdb_id",
+    "imdb_id",
+    "title",
+    "original_title",
+    "overview",
+    "release_date",
+    "runtime",
+    "budget",
+    "revenue",
+    "popularity",
+    "vote_average",
+    "vote_count",
+    "poster_path",
+    "backdrop_path",
+    "adult",
+    "video",
+    "status",
+    "tagline",
+    "homepage",
+    "original_language",
+)
+
+PERSON_FIELDS = (
+    "tmdb_id",
+    "name",
+    "gender",
+    "popularity",
+    "profile_path",
+    "adult",
+    "known_for_department",
+)
+
+staging = MetaData()
+
+
+def _staging_table(name: str, *columns: Column) -> Table:
+    return Table(
+        name,
+        staging,
+        *columns,
+        prefixes=["TEMPORARY"],
+        postgresql_on_commit="DROP",
+    )
+
+
+stage_movies = _staging_table(
+    "stage_movies",
+    *[
+        Column(column.name, column.type)
+        for column in Movie.__table__.columns
+        if column.name in MOVIE_FIELDS
+    ],
+    # Whether the record listed credits, genres and production companies;
+    # a movie's existing rows are only replaced from a list it carried
+    Column("has_credits", Boolean),
+    Column("has_genres", Boolean),
+    Column("has_companies", Boolean),
+)
+stage_people = _staging_table(
+    "stage_people",
+    *[
+        Column(column.name, column.type)
+        for column in Person.__table__.columns
+        if column.name in PERSON_FIELDS
+    ],
+)
+stage_genres = _staging_table(
+    "stage_genres", Column("tmdb_id", Integer), Column("name", String(100))
+)
+stage_movie_genres = _staging_table(
+    "stage_movie_genres",
+    Column("movie_tmdb_id", Integer),
+    Column("genre_tmdb_id", Integer),
+)
+stage_companies = _staging_table(
+    "stage_companies",
+    Column("tmdb_id", Integer),
+    Column("name", String(255)),
+    Column("origin_country", String(10)),
+)
+stage_movie_companies = _staging_table(
+    "stage_movie_companies",
+    Column("movie_tmdb_id", Integer),
+    Column("company_tmdb_id", Integer),
+)
+stage_cast = _staging_table(
+    "stage_cast",
+    Column("movie_tmdb_id", Integer),
+    Column("person_tmdb_id", Integer),
+    Column("character_name", String(255)),
+    Column("order", Integer),
+)
+stage_crew = _staging_table(
+    "stage_crew",
+    Column("movie_tmdb_id", Integer),
+    Column("person_tmdb_id", Integer),
+    Column("job", String(100)),
+    Column("department", String(100)),
+)
+
+STAGING_TABLES = (
+    stage_movies,
+    stage_people,
+    stage_genres,
+    stage_movie_genres,
+    stage_companies,
+    stage_movie_companies,
+    stage_cast,
+    stage_crew,
+)
+
+
+def parse_date(value: Optional[str]) -> Optional[datetime]:
+    """Parse a TMDb YYYY-MM-DD date; empty or malformed values become None."""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        return None
+
+
+COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def copy_value(value: Any) -> str:
+    """Encode one field for COPY's text format (\\N is NULL)."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    return str(value).translate(COPY_ESCAPES)
+
+
+def iter_json_records(paths: Iterable[Union[str, Path]]) -> Iterator[Dict[str, Any]]:
+    """
+    Stream movie records from JSON files.
+
+    ``.jsonl`` files hold one record per line. ``.json`` files hold a list of
+    records or an API page with a ``results`` list.
+    """
+    for path in map(Path, paths):
+        with path.open(encoding="utf-8") as handle:
+            if path.suffix == ".jsonl":
+                for line in handle:
+                    if line.strip():
+                        yield json.loads(line)
+                continue
+            data = json.load(handle)
+        if isinstance(data, dict):
+            data = data.get("results", [data])
+        yield from data
+
+
+class _Flattener:
+    """Turn nested movie records into staging rows, dropping duplicate keys."""
+
+    def __init__(self):
+        self.movies = set()
+        self.imdb_ids = set()
+        self.people = set()
+        self.genres = set()
+        self.companies = set()
+
+    def rows(self, record: Dict[str, Any]) -> Iterator[tuple]:
+        """Yield (staging table, row) pairs for one record."""
+        movie_id = record.get("id")
+        if movie_id is None or not record.get("title") or movie_id in self.movies:
+            return
+        self.movies.add(movie_id)
+
+        imdb_id = record.get("imdb_id") or None
+        if imdb_id in self.imdb_ids:
+            imdb_id = None
+        elif imdb_id:
+            self.imdb_ids.add(imdb_id)
+
+        credits = record.get("credits")
+        movie = {field: record.get(field) for field in MOVIE_FIELDS[2:]}
+        movie.update(
+            tmdb_id=movie_id,
+            imdb_id=imdb_id,
+            release_date=parse_date(record.get("release_date")),
+            adult=bool(record.get("adult", False)),
+            video=bool(record.get("video", False)),
+            has_credits=credits is not None,
+            has_genres=record.get("genres") is not None,
+            has_companies=record.get("production_companies") is not None,
+        )
+        yield stage_movies, movie
+
+        for genre in record.get("genres") or ():
+            if genre["id"] not in self.genres:
+                self.genres.add(genre["id"])
+                yield stage_genres, {"tmdb_id": genre["id"], "name": genre["name"]}
+            yield stage_movie_genres, {
+                "movie_tmdb_id": movie_id,
+                "genre_tmdb_id": genre["id"],
+            }
+
+        companies_seen = set()
+        for company in record.get("production_companies") or ():
+            if company["id"] not in self.companies and company.get("name"):
+                self.companies.add(company["id"])
+                yield stage_companies, {
+                    "tmdb_id": company["id"],
+                    "name": company["name"],
+                    "origin_country": company.get("origin_country") or None,
+                }
+            if company["id"] not in companies_seen:
+                companies_seen.add(company["id"])
+                yield stage_movie_companies, {
+                    "movie_tmdb_id": movie_id,
+                    "company_tmdb_id": company["id"],
+                }
+
+        credits = credits or {}
+        cast_seen = set()
+        for member in credits.get("cast") or ():
+            yield from self._person(member)
+            # One row per (movie, person); keep the top-billed character
+            if member["id"] not in cast_seen:
+                cast_seen.add(member["id"])
+                yield stage_cast, {
+                    "movie_tmdb_id": movie_id,
+                    "person_tmdb_id": member["id"],
+                    "character_name": member.get("character"),
+                    "order": member.get("order"),
+                }
+
+        crew_seen = set()
+        for member in credits.get("crew") or ():
+            yield from self._person(member)
+            key = (member["id"], member.get("job") or "")
+            if key not in crew_seen:
+                crew_seen.add(key)
+                yield stage_crew, {
+                    "movie_tmdb_id": movie_id,
+                    "person_tmdb_id": member["id"],
+                    "job": key[1],
+                    "department": member.get("department"),
+                }
+
+    def _person(self, member: Dict[str, Any]) -> Iterator[tuple]:
+        if member["id"] in self.people or not member.get("name"):
+            return
+        self.people.add(member["id"])
+        person = {field: member.get(field) for field in PERSON_FIELDS[1:]}
+        person.update(tmdb_id=member["id"], adult=bool(member.get("adult", False)))
+        yield stage_people, person
+
+
+class BulkLoader:
+    """Stage and merge movie records into the catalogue tables."""
+
+    def __init__(self, bind: Optional[Engine] = None, batch_size: int = 50_000):
+        self.bind = bind or default_engine
+        self.batch_size = batch_size
+
+    def load(self, records: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """Load ``records``; return staged/merged row counts per table."""
+        started = time.perf_counter()
+        with self.bind.begin() as connection:
+            for table in STAGING_TABLES:
+                table.drop(connection, checkfirst=True)
+                table.create(connection)
+            try:
+                stats = self._stage(connection, records)
+                stats.update(self._merge(connection))
+            finally:
+                if connection.dialect.name != "postgresql":
+                    # PostgreSQL drops them on commit
+                    for table in STAGING_TABLES:
+                        table.drop(connection, checkfirst=True)
+
+        logger.info(
+            f"Bulk load finished in {time.perf_counter() - started:.1f}s: {stats}"
+        )
+        return stats
+
+    def load_files(self, paths: Iterable[Union[str, Path]]) -> Dict[str, int]:
+        return self.load(iter_json_records(paths))
+
+    # Staging
+
+    def _stage(self, connection: Connection, records) -> Dict[str, int]:
+        flattener = _Flattener()
+        buffers: Dict[Table, List[Dict[str, Any]]] = {t: [] for t in STAGING_TABLES}
+        counts = {table.name: 0 for table in STAGING_TABLES}
+
+        for record in records:
+            for table, row in flattener.rows(record):
+                buffer = buffers[table]
+                buffer.append(row)
+                if len(buffer) >= self.batch_size:
+                    self._write(connection, table, buffer)
+                    counts[table.name] += len(buffer)
+                    buffer.clear()
+
+        for table, buffer in buffers.items():
+            if buffer:
+                self._write(connection, table, buffer)
+                counts[table.name] += len(buffer)
+        return counts
+
+    def _write(self, connection: Connection, table: Table, rows: List[Dict]):
+        if connection.dialect.driver == "psycopg2":
+            self._copy(connection, table, rows)
+        else:
+            connection.execute(table.insert(), rows)
+
+    def _copy(self, connection: Connection, table: Table, rows: List[Dict]):
+        """COPY ``rows`` into ``table`` in PostgreSQL text format (psycopg2)."""
+        names = [column.name for column in table.columns]
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write("\t".join(copy_value(row.get(name)) for name in names))
+            buffer.write("\n")
+        buffer.seek(0)
+
+        quote = connection.dialect.identifier_preparer.quote
+        columns = ", ".join(quote(name) for name in names)
+        cursor = connection.connection.dbapi_connection.cursor()
+        try:
+            cursor.copy_expert(f"COPY {table.name} ({columns}) FROM STDIN", buffer)
+        finally:
+            cursor.close()
+
+    # Merging
+
+    def _merge(self, connection: Connection) -> Dict[str, int]:
+        dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+        if dialect is postgresql:
+            # Autovacuum never analyzes temporary tables
+            for table in STAGING_TABLES:
+                connection.exec_driver_sql(f"ANALYZE {table.name}")
+
+        movies, people = Movie.__table__, Person.__table__
+        genres, companies = Genre.__table__, Company.__table__
+        merged, removed = {}, {}
+
+        insert = dialect.insert(genres).from_select(
+            ["tmdb_id", "name"],
+            select(stage_genres.c.tmdb_id, stage_genres.c.name).where(true()),
+        )
+        merged["genres"] = connection.execute(insert.on_conflict_do_nothing()).rowcount
+        insert = dialect.insert(companies).from_select(
+            ["tmdb_id", "name", "origin_country"],
+            select(
+                stage_companies.c.tmdb_id,
+                stage_companies.c.name,
+                stage_companies.c.origin_country,
+            ).where(true()),
+        )
+        merged["companies"] = connection.execute(
+            insert.on_conflict_do_nothing()
+        ).rowcount
+
+        # An imdb_id already held by a different movie would abort the upsert
+        connection.execute(
+            update(stage_movies)
+            .where(
+                exists().where(
+                    movies.c.imdb_id == stage_movies.c.imdb_id,
+                    movies.c.tmdb_id.is_distinct_from(stage_movies.c.tmdb_id),
+                )
+            )
+            .values(imdb_id=None)
+        )
+        merged["movies"] = self._upsert(
+            connection, dialect, movies, stage_movies, MOVIE_FIELDS
+        )
+        merged["people"] = self._upsert(
+            connection, dialect, people, stage_people, PERSON_FIELDS
+        )
+
+        for association, stage, flag, target, keys in (
+            (
+                movie_genre_association,
+                stage_movie_genres,
+                stage_movies.c.has_genres,
+                genres,
+                ("genre_id", "genre_tmdb_id"),
+            ),
+            (
+                movie_company_association,
+                stage_movie_companies,
+                stage_movies.c.has_companies,
+                companies,
+                ("company_id", "company_tmdb_id"),
+            ),
+        ):
+            link, staged_key = keys
+            # Drop links the record no longer lists, then add the new ones
+            listed = (
+                select(movies.c.id)
+                .join(stage_movies, stage_movies.c.tmdb_id == movies.c.tmdb_id)
+                .where(flag)
+            )
+            removed[association.name] = connection.execute(
+                delete(association).where(
+                    association.c.movie_id.in_(listed),
+                    ~exists().where(
+                        movies.c.id == association.c.movie_id,
+                        stage.c.movie_tmdb_id == movies.c.tmdb_id,
+                        target.c.id == association.c[link],
+                        stage.c[staged_key] == target.c.tmdb_id,
+                    ),
+                )
+            ).rowcount
+            insert = dialect.insert(association).from_select(
+                ["movie_id", link],
+                select(movies.c.id, target.c.id)
+                .select_from(stage)
+                .join(movies, movies.c.tmdb_id == stage.c.movie_tmdb_id)
+                .join(target, target.c.tmdb_id == stage.c[staged_key])
+                .where(true()),
+            )
+            merged[association.name] = connection.execute(
+                insert.on_conflict_do_nothing()
+            ).rowcount
+
+        # Records that carried credits replace the movie's existing credits
+        reloaded = (
+            select(movies.c.id)
+            .join(stage_movies, stage_movies.c.tmdb_id == movies.c.tmdb_id)
+            .where(stage_movies.c.has_credits)
+        )
+        for association, stage, extra in (
+            (movie_cast_association, stage_cast, ("character_name", "order")),
+            (movie_crew_association, stage_crew, ("job", "department")),
+        ):
+            connection.execute(
+                delete(association).where(association.c.movie_id.in_(reloaded))
+            )
+            insert = dialect.insert(association).from_select(
+                ["movie_id", "person_id", *extra],
+                select(movies.c.id, people.c.id, *[stage.c[name] for name in extra])
+                .select_from(stage)
+                .join(movies, movies.c.tmdb_id == stage.c.movie_tmdb_id)
+                .join(people, people.c.tmdb_id == stage.c.person_tmdb_id)
+                .where(true()),
+            )
+            merged[association.name] = connection.execute(
+                insert.on_conflict_do_nothing()
+            ).rowcount
+
+        if dialect is postgresql:
+            for name in (
+                "movies",
+                "people",
+                "movies_genres",
+                "movies_companies",
+                "movie_cast",
+                "movie_crew",
+            ):
+                connection.exec_driver_sql(f"ANALYZE {name}")
+        stats = {f"merged_{name}": count for name, count in merged.items()}
+        stats.update({f"removed_{name}": count for name, count in removed.items()})
+        return stats
+
+    def _upsert(self, connection, dialect, target: Table, stage: Table, fields):
+        """Insert new rows by tmdb_id and refresh the fields of existing ones."""
+        insert = dialect.insert(target).from_select(
+            list(fields), select(*[stage.c[name] for name in fields]).where(true())
+        )
+        updates = {name: insert.excluded[name] for name in fields if name != "tmdb_id"}
+        updates["updated_at"] = func.now()
+        insert = insert.on_conflict_do_update(index_elements=["tmdb_id"], set_=updates)
+        return connection.execute(insert).rowcount
+
+
+def bulk_load_files(
+    paths: Iterable[Union[str, Path]],
+    bind: Optional[Engine] = None,
+    batch_size: int = 50_000,
+) -> Dict[str, int]:
+    """Load JSON/JSONL movie files; see BulkLoader."""
+    return BulkLoader(bind, batch_size).load_files(paths)
@@ -0,0 +1,77 @@
+"""
+Add the inflation-adjusted financial columns to movies and the movie
+read model (see data/processors/financials.py).
+
+Fresh databases get them from create_tables() and the read model sync.
+This migration brings an existing database up to date and is safe to
+run repeatedly; run scripts/adjust_financials.py afterwards to fill them:
+
+    python src/database/migrations/adjusted_financials.py
+"""
+
+import logging
+import sys
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import Table, inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateColumn
+
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from database.connection import engine as default_engine
+from database.models import Movie
+from database.read_model import get_read_model_engine, movie_read_model
+
+logger = logging.getLogger(__name__)
+
+ADJUSTED_COLUMNS = (
+    "adjusted_budget",
+    "adjusted_revenue",
+    "adjusted_profit",
+    "price_index_version",
+    "adjusted_at",
+)
+
+
+def add_missing_columns(connection: Connection, table: Table) -> int:
+    """Add the adjusted columns ``table`` defines but lacks, with their indexes."""
+    inspector = inspect(connection)
+    if table.name not in inspector.get_table_names():
+        return 0
+    existing = {column["name"] for column in inspector.get_columns(table.name)}
+    q = connection.dialect.identifier_preparer.quote
+    added = 0
+    for name in ADJUSTED_COLUMNS:
+        if name not in table.c or name in existing:
+            continue
+        column = CreateColumn(table.c[name]).compile(dialect=connection.dialect)
+        connection.execute(text(f"ALTER TABLE {q(table.name)} ADD COLUMN {column}"))
+        added += 1
+    for index in table.indexes:
+        if any(column.name in ADJUSTED_COLUMNS for column in index.columns):
+            index.create(connection, checkfirst=True)
+    return added
+
+
+def upgrade(
+    bind: Optional[Engine] = None, read_model_bind: Optional[Engine] = None
+) -> None:
+    """Apply the migration (idempotent)."""
+    for engine, table in (
+        (bind or default_engine, Movie.__table__),
+        (read_model_bind or get_read_model_engine(), movie_read_model),
+    ):
+        with engine.begin() as connection:
+            added = add_missing_columns(connection, table)
+        if added:
+            logger.info(f"Added {added} adjusted columns to {table.name}")
+
+    logger.info("Adjusted financial columns are up to date")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    upgrade()
@@ -0,0 +1,117 @@
+"""
+Add composite primary keys to the association tables and the missing
+foreign-key / sort-column indexes.
+
+Fresh databases get all of this from create_tables(). This migration
+brings an existing database up to date and is safe to run repeatedly:
+
+    python src/database/migrations/association_keys.py
+"""
+
+import logging
+import sys
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import Table, inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from database.connection import engine as default_engine
+from database.models import (
+    Base,
+    movie_cast_association,
+    movie_crew_association,
+    movie_genre_association,
+)
+
+logger = logging.getLogger(__name__)
+
+ASSOCIATION_TABLES = (
+    movie_genre_association,
+    movie_cast_association,
+    movie_crew_association,
+)
+
+INDEXED_TABLES = ("movies", "ratings", "box_office")
+
+
+def rebuild_with_primary_key(connection: Connection, table: Table) -> int:
+    """
+    Copy ``table`` into a new table with its composite primary key.
+
+    Rows with a NULL key are dropped and duplicate keys are collapsed
+    (SQLite cannot add a primary key in place, so both dialects rebuild).
+    Returns the number of rows kept.
+    """
+    old_name = f"{table.name}_old"
+    q = connection.dialect.identifier_preparer.quote
+
+    connection.execute(text(f"ALTER TABLE {q(table.name)} RENAME TO {q(old_name)}"))
+    table.create(connection)
+
+    keys, selected = [], []
+    for column in table.columns:
+        name = q(column.name)
+        if not column.primary_key:
+            selected.append(f"MIN({name})")
+            continue
+        if column.default is not None:
+            # e.g. movie_crew.job: NULL becomes '' so the row keeps a key
+            name = f"COALESCE({name}, '{column.default.arg}')"
+        keys.append(name)
+        selected.append(name)
+    not_null = " AND ".join(
+        f"{q(c.name)} IS NOT NULL"
+        for c in table.columns
+        if c.primary_key and c.default is None
+    )
+    columns = ", ".join(q(c.name) for c in table.columns)
+
+    connection.execute(
+        text(
+            f"INSERT INTO {q(table.name)} ({columns}) "
+            f"SELECT {', '.join(selected)} FROM {q(old_name)} "
+            f"WHERE {not_null} GROUP BY {', '.join(keys)}"
+        )
+    )
+    connection.execute(text(f"DROP TABLE {q(old_name)}"))
+    return connection.execute(
+        text(f"SELECT COUNT(*) FROM {q(table.name)}")
+    ).scalar_one()
+
+
+def upgrade(bind: Optional[Engine] = None) -> None:
+    """Apply the migration (idempotent)."""
+    bind = bind or default_engine
+
+    with bind.begin() as connection:
+        inspector = inspect(connection)
+        existing = set(inspector.get_table_names())
+
+        for table in ASSOCIATION_TABLES:
+            if table.name not in existing:
+                table.create(connection)
+                continue
+            if inspector.get_pk_constraint(table.name)["constrained_columns"]:
+                continue
+            kept = rebuild_with_primary_key(connection, table)
+            logger.info(f"Rebuilt {table.name} with a primary key ({kept} rows)")
+
+        for name in INDEXED_TABLES:
+            if name not in existing:
+                continue
+            for index in Base.metadata.tables[name].indexes:
+                index.create(connection, checkfirst=True)
+
+        # Refresh planner statistics so the new indexes are actually chosen
+        connection.execute(text("ANALYZE"))
+
+    logger.info("Association keys and indexes are up to date")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    upgrade()
@@ -4,15 +4,19 @@ Database models for CineMetrics platform
 from datetime import datetime
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     Column,
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Table,
     Text,
+    UniqueConstraint,
+    text,
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
@@ -20,30 +24,44 @@ from sqlalchemy.sql import func
 
 Base = declarative_base()
 
-# Associate tables for many-to-many relationships
+# Associate tables for many-to-many relationships. The composite primary
+# key serves lookups from the movie side; the reverse index serves lookups
+# from the genre/person side. See migrations/association_keys.py.
 movie_genre_association = Table(
     "movies_genres",
     Base.metadata,
-    Column("movie_id", Integer, ForeignKey("movies.id")),
-    Column("genre_id", Integer, ForeignKey("genres.id")),
+    Column("movie_id", Integer, ForeignKey("movies.id"), primary_key=True),
+    Column("genre_id", Integer, ForeignKey("genres.id"), primary_key=True),
+    Index("ix_movies_genres_genre_id_movie_id", "genre_id", "movie_id"),
+)
+
+movie_company_association = Table(
+    "movies_companies",
+    Base.metadata,
+    Column("movie_id", Integer, ForeignKey("movies.id"), primary_key=True),
+    Column("company_id", Integer, ForeignKey("companies.id"), primary_key=True),
+    Index("ix_movies_companies_company_id_movie_id", "company_id", "movie_id"),
 )
 
 movie_cast_association = Table(
     "movie_cast",
     Base.metadata,
-    Column("movie_id", Integer, ForeignKey("movies.id")),
-    Column("person_id", Integer, ForeignKey("people.id")),
+    Column("movie_id", Integer, ForeignKey("movies.id"), primary_key=True),
+    Column("person_id", Integer, ForeignKey("people.id"), primary_key=True),
     Column("character_name", String(255)),
     Column("order", Integer),
+    Index("ix_movie_cast_person_id_movie_id", "person_id", "movie_id"),
 )
 
 movie_crew_association = Table(
     "movie_crew",
     Base.metadata,
-    Column("movie_id", Integer, ForeignKey("movies.id")),
-    Column("person_id", Integer, ForeignKey("people.id")),
-    Column("job", String(100)),
+    Column("movie_id", Integer, ForeignKey("movies.id"), primary_key=True),
+    Column("person_id", Integer, ForeignKey("people.id"), primary_key=True),
+    # One row per job: the same person can direct and write a movie
+    Column("job", String(100), primary_key=True, default=""),
     Column("department", String(100)),
+    Index("ix_movie_crew_person_id_movie_id", "person_id", "movie_id"),
 )
 
 
@@ -56,12 +74,12 @@ class Movie(Base):
     title = Column(String(255), nullable=False, index=True)
     original_title = Column(String(255))
     overview = Column(Text)
-    release_date = Column(DateTime)  # Fixed: DataTime -> DateTime
+    release_date = Column(DateTime, index=True)  # Fixed: DataTime -> DateTime
     runtime = Column(Integer)
-    budget = Column(Integer)
-    revenue = Column(Integer)  # Fixed: revenuew -> revenue
+    budget = Column(Integer, index=True)
+    revenue = Column(Integer, index=True)  # Fixed: revenuew -> revenue
     popularity = Column(Float)
-    vote_average = Column(Float)
+    vote_average = Column(Float, index=True)
     vote_count = Column(Integer)
     poster_path = Column(String(255))
     backdrop_path = Column(String(255))
@@ -72,6 +90,14 @@ class Movie(Base):
     homepage = Column(String(500))
     original_language = Column(String(10))
 
+    # Constant dollars of the price index base year, filled in by
+    # data.processors.financials
+    adjusted_budget = Column(BigInteger, index=True)
+    adjusted_revenue = Column(BigInteger, index=True)
+    adjusted_profit = Column(BigInteger)
+    price_index_version = Column(String(16))
+    adjusted_at = Column(DateTime)
+
     # Timestamps
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
@@ -86,7 +112,11 @@ class Movie(Base):
     crew = relationship(
         "Person", secondary=movie_crew_association, back_populates="crew_movies"
     )  # Fixed: back_poplates -> back_populates
+    companies = relationship(
+        "Company", secondary=movie_company_association, back_populates="movies"
+    )
     ratings = relationship("Rating", back_populates="movie")
+    reviews = relationship("Review", back_populates="movie")
     box_office = relationship("BoxOffice", back_populates="movie", uselist=False)
 
 
@@ -163,11 +193,26 @@ class Genre(Base):
     )
 
 
+# Production companies (studios), from TMDb's production_companies
+class Company(Base):
+    __tablename__ = "companies"
+
+    id = Column(Integer, primary_key=True, index=True)
+    tmdb_id = Column(Integer, unique=True, index=True)
+    name = Column(String(255), nullable=False, index=True)
+    origin_country = Column(String(10))
+
+    # Relationships
+    movies = relationship(
+        "Movie", secondary=movie_company_association, back_populates="companies"
+    )
+
+
 class Rating(Base):
     __tablename__ = "ratings"
 
     id = Column(Integer, primary_key=True, index=True)
-    movie_id = Column(Integer, ForeignKey("movies.id"))
+    movie_id = Column(Integer, ForeignKey("movies.id"), index=True)
     source = Column(String(50), nullable=False)  # imdb, rotten_tomatoes, metacritic
     value = Column(String(50), nullable=False)
     votes = Column(Integer)
@@ -184,7 +229,9 @@ class BoxOffice(Base):
     __tablename__ = "box_office"
 
     id = Column(Integer, primary_key=True, index=True)
-    movie_id = Column(Integer, ForeignKey("movies.id"))  # Fixed: moveis -> movies
+    movie_id = Column(
+        Integer, ForeignKey("movies.id"), index=True
+    )  # Fixed: moveis -> movies
     domestic_gross = Column(Integer)
     international_gross = Column(Integer)
     worldwide_gross = Column(Integer)
@@ -199,6 +246,59 @@ class BoxOffice(Base):
     movie = relationship("Movie", back_populates="box_office")
 
 
+class Review(Base):
+    __tablename__ = "reviews"
+    __table_args__ = (
+        UniqueConstraint("source", "external_id"),
+        # Serves the sentiment pipeline's lookup of reviews not yet scored
+        Index(
+            "ix_reviews_pending_movie_id",
+            "movie_id",
+            postgresql_where=text("analyzed_at IS NULL"),
+            sqlite_where=text("analyzed_at IS NULL"),
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    movie_id = Column(Integer, ForeignKey("movies.id"), nullable=False, index=True)
+    source = Column(String(50), nullable=False)  # tmdb
+    external_id = Column(String(100), nullable=False)
+    author = Column(String(255))
+    author_rating = Column(Float)  # 0 to 10, when the author gave one
+    content = Column(Text, nullable=False)
+    published_at = Column(DateTime)
+    analyzed_at = Column(DateTime)  # set once scored by data.processors.sentiment
+
+    # Timestamps
+    created_at = Column(DateTime, server_default=func.now())
+
+    # Relationships
+    movie = relationship("Movie", back_populates="reviews")
+
+
+# OMDb entity resolution for movies without an IMDb ID (see
+# data/processors/entity_resolution.py). omdb_titles keeps every OMDb
+# search result seen, so later lookups can match locally.
+class OMDbTitle(Base):
+    __tablename__ = "omdb_titles"
+
+    imdb_id = Column(String(20), primary_key=True)
+    title = Column(String(255), nullable=False)
+    year = Column(Integer, index=True)
+    type = Column(String(20))  # movie, series, episode
+    fetched_at = Column(DateTime, nullable=False)
+
+
+class OMDbMatch(Base):
+    __tablename__ = "omdb_matches"
+
+    movie_id = Column(Integer, ForeignKey("movies.id"), primary_key=True)
+    imdb_id = Column(String(20), index=True)  # NULL: OMDb searched, no match
+    score = Column(Float)
+    method = Column(String(20))  # local, search
+    matched_at = Column(DateTime, nullable=False)
+
+
 class SentimentAnalysis(Base):
     __tablename__ = "sentiment_analysis"
 
@@ -215,3 +315,64 @@ class SentimentAnalysis(Base):
     # Timestamps
     analysis_date = Column(DateTime, server_default=func.now())
     created_at = Column(DateTime, server_default=func.now())
+
+
+# Monthly rollups of the time-series tables. Old partitions are compacted
+# into these (see database/partitioning.py); sums and counts rather than
+# averages so repeated compactions of the same month merge exactly.
+class SentimentMonthly(Base):
+    __tablename__ = "sentiment_monthly"
+
+    movie_id = Column(Integer, ForeignKey("movies.id"), primary_key=True)
+    source = Column(String(50), primary_key=True, default="")
+    month = Column(DateTime, primary_key=True)
+    sample_count = Column(Integer, nullable=False, default=0)
+    # Sum of sentiment_score * review_count: the mean is per review
+    sentiment_score_sum = Column(Float, nullable=False, default=0.0)
+    confidence_sum = Column(Float, nullable=False, default=0.0)
+    review_count = Column(Integer, nullable=False, default=0)
+    positive_mentions = Column(Integer, nullable=False, default=0)
+    negative_mentions = Column(Integer, nullable=False, default=0)
+    neutral_mentions = Column(Integer, nullable=False, default=0)
+
+    @property
+    def avg_sentiment_score(self):
+        return (
+            self.sentiment_score_sum / self.review_count if self.review_count else None
+        )
+
+
+class RatingMonthly(Base):
+    __tablename__ = "ratings_monthly"
+
+    movie_id = Column(Integer, ForeignKey("movies.id"), primary_key=True)
+    source = Column(String(50), primary_key=True, default="")
+    month = Column(DateTime, primary_key=True)
+    sample_count = Column(Integer, nullable=False, default=0)
+    value = Column(String(50))  # last value seen in the month
+    votes = Column(Integer)  # highest vote count seen in the month
+
+
+class BoxOfficeMonthly(Base):
+    __tablename__ = "box_office_monthly"
+
+    movie_id = Column(Integer, ForeignKey("movies.id"), primary_key=True)
+    month = Column(DateTime, primary_key=True)
+    sample_count = Column(Integer, nullable=False, default=0)
+    # Grosses are cumulative, so the monthly maximum is the month-end figure
+    domestic_gross = Column(Integer)
+    international_gross = Column(Integer)
+    worldwide_gross = Column(Integer)
+    opening_weekend = Column(Integer)
+    widest_release = Column(Integer)
+
+
+# Latest model output per movie, written by scripts/score_movies.py
+class MoviePrediction(Base):
+    __tablename__ = "movie_predictions"
+
+    movie_id = Column(Integer, ForeignKey("movies.id"), primary_key=True)
+    model_version = Column(String(50), nullable=False)
+    predicted_roi = Column(Float)
+    success_probability = Column(Float)
+    scored_at = Column(DateTime, nullable=False)
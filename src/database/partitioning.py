@@ -0,0 +1,419 @@
+"""
+Monthly range partitioning for the time-series tables.
+
+On PostgreSQL, sentiment_analysis, ratings and box_office are declaratively
+partitioned by month on their timestamp column, with a BRIN index on that
+column, so trend queries filtered by date only touch the matching months.
+Partitions are created ahead of time by ensure_partitions(). compact()
+rolls months older than the retention window into the *_monthly tables and
+drops their partitions. ratings and box_office hold each movie's current
+figures, so the read model falls back to their rollups once the raw rows
+are compacted away.
+
+Other databases keep plain tables. There compact() rolls up old rows and
+deletes them, using the same SQL.
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import DateTime, Table, and_, func, literal, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+from .connection import engine as default_engine
+from .models import (
+    BoxOffice,
+    BoxOfficeMonthly,
+    Rating,
+    RatingMonthly,
+    SentimentAnalysis,
+    SentimentMonthly,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class month_trunc(FunctionElement):
+    """First instant of the month containing a timestamp."""
+
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(month_trunc)
+def _month_trunc_default(element, compiler, **kw):
+    return f"date_trunc('month', {compiler.process(element.clauses, **kw)})"
+
+
+@compiles(month_trunc, "sqlite")
+def _month_trunc_sqlite(element, compiler, **kw):
+    arg = compiler.process(element.clauses, **kw)
+    return f"strftime('%Y-%m-01 00:00:00.000000', {arg})"
+
+
+@dataclass(frozen=True)
+class PartitionSpec:
+    """How one time-series table is partitioned and rolled up."""
+
+    table: Table
+    column: str  # partition key
+    rollup: Table
+    group_by: Tuple[str, ...]
+    # rollup column -> (aggregate, source column[, weight column]); aggregate
+    # is one of count, sum, max (merged by adding / taking the max) or last.
+    # A weighted sum adds up column * weight.
+    aggregates: Dict[str, Tuple[str, ...]]
+    # used in place of a NULL partition key when converting existing rows
+    fallback: Tuple[str, ...] = ()
+
+
+PARTITIONED_TABLES = (
+    PartitionSpec(
+        table=SentimentAnalysis.__table__,
+        column="analysis_date",
+        rollup=SentimentMonthly.__table__,
+        group_by=("movie_id", "source"),
+        aggregates={
+            "sample_count": ("count", "id"),
+            # Each row averages one run's new reviews: weight by their count
+            "sentiment_score_sum": ("sum", "sentiment_score", "review_count"),
+            "confidence_sum": ("sum", "confidence"),
+            "review_count": ("sum", "review_count"),
+            "positive_mentions": ("sum", "positive_mentions"),
+            "negative_mentions": ("sum", "negative_mentions"),
+            "neutral_mentions": ("sum", "neutral_mentions"),
+        },
+        fallback=("created_at",),
+    ),
+    PartitionSpec(
+        table=Rating.__table__,
+        column="created_at",
+        rollup=RatingMonthly.__table__,
+        group_by=("movie_id", "source"),
+        aggregates={
+            "sample_count": ("count", "id"),
+            "value": ("last", "value"),
+            "votes": ("max", "votes"),
+        },
+    ),
+    PartitionSpec(
+        table=BoxOffice.__table__,
+        column="created_at",
+        rollup=BoxOfficeMonthly.__table__,
+        group_by=("movie_id",),
+        aggregates={
+            "sample_count": ("count", "id"),
+            "domestic_gross": ("max", "domestic_gross"),
+            "international_gross": ("max", "international_gross"),
+            "worldwide_gross": ("max", "worldwide_gross"),
+            "opening_weekend": ("max", "opening_weekend"),
+            "widest_release": ("max", "widest_release"),
+        },
+    ),
+)
+
+PARTITION_SUFFIX = re.compile(r"_y(\d{4})m(\d{2})$")
+
+
+def month_start(moment: datetime) -> datetime:
+    return datetime(moment.year, moment.month, 1)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: datetime) -> str:
+    return f"{table}_y{month:%Y}m{month:%m}"
+
+
+def is_partitioned(connection: Connection, table: str) -> bool:
+    if connection.dialect.name != "postgresql":
+        return False
+    return (
+        connection.execute(
+            text(
+                "SELECT 1 FROM pg_partitioned_table p "
+                "JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = :table"
+            ),
+            {"table": table},
+        ).first()
+        is not None
+    )
+
+
+def list_partitions(connection: Connection, table: str) -> List[Tuple[str, datetime]]:
+    """(partition name, month) for every monthly partition of ``table``."""
+    rows = connection.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :table ORDER BY c.relname"
+        ),
+        {"table": table},
+    )
+    partitions = []
+    for (name,) in rows:
+        match = PARTITION_SUFFIX.search(name)
+        if match:
+            year, month = map(int, match.groups())
+            partitions.append((name, datetime(year, month, 1)))
+    return partitions
+
+
+def create_partition(connection: Connection, table: str, month: datetime) -> str:
+    name = partition_name(table, month)
+    connection.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') "
+            f"TO ('{add_months(month, 1):%Y-%m-%d}')"
+        )
+    )
+    return name
+
+
+def _convert_table(
+    connection: Connection, spec: PartitionSpec, current: datetime, months_ahead: int
+):
+    """Swap a plain table for a partitioned one holding the same rows."""
+    name, key = spec.table.name, spec.column
+    old = f"{name}_unpartitioned"
+    fill = f"COALESCE({', '.join((key,) + spec.fallback)}, now())"
+
+    connection.execute(text(f"ALTER TABLE {name} RENAME TO {old}"))
+    connection.execute(
+        text(
+            f"CREATE TABLE {name} (LIKE {old} INCLUDING DEFAULTS) "
+            f"PARTITION BY RANGE ({key})"
+        )
+    )
+    # Keep the id sequence alive when the old table is dropped
+    sequence = connection.execute(
+        text("SELECT pg_get_serial_sequence(:table, 'id')"), {"table": old}
+    ).scalar()
+    if sequence:
+        connection.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY {name}.id"))
+
+    first = connection.execute(text(f"SELECT MIN({fill}) FROM {old}")).scalar()
+    newest = connection.execute(text(f"SELECT MAX({fill}) FROM {old}")).scalar()
+    month = min(month_start(first), current) if first else current
+    last = add_months(max(current, month_start(newest or current)), months_ahead)
+    while month <= last:
+        create_partition(connection, name, month)
+        month = add_months(month, 1)
+
+    columns = [column.name for column in spec.table.columns]
+    selected = [fill if column == key else column for column in columns]
+    connection.execute(
+        text(
+            f"INSERT INTO {name} ({', '.join(columns)}) "
+            f"SELECT {', '.join(selected)} FROM {old}"
+        )
+    )
+    connection.execute(text(f"DROP TABLE {old}"))
+
+    # The partition key must be part of every unique constraint
+    connection.execute(text(f"ALTER TABLE {name} ALTER COLUMN {key} SET NOT NULL"))
+    connection.execute(text(f"ALTER TABLE {name} ADD PRIMARY KEY (id, {key})"))
+    connection.execute(
+        text(f"ALTER TABLE {name} ADD FOREIGN KEY (movie_id) REFERENCES movies (id)")
+    )
+    connection.execute(text(f"CREATE INDEX ix_{name}_movie_id ON {name} (movie_id)"))
+    connection.execute(
+        text(f"CREATE INDEX brin_{name}_{key} ON {name} USING brin ({key})")
+    )
+
+
+def partition_tables(
+    bind: Optional[Engine] = None, months_ahead: int = 3, now: Optional[datetime] = None
+) -> List[str]:
+    """
+    Convert the time-series tables to monthly partitions (PostgreSQL only).
+
+    Idempotent; returns the names of the tables converted by this call.
+    """
+    bind = bind or default_engine
+    if bind.dialect.name != "postgresql":
+        return []
+
+    current = month_start(now or datetime.utcnow())
+    converted = []
+    for spec in PARTITIONED_TABLES:
+        with bind.begin() as connection:
+            if is_partitioned(connection, spec.table.name):
+                continue
+            _convert_table(connection, spec, current, months_ahead)
+            converted.append(spec.table.name)
+            logger.info(f"Partitioned {spec.table.name} by month on {spec.column}")
+    return converted
+
+
+def ensure_partitions(
+    bind: Optional[Engine] = None, months_ahead: int = 3, now: Optional[datetime] = None
+) -> List[str]:
+    """
+    Create any missing partitions from this month to ``months_ahead`` months
+    ahead. Run it on a schedule (and before ingestion) so inserts never land
+    outside a partition.
+    """
+    bind = bind or default_engine
+    if bind.dialect.name != "postgresql":
+        return []
+
+    current = month_start(now or datetime.utcnow())
+    created = []
+    with bind.begin() as connection:
+        for spec in PARTITIONED_TABLES:
+            if not is_partitioned(connection, spec.table.name):
+                continue
+            existing = {
+                name for name, _ in list_partitions(connection, spec.table.name)
+            }
+            for offset in range(months_ahead + 1):
+                month = add_months(current, offset)
+                if partition_name(spec.table.name, month) not in existing:
+                    created.append(create_partition(connection, spec.table.name, month))
+    if created:
+        logger.info(f"Created partitions: {', '.join(created)}")
+    return created
+
+
+def _group_expr(table, spec: PartitionSpec, name: str):
+    """Group-by column, with NULLs mapped to the rollup column's default."""
+    default = spec.rollup.c[name].default
+    if default is None:
+        return table.c[name]
+    return func.coalesce(table.c[name], default.arg)
+
+
+def rollup_month(connection: Connection, spec: PartitionSpec, month: datetime) -> int:
+    """Aggregate one month of ``spec.table`` into its rollup table (upsert)."""
+    source, key = spec.table, spec.table.c[spec.column]
+    end = add_months(month, 1)
+    groups = [_group_expr(source, spec, name) for name in spec.group_by]
+
+    aggregates = []
+    for name, (aggregate, column, *weight) in spec.aggregates.items():
+        if aggregate == "last":
+            inner = source.alias()
+            expr = (
+                select(inner.c[column])
+                .where(
+                    *[
+                        _group_expr(inner, spec, group) == outer
+                        for group, outer in zip(spec.group_by, groups)
+                    ],
+                    inner.c[spec.column] >= month,
+                    inner.c[spec.column] < end,
+                )
+                .order_by(inner.c[spec.column].desc())
+                .limit(1)
+                .scalar_subquery()
+            )
+        elif aggregate == "count":
+            expr = func.count(source.c[column])
+        elif aggregate == "sum":
+            value = source.c[column]
+            if weight:
+                value = value * source.c[weight[0]]
+            # Rollup sums are NOT NULL; a month of NULLs sums to zero
+            expr = func.coalesce(func.sum(value), 0)
+        else:
+            expr = getattr(func, aggregate)(source.c[column])
+        aggregates.append(expr.label(name))
+
+    rows = (
+        select(
+            *[group.label(name) for group, name in zip(groups, spec.group_by)],
+            literal(month, DateTime()).label("month"),
+            *aggregates,
+        )
+        .where(key >= month, key < end, source.c.movie_id.isnot(None))
+        .group_by(*groups)
+    )
+
+    dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+    names = list(spec.group_by) + ["month"] + list(spec.aggregates)
+    insert = dialect.insert(spec.rollup).from_select(names, rows)
+
+    merged = {}
+    for name, (aggregate, *_) in spec.aggregates.items():
+        current, incoming = spec.rollup.c[name], insert.excluded[name]
+        if aggregate in ("count", "sum"):
+            merged[name] = func.coalesce(current, 0) + func.coalesce(incoming, 0)
+        elif aggregate == "max":
+            # Two-argument max: greatest() on PostgreSQL, max() on SQLite
+            larger = (
+                func.greatest(current, incoming)
+                if dialect is postgresql
+                else func.max(current, incoming)
+            )
+            merged[name] = func.coalesce(larger, current, incoming)
+        else:
+            merged[name] = incoming
+
+    insert = insert.on_conflict_do_update(
+        index_elements=list(spec.group_by) + ["month"], set_=merged
+    )
+    return connection.execute(insert).rowcount
+
+
+def compact(
+    bind: Optional[Engine] = None, keep_months: int = 12, now: Optional[datetime] = None
+) -> Dict[str, List[datetime]]:
+    """
+    Roll months older than ``keep_months`` into the monthly tables and drop
+    the raw rows: whole partitions on PostgreSQL, a range DELETE elsewhere.
+    Each month is its own transaction, so an interrupted run can resume.
+    Returns table name -> compacted months.
+    """
+    bind = bind or default_engine
+    cutoff = add_months(month_start(now or datetime.utcnow()), -keep_months)
+    compacted: Dict[str, List[datetime]] = {}
+
+    for spec in PARTITIONED_TABLES:
+        name, key = spec.table.name, spec.table.c[spec.column]
+        with bind.connect() as connection:
+            partitioned = is_partitioned(connection, name)
+            if partitioned:
+                months = [
+                    (partition, month)
+                    for partition, month in list_partitions(connection, name)
+                    if month < cutoff
+                ]
+            else:
+                bucket = month_trunc(key)
+                months = [
+                    (None, month_start(month))
+                    for (month,) in connection.execute(
+                        select(bucket).where(key < cutoff).group_by(bucket)
+                    )
+                ]
+
+        for partition, month in months:
+            with bind.begin() as connection:
+                rollup_month(connection, spec, month)
+                if partition:
+                    connection.execute(
+                        text(f"ALTER TABLE {name} DETACH PARTITION {partition}")
+                    )
+                    connection.execute(text(f"DROP TABLE {partition}"))
+                else:
+                    connection.execute(
+                        spec.table.delete().where(
+                            and_(key >= month, key < add_months(month, 1))
+                        )
+                    )
+            compacted.setdefault(name, []).append(month)
+            logger.info(f"Compacted {name} {month:%Y-%m} into {spec.rollup.name}")
+
+    return compacted
@@ -0,0 +1,435 @@
+"""
+Denormalised read model built from the ingestion store.
+
+movie_read_model holds one wide row per movie: catalogue fields, genre
+names, latest OMDb ratings, box office, derived profit/ROI and the
+inflation-adjusted figures.
+movie_genre_read_model holds one narrow row per (movie, genre) for genre
+rollups without joins. ReadModelSync keeps both up to date incrementally
+by updated_at. person_rollup holds per-person career metrics, refreshed
+the same way by analytics.talent. The tables live in READ_MODEL_DATABASE_URL, which
+defaults to the ingestion database. The Django API (movies.MovieReadModel)
+and GenrePerformanceAnalyzer read them instead of the two source schemas.
+"""
+
+import logging
+import os
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import AsyncIterator, Dict, List, Optional, Sequence
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    delete,
+    func,
+    select,
+    union,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from .connection import create_async_database_engine, create_database_engine
+from .connection import engine as default_engine
+from .connection import new_async_read_session
+from .models import (
+    BoxOffice,
+    BoxOfficeMonthly,
+    Genre,
+    Movie,
+    Rating,
+    RatingMonthly,
+    movie_genre_association,
+)
+
+logger = logging.getLogger(__name__)
+
+READ_MODEL_DATABASE_URL = os.getenv("READ_MODEL_DATABASE_URL")
+
+# Separate metadata: the read model may live in another database
+read_model_metadata = MetaData()
+
+GENRE_SEPARATOR = ", "
+
+movie_read_model = Table(
+    "movie_read_model",
+    read_model_metadata,
+    Column("id", Integer, primary_key=True, autoincrement=False),
+    Column("tmdb_id", Integer, unique=True),
+    Column("imdb_id", String(20)),
+    Column("title", String(255), nullable=False, index=True),
+    Column("original_title", String(255)),
+    Column("release_date", DateTime, index=True),
+    Column("release_year", Integer, index=True),
+    Column("runtime", Integer),
+    # BigInteger: grosses overflow 32 bits
+    Column("budget", BigInteger, index=True),
+    Column("revenue", BigInteger, index=True),
+    Column("profit", BigInteger),
+    Column("roi", Float, index=True),
+    # Price-index base year dollars (data.processors.financials)
+    Column("adjusted_budget", BigInteger, index=True),
+    Column("adjusted_revenue", BigInteger, index=True),
+    Column("adjusted_profit", BigInteger),
+    Column("popularity", Float),
+    Column("vote_average", Float, index=True),
+    Column("vote_count", Integer),
+    Column("genre_names", String(500)),
+    Column("primary_genre", String(100), index=True),
+    Column("imdb_rating", String(50)),
+    Column("rotten_tomatoes", String(50)),
+    Column("metacritic", String(50)),
+    Column("domestic_gross", BigInteger),
+    Column("worldwide_gross", BigInteger),
+    Column("source_updated_at", DateTime),
+    Column("synced_at", DateTime, nullable=False),
+)
+
+movie_genre_read_model = Table(
+    "movie_genre_read_model",
+    read_model_metadata,
+    Column("movie_id", Integer, primary_key=True, autoincrement=False),
+    Column("genre_name", String(100), primary_key=True),
+    Column("title", String(255), nullable=False),
+    Column("release_date", DateTime),
+    Column("budget", BigInteger),
+    Column("revenue", BigInteger),
+    Column("vote_average", Float),
+    Index("ix_movie_genre_read_model_genre_rating", "genre_name", "vote_average"),
+)
+
+person_rollup = Table(
+    "person_rollup",
+    read_model_metadata,
+    Column("person_id", Integer, primary_key=True, autoincrement=False),
+    Column("name", String(255), nullable=False),
+    Column("primary_role", String(20), index=True),
+    Column("film_count", Integer, nullable=False, index=True),
+    Column("rated_films", Integer, nullable=False),
+    Column("avg_rating", Float, index=True),
+    Column("median_rating", Float),
+    Column("revenue_films", Integer, nullable=False),
+    Column("total_revenue", BigInteger, index=True),
+    Column("avg_revenue", Float, index=True),
+    Column("total_budget", BigInteger),
+    Column("roi", Float, index=True),
+    Column("first_year", Integer),
+    Column("last_year", Integer),
+    Column("rating_trend", Float, index=True),
+    Column("refreshed_at", DateTime, nullable=False),
+    Index("ix_person_rollup_role_roi", "primary_role", "roi"),
+)
+
+read_model_state = Table(
+    "read_model_state",
+    read_model_metadata,
+    Column("name", String(100), primary_key=True),
+    Column("watermark", DateTime),
+    Column("refreshed_at", DateTime, nullable=False),
+)
+
+
+@lru_cache(maxsize=None)
+def get_read_model_engine() -> Engine:
+    """Engine for the read model database (the ingestion engine by default)."""
+    if not READ_MODEL_DATABASE_URL:
+        return default_engine
+    return create_database_engine(READ_MODEL_DATABASE_URL)
+
+
+# Only used when the read model has its own database
+_async_read_model_engine: Optional[AsyncEngine] = None
+_async_read_model_sessions: Optional[async_sessionmaker] = None
+
+
+async def get_async_read_model_database() -> AsyncIterator[AsyncSession]:
+    """Async session on the read model database (FastAPI dependency)."""
+    global _async_read_model_engine, _async_read_model_sessions
+    if not READ_MODEL_DATABASE_URL:
+        async with new_async_read_session() as db:
+            yield db
+        return
+    if _async_read_model_sessions is None:
+        _async_read_model_engine = create_async_database_engine(READ_MODEL_DATABASE_URL)
+        _async_read_model_sessions = async_sessionmaker(
+            _async_read_model_engine, autoflush=False, expire_on_commit=False
+        )
+    async with _async_read_model_sessions() as db:
+        yield db
+
+
+async def dispose_async_read_model_engine() -> None:
+    """Close the read model's own async pool, if one was opened."""
+    global _async_read_model_engine, _async_read_model_sessions
+    if _async_read_model_engine is not None:
+        await _async_read_model_engine.dispose()
+        _async_read_model_engine = None
+        _async_read_model_sessions = None
+
+
+def profit_and_roi(budget: Optional[int], revenue: Optional[int]):
+    """(profit, ROI %) or (None, None) when either figure is missing."""
+    if not budget or not revenue or budget <= 0:
+        return None, None
+    profit = revenue - budget
+    return profit, round(profit / budget * 100, 2)
+
+
+class ReadModelSync:
+    """Project changed movies from the ingestion store into the read model."""
+
+    name = "movies"
+
+    def __init__(
+        self,
+        source: Optional[Engine] = None,
+        target: Optional[Engine] = None,
+        batch_size: int = 2000,
+    ):
+        self.source = source or default_engine
+        self.target = target or get_read_model_engine()
+        self.batch_size = batch_size
+
+    def run(self, full: bool = False) -> Dict[str, int]:
+        """
+        Refresh rows for movies whose movie, rating or box office rows changed
+        since the last run (everything when ``full``). A full run also drops
+        read-model rows whose movie no longer exists.
+        """
+        started = time.perf_counter()
+        read_model_metadata.create_all(self.target)
+
+        since = None if full else self._watermark()
+        with self.source.connect() as source:
+            until = self._high_watermark(source)
+            movie_ids = self._changed_ids(source, since)
+            stats = {"changed": len(movie_ids), "upserted": 0, "deleted": 0}
+
+            for start in range(0, len(movie_ids), self.batch_size):
+                chunk = movie_ids[start : start + self.batch_size]
+                rows, genre_rows = self._project(source, chunk)
+                with self.target.begin() as target:
+                    stats["upserted"] += self._write(target, chunk, rows, genre_rows)
+                    stats["deleted"] += len(chunk) - len(rows)
+
+            if full:
+                stats["deleted"] += self._delete_missing(source)
+
+        with self.target.begin() as target:
+            self._save_watermark(target, until)
+
+        logger.info(
+            f"Read model sync ({'full' if full else 'incremental'}) "
+            f"finished in {time.perf_counter() - started:.1f}s: {stats}"
+        )
+        return stats
+
+    # Change detection
+
+    def _watermark(self) -> Optional[datetime]:
+        with self.target.connect() as target:
+            return target.execute(
+                select(read_model_state.c.watermark).where(
+                    read_model_state.c.name == self.name
+                )
+            ).scalar()
+
+    def _save_watermark(self, target: Connection, watermark: Optional[datetime]):
+        dialect = postgresql if target.dialect.name == "postgresql" else sqlite
+        values = {"watermark": watermark, "refreshed_at": datetime.utcnow()}
+        insert = dialect.insert(read_model_state).values(name=self.name, **values)
+        target.execute(
+            insert.on_conflict_do_update(index_elements=["name"], set_=values)
+        )
+
+    @staticmethod
+    def _high_watermark(source: Connection) -> Optional[datetime]:
+        """Latest updated_at across the source tables, read before syncing."""
+        stamps = [
+            source.execute(select(func.max(table.updated_at))).scalar()
+            for table in (Movie, Rating, BoxOffice)
+        ]
+        stamps = [stamp for stamp in stamps if stamp is not None]
+        return max(stamps) if stamps else None
+
+    @staticmethod
+    def _changed_ids(source: Connection, since: Optional[datetime]) -> List[int]:
+        if since is None:
+            return list(source.execute(select(Movie.id).order_by(Movie.id)).scalars())
+        # >= rather than >: updated_at may only have second resolution, and
+        # re-projecting a boundary row is harmless
+        changed = union(
+            select(Movie.id).where(Movie.updated_at >= since),
+            select(Rating.movie_id).where(Rating.updated_at >= since),
+            select(BoxOffice.movie_id).where(BoxOffice.updated_at >= since),
+        ).subquery()
+        return [
+            movie_id
+            for movie_id in source.execute(
+                select(changed.c[0]).order_by(changed.c[0])
+            ).scalars()
+            if movie_id is not None
+        ]
+
+    # Projection
+
+    def _project(self, source: Connection, movie_ids: Sequence[int]):
+        """
+        Build read-model rows for ``movie_ids`` with six batched queries.
+
+        Ratings and box office also read the monthly rollups, which hold
+        the figures of rows compacted away by database.partitioning.
+        """
+        movies = source.execute(
+            select(Movie.__table__).where(Movie.id.in_(movie_ids))
+        ).all()
+
+        genres: Dict[int, List[str]] = {}
+        for movie_id, name in source.execute(
+            select(movie_genre_association.c.movie_id, Genre.name)
+            .join(Genre, Genre.id == movie_genre_association.c.genre_id)
+            .where(movie_genre_association.c.movie_id.in_(movie_ids))
+            .order_by(movie_genre_association.c.movie_id, Genre.id)
+        ):
+            genres.setdefault(movie_id, []).append(name)
+
+        # Ratings are snapshots; keep the latest value per source. Rollups
+        # only cover months before any live row, so they are read first.
+        ratings: Dict[int, Dict[str, str]] = {}
+        compacted_ratings = (
+            select(RatingMonthly.movie_id, RatingMonthly.source, RatingMonthly.value)
+            .where(
+                RatingMonthly.movie_id.in_(movie_ids), RatingMonthly.value.isnot(None)
+            )
+            .order_by(RatingMonthly.month)
+        )
+        live_ratings = (
+            select(Rating.movie_id, Rating.source, Rating.value)
+            .where(Rating.movie_id.in_(movie_ids))
+            .order_by(Rating.created_at, Rating.id)
+        )
+        for query in (compacted_ratings, live_ratings):
+            for movie_id, source_name, value in source.execute(query):
+                ratings.setdefault(movie_id, {})[source_name] = value
+
+        # Grosses are cumulative: the largest figure, live or compacted
+        box_office: Dict[int, Dict[str, Optional[int]]] = {}
+        for table in (BoxOfficeMonthly, BoxOffice):
+            for row in source.execute(
+                select(
+                    table.movie_id,
+                    func.max(table.domestic_gross).label("domestic_gross"),
+                    func.max(table.worldwide_gross).label("worldwide_gross"),
+                )
+                .where(table.movie_id.in_(movie_ids))
+                .group_by(table.movie_id)
+            ):
+                gross = box_office.setdefault(
+                    row.movie_id, {"domestic_gross": None, "worldwide_gross": None}
+                )
+                for column, value in gross.items():
+                    incoming = getattr(row, column)
+                    if incoming is not None:
+                        gross[column] = max(value or 0, incoming)
+
+        synced_at = datetime.utcnow()
+        rows, genre_rows = [], []
+        for movie in movies:
+            names = genres.get(movie.id, [])
+            movie_ratings = ratings.get(movie.id, {})
+            gross = box_office.get(movie.id, {})
+            profit, roi = profit_and_roi(movie.budget, movie.revenue)
+            rows.append(
+                {
+                    "id": movie.id,
+                    "tmdb_id": movie.tmdb_id,
+                    "imdb_id": movie.imdb_id,
+                    "title": movie.title,
+                    "original_title": movie.original_title,
+                    "release_date": movie.release_date,
+                    "release_year": movie.release_date.year
+                    if movie.release_date
+                    else None,
+                    "runtime": movie.runtime,
+                    "budget": movie.budget,
+                    "revenue": movie.revenue,
+                    "profit": profit,
+                    "roi": roi,
+                    "adjusted_budget": movie.adjusted_budget,
+                    "adjusted_revenue": movie.adjusted_revenue,
+                    "adjusted_profit": movie.adjusted_profit,
+                    "popularity": movie.popularity,
+                    "vote_average": movie.vote_average,
+                    "vote_count": movie.vote_count,
+                    "genre_names": GENRE_SEPARATOR.join(names) or None,
+                    "primary_genre": names[0] if names else None,
+                    "imdb_rating": movie_ratings.get("imdb"),
+                    "rotten_tomatoes": movie_ratings.get("rotten_tomatoes"),
+                    "metacritic": movie_ratings.get("metacritic"),
+                    "domestic_gross": gross.get("domestic_gross"),
+                    "worldwide_gross": gross.get("worldwide_gross"),
+                    "source_updated_at": movie.updated_at,
+                    "synced_at": synced_at,
+                }
+            )
+            genre_rows.extend(
+                {
+                    "movie_id": movie.id,
+                    "genre_name": name,
+                    "title": movie.title,
+                    "release_date": movie.release_date,
+                    "budget": movie.budget,
+                    "revenue": movie.revenue,
+                    "vote_average": movie.vote_average,
+                }
+                for name in dict.fromkeys(names)
+            )
+        return rows, genre_rows
+
+    @staticmethod
+    def _write(
+        target: Connection,
+        movie_ids: Sequence[int],
+        rows: List[Dict],
+        genre_rows: List[Dict],
+    ) -> int:
+        # Clear the batch first: covers deleted movies and dropped genres
+        target.execute(
+            delete(movie_genre_read_model).where(
+                movie_genre_read_model.c.movie_id.in_(movie_ids)
+            )
+        )
+        target.execute(
+            delete(movie_read_model).where(movie_read_model.c.id.in_(movie_ids))
+        )
+        if rows:
+            target.execute(movie_read_model.insert(), rows)
+        if genre_rows:
+            target.execute(movie_genre_read_model.insert(), genre_rows)
+        return len(rows)
+
+    def _delete_missing(self, source: Connection) -> int:
+        existing = set(source.execute(select(Movie.id)).scalars())
+        with self.target.begin() as target:
+            stale = [
+                movie_id
+                for movie_id in target.execute(select(movie_read_model.c.id)).scalars()
+                if movie_id not in existing
+            ]
+            for start in range(0, len(stale), self.batch_size):
+                self._write(target, stale[start : start + self.batch_size], [], [])
+        return len(stale)
+
+
+def sync_read_model(full: bool = False, **kwargs) -> Dict[str, int]:
+    """Run one incremental (or full) read model refresh."""
+    return ReadModelSync(**kwargs).run(full=full)
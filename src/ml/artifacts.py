@@ -0,0 +1,117 @@
+"""
+Versioned artifact directories shared by the ML modules.
+
+A builder writes each artifact (index, model, ...) into a fresh version
+directory under its root, then publish_version() atomically rewrites the
+root's CURRENT file to point at it and prunes old versions. Serving code
+holds a CurrentArtifact, which loads the current version once per process
+and swaps in a newer one when CURRENT changes. Async routes use aget(),
+which loads off the event loop.
+"""
+
+import asyncio
+import logging
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Generic, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).parent.parent.parent / "data"
+KEEP_VERSIONS = 2
+
+T = TypeVar("T")
+
+
+def new_version_dir(root: Path) -> Tuple[str, Path]:
+    """Create and return an empty, uniquely named version directory."""
+    root.mkdir(parents=True, exist_ok=True)
+    version = datetime.now().strftime("%Y%m%dT%H%M%S")
+    for suffix in range(100):
+        name = version if not suffix else f"{version}-{suffix}"
+        try:
+            (root / name).mkdir()
+        except FileExistsError:
+            continue
+        return name, root / name
+    raise FileExistsError(f"Too many versions created this second in {root}")
+
+
+def publish_version(root: Path, version: str, keep: int = KEEP_VERSIONS):
+    """Point CURRENT at ``version`` and drop all but the newest ``keep``."""
+    tmp_path = root / "CURRENT.tmp"
+    tmp_path.write_text(version)
+    os.replace(tmp_path, root / "CURRENT")
+    # Workers still serving an old version keep their open/mapped files
+    stale = sorted(
+        child for child in root.iterdir() if child.is_dir() and child.name != version
+    )
+    for path in stale[: max(0, len(stale) - (keep - 1))]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def current_version(root: Path) -> Optional[str]:
+    try:
+        return (root / "CURRENT").read_text().strip() or None
+    except OSError:
+        return None
+
+
+class CurrentArtifact(Generic[T]):
+    """Process-wide holder that follows a root directory's CURRENT version."""
+
+    def __init__(
+        self, root: Path, load: Callable[[Path], T], refresh_seconds: int = 30
+    ):
+        self.root = Path(root)
+        self.load = load
+        self.refresh_seconds = refresh_seconds
+        self.version: Optional[str] = None
+        self._artifact: Optional[T] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _fresh(self) -> bool:
+        return (
+            self._artifact is not None
+            and time.monotonic() - self._checked_at < self.refresh_seconds
+        )
+
+    def get(self) -> Optional[T]:
+        """
+        The current artifact, or None if none has been published. Checks
+        CURRENT at most every ``refresh_seconds`` and may load a new version
+        from disk, so async code should await aget() instead.
+        """
+        if self._fresh():
+            return self._artifact
+
+        # While one caller loads a new version, others keep the old one
+        if not self._lock.acquire(blocking=self._artifact is None):
+            return self._artifact
+        try:
+            if time.monotonic() - self._checked_at >= self.refresh_seconds:
+                version = current_version(self.root)
+                if version and version != self.version:
+                    try:
+                        self._artifact = self.load(self.root / version)
+                        self.version = version
+                        logger.info(f"Loaded {self.root.name} version {version}")
+                    except (OSError, ValueError, KeyError) as e:
+                        logger.warning(
+                            f"Could not load {self.root.name} version {version}: {e}"
+                        )
+                self._checked_at = time.monotonic()
+        finally:
+            self._lock.release()
+        return self._artifact
+
+    async def aget(self) -> Optional[T]:
+        """get() for the event loop: checks and loads run in a worker thread."""
+        if self._fresh():
+            return self._artifact
+        return await asyncio.to_thread(self.get)
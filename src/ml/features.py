@@ -0,0 +1,574 @@
+"""
+Feature store for the ML modules.
+
+Per-movie features are computed once from the ingestion store and kept
+as float32 matrices, so training, bulk scoring and the API read the
+same numbers instead of each rebuilding them from raw rows:
+
+- release year and month
+- budget, log budget and budget tier (the backend's tiers)
+- runtime
+- one 0/1 column per genre, plus the genre count
+- cast star power: log1p of the summed TMDb popularity of the top-billed
+  cast, of the most popular of them, and of the director
+- revenue and ROI %, the training targets
+
+Studios are not in the ingestion store, so there is no studio encoding.
+Missing values are NaN.
+
+Matrices are keyed by feature-set version and data version. Everything
+for one feature-set version lives under FEATURE_STORE_DIR/movies-v<N>/;
+FEATURE_SET_VERSION is bumped whenever a feature's definition changes,
+which starts a fresh store. Each data version is a directory holding a
+manifest.json, published through a CURRENT file (see ml.artifacts). A
+manifest lists immutable segments, each an ids.npy and a values.npy that
+readers memory-map. A full build writes one segment. An incremental
+refresh computes only movies updated since the last watermark and
+publishes a new data version that appends them as another segment.
+Later segments win for movies that appear more than once, and the
+segments are compacted back into one after MAX_SEGMENTS appends.
+
+Cast and genre links, and people's popularity, carry no updated_at, so
+only movie updates are picked up incrementally. Deleted movies are
+dropped by a full build.
+"""
+
+import json
+import logging
+import os
+import shutil
+import sys
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.engine import Connection, Engine
+
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from database.connection import engine as default_engine
+from database.models import (
+    Genre,
+    Movie,
+    Person,
+    movie_cast_association,
+    movie_crew_association,
+    movie_genre_association,
+)
+from ml.artifacts import (
+    DATA_DIR,
+    CurrentArtifact,
+    current_version,
+    new_version_dir,
+    publish_version,
+)
+
+logger = logging.getLogger(__name__)
+
+FEATURE_STORE_DIR = Path(os.getenv("FEATURE_STORE_DIR", str(DATA_DIR / "features")))
+FEATURE_STORE_REFRESH_SECONDS = int(os.getenv("FEATURE_STORE_REFRESH_SECONDS", "30"))
+
+FEATURE_SET = "movies"
+# Bump whenever a feature's definition changes; old matrices are then ignored
+FEATURE_SET_VERSION = 1
+
+# Upper bounds of movies.tiers.BUDGET_TIERS in the Django backend
+BUDGET_TIERS = (1_000_000, 15_000_000, 50_000_000, 150_000_000)
+BUDGET_TIER_NAMES = (
+    "micro_budget",
+    "low_budget",
+    "medium_budget",
+    "high_budget",
+    "blockbuster",
+)
+TOP_CAST = 5
+DIRECTOR_JOB = "Director"
+BASE_COLUMNS = (
+    "release_year",
+    "release_month",
+    "budget",
+    "log_budget",
+    "budget_tier",
+    "runtime",
+    "genre_count",
+    "cast_star_power",
+    "cast_top_popularity",
+    "director_popularity",
+    "revenue",
+    "roi",
+)
+TARGET_COLUMNS = ("revenue", "roi")
+GENRE_PREFIX = "genre_"
+MAX_SEGMENTS = 8
+BATCH_SIZE = 5000
+
+
+def feature_set_key() -> str:
+    return f"{FEATURE_SET}-v{FEATURE_SET_VERSION}"
+
+
+def column_names(genre_names: Sequence[str]) -> List[str]:
+    return list(BASE_COLUMNS) + [f"{GENRE_PREFIX}{name}" for name in genre_names]
+
+
+def _positive(values: np.ndarray) -> np.ndarray:
+    return np.where(values > 0, values, np.nan)
+
+
+def derive(raw: Dict[str, np.ndarray], genres: np.ndarray) -> np.ndarray:
+    """
+    The feature matrix for raw per-movie inputs: ``raw`` holds float
+    arrays (NaN when unknown) for budget, revenue, runtime, release_year,
+    release_month and the summed/top cast and director popularity;
+    ``genres`` is a 0/1 matrix over the store's genre vocabulary.
+    """
+    budget = _positive(raw["budget"])
+    revenue = _positive(raw["revenue"])
+    known = np.isfinite(budget)
+    tier = np.full(len(budget), np.nan)
+    tier[known] = np.searchsorted(BUDGET_TIERS, budget[known], side="right")
+    columns = {
+        "release_year": raw["release_year"],
+        "release_month": raw["release_month"],
+        "budget": budget,
+        "log_budget": np.log1p(budget),
+        "budget_tier": tier,
+        "runtime": _positive(raw["runtime"]),
+        "genre_count": genres.sum(axis=1),
+        "cast_star_power": np.log1p(raw["cast_popularity"]),
+        "cast_top_popularity": np.log1p(raw["cast_top_popularity"]),
+        "director_popularity": np.log1p(raw["director_popularity"]),
+        "revenue": revenue,
+        "roi": (revenue - budget) / budget * 100,
+    }
+    return np.column_stack(
+        [columns[name] for name in BASE_COLUMNS] + [genres.reshape(len(budget), -1)]
+    ).astype(np.float32)
+
+
+class FeatureFrame:
+    """Feature rows for movies in ascending id order."""
+
+    def __init__(
+        self,
+        ids: np.ndarray,
+        values: np.ndarray,
+        genre_names: Sequence[str],
+        key: Optional[str] = None,
+    ):
+        self.ids = ids
+        self.values = values
+        self.genre_names = list(genre_names)
+        self.names = column_names(self.genre_names)
+        self.key = key
+        self._index = {name: i for i, name in enumerate(self.names)}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def column(self, name: str) -> np.ndarray:
+        return np.asarray(self.values[:, self._index[name]], dtype=np.float64)
+
+    def genre_matrix(self, genre_names: Sequence[str]) -> np.ndarray:
+        """0/1 matrix with one column per name in ``genre_names``, in that order."""
+        matrix = np.zeros((len(self), len(genre_names)))
+        for j, name in enumerate(genre_names):
+            index = self._index.get(f"{GENRE_PREFIX}{name}")
+            if index is not None:
+                matrix[:, j] = self.values[:, index]
+        return matrix
+
+    def select(self, rows: np.ndarray) -> "FeatureFrame":
+        """Row subset by boolean mask or positions."""
+        return FeatureFrame(
+            self.ids[rows], np.asarray(self.values[rows]), self.genre_names, self.key
+        )
+
+    def take(self, movie_ids: Iterable[int]) -> Tuple["FeatureFrame", List[int]]:
+        """Rows for ``movie_ids`` in the store, and the ids that are not."""
+        wanted = np.unique(np.fromiter(movie_ids, dtype=np.int64))
+        rows = np.minimum(np.searchsorted(self.ids, wanted), max(len(self) - 1, 0))
+        found = self.ids[rows] == wanted if len(self) else np.zeros(len(wanted), bool)
+        return self.select(rows[found]), wanted[~found].tolist()
+
+    @classmethod
+    def load(cls, path: Path) -> "FeatureFrame":
+        """Memory-map the segments of one data version (see FeatureStore)."""
+        path = Path(path)
+        manifest = json.loads((path / "manifest.json").read_text())
+        segments_dir = path.parent.parent / "segments" / path.parent.name
+        ids, values = [], []
+        for segment in manifest["segments"]:
+            ids.append(np.load(segments_dir / segment / "ids.npy", mmap_mode="r"))
+            values.append(np.load(segments_dir / segment / "values.npy", mmap_mode="r"))
+        key = f"{manifest['feature_set']}@{manifest['data_version']}"
+        if len(ids) == 1:
+            return cls(ids[0], values[0], manifest["genre_names"], key)
+
+        # Later segments hold newer rows: keep each id's last occurrence
+        all_ids = np.concatenate(ids)
+        order = np.argsort(all_ids, kind="stable")
+        sorted_ids = all_ids[order]
+        last = np.append(sorted_ids[1:] != sorted_ids[:-1], True)
+        return cls(
+            sorted_ids[last],
+            np.concatenate(values)[order[last]],
+            manifest["genre_names"],
+            key,
+        )
+
+
+# Computing features
+
+
+def _rows_for(ids: np.ndarray, movie_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    rows = np.minimum(np.searchsorted(ids, movie_ids), len(ids) - 1)
+    return rows, ids[rows] == movie_ids
+
+
+def _popularity(
+    ids: np.ndarray, pairs: List[Tuple[int, Optional[float]]]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-movie sum and max of people's popularity (NaN with no people)."""
+    total = np.full(len(ids), np.nan)
+    top = np.full(len(ids), np.nan)
+    if not pairs:
+        return total, top
+    movie_ids = np.fromiter((pair[0] for pair in pairs), dtype=np.int64)
+    popularity = np.array([pair[1] or 0.0 for pair in pairs], dtype=np.float64).clip(
+        min=0
+    )
+    rows, known = _rows_for(ids, movie_ids)
+    rows, popularity = rows[known], popularity[known]
+    seen = np.zeros(len(ids), dtype=bool)
+    seen[rows] = True
+    total[seen] = 0.0
+    top[seen] = 0.0
+    np.add.at(total, rows, popularity)
+    np.maximum.at(top, rows, popularity)
+    return total, top
+
+
+def compute_features(
+    connection: Connection, movie_ids: Sequence[int], genre_names: Sequence[str]
+) -> FeatureFrame:
+    """Feature rows for ``movie_ids`` (ids that do not exist are skipped)."""
+    movies = connection.execute(
+        select(Movie.id, Movie.budget, Movie.revenue, Movie.runtime, Movie.release_date)
+        .where(Movie.id.in_(list(movie_ids)))
+        .order_by(Movie.id)
+    ).all()
+    ids = np.array([movie.id for movie in movies], dtype=np.int64)
+    if not len(ids):
+        return FeatureFrame(
+            ids, np.empty((0, len(column_names(genre_names))), np.float32), genre_names
+        )
+
+    def numbers(values) -> np.ndarray:
+        return np.array(
+            [np.nan if value is None else value for value in values], dtype=np.float64
+        )
+
+    raw = {
+        "budget": numbers(movie.budget for movie in movies),
+        "revenue": numbers(movie.revenue for movie in movies),
+        "runtime": numbers(movie.runtime for movie in movies),
+        "release_year": numbers(
+            movie.release_date.year if movie.release_date else None for movie in movies
+        ),
+        "release_month": numbers(
+            movie.release_date.month if movie.release_date else None for movie in movies
+        ),
+    }
+
+    genres = np.zeros((len(ids), len(genre_names)), dtype=np.float64)
+    genre_columns = {name: j for j, name in enumerate(genre_names)}
+    pairs = connection.execute(
+        select(movie_genre_association.c.movie_id, Genre.name)
+        .join(Genre, Genre.id == movie_genre_association.c.genre_id)
+        .where(movie_genre_association.c.movie_id.in_(ids.tolist()))
+    ).all()
+    pairs = [(movie_id, name) for movie_id, name in pairs if name in genre_columns]
+    if pairs:
+        rows, known = _rows_for(ids, np.array([pair[0] for pair in pairs]))
+        columns = np.array([genre_columns[pair[1]] for pair in pairs])
+        genres[rows[known], columns[known]] = 1.0
+
+    cast = connection.execute(
+        select(movie_cast_association.c.movie_id, Person.popularity)
+        .join(Person, Person.id == movie_cast_association.c.person_id)
+        .where(movie_cast_association.c.movie_id.in_(ids.tolist()))
+        .where(movie_cast_association.c.order < TOP_CAST)
+    ).all()
+    raw["cast_popularity"], raw["cast_top_popularity"] = _popularity(ids, cast)
+    directors = connection.execute(
+        select(movie_crew_association.c.movie_id, Person.popularity)
+        .join(Person, Person.id == movie_crew_association.c.person_id)
+        .where(movie_crew_association.c.movie_id.in_(ids.tolist()))
+        .where(movie_crew_association.c.job == DIRECTOR_JOB)
+    ).all()
+    raw["director_popularity"] = _popularity(ids, directors)[1]
+
+    return FeatureFrame(ids, derive(raw, genres), genre_names)
+
+
+def features_from_records(
+    records: Sequence[Dict[str, Any]], genre_names: Sequence[str]
+) -> FeatureFrame:
+    """
+    Feature rows for movies that are not stored, from dicts with optional
+    budget, runtime, release_date and genres (names). Cast features are
+    unknown (NaN).
+    """
+
+    def numbers(name: str) -> np.ndarray:
+        return np.array(
+            [
+                np.nan if record.get(name) is None else record[name]
+                for record in records
+            ],
+            dtype=np.float64,
+        )
+
+    dates: List[Optional[date]] = [record.get("release_date") for record in records]
+    genre_columns = {name: j for j, name in enumerate(genre_names)}
+    genres = np.zeros((len(records), len(genre_names)))
+    for i, record in enumerate(records):
+        for name in record.get("genres") or ():
+            if name in genre_columns:
+                genres[i, genre_columns[name]] = 1.0
+    unknown = np.full(len(records), np.nan)
+    raw = {
+        "budget": numbers("budget"),
+        "revenue": numbers("revenue"),
+        "runtime": numbers("runtime"),
+        "release_year": np.array(
+            [day.year if day else np.nan for day in dates], dtype=np.float64
+        ),
+        "release_month": np.array(
+            [day.month if day else np.nan for day in dates], dtype=np.float64
+        ),
+        "cast_popularity": unknown,
+        "cast_top_popularity": unknown,
+        "director_popularity": unknown,
+    }
+    return FeatureFrame(
+        np.zeros(len(records), dtype=np.int64), derive(raw, genres), genre_names
+    )
+
+
+# Storage
+
+
+def _unchanged(frame: FeatureFrame, current: FeatureFrame) -> np.ndarray:
+    """Rows of ``frame`` whose features equal ``current``'s (NaN == NaN)."""
+    unchanged = np.zeros(len(frame), dtype=bool)
+    if not len(frame) or not len(current):
+        return unchanged
+    rows = np.minimum(np.searchsorted(current.ids, frame.ids), len(current) - 1)
+    stored = current.ids[rows] == frame.ids
+    old = np.asarray(current.values[rows[stored]])
+    new = frame.values[stored]
+    unchanged[stored] = ((old == new) | (np.isnan(old) & np.isnan(new))).all(axis=1)
+    return unchanged
+
+
+class FeatureStore:
+    """Materialise and refresh the current feature-set version."""
+
+    def __init__(
+        self,
+        engine: Optional[Engine] = None,
+        store_dir: Optional[Path] = None,
+        batch_size: int = BATCH_SIZE,
+    ):
+        self.engine = engine or default_engine
+        store_dir = Path(store_dir or FEATURE_STORE_DIR)
+        self.versions_dir = store_dir / feature_set_key()
+        self.segments_dir = store_dir / "segments" / feature_set_key()
+        self.batch_size = batch_size
+
+    def manifest(self) -> Optional[Dict[str, Any]]:
+        version = current_version(self.versions_dir)
+        if version is None:
+            return None
+        return json.loads((self.versions_dir / version / "manifest.json").read_text())
+
+    def read(self) -> Optional[FeatureFrame]:
+        version = current_version(self.versions_dir)
+        return FeatureFrame.load(self.versions_dir / version) if version else None
+
+    def refresh(self, full: bool = False) -> Dict[str, Any]:
+        """
+        Compute features for movies updated since the last refresh (every
+        movie when ``full`` or when there is no store yet) and publish them
+        as a new data version.
+        """
+        started = time.perf_counter()
+        manifest = None if full else self.manifest()
+        with self.engine.connect() as connection:
+            until = connection.execute(select(func.max(Movie.updated_at))).scalar()
+            if manifest is None:
+                genre_names = list(
+                    connection.execute(select(Genre.name).order_by(Genre.id)).scalars()
+                )
+                query = select(Movie.id)
+            else:
+                genre_names = manifest["genre_names"]
+                query = select(Movie.id)
+                if manifest["watermark"]:
+                    # >= as in the read model sync: updated_at may have
+                    # second resolution, and recomputing a row is harmless
+                    since = datetime.fromisoformat(manifest["watermark"])
+                    query = query.where(Movie.updated_at >= since)
+            movie_ids = np.fromiter(
+                connection.execute(query.order_by(Movie.id)).scalars(), dtype=np.int64
+            )
+
+            current = None if manifest is None else self.read()
+            segment, written = self._write_segment(
+                connection, movie_ids, genre_names, current
+            )
+
+        stats = {
+            "mode": "full" if manifest is None else "incremental",
+            "computed": len(movie_ids),
+            "written": written,
+        }
+        if segment is None:
+            stats["data_version"] = manifest["data_version"]
+            logger.info(f"Feature store is up to date: {stats}")
+            return stats
+        segments = [segment] if manifest is None else manifest["segments"] + [segment]
+        version, path = new_version_dir(self.versions_dir)
+        self._write_manifest(
+            path,
+            version,
+            segments,
+            genre_names,
+            until.isoformat() if until else None,
+        )
+        publish_version(self.versions_dir, version)
+
+        if len(segments) > MAX_SEGMENTS:
+            self.compact()
+        self._remove_unused_segments()
+        stats["data_version"] = current_version(self.versions_dir)
+        stats["rows"] = len(self.read())
+        logger.info(
+            f"Feature store refresh finished in {time.perf_counter() - started:.1f}s: "
+            f"{stats}"
+        )
+        return stats
+
+    def compact(self) -> Optional[str]:
+        """Rewrite the current data version as a single segment."""
+        manifest = self.manifest()
+        if manifest is None or len(manifest["segments"]) == 1:
+            return None
+        frame = self.read()
+        name, path = new_version_dir(self.segments_dir)
+        np.save(path / "ids.npy", frame.ids)
+        np.save(path / "values.npy", frame.values)
+        version, version_path = new_version_dir(self.versions_dir)
+        self._write_manifest(
+            version_path,
+            version,
+            [name],
+            manifest["genre_names"],
+            manifest["watermark"],
+        )
+        publish_version(self.versions_dir, version)
+        self._remove_unused_segments()
+        logger.info(f"Compacted {len(manifest['segments'])} segments into {name}")
+        return version
+
+    def _write_segment(
+        self,
+        connection: Connection,
+        movie_ids: np.ndarray,
+        genre_names: List[str],
+        current: Optional[FeatureFrame] = None,
+    ) -> Tuple[Optional[str], int]:
+        """
+        Compute ``movie_ids`` batch by batch into a new segment, leaving out
+        rows identical to ``current``. Returns the segment name (None when
+        nothing was written) and its row count.
+        """
+        name, path = new_version_dir(self.segments_dir)
+        try:
+            values = np.lib.format.open_memmap(
+                path / "values.npy",
+                mode="w+",
+                dtype=np.float32,
+                shape=(len(movie_ids), len(column_names(genre_names))),
+            )
+            ids = np.empty(len(movie_ids), dtype=np.int64)
+            written = 0
+            for start in range(0, len(movie_ids), self.batch_size):
+                frame = compute_features(
+                    connection,
+                    movie_ids[start : start + self.batch_size].tolist(),
+                    genre_names,
+                )
+                if current is not None:
+                    frame = frame.select(~_unchanged(frame, current))
+                values[written : written + len(frame)] = frame.values
+                ids[written : written + len(frame)] = frame.ids
+                written += len(frame)
+            values.flush()
+            del values
+            if not written and current is not None:
+                shutil.rmtree(path)
+                return None, 0
+            if written < len(movie_ids):
+                # Unchanged or deleted movies: rewrite without the gap
+                kept = np.load(path / "values.npy")[:written]
+                np.save(path / "values.npy", kept)
+            np.save(path / "ids.npy", ids[:written])
+        except BaseException:
+            shutil.rmtree(path, ignore_errors=True)
+            raise
+        return name, written
+
+    @staticmethod
+    def _write_manifest(
+        path: Path,
+        version: str,
+        segments: List[str],
+        genre_names: List[str],
+        watermark: Optional[str],
+    ):
+        manifest = {
+            "feature_set": feature_set_key(),
+            "data_version": version,
+            "watermark": watermark,
+            "built_at": datetime.now().isoformat(timespec="seconds"),
+            "columns": column_names(genre_names),
+            "genre_names": genre_names,
+            "segments": segments,
+        }
+        (path / "manifest.json").write_text(json.dumps(manifest, indent=2))
+
+    def _remove_unused_segments(self):
+        used = set()
+        for path in self.versions_dir.iterdir():
+            if (path / "manifest.json").exists():
+                manifest = json.loads((path / "manifest.json").read_text())
+                used.update(manifest["segments"])
+        for path in self.segments_dir.iterdir():
+            if path.is_dir() and path.name not in used:
+                shutil.rmtree(path, ignore_errors=True)
+
+
+# Serving
+
+feature_frames = CurrentArtifact(
+    FEATURE_STORE_DIR / feature_set_key(),
+    FeatureFrame.load,
+    FEATURE_STORE_REFRESH_SECONDS,
+)
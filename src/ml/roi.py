@@ -0,0 +1,432 @@
+"""
+Box-office ROI prediction.
+
+Two linear models share one design matrix built from the feature store
+(see ml.features), so training and scoring read identical features:
+
+- ``roi``: ridge regression on log(revenue / budget), reported back as
+  ROI % like the read model's ``roi`` column
+- ``success``: L2-regularised logistic regression for ROI > 50%, the
+  ``is_successful`` target of the /api/v1/ml-training-data/ endpoint
+
+Inputs are the stored features that are known before release: log
+budget, budget tier, runtime, release year and month, genre flags and
+count, and cast and director star power. Every transform is a
+whole-column NumPy operation.
+
+train_roi_model() picks each model's regularisation strength by k-fold
+cross-validation. The (fold, alpha) fits run in a process pool that
+memory-maps one shared copy of the feature matrix. Models are saved as
+.npz weights plus JSON metadata into versioned directories under
+ROI_MODEL_DIR (see ml.artifacts). roi_models loads the current one once
+per process for the API.
+"""
+
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from database.connection import engine as default_engine
+from database.models import MoviePrediction
+from ml.artifacts import DATA_DIR, CurrentArtifact, new_version_dir, publish_version
+from ml.features import BUDGET_TIER_NAMES, FEATURE_SET_VERSION, FeatureFrame
+
+logger = logging.getLogger(__name__)
+
+ROI_MODEL_DIR = Path(os.getenv("ROI_MODEL_DIR", str(DATA_DIR / "models" / "roi")))
+ROI_MODEL_REFRESH_SECONDS = int(os.getenv("ROI_MODEL_REFRESH_SECONDS", "30"))
+
+MODEL_FORMAT = 2
+# is_successful in the ML training export: ROI above 50%
+SUCCESS_ROI = 50.0
+# Revenue/budget ratios are floored here before taking logs
+MIN_RATIO = 0.01
+ALPHAS = (0.01, 0.1, 1.0, 10.0, 100.0)
+FOLDS = 5
+NEWTON_ITERATIONS = 25
+CONTINUOUS = (
+    "log_budget",
+    "runtime",
+    "release_year",
+    "genre_count",
+    "cast_star_power",
+    "director_popularity",
+)
+# Continuous features that get a missing-value flag
+FLAGGED = ("log_budget", "runtime", "release_year", "cast_star_power")
+
+
+# Features
+
+
+@dataclass
+class FeatureSpec:
+    """Everything needed to rebuild the training feature matrix."""
+
+    genre_names: List[str]
+    fills: List[float]
+    means: List[float]
+    stds: List[float]
+
+    @property
+    def names(self) -> List[str]:
+        return (
+            list(CONTINUOUS)
+            + [f"{name}_missing" for name in FLAGGED]
+            + [f"month_{month}" for month in range(1, 13)]
+            + [f"tier_{name}" for name in BUDGET_TIER_NAMES]
+            + [f"genre_{name}" for name in self.genre_names]
+            + ["intercept"]
+        )
+
+    @staticmethod
+    def _continuous(frame: FeatureFrame) -> np.ndarray:
+        return np.column_stack([frame.column(name) for name in CONTINUOUS])
+
+    @classmethod
+    def fit(cls, frame: FeatureFrame) -> "FeatureSpec":
+        raw = cls._continuous(frame)
+        fills = np.nanmedian(raw, axis=0)
+        fills = np.where(np.isfinite(fills), fills, 0.0)
+        filled = np.where(np.isfinite(raw), raw, fills)
+        stds = filled.std(axis=0)
+        return cls(
+            genre_names=list(frame.genre_names),
+            fills=fills.tolist(),
+            means=filled.mean(axis=0).tolist(),
+            stds=np.where(stds > 0, stds, 1.0).tolist(),
+        )
+
+    def transform(self, frame: FeatureFrame) -> np.ndarray:
+        raw = self._continuous(frame)
+        missing = ~np.isfinite(raw[:, [CONTINUOUS.index(name) for name in FLAGGED]])
+        continuous = (np.where(np.isfinite(raw), raw, self.fills) - self.means) / (
+            self.stds
+        )
+
+        rows = len(raw)
+        months = np.zeros((rows, 12))
+        month = frame.column("release_month")
+        known = np.isfinite(month)
+        months[np.flatnonzero(known), month[known].astype(np.int64) - 1] = 1
+
+        tiers = np.zeros((rows, len(BUDGET_TIER_NAMES)))
+        tier = frame.column("budget_tier")
+        known = np.isfinite(tier)
+        tiers[np.flatnonzero(known), tier[known].astype(np.int64)] = 1
+
+        return np.hstack(
+            [
+                continuous,
+                missing.astype(np.float64),
+                months,
+                tiers,
+                frame.genre_matrix(self.genre_names),
+                np.ones((rows, 1)),
+            ]
+        )
+
+
+def targets(frame: FeatureFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """log(revenue / budget) and the ROI > 50% flag."""
+    roi = frame.column("roi")
+    log_ratio = np.log(np.maximum(1 + roi / 100, MIN_RATIO))
+    return log_ratio, (roi > SUCCESS_ROI).astype(np.float64)
+
+
+def trainable(frame: FeatureFrame) -> np.ndarray:
+    return np.isfinite(frame.column("roi")) & (frame.column("budget") > 0)
+
+
+# Models
+
+
+def _penalty(features: int, alpha: float) -> np.ndarray:
+    # The intercept (last column) is not shrunk
+    penalty = np.full(features, alpha)
+    penalty[-1] = 0.0
+    return np.diag(penalty)
+
+
+def fit_ridge(X: np.ndarray, y: np.ndarray, alpha: float) -> np.ndarray:
+    return np.linalg.solve(X.T @ X + _penalty(X.shape[1], alpha), X.T @ y)
+
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    return 1 / (1 + np.exp(-np.clip(z, -35, 35)))
+
+
+def fit_logistic(X: np.ndarray, y: np.ndarray, alpha: float) -> np.ndarray:
+    """Newton-Raphson; the feature count is small enough for exact Hessians."""
+    penalty = _penalty(X.shape[1], alpha)
+    coef = np.zeros(X.shape[1])
+    for _ in range(NEWTON_ITERATIONS):
+        p = _sigmoid(X @ coef)
+        gradient = X.T @ (p - y) + penalty @ coef
+        hessian = (X * (p * (1 - p))[:, None]).T @ X + penalty
+        step = np.linalg.solve(hessian + 1e-9 * np.eye(len(coef)), gradient)
+        coef -= step
+        if np.abs(step).max() < 1e-6:
+            break
+    return coef
+
+
+def _auc(y: np.ndarray, scores: np.ndarray) -> Optional[float]:
+    positives = int(y.sum())
+    negatives = len(y) - positives
+    if not positives or not negatives:
+        return None
+    ranks = np.empty(len(scores))
+    ranks[np.argsort(scores, kind="stable")] = np.arange(1, len(scores) + 1)
+    return float(
+        (ranks[y == 1].sum() - positives * (positives + 1) / 2)
+        / (positives * negatives)
+    )
+
+
+def evaluate(
+    X: np.ndarray,
+    log_ratio: np.ndarray,
+    success: np.ndarray,
+    roi_coef: np.ndarray,
+    success_coef: np.ndarray,
+) -> Dict[str, Optional[float]]:
+    predicted = X @ roi_coef
+    p = np.clip(_sigmoid(X @ success_coef), 1e-12, 1 - 1e-12)
+    return {
+        "rmse_log_ratio": float(np.sqrt(np.mean((predicted - log_ratio) ** 2))),
+        "median_abs_error_roi": float(
+            np.median(np.abs(np.exp(predicted) - np.exp(log_ratio)) * 100)
+        ),
+        "log_loss": float(
+            -np.mean(success * np.log(p) + (1 - success) * np.log(1 - p))
+        ),
+        "accuracy": float(np.mean((p > 0.5) == (success == 1))),
+        "auc": _auc(success, p),
+    }
+
+
+@dataclass
+class RoiModel:
+    spec: FeatureSpec
+    roi_coef: np.ndarray
+    success_coef: np.ndarray
+    meta: Dict[str, Any]
+
+    @property
+    def version(self) -> Optional[str]:
+        return self.meta.get("version")
+
+    def predict(self, frame: FeatureFrame) -> Dict[str, np.ndarray]:
+        """Predicted ROI % and P(ROI > 50%) for every row of ``frame``."""
+        X = self.spec.transform(frame)
+        return {
+            "predicted_roi": (np.exp(X @ self.roi_coef) - 1) * 100,
+            "success_probability": _sigmoid(X @ self.success_coef),
+        }
+
+    def save(self, path: Path):
+        np.savez(path / "model.npz", roi=self.roi_coef, success=self.success_coef)
+        (path / "meta.json").write_text(
+            json.dumps(
+                {**self.meta, "format": MODEL_FORMAT, "spec": asdict(self.spec)},
+                indent=2,
+            )
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "RoiModel":
+        meta = json.loads((Path(path) / "meta.json").read_text())
+        if meta.get("format") != MODEL_FORMAT:
+            raise ValueError(f"Unsupported ROI model format: {meta.get('format')}")
+        if meta.get("feature_set_version") != FEATURE_SET_VERSION:
+            raise ValueError(
+                f"ROI model was trained on feature set "
+                f"v{meta.get('feature_set_version')}, not v{FEATURE_SET_VERSION}"
+            )
+        with np.load(Path(path) / "model.npz") as weights:
+            roi_coef, success_coef = weights["roi"], weights["success"]
+        spec = FeatureSpec(**meta.pop("spec"))
+        return cls(spec, roi_coef, success_coef, meta)
+
+
+# Training
+
+
+def _cross_validate(task: Tuple[str, int, float]) -> Dict[str, Any]:
+    """One (fold, alpha) fit; runs in a worker process."""
+    workdir, fold, alpha = task
+    workdir = Path(workdir)
+    X = np.load(workdir / "X.npy", mmap_mode="r")
+    log_ratio = np.load(workdir / "log_ratio.npy")
+    success = np.load(workdir / "success.npy")
+    held_out = np.load(workdir / "folds.npy") == fold
+
+    train = np.asarray(X[~held_out])
+    roi_coef = fit_ridge(train, log_ratio[~held_out], alpha)
+    success_coef = fit_logistic(train, success[~held_out], alpha)
+    metrics = evaluate(
+        np.asarray(X[held_out]),
+        log_ratio[held_out],
+        success[held_out],
+        roi_coef,
+        success_coef,
+    )
+    return {"fold": fold, "alpha": alpha, **metrics}
+
+
+def _mean(rows: List[Dict[str, Any]], metric: str) -> Optional[float]:
+    values = [row[metric] for row in rows if row[metric] is not None]
+    return float(np.mean(values)) if values else None
+
+
+def train_roi_model(
+    frame: FeatureFrame,
+    folds: int = FOLDS,
+    alphas: Sequence[float] = ALPHAS,
+    workers: Optional[int] = None,
+    seed: int = 0,
+) -> RoiModel:
+    """Cross-validate ``alphas`` in a process pool, then fit on every row."""
+    started = time.perf_counter()
+    features_key = frame.key
+    frame = frame.select(trainable(frame))
+    rows = len(frame)
+    if rows < folds * 2:
+        raise ValueError(f"Only {rows} movies with budget and ROI; need more to train")
+
+    spec = FeatureSpec.fit(frame)
+    X = spec.transform(frame)
+    log_ratio, success = targets(frame)
+    fold_of = np.random.default_rng(seed).permutation(rows) % folds
+
+    tasks = [(fold, alpha) for alpha in alphas for fold in range(folds)]
+    with tempfile.TemporaryDirectory(prefix="roi-cv-") as workdir:
+        np.save(Path(workdir) / "X.npy", X)
+        np.save(Path(workdir) / "log_ratio.npy", log_ratio)
+        np.save(Path(workdir) / "success.npy", success)
+        np.save(Path(workdir) / "folds.npy", fold_of)
+        workers = min(workers or os.cpu_count() or 1, len(tasks))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(
+                pool.map(
+                    _cross_validate,
+                    [(workdir, fold, alpha) for fold, alpha in tasks],
+                )
+            )
+
+    cv = {}
+    for alpha in alphas:
+        fold_rows = [row for row in results if row["alpha"] == alpha]
+        cv[str(alpha)] = {
+            metric: _mean(fold_rows, metric)
+            for metric in fold_rows[0]
+            if metric not in ("fold", "alpha")
+        }
+    roi_alpha = min(alphas, key=lambda alpha: cv[str(alpha)]["rmse_log_ratio"])
+    success_alpha = min(alphas, key=lambda alpha: cv[str(alpha)]["log_loss"])
+
+    model = RoiModel(
+        spec,
+        fit_ridge(X, log_ratio, roi_alpha),
+        fit_logistic(X, success, success_alpha),
+        {
+            "trained_at": datetime.now().isoformat(timespec="seconds"),
+            "rows": rows,
+            "feature_set_version": FEATURE_SET_VERSION,
+            "features_key": features_key,
+            "folds": folds,
+            "features": spec.names,
+            "roi_alpha": roi_alpha,
+            "success_alpha": success_alpha,
+            "cross_validation": cv,
+        },
+    )
+    logger.info(
+        f"Trained ROI model on {rows:,} movies in {time.perf_counter() - started:.1f}s "
+        f"({len(tasks)} CV fits on {workers} processes): "
+        f"roi alpha {roi_alpha} rmse {cv[str(roi_alpha)]['rmse_log_ratio']:.3f}, "
+        f"success alpha {success_alpha} auc {cv[str(success_alpha)]['auc']}"
+    )
+    return model
+
+
+def publish_model(model: RoiModel, root: Optional[Path] = None) -> Path:
+    """Save ``model`` as a new version under ``root`` and make it current."""
+    root = Path(root or ROI_MODEL_DIR)
+    version, path = new_version_dir(root)
+    model.meta["version"] = version
+    model.save(path)
+    publish_version(root, version)
+    return path
+
+
+# Serving
+
+
+roi_models = CurrentArtifact(ROI_MODEL_DIR, RoiModel.load, ROI_MODEL_REFRESH_SECONDS)
+
+
+def write_predictions(
+    movie_ids: np.ndarray,
+    predictions: Dict[str, np.ndarray],
+    model_version: str,
+    engine: Optional[Engine] = None,
+    batch_size: int = 10_000,
+) -> int:
+    """Upsert one movie_predictions row per movie; returns the row count."""
+    engine = engine or default_engine
+    table = MoviePrediction.__table__
+    scored_at = datetime.utcnow()
+    roi = predictions["predicted_roi"]
+    probability = predictions["success_probability"]
+    with engine.begin() as connection:
+        dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+        insert = dialect.insert(table)
+        upsert = insert.on_conflict_do_update(
+            index_elements=["movie_id"],
+            set_={
+                name: insert.excluded[name]
+                for name in (
+                    "model_version",
+                    "predicted_roi",
+                    "success_probability",
+                    "scored_at",
+                )
+            },
+        )
+        for start in range(0, len(movie_ids), batch_size):
+            stop = start + batch_size
+            connection.execute(
+                upsert,
+                [
+                    {
+                        "movie_id": movie_id,
+                        "model_version": model_version,
+                        "predicted_roi": round(predicted_roi, 2),
+                        "success_probability": round(success_probability, 4),
+                        "scored_at": scored_at,
+                    }
+                    for movie_id, predicted_roi, success_probability in zip(
+                        movie_ids[start:stop].tolist(),
+                        roi[start:stop].tolist(),
+                        probability[start:stop].tolist(),
+                    )
+                ],
+            )
+    return len(movie_ids)
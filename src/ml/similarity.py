@@ -0,0 +1,507 @@
+"""
+Content-based "movies like this".
+
+Each movie becomes one dense float32 vector made of three feature blocks:
+
+- genres: one-hot over TMDb genre ids
+- text: TF-IDF of overview and tagline tokens, hashed into a fixed number
+  of signed buckets
+- people: top-billed cast and key crew (director, writers, ...), hashed
+  the same way
+
+Every block is L2-normalised and weighted, then the whole row is
+normalised again, so a dot product is a cosine similarity. The matrix is
+written as a .npy file and memory-mapped read-only, so every API worker
+shares one copy through the page cache.
+
+Catalogues above IVF_MIN_ROWS also get an inverted-file (IVF) index:
+spherical k-means centroids, with rows stored grouped by their nearest
+centroid. A query scores the centroids, then only the rows in the
+``nprobe`` closest lists. Smaller catalogues, and ``exact=True``, use an
+exact blocked matrix-vector product over every row.
+
+Indexes are built by scripts/build_similarity_index.py into a new version
+directory under SIMILARITY_INDEX_DIR; the CURRENT file names the live
+one, and API workers pick up a new version without a restart (see
+ml.artifacts).
+"""
+
+import json
+import logging
+import os
+import re
+import shutil
+import sys
+import time
+import zlib
+from array import array
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from database.connection import engine as default_engine
+from database.models import (
+    Movie,
+    movie_cast_association,
+    movie_crew_association,
+    movie_genre_association,
+)
+from ml.artifacts import DATA_DIR, CurrentArtifact, new_version_dir, publish_version
+
+logger = logging.getLogger(__name__)
+
+SIMILARITY_INDEX_DIR = Path(
+    os.getenv("SIMILARITY_INDEX_DIR", str(DATA_DIR / "similarity"))
+)
+SIMILARITY_NPROBE = int(os.getenv("SIMILARITY_NPROBE", "16"))
+SIMILARITY_REFRESH_SECONDS = int(os.getenv("SIMILARITY_REFRESH_SECONDS", "30"))
+
+INDEX_FORMAT = 1
+GENRE_DIM = 32
+TEXT_DIM = 160
+PEOPLE_DIM = 64
+DIM = GENRE_DIM + TEXT_DIM + PEOPLE_DIM
+# Share of the squared norm each block contributes to a full vector
+BLOCK_WEIGHTS = {"genres": 0.45, "text": 0.30, "people": 0.25}
+BLOCKS = {
+    "genres": slice(0, GENRE_DIM),
+    "text": slice(GENRE_DIM, GENRE_DIM + TEXT_DIM),
+    "people": slice(GENRE_DIM + TEXT_DIM, DIM),
+}
+
+TOP_CAST = 5
+CREW_WEIGHTS = {
+    "Director": 1.0,
+    "Screenplay": 0.7,
+    "Writer": 0.7,
+    "Novel": 0.5,
+    "Producer": 0.4,
+    "Original Music Composer": 0.4,
+    "Director of Photography": 0.4,
+}
+
+TOKEN_PATTERN = re.compile(r"[a-z][a-z']{2,}")
+STOP_WORDS = frozenset(
+    """
+    about after again against all also and any are around back been before
+    being between both but can could did does doing down during each even
+    ever every few find finds for from get gets had has have her here hers
+    him his how into its just last life like made make makes many more most
+    much must new not now off one only other our out over own same she
+    should some soon still such than that the their them then there these
+    they this those through time too two under until upon very was way
+    were what when where which while who whom whose why will with world
+    would year years you young your
+    """.split()
+)
+
+# Rows per chunk when filling, normalising and scanning the matrix
+CHUNK_ROWS = 65_536
+IVF_MIN_ROWS = 20_000
+MAX_LISTS = 4096
+KMEANS_ITERATIONS = 12
+KMEANS_SAMPLE_PER_LIST = 40
+
+
+# Feature hashing
+
+
+def _token_bucket(token: str) -> Tuple[int, float]:
+    digest = zlib.crc32(token.encode())
+    return digest % TEXT_DIM, 1.0 if digest & 0x80000000 else -1.0
+
+
+def _people_buckets(person_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Bucket and sign per person id (multiplicative hash, wraps in uint64)."""
+    digest = (
+        person_ids.astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+    ) >> np.uint64(32)
+    buckets = (digest % np.uint64(PEOPLE_DIM)).astype(np.int64)
+    signs = np.where(digest & np.uint64(1 << 16), 1.0, -1.0)
+    return buckets, signs
+
+
+def tokenize(*texts: Optional[str]) -> Counter:
+    return Counter(
+        token
+        for text in texts
+        if text
+        for token in TOKEN_PATTERN.findall(text.lower())
+        if token not in STOP_WORDS
+    )
+
+
+def _scatter(
+    block: np.ndarray, rows: np.ndarray, columns: np.ndarray, values: np.ndarray
+):
+    """block[rows, columns] += values, with repeated cells summed."""
+    width = block.shape[1]
+    block += np.bincount(
+        rows * width + columns, weights=values, minlength=block.size
+    ).reshape(block.shape)
+
+
+class SimilarityIndexBuilder:
+    """Build a similarity index from the ingestion store."""
+
+    def __init__(
+        self,
+        engine: Optional[Engine] = None,
+        index_dir: Optional[Path] = None,
+        chunk_rows: int = CHUNK_ROWS,
+    ):
+        self.engine = engine or default_engine
+        self.index_dir = Path(index_dir or SIMILARITY_INDEX_DIR)
+        self.chunk_rows = chunk_rows
+
+    # Loading
+
+    def _pairs(self, query) -> Tuple[np.ndarray, ...]:
+        with self.engine.connect() as connection:
+            rows = connection.execute(query).all()
+        if not rows:
+            return tuple(np.empty(0) for _ in query.selected_columns)
+        return tuple(np.asarray(column) for column in zip(*rows))
+
+    def _text(self) -> Tuple[np.ndarray, ...]:
+        """(movie id, bucket, signed TF-IDF) for every distinct token per movie."""
+        vocabulary: Dict[str, int] = {}
+        # Typed arrays: a million overviews make tens of millions of entries
+        movie_ids, token_ids, counts = array("q"), array("q"), array("d")
+        query = select(Movie.id, Movie.overview, Movie.tagline).order_by(Movie.id)
+        with self.engine.connect() as connection:
+            result = connection.execution_options(yield_per=self.chunk_rows).execute(
+                query
+            )
+            for movie_id, overview, tagline in result:
+                for token, count in tokenize(overview, tagline).items():
+                    movie_ids.append(movie_id)
+                    token_ids.append(vocabulary.setdefault(token, len(vocabulary)))
+                    counts.append(count)
+
+        movie_ids = np.frombuffer(movie_ids, dtype=np.int64)
+        token_ids = np.frombuffer(token_ids, dtype=np.int64)
+        # Sublinear term frequency x smoothed IDF
+        document_frequency = np.bincount(token_ids, minlength=len(vocabulary))
+        documents = len(np.unique(movie_ids))
+        idf = np.log((documents + 1) / (document_frequency + 1)) + 1
+        values = (1 + np.log(np.frombuffer(counts))) * idf[token_ids]
+
+        buckets = np.empty(len(vocabulary), dtype=np.int64)
+        signs = np.empty(len(vocabulary))
+        for token, token_id in vocabulary.items():
+            buckets[token_id], signs[token_id] = _token_bucket(token)
+        logger.info(f"Text features: {len(vocabulary):,} distinct tokens")
+        return movie_ids, buckets[token_ids], values * signs[token_ids]
+
+    def _people(self) -> Tuple[np.ndarray, ...]:
+        cast = self._pairs(
+            select(
+                movie_cast_association.c.movie_id,
+                movie_cast_association.c.person_id,
+                movie_cast_association.c.order,
+            ).filter(movie_cast_association.c.order < TOP_CAST)
+        )
+        crew = self._pairs(
+            select(
+                movie_crew_association.c.movie_id,
+                movie_crew_association.c.person_id,
+                movie_crew_association.c.job,
+            ).filter(movie_crew_association.c.job.in_(list(CREW_WEIGHTS)))
+        )
+        movie_ids = np.concatenate([cast[0], crew[0]]).astype(np.int64)
+        person_ids = np.concatenate([cast[1], crew[1]]).astype(np.int64)
+        weights = np.concatenate(
+            [
+                1 / np.sqrt(1 + cast[2].astype(np.float64)),
+                np.array([CREW_WEIGHTS[job] for job in crew[2]], dtype=np.float64),
+            ]
+        )
+        buckets, signs = _people_buckets(person_ids)
+        return movie_ids, buckets, weights * signs
+
+    def _genres(self):
+        movie_ids, genre_ids = self._pairs(
+            select(
+                movie_genre_association.c.movie_id,
+                movie_genre_association.c.genre_id,
+            )
+        )
+        genre_ids = genre_ids.astype(np.int64)
+        vocabulary = np.unique(genre_ids)
+        if len(vocabulary) > GENRE_DIM:
+            logger.warning(
+                f"{len(vocabulary)} genres for {GENRE_DIM} slots; the rest share slots"
+            )
+        columns = np.searchsorted(vocabulary, genre_ids) % GENRE_DIM
+        return movie_ids.astype(np.int64), columns, np.ones(len(columns)), vocabulary
+
+    # Building
+
+    def _fill(
+        self,
+        vectors: np.ndarray,
+        ids: np.ndarray,
+        block: str,
+        movie_ids,
+        columns,
+        values,
+    ):
+        """Add (movie id, column, value) triples into one feature block."""
+        offset = BLOCKS[block].start
+        rows = np.minimum(np.searchsorted(ids, movie_ids), len(ids) - 1)
+        # Drop rows for movies added since the id list was read
+        known = ids[rows] == movie_ids
+        rows, columns, values = rows[known], columns[known], values[known]
+        order = np.argsort(rows, kind="stable")
+        rows, columns, values = rows[order], columns[order], values[order]
+        for start in range(0, len(vectors), self.chunk_rows):
+            stop = min(start + self.chunk_rows, len(vectors))
+            lo, hi = np.searchsorted(rows, [start, stop])
+            if lo == hi:
+                continue
+            chunk = np.zeros((stop - start, BLOCKS[block].stop - offset))
+            _scatter(chunk, rows[lo:hi] - start, columns[lo:hi], values[lo:hi])
+            vectors[start:stop, BLOCKS[block]] = chunk
+
+    def _normalise(self, vectors: np.ndarray):
+        for start in range(0, len(vectors), self.chunk_rows):
+            chunk = vectors[start : start + self.chunk_rows].astype(np.float64)
+            for name, columns in BLOCKS.items():
+                block = chunk[:, columns]
+                norms = np.linalg.norm(block, axis=1, keepdims=True)
+                np.divide(block, norms, out=block, where=norms > 0)
+                chunk[:, columns] = block * np.sqrt(BLOCK_WEIGHTS[name])
+            norms = np.linalg.norm(chunk, axis=1, keepdims=True)
+            np.divide(chunk, norms, out=chunk, where=norms > 0)
+            vectors[start : start + self.chunk_rows] = chunk
+
+    def build(self, nlist: Optional[int] = None, seed: int = 0) -> Path:
+        """Build a new index version, make it current and return its path."""
+        started = time.perf_counter()
+        with self.engine.connect() as connection:
+            ids = np.fromiter(
+                connection.execute(select(Movie.id).order_by(Movie.id)).scalars(),
+                dtype=np.int64,
+            )
+        if not len(ids):
+            raise ValueError("No movies to index")
+
+        version, path = new_version_dir(self.index_dir)
+        try:
+            raw = np.lib.format.open_memmap(
+                path / "raw.npy", mode="w+", dtype=np.float32, shape=(len(ids), DIM)
+            )
+            *genres, genre_ids = self._genres()
+            self._fill(raw, ids, "genres", *genres)
+            self._fill(raw, ids, "text", *self._text())
+            self._fill(raw, ids, "people", *self._people())
+            self._normalise(raw)
+
+            if nlist is None:
+                nlist = (
+                    min(MAX_LISTS, int(np.sqrt(len(ids))))
+                    if len(ids) >= IVF_MIN_ROWS
+                    else 0
+                )
+            if nlist:
+                centroids = train_centroids(raw, nlist, seed, self.chunk_rows)
+                lists = assign_lists(raw, centroids, self.chunk_rows)
+                order = np.argsort(lists, kind="stable")
+                offsets = np.concatenate(
+                    [[0], np.cumsum(np.bincount(lists, minlength=nlist))]
+                )
+            else:
+                centroids = np.empty((0, DIM), dtype=np.float32)
+                order = np.arange(len(ids))
+                offsets = np.array([0, len(ids)])
+
+            vectors = np.lib.format.open_memmap(
+                path / "vectors.npy", mode="w+", dtype=np.float32, shape=raw.shape
+            )
+            for start in range(0, len(ids), self.chunk_rows):
+                vectors[start : start + self.chunk_rows] = raw[
+                    order[start : start + self.chunk_rows]
+                ]
+            vectors.flush()
+            del raw, vectors
+            (path / "raw.npy").unlink()
+
+            np.save(path / "ids.npy", ids[order])
+            np.save(path / "centroids.npy", centroids.astype(np.float32))
+            np.save(path / "offsets.npy", offsets.astype(np.int64))
+            (path / "meta.json").write_text(
+                json.dumps(
+                    {
+                        "format": INDEX_FORMAT,
+                        "version": version,
+                        "built_at": datetime.now().isoformat(timespec="seconds"),
+                        "movies": len(ids),
+                        "dim": DIM,
+                        "nlist": int(nlist),
+                        "blocks": {
+                            name: [columns.start, columns.stop]
+                            for name, columns in BLOCKS.items()
+                        },
+                        "block_weights": BLOCK_WEIGHTS,
+                        "genre_ids": genre_ids.tolist(),
+                    },
+                    indent=2,
+                )
+            )
+        except BaseException:
+            shutil.rmtree(path, ignore_errors=True)
+            raise
+
+        publish_version(self.index_dir, version)
+        logger.info(
+            f"Similarity index {version}: {len(ids):,} movies, {nlist} lists, "
+            f"built in {time.perf_counter() - started:.1f}s"
+        )
+        return path
+
+
+# IVF
+
+
+def assign_lists(
+    vectors: np.ndarray, centroids: np.ndarray, chunk_rows: int = CHUNK_ROWS
+) -> np.ndarray:
+    """Nearest centroid (by dot product) for every row."""
+    lists = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), chunk_rows):
+        chunk = np.asarray(vectors[start : start + chunk_rows])
+        lists[start : start + chunk_rows] = np.argmax(chunk @ centroids.T, axis=1)
+    return lists
+
+
+def train_centroids(
+    vectors: np.ndarray, nlist: int, seed: int = 0, chunk_rows: int = CHUNK_ROWS
+) -> np.ndarray:
+    """Spherical k-means on a sample of the rows."""
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(vectors), nlist * KMEANS_SAMPLE_PER_LIST)
+    sample = np.asarray(
+        vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))]
+    )
+    sample = sample[np.linalg.norm(sample, axis=1) > 0]
+    centroids = sample[rng.choice(len(sample), nlist, replace=len(sample) < nlist)]
+
+    for _ in range(KMEANS_ITERATIONS):
+        assignment = assign_lists(sample, centroids, chunk_rows)
+        sums = np.zeros_like(centroids, dtype=np.float64)
+        np.add.at(sums, assignment, sample)
+        empty = np.flatnonzero(np.bincount(assignment, minlength=nlist) == 0)
+        sums[empty] = sample[rng.choice(len(sample), len(empty))]
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        centroids = (sums / np.where(norms > 0, norms, 1)).astype(np.float32)
+    return centroids
+
+
+# Serving
+
+
+class SimilarityIndex:
+    """A built index, memory-mapped read-only."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.meta = json.loads((self.path / "meta.json").read_text())
+        if self.meta.get("format") != INDEX_FORMAT:
+            raise ValueError(
+                f"Unsupported similarity index format: {self.meta.get('format')}"
+            )
+        self.version = self.meta["version"]
+        self.vectors = np.load(self.path / "vectors.npy", mmap_mode="r")
+        self.ids = np.load(self.path / "ids.npy")
+        self.centroids = np.load(self.path / "centroids.npy")
+        self.offsets = np.load(self.path / "offsets.npy")
+        self._id_order = np.argsort(self.ids)
+        self._sorted_ids = self.ids[self._id_order]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def row(self, movie_id: int) -> Optional[int]:
+        position = np.searchsorted(self._sorted_ids, movie_id)
+        if position < len(self._sorted_ids) and self._sorted_ids[position] == movie_id:
+            return int(self._id_order[position])
+        return None
+
+    def __contains__(self, movie_id: int) -> bool:
+        return self.row(movie_id) is not None
+
+    def _candidate_ranges(self, query: np.ndarray, nprobe: int, needed: int):
+        """Row ranges of the closest lists, enough to hold ``needed`` rows."""
+        order = np.argsort(-(self.centroids @ query))
+        ranges, total = [], 0
+        for probed, list_id in enumerate(order):
+            if probed >= nprobe and total >= needed:
+                break
+            start, stop = self.offsets[list_id], self.offsets[list_id + 1]
+            if stop > start:
+                ranges.append((start, stop))
+                total += stop - start
+        return ranges
+
+    def _scan(self, query: np.ndarray, ranges, limit: int):
+        rows, scores = [], []
+        for start, stop in ranges:
+            for lo in range(start, stop, CHUNK_ROWS):
+                hi = min(lo + CHUNK_ROWS, stop)
+                block = self.vectors[lo:hi] @ query
+                if len(block) > limit:
+                    keep = np.argpartition(-block, limit)[:limit]
+                    block_rows = keep + lo
+                    block = block[keep]
+                else:
+                    block_rows = np.arange(lo, hi)
+                rows.append(block_rows)
+                scores.append(block)
+        return np.concatenate(rows), np.concatenate(scores)
+
+    def similar(
+        self,
+        movie_id: int,
+        limit: int = 10,
+        nprobe: Optional[int] = None,
+        exact: bool = False,
+    ) -> List[Tuple[int, float]]:
+        """Up to ``limit`` (movie id, cosine similarity), most similar first."""
+        row = self.row(movie_id)
+        if row is None:
+            raise KeyError(movie_id)
+        query = np.asarray(self.vectors[row], dtype=np.float32)
+        if not query.any():
+            return []
+
+        # One extra for the movie itself
+        wanted = limit + 1
+        if exact or not len(self.centroids):
+            ranges = [(0, len(self.ids))]
+        else:
+            ranges = self._candidate_ranges(query, nprobe or SIMILARITY_NPROBE, wanted)
+        rows, scores = self._scan(query, ranges, wanted)
+
+        if len(rows) > wanted:
+            keep = np.argpartition(-scores, wanted)[:wanted]
+            rows, scores = rows[keep], scores[keep]
+        ranked = np.argsort(-scores, kind="stable")
+        return [
+            (int(self.ids[rows[i]]), round(float(scores[i]), 4))
+            for i in ranked
+            if rows[i] != row
+        ][:limit]
+
+
+similar_movies = CurrentArtifact(
+    SIMILARITY_INDEX_DIR, SimilarityIndex, SIMILARITY_REFRESH_SECONDS
+)
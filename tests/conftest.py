@@ -0,0 +1,40 @@
+"""
+Fixtures for the src/ tests: throwaway SQLite ingestion and read-model
+databases per test
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# The database package builds its default engines on import
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='cinemetrics-')}/default.db"
+)
+ROOT = Path(__file__).parent.parent
+# src/ for the packages, the root for scripts/
+sys.path[:0] = [str(ROOT / "src"), str(ROOT)]
+
+import pytest
+
+from database.connection import create_database_engine
+from database.models import Base
+from database.read_model import read_model_metadata
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Ingestion database with every table created."""
+    engine = create_database_engine(f"sqlite:///{tmp_path}/ingest.db")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def read_model_engine(tmp_path):
+    engine = create_database_engine(f"sqlite:///{tmp_path}/read_model.db")
+    read_model_metadata.create_all(engine)
+    yield engine
+    engine.dispose()
@@ -0,0 +1,87 @@
+import asyncio
+import threading
+import time
+
+from ml.artifacts import (
+    CurrentArtifact,
+    current_version,
+    new_version_dir,
+    publish_version,
+)
+
+
+def publish(root, payload):
+    version, path = new_version_dir(root)
+    (path / "payload").write_text(payload)
+    publish_version(root, version)
+    return version
+
+
+def test_publish_keeps_newest_versions(tmp_path):
+    versions = [publish(tmp_path, str(n)) for n in range(3)]
+
+    assert current_version(tmp_path) == versions[-1]
+    assert sorted(p.name for p in tmp_path.iterdir() if p.is_dir()) == versions[1:]
+
+
+def test_get_follows_current(tmp_path):
+    artifact = CurrentArtifact(
+        tmp_path, lambda path: (path / "payload").read_text(), refresh_seconds=0
+    )
+    assert artifact.get() is None
+
+    publish(tmp_path, "one")
+    assert artifact.get() == "one"
+    publish(tmp_path, "two")
+    assert artifact.get() == "two"
+
+
+def test_others_keep_old_version_while_one_loads(tmp_path):
+    started, release = threading.Event(), threading.Event()
+
+    def slow_load(path):
+        payload = (path / "payload").read_text()
+        if payload == "two":
+            started.set()
+            release.wait(5)
+        return payload
+
+    artifact = CurrentArtifact(tmp_path, slow_load, refresh_seconds=0)
+    publish(tmp_path, "one")
+    assert artifact.get() == "one"
+
+    publish(tmp_path, "two")
+    loader = threading.Thread(target=artifact.get)
+    loader.start()
+    assert started.wait(5)
+    assert artifact.get() == "one"
+    release.set()
+    loader.join()
+    assert artifact.get() == "two"
+
+
+def test_aget_loads_off_the_event_loop(tmp_path):
+    def slow_load(path):
+        time.sleep(0.3)
+        return (path / "payload").read_text()
+
+    artifact = CurrentArtifact(tmp_path, slow_load)
+    publish(tmp_path, "one")
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        loaded = await artifact.aget()
+        task.cancel()
+        return loaded, ticks
+
+    loaded, ticks = asyncio.run(main())
+    assert loaded == "one"
+    assert ticks >= 10
@@ -0,0 +1,143 @@
+import json
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from database.bulk_load import BulkLoader, copy_value, iter_json_records
+from database.models import Company, Genre, Movie, Person, movie_crew_association
+
+
+def record(tmdb_id=603, **overrides):
+    data = {
+        "id": tmdb_id,
+        "imdb_id": f"tt{tmdb_id:07d}",
+        "title": "The Matrix",
+        "release_date": "1999-03-30",
+        "budget": 63_000_000,
+        "revenue": 463_517_383,
+        "genres": [{"id": 28, "name": "Action"}, {"id": 878, "name": "Sci-Fi"}],
+        "production_companies": [
+            {"id": 79, "name": "Village Roadshow", "origin_country": "US"},
+            {"id": 174, "name": "Warner Bros.", "origin_country": "US"},
+        ],
+        "credits": {
+            "cast": [
+                {"id": 6384, "name": "Keanu Reeves", "character": "Neo", "order": 0},
+                {"id": 6384, "name": "Keanu Reeves", "character": "Thomas", "order": 9},
+            ],
+            "crew": [
+                {"id": 9340, "name": "Lana Wachowski", "job": "Director"},
+                {"id": 9340, "name": "Lana Wachowski", "job": "Writer"},
+            ],
+        },
+    }
+    data.update(overrides)
+    return data
+
+
+def load(engine, *records):
+    return BulkLoader(engine, batch_size=2).load(records)
+
+
+def catalogue(engine):
+    with Session(engine) as db:
+        movie = db.scalars(select(Movie)).one()
+        return {
+            "title": movie.title,
+            "genres": sorted(genre.name for genre in movie.genres),
+            "companies": sorted(company.name for company in movie.companies),
+            "cast": [(person.name,) for person in movie.cast],
+            "crew": db.scalar(select(func.count()).select_from(movie_crew_association)),
+        }
+
+
+def test_load_merges_every_table(engine):
+    stats = load(engine, record())
+
+    assert stats["merged_movies"] == 1
+    assert stats["stage_cast"] == 1  # duplicate billing de-duplicated
+    assert stats["stage_crew"] == 2  # one row per job
+    assert catalogue(engine) == {
+        "title": "The Matrix",
+        "genres": ["Action", "Sci-Fi"],
+        "companies": ["Village Roadshow", "Warner Bros."],
+        "cast": [("Keanu Reeves",)],
+        "crew": 2,
+    }
+
+
+def test_reload_is_idempotent(engine):
+    load(engine, record())
+    load(engine, record())
+
+    with Session(engine) as db:
+        assert len(db.scalars(select(Movie)).all()) == 1
+        assert len(db.scalars(select(Person)).all()) == 2
+    assert catalogue(engine)["genres"] == ["Action", "Sci-Fi"]
+
+
+def test_reload_replaces_links_dropped_upstream(engine):
+    load(engine, record())
+    stats = load(
+        engine,
+        record(
+            title="The Matrix (1999)",
+            genres=[{"id": 878, "name": "Sci-Fi"}],
+            production_companies=[{"id": 174, "name": "Warner Bros."}],
+            credits={"cast": [], "crew": []},
+        ),
+    )
+
+    assert stats["removed_movies_genres"] == 1
+    assert stats["removed_movies_companies"] == 1
+    assert catalogue(engine) == {
+        "title": "The Matrix (1999)",
+        "genres": ["Sci-Fi"],
+        "companies": ["Warner Bros."],
+        "cast": [],
+        "crew": 0,
+    }
+    with Session(engine) as db:
+        # The genre and company rows themselves stay
+        assert len(db.scalars(select(Genre)).all()) == 2
+        assert len(db.scalars(select(Company)).all()) == 2
+
+
+def test_record_without_lists_keeps_existing_links(engine):
+    load(engine, record())
+    trimmed = record()
+    for key in ("genres", "production_companies", "credits"):
+        del trimmed[key]
+    load(engine, trimmed)
+
+    links = catalogue(engine)
+    assert links["genres"] == ["Action", "Sci-Fi"]
+    assert links["companies"] == ["Village Roadshow", "Warner Bros."]
+    assert links["crew"] == 2
+
+
+def test_imdb_id_clash_is_nulled_not_fatal(engine):
+    load(engine, record())
+    load(engine, record(tmdb_id=604, title="The Matrix Reloaded", imdb_id="tt0000603"))
+
+    with Session(engine) as db:
+        reloaded = db.scalars(select(Movie).where(Movie.tmdb_id == 604)).one()
+        assert reloaded.imdb_id is None
+
+
+def test_iter_json_records_reads_lists_pages_and_lines(tmp_path):
+    (tmp_path / "page.json").write_text(json.dumps({"results": [record(1)]}))
+    (tmp_path / "list.json").write_text(json.dumps([record(2)]))
+    (tmp_path / "lines.jsonl").write_text(
+        json.dumps(record(3)) + "\n\n" + json.dumps(record(4)) + "\n"
+    )
+
+    records = iter_json_records(sorted(tmp_path.iterdir(), key=lambda path: path.name))
+
+    assert [item["id"] for item in records] == [3, 4, 2, 1]
+
+
+def test_copy_value_escapes_text_format():
+    assert copy_value(None) == "\\N"
+    assert copy_value(True) == "t"
+    assert copy_value("a\tb\\c\nd") == "a\\tb\\\\c\\nd"
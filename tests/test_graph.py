@@ -0,0 +1,40 @@
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from analytics.graph import CollaborationGraph, CollaborationGraphBuilder
+from database.models import Movie, Person, movie_crew_association
+
+
+def test_pairs_count_each_film_once_per_role(engine, tmp_path):
+    with Session(engine) as db:
+        db.add_all(
+            [
+                Movie(id=1, tmdb_id=1, title="Heat", budget=100, revenue=300),
+                Movie(id=2, tmdb_id=2, title="Ronin", budget=100, revenue=500),
+                Person(id=1, tmdb_id=1, name="Director"),
+                Person(id=2, tmdb_id=2, name="Writer"),
+            ]
+        )
+        db.flush()
+        db.execute(
+            insert(movie_crew_association),
+            [
+                {"movie_id": 1, "person_id": 1, "job": "Director"},
+                {"movie_id": 1, "person_id": 2, "job": "Writer"},
+                {"movie_id": 1, "person_id": 2, "job": "Screenplay"},
+                {"movie_id": 2, "person_id": 1, "job": "Director"},
+                {"movie_id": 2, "person_id": 2, "job": "Writer"},
+            ],
+        )
+        db.commit()
+
+    path = CollaborationGraphBuilder(engine, graph_dir=tmp_path / "graph").build()
+    graph = CollaborationGraph(path)
+
+    [pair] = graph.top_pairs("director-writer", sort="films")
+    assert (pair["left_id"], pair["right_id"]) == (1, 2)
+    assert pair["films"] == 2
+    assert pair["roi_films"] == 2
+    assert pair["total_revenue"] == 800.0
+    assert pair["mean_roi"] == 300.0
+    assert graph.person(graph.person_row(2))["films"] == 2
@@ -0,0 +1,139 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from database.models import (
+    BoxOffice,
+    BoxOfficeMonthly,
+    Movie,
+    Rating,
+    RatingMonthly,
+    SentimentAnalysis,
+    SentimentMonthly,
+)
+from database.partitioning import compact
+from database.read_model import ReadModelSync, movie_read_model
+
+NOW = datetime(2024, 6, 15)
+OLD = datetime(2022, 3, 10)
+
+
+def add_movie(db: Session, **values) -> Movie:
+    movie = Movie(tmdb_id=values.pop("tmdb_id", 1), title="Heat", **values)
+    db.add(movie)
+    db.flush()
+    return movie
+
+
+def test_compact_rolls_up_and_deletes_old_rows(engine):
+    with Session(engine) as db:
+        movie = add_movie(db)
+        for day, score, reviews in ((1, 0.5, 3), (20, -0.1, 1)):
+            db.add(
+                SentimentAnalysis(
+                    movie_id=movie.id,
+                    source="tmdb_reviews",
+                    sentiment_score=score,
+                    review_count=reviews,
+                    analysis_date=datetime(2022, 3, day),
+                )
+            )
+        db.add(
+            SentimentAnalysis(movie_id=movie.id, sentiment_score=0.9, analysis_date=NOW)
+        )
+        db.commit()
+
+    compacted = compact(engine, keep_months=12, now=NOW)
+
+    assert compacted == {"sentiment_analysis": [datetime(2022, 3, 1)]}
+    with Session(engine) as db:
+        assert db.scalar(select(func.count(SentimentAnalysis.id))) == 1
+        rollup = db.scalars(select(SentimentMonthly)).one()
+        assert rollup.sample_count == 2
+        assert rollup.review_count == 4
+        # Review-weighted: (0.5 * 3 - 0.1 * 1) / 4
+        assert rollup.avg_sentiment_score == pytest.approx(0.35)
+
+
+def test_compacting_a_backfilled_month_merges_into_its_rollup(engine):
+    with Session(engine) as db:
+        movie_id = add_movie(db).id
+        db.add(Rating(movie_id=movie_id, source="imdb", value="7.0", created_at=OLD))
+        db.commit()
+    compact(engine, keep_months=12, now=NOW)
+    with Session(engine) as db:
+        db.add(
+            Rating(
+                movie_id=movie_id,
+                source="imdb",
+                value="7.4",
+                created_at=datetime(2022, 3, 28),
+            )
+        )
+        db.commit()
+    compact(engine, keep_months=12, now=NOW)
+
+    with Session(engine) as db:
+        rollup = db.scalars(select(RatingMonthly)).one()
+        assert (rollup.sample_count, rollup.value) == (2, "7.4")
+
+
+def test_read_model_keeps_compacted_ratings_and_box_office(engine, read_model_engine):
+    with Session(engine) as db:
+        movie = add_movie(db, budget=100, revenue=300)
+        db.add_all(
+            [
+                Rating(movie_id=movie.id, source="imdb", value="8.3", created_at=OLD),
+                Rating(
+                    movie_id=movie.id,
+                    source="metacritic",
+                    value="76/100",
+                    created_at=OLD,
+                ),
+                BoxOffice(
+                    movie_id=movie.id,
+                    domestic_gross=67_000_000,
+                    worldwide_gross=187_000_000,
+                    created_at=OLD,
+                ),
+            ]
+        )
+        db.commit()
+        movie_id = movie.id
+
+    sync = ReadModelSync(source=engine, target=read_model_engine)
+    sync.run(full=True)
+    compact(engine, keep_months=12, now=NOW)
+    with Session(engine) as db:
+        assert db.scalar(select(func.count(Rating.id))) == 0
+        assert db.scalar(select(func.count(BoxOffice.id))) == 0
+        assert db.scalar(select(func.count()).select_from(BoxOfficeMonthly)) == 1
+    sync.run(full=True)
+
+    with read_model_engine.connect() as connection:
+        row = connection.execute(
+            select(movie_read_model).where(movie_read_model.c.id == movie_id)
+        ).one()
+    assert row.imdb_rating == "8.3"
+    assert row.metacritic == "76/100"
+    assert row.domestic_gross == 67_000_000
+    assert row.worldwide_gross == 187_000_000
+
+
+def test_live_rating_supersedes_compacted_one(engine, read_model_engine):
+    with Session(engine) as db:
+        movie = add_movie(db)
+        db.add(Rating(movie_id=movie.id, source="imdb", value="8.0", created_at=OLD))
+        db.commit()
+        compact(engine, keep_months=12, now=NOW)
+        db.add(Rating(movie_id=movie.id, source="imdb", value="8.1", created_at=NOW))
+        db.commit()
+
+    ReadModelSync(source=engine, target=read_model_engine).run(full=True)
+
+    with read_model_engine.connect() as connection:
+        assert (
+            connection.execute(select(movie_read_model.c.imdb_rating)).scalar() == "8.1"
+        )
@@ -0,0 +1,154 @@
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from analytics.performance import AsyncGenrePerformanceAnalyzer
+from database.connection import create_async_database_engine
+from database.models import Genre, Movie, Rating, movie_genre_association
+from database.read_model import (
+    ReadModelSync,
+    movie_genre_read_model,
+    movie_read_model,
+    read_model_state,
+)
+
+T0, T1, T2 = datetime(2024, 1, 1), datetime(2024, 2, 1), datetime(2024, 3, 1)
+
+
+def seed(engine):
+    with Session(engine) as db:
+        drama, crime = Genre(name="Drama"), Genre(name="Crime")
+        db.add_all(
+            [
+                Movie(
+                    tmdb_id=1,
+                    title="Heat",
+                    vote_average=8.3,
+                    vote_count=7000,
+                    budget=60,
+                    revenue=187,
+                    release_date=datetime(1995, 12, 15),
+                    genres=[crime, drama],
+                    updated_at=T0,
+                ),
+                Movie(
+                    tmdb_id=2,
+                    title="Ronin",
+                    vote_average=7.2,
+                    vote_count=3000,
+                    budget=55,
+                    revenue=41,
+                    release_date=datetime(1998, 9, 25),
+                    genres=[crime],
+                    updated_at=T0,
+                ),
+            ]
+        )
+        db.commit()
+        return {movie.title: movie.id for movie in db.scalars(select(Movie))}
+
+
+def read_model(read_model_engine):
+    with read_model_engine.connect() as connection:
+        return {
+            row.title: row for row in connection.execute(select(movie_read_model)).all()
+        }
+
+
+def test_full_sync_projects_movies_and_genres(engine, read_model_engine):
+    seed(engine)
+
+    stats = ReadModelSync(source=engine, target=read_model_engine).run(full=True)
+
+    assert stats == {"changed": 2, "upserted": 2, "deleted": 0}
+    heat = read_model(read_model_engine)["Heat"]
+    assert sorted(heat.genre_names.split(", ")) == ["Crime", "Drama"]
+    assert heat.primary_genre == heat.genre_names.split(", ")[0]
+    assert (heat.profit, heat.roi, heat.release_year) == (127, 211.67, 1995)
+    with read_model_engine.connect() as connection:
+        genres = connection.execute(
+            select(movie_genre_read_model.c.genre_name).order_by("genre_name")
+        ).scalars()
+        assert list(genres) == ["Crime", "Crime", "Drama"]
+        watermark = connection.execute(select(read_model_state.c.watermark))
+        assert watermark.scalar() == T0
+
+
+def test_incremental_sync_only_reprojects_changes(engine, read_model_engine):
+    ids = seed(engine)
+    sync = ReadModelSync(source=engine, target=read_model_engine)
+    sync.run(full=True)
+
+    with engine.begin() as connection:
+        connection.execute(
+            update(Movie)
+            .where(Movie.id == ids["Ronin"])
+            .values(title="Ronin (1998)", updated_at=T1)
+        )
+    # Rows stamped exactly at the watermark (Heat, at T0) are re-projected too
+    assert sync.run()["changed"] == 2
+    assert "Ronin (1998)" in read_model(read_model_engine)
+
+    with Session(engine) as db:
+        db.add(
+            Rating(
+                movie_id=ids["Heat"],
+                source="imdb",
+                value="8.3/10",
+                created_at=T2,
+                updated_at=T2,
+            )
+        )
+        db.commit()
+    assert sync.run()["changed"] == 2
+    assert read_model(read_model_engine)["Heat"].imdb_rating == "8.3/10"
+
+    # Nothing new: only the movie at the T2 watermark
+    assert sync.run()["changed"] == 1
+
+
+def test_full_sync_removes_deleted_movies(engine, read_model_engine):
+    ids = seed(engine)
+    sync = ReadModelSync(source=engine, target=read_model_engine)
+    sync.run(full=True)
+
+    with engine.begin() as connection:
+        connection.execute(
+            delete(movie_genre_association).where(
+                movie_genre_association.c.movie_id == ids["Ronin"]
+            )
+        )
+        connection.execute(delete(Movie).where(Movie.id == ids["Ronin"]))
+    stats = sync.run(full=True)
+
+    assert stats["deleted"] == 1
+    assert list(read_model(read_model_engine)) == ["Heat"]
+    with read_model_engine.connect() as connection:
+        genres = connection.execute(select(movie_genre_read_model.c.movie_id))
+        assert set(genres.scalars()) == {ids["Heat"]}
+
+
+def test_async_analyzer_matches_on_both_sources(engine, read_model_engine):
+    seed(engine)
+    ReadModelSync(source=engine, target=read_model_engine).run(full=True)
+
+    async def results(url, use_read_model):
+        async_engine = create_async_database_engine(url)
+        try:
+            async with AsyncSession(async_engine) as db:
+                analyzer = AsyncGenrePerformanceAnalyzer(db, use_read_model)
+                return (
+                    await analyzer.get_genre_ratings_summary(),
+                    await analyzer.get_top_movies_by_genre("Crime"),
+                    await analyzer.get_top_movies(),
+                    await analyzer.get_financial_summary(limit=1),
+                )
+        finally:
+            await async_engine.dispose()
+
+    assert asyncio.run(results(str(engine.url), False)) == asyncio.run(
+        results(str(read_model_engine.url), True)
+    )
@@ -0,0 +1,84 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from analytics.trends import format_sentiment_trend, sentiment_trend_query
+from data.processors.sentiment import SentimentPipeline
+from database.models import Movie, Review, SentimentAnalysis
+from scripts.collect_data import DataCollectionPipeline
+
+
+class FakeTMDb:
+    def __init__(self, reviews):
+        self.reviews = reviews
+
+    def get_movie_reviews(self, movie_id, page=1):
+        return {"results": self.reviews}
+
+
+def review(review_id, content):
+    return {
+        "id": review_id,
+        "author": "critic",
+        "author_details": {"rating": 8.0},
+        "content": content,
+        "created_at": "2024-05-01T12:00:00.000Z",
+    }
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    monkeypatch.setenv("TMDB_API_KEY", "test")
+    monkeypatch.setenv("OMDB_API_KEY", "test")
+    return DataCollectionPipeline()
+
+
+def test_existing_movies_get_new_reviews_once(engine, pipeline):
+    with Session(engine) as db:
+        db.add(Movie(tmdb_id=603, title="The Matrix"))
+        db.commit()
+
+        for reviews in (
+            [review("a", "A brilliant, wonderful film.")],
+            [
+                review("a", "A brilliant, wonderful film. Edited."),
+                review("b", "Dull and boring."),
+            ],
+        ):
+            pipeline.tmdb_collector = FakeTMDb(reviews)
+            pipeline._process_movie(db, {"id": 603, "title": "The Matrix"})
+            db.commit()
+            SentimentPipeline(engine, workers=1).run()
+
+        stored = db.scalars(select(Review).order_by(Review.external_id)).all()
+        assert [r.content for r in stored][0].endswith("Edited.")
+        assert all(r.analyzed_at is not None for r in stored)
+        runs = db.scalars(select(SentimentAnalysis)).all()
+        # One delta row per run, each covering only that run's new review
+        assert [run.review_count for run in runs] == [1, 1]
+
+
+def test_trend_weights_runs_by_review_count(engine):
+    with Session(engine) as db:
+        movie = Movie(tmdb_id=1, title="Heat")
+        db.add(movie)
+        db.flush()
+        for score, reviews in ((0.8, 3), (-0.4, 1)):
+            db.add(
+                SentimentAnalysis(
+                    movie_id=movie.id,
+                    source="tmdb",
+                    sentiment_score=score,
+                    review_count=reviews,
+                    analysis_date=datetime(2024, 5, 2),
+                )
+            )
+        db.commit()
+
+        rows = db.execute(sentiment_trend_query(movie.id, datetime(2024, 1, 1))).all()
+
+    assert format_sentiment_trend(rows) == [
+        {"month": "2024-05", "avg_sentiment": 0.5, "samples": 2, "reviews": 4}
+    ]
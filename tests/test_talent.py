@@ -0,0 +1,30 @@
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from analytics.talent import TalentRollupSync
+from database.models import Movie, Person, movie_crew_association
+from database.read_model import person_rollup
+
+
+def test_primary_role_counts_films_not_jobs(engine, read_model_engine):
+    with Session(engine) as db:
+        db.add_all([Movie(id=n, tmdb_id=n, title=f"Film {n}") for n in range(1, 6)])
+        db.add(Person(id=1, tmdb_id=1, name="Auteur"))
+        db.flush()
+        directed = [
+            {"movie_id": n, "person_id": 1, "job": "Director"} for n in (1, 2, 3)
+        ]
+        written = [
+            {"movie_id": n, "person_id": 1, "job": job}
+            for n in (4, 5)
+            for job in ("Writer", "Screenplay")
+        ]
+        db.execute(insert(movie_crew_association), directed + written)
+        db.commit()
+
+    TalentRollupSync(source=engine, target=read_model_engine).run(full=True)
+
+    with Session(read_model_engine) as db:
+        row = db.execute(select(person_rollup)).one()
+    assert row.primary_role == "director"
+    assert row.film_count == 5